@@ -4,7 +4,7 @@ from api_versions.v2.models import App
 
 # 日志记录依赖
 from api_versions.auth.routers import get_current_user
-from api_versions.v2.models import OperationLog
+from core.batch_writer import operation_log_writer
 from core.logger import logger
 
 router = APIRouter()
@@ -24,12 +24,12 @@ async def create_app(request: Request, app_data: AppCreateSchema):
         try:
             current_user = await get_current_user(request)
             username = current_user.username
-            is_admin = any(role.name in ["super_admin", "admin"] for role in await current_user.roles.all())
+            is_admin = current_user.principal.has_role("super_admin", "admin")
         except Exception:
             username = "anonymous"
             is_admin = False
 
-        await OperationLog.create(
+        operation_log_writer.submit(
             username=username,
             operation_type="CREATE",
             operation_content=f"创建应用: {app.name}",
@@ -55,12 +55,12 @@ async def update_app(request: Request, app_id: int, app_data: AppUpdateSchema):
         try:
             current_user = await get_current_user(request)
             username = current_user.username
-            is_admin = any(role.name in ["super_admin", "admin"] for role in await current_user.roles.all())
+            is_admin = current_user.principal.has_role("super_admin", "admin")
         except Exception:
             username = "anonymous"
             is_admin = False
 
-        await OperationLog.create(
+        operation_log_writer.submit(
             username=username,
             operation_type="UPDATE",
             operation_content=f"更新应用: {app.name}",
@@ -86,12 +86,12 @@ async def delete_app(request: Request, app_id: int):
         try:
             current_user = await get_current_user(request)
             username = current_user.username
-            is_admin = any(role.name in ["super_admin", "admin"] for role in await current_user.roles.all())
+            is_admin = current_user.principal.has_role("super_admin", "admin")
         except Exception:
             username = "anonymous"
             is_admin = False
 
-        await OperationLog.create(
+        operation_log_writer.submit(
             username=username,
             operation_type="DELETE",
             operation_content=f"删除应用: {app.name if app else app_id}",
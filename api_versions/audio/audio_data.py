@@ -8,6 +8,9 @@ from api_versions.logs.utils import record_operation_log
 from pydantic import BaseModel
 from settings.config import GREETING_LIST
 from core.logger import logger
+from tortoise.functions import Count, Min
+from core.stats_rollup import mark_dirty, question_hash
+from utils import audio_search
 
 router = APIRouter()
 
@@ -65,28 +68,58 @@ async def get_audio_data_list(
     search: Optional[str] = Query(None, description="搜索关键词"),
     current_user: User = Depends(get_current_user)
 ):
-    """获取音频数据列表（按问题分组）"""
-    query = AudioData.all()
+    """
+    获取音频数据列表（按问题分组）
+    分组与分页在数据库中完成：先按 question_hash 分组取出一页问题（按组内最早创建时间排序），
+    再只查询这一页问题的记录，耗时与表大小无关
+    """
+    greeting_hashes = [question_hash(q) for q in GREETING_LIST]
+    offset = (page - 1) * size
+    fulltext = audio_search.fulltext_query(search) if search else None
     
-    if search:
-        query = query.filter(
-            Q(user_question__icontains=search) | Q(ai_response_text__icontains=search)
+    if fulltext:
+        # 全文检索（FULLTEXT ngram 索引）命中的分组与记录
+        logger.info(f"🔍 全文检索: {search}")
+        total_groups, page_hashes = await audio_search.grouped_page(fulltext, greeting_hashes, offset, size)
+        row_ids = await audio_search.group_row_ids(fulltext, page_hashes)
+        page_audio_data = await AudioData.filter(id__in=row_ids).order_by("created_at") if row_ids else []
+    else:
+        query = AudioData.all()
+        
+        if search:
+            # 关键词短于 ngram 长度（单字）时无法走全文索引，回退到 LIKE
+            query = query.filter(
+                Q(user_question__icontains=search) | Q(ai_response_text__icontains=search)
+            )
+            logger.info(f"🔍 应用搜索过滤: {search}")
+        
+        # 过滤掉GREETING_LIST中的问候语（按哈希过滤，可以只走 (question_hash, created_at) 索引）
+        query = query.exclude(question_hash__in=greeting_hashes)
+        
+        # 分组总数
+        count_rows = await query.annotate(total=Count("question_hash", distinct=True)).values("total")
+        total_groups = count_rows[0]["total"] if count_rows else 0
+        
+        # 第一步：当前页的问题（按每个分组中最早音频的创建时间升序排序）
+        page_groups = await (
+            query.annotate(first_created_at=Min("created_at"))
+            .group_by("question_hash")
+            .order_by("first_created_at", "question_hash")
+            .offset(offset)
+            .limit(size)
+            .values("question_hash", "first_created_at")
         )
-        logger.info(f"🔍 应用搜索过滤: {search}")
-    
-    # 过滤掉GREETING_LIST中的问候语
-    query = query.exclude(user_question__in=GREETING_LIST)
-    
-    # 获取所有符合条件的音频数据（按创建时间升序排序）
-    all_audio_data = await query.order_by("created_at")
-    
-    # 先按问题分组
-    grouped_data = {}
-    for audio_data in all_audio_data:
-        question = audio_data.user_question
-        if question not in grouped_data:
-            grouped_data[question] = []
+        page_hashes = [group["question_hash"] for group in page_groups]
         
+        # 第二步：只取这一页问题的记录（按创建时间升序）
+        if page_hashes:
+            page_audio_data = await query.filter(question_hash__in=page_hashes).order_by("created_at")
+        else:
+            page_audio_data = []
+    
+    total_pages = (total_groups + size - 1) // size
+    grouped_data = {question_hash_: [] for question_hash_ in page_hashes}
+    for audio_data in page_audio_data:
         audio_url = None
         if audio_data.audio_file_path:
             file_path = audio_data.audio_file_path
@@ -99,7 +132,7 @@ async def get_audio_data_list(
         if audio_data.tts_started_at and audio_data.tts_completed_at:
             tts_duration = (audio_data.tts_completed_at - audio_data.tts_started_at).total_seconds()
         
-        grouped_data[question].append(AudioDataSchema(
+        grouped_data[audio_data.question_hash].append(AudioDataSchema(
             id=audio_data.id,
             user_question=audio_data.user_question,
             ai_response_text=audio_data.ai_response_text,
@@ -111,23 +144,10 @@ async def get_audio_data_list(
             tts_duration=tts_duration
         ))
     
-    # 按最早的音频记录创建时间对分组进行排序
-    grouped_list = []
-    for question, audio_list in grouped_data.items():
-        # 按创建时间升序排序每个分组内的音频
-        audio_list.sort(key=lambda x: x.created_at, reverse=False)
-        grouped_list.append((question, audio_list))
-    
-    # 按每个分组中最早音频的创建时间升序排序
-    grouped_list.sort(key=lambda x: x[1][0].created_at, reverse=False)
-    
-    # 计算分组总数和分页
-    total_groups = len(grouped_list)
-    total_pages = (total_groups + size - 1) // size
-    
-    # 对分组进行分页
-    offset = (page - 1) * size
-    paginated_groups = grouped_list[offset:offset + size]
+    paginated_groups = [
+        (audio_list[0].user_question, audio_list)
+        for audio_list in grouped_data.values() if audio_list
+    ]
     
     result_data = {
         "groups": paginated_groups,
@@ -139,6 +159,53 @@ async def get_audio_data_list(
     
     return success(result_data)
 
+@router.get("/search", summary="全文检索音频数据")
+async def search_audio_data(
+    request: Request,
+    q: str = Query(..., min_length=1, description="搜索关键词，多个词用空格分隔"),
+    page: int = Query(1, ge=1, description="页码"),
+    size: int = Query(10, ge=1, le=100, description="每页数量"),
+    current_user: User = Depends(get_current_user)
+):
+    """按相关度排序的全文检索结果，附带高亮片段（命中词以 <em> 标记）"""
+    fulltext = audio_search.fulltext_query(q)
+    if not fulltext:
+        raise HTTPException(status_code=400, detail=f"搜索关键词每个词至少 {audio_search.NGRAM_TOKEN_SIZE} 个字符")
+    
+    greeting_hashes = [question_hash(question) for question in GREETING_LIST]
+    total, ranked = await audio_search.ranked_page(fulltext, greeting_hashes, (page - 1) * size, size)
+    records = {item.id: item for item in await AudioData.filter(id__in=[id_ for id_, _ in ranked])}
+    terms = audio_search.search_terms(q)
+    
+    items = []
+    for id_, score in ranked:
+        audio_data = records.get(id_)
+        if audio_data is None:
+            continue
+        audio_url = None
+        if audio_data.audio_file_path:
+            file_path = audio_data.audio_file_path
+            if file_path.startswith('static/'):
+                file_path = file_path[7:]
+            audio_url = str(request.url_for("audio_files", path=file_path))
+        items.append({
+            "id": audio_data.id,
+            "score": round(score, 4),
+            "user_question": audio_data.user_question,
+            "question_highlight": audio_search.highlight(audio_data.user_question, terms),
+            "answer_highlight": audio_search.highlight(audio_data.ai_response_text, terms),
+            "audio_url": audio_url,
+            "created_at": convert_to_china_timezone(audio_data.created_at),
+        })
+    
+    return success({
+        "items": items,
+        "total": total,
+        "page": page,
+        "size": size,
+        "pages": (total + size - 1) // size
+    })
+
 @router.post("/create", summary="创建音频数据记录")
 async def create_audio_data(
     request: Request,
@@ -149,11 +216,13 @@ async def create_audio_data(
     try:
         audio_data = await AudioData.create(
             user_question=data.user_question,
+            question_hash=question_hash(data.user_question),
             ai_response_text=data.ai_response_text,
             audio_file_path=data.audio_file_path,
             tts_started_at=data.tts_started_at,
             tts_completed_at=data.tts_completed_at
         )
+        mark_dirty(audio_data.created_at)
         
         await record_operation_log(
             request=request,
@@ -211,6 +280,7 @@ async def delete_audio_data(
     audio_file_path = audio_data.audio_file_path
     
     await audio_data.delete()
+    mark_dirty(audio_data.created_at)
     
     await record_operation_log(
         request=request,
@@ -0,0 +1,157 @@
+import time
+import orjson
+from core.logger import logger
+from core.redis_client import redis_client
+from settings.config import settings
+
+# Redis 中的主体缓存：key 带全局版本号，角色 / 权限变更时版本号递增，旧版本的 key 自然过期
+PRINCIPAL_KEY = "auth:principal:{version}:{user_id}"
+VERSION_KEY = "auth:principal:version"
+# 缓存的用户字段（不含密码哈希）
+USER_FIELDS = ("id", "username", "avatar", "email", "phone", "gender", "department", "created_at", "updated_at")
+
+ADMIN_ROLES = ("admin", "super_admin")
+
+
+class Principal:
+    """
+    已认证请求的主体：用户 id、用户名、角色名与权限位图（第 n 位对应 id 为 n 的权限）
+    - user: 由缓存字段构造的 User 实例（不含密码哈希），可直接用于日志外键等场景
+    """
+
+    def __init__(self, fields: dict, roles: list, permission_bits: int, catalog: dict):
+        self.fields = fields
+        self.id = fields["id"]
+        self.username = fields["username"]
+        self.roles = tuple(roles)
+        self.permission_bits = permission_bits
+        self._catalog = catalog
+        self._user = None
+
+    def has_role(self, *names) -> bool:
+        return any(role in names for role in self.roles)
+
+    @property
+    def is_admin(self) -> bool:
+        return self.has_role(*ADMIN_ROLES)
+
+    def has_permission(self, code: str) -> bool:
+        bit = self._catalog.get(code)
+        return bit is not None and bool(self.permission_bits >> bit & 1)
+
+    @property
+    def permissions(self) -> list:
+        return [code for code, bit in self._catalog.items() if self.permission_bits >> bit & 1]
+
+    @property
+    def user(self):
+        if self._user is None:
+            from api_versions.v2.models import User
+
+            user = User(**self.fields)
+            # 对应数据库中已存在的记录，可作为外键赋值
+            user._saved_in_db = True
+            user.principal = self
+            self._user = user
+        return self._user
+
+
+class PrincipalCache:
+    """
+    主体缓存：进程内（principal_cache_ttl 秒）→ Redis（principal_cache_redis_ttl 秒）→ 数据库（2 次查询）
+    - 用户资料 / 角色分配变更时 invalidate_user，角色权限或权限表变更时 invalidate_all
+    - 其他 worker 的进程内缓存最多滞后 principal_cache_ttl 秒
+    """
+
+    def __init__(self):
+        self._local = {}
+        self._catalog = None
+
+    async def get(self, user_id: int):
+        entry = self._local.get(user_id)
+        now = time.monotonic()
+        if entry and entry[0] > now:
+            return entry[1]
+
+        principal = None
+        try:
+            version = await redis_client.get(VERSION_KEY) or "0"
+            payload = await redis_client.get(PRINCIPAL_KEY.format(version=version, user_id=user_id))
+            if payload:
+                principal = await self._from_payload(orjson.loads(payload), version)
+        except Exception as e:
+            version = None
+            logger.warning(f"读取主体缓存失败: {e}")
+
+        if principal is None:
+            principal = await self._load(user_id, version)
+        if principal is None:
+            self._local.pop(user_id, None)
+            return None
+        self._local[user_id] = (now + settings.principal_cache_ttl, principal)
+        return principal
+
+    async def _catalog_for(self, version) -> dict:
+        """权限编码 -> 位序号，随版本号刷新"""
+        if self._catalog is None or self._catalog[0] != version:
+            from api_versions.v2.models import Permission
+
+            rows = await Permission.all().values_list("id", "code")
+            self._catalog = (version, {code: permission_id for permission_id, code in rows})
+        return self._catalog[1]
+
+    async def _from_payload(self, payload: dict, version) -> Principal:
+        from datetime import datetime
+
+        fields = payload["user"]
+        for name in ("created_at", "updated_at"):
+            if fields.get(name):
+                fields[name] = datetime.fromisoformat(fields[name])
+        return Principal(fields, payload["roles"], int(payload["bits"]), await self._catalog_for(version))
+
+    async def _load(self, user_id: int, version):
+        from api_versions.v2.models import User, Role
+
+        users = await User.filter(id=user_id).values(*USER_FIELDS)
+        if not users:
+            return None
+        fields = users[0]
+        # 一次联表查询取出角色名与角色下的权限 id
+        roles, bits = [], 0
+        for row in await Role.filter(users__id=user_id).values("name", "permissions__id"):
+            if row["name"] not in roles:
+                roles.append(row["name"])
+            if row["permissions__id"] is not None:
+                bits |= 1 << row["permissions__id"]
+
+        principal = Principal(fields, roles, bits, await self._catalog_for(version))
+        if version is not None:
+            payload = orjson.dumps({"user": fields, "roles": roles, "bits": str(bits)})
+            try:
+                await redis_client.set(
+                    PRINCIPAL_KEY.format(version=version, user_id=user_id), payload, ex=settings.principal_cache_redis_ttl
+                )
+            except Exception as e:
+                logger.warning(f"写入主体缓存失败: {e}")
+        return principal
+
+    async def invalidate_user(self, *user_ids: int):
+        for user_id in user_ids:
+            self._local.pop(user_id, None)
+        try:
+            version = await redis_client.get(VERSION_KEY) or "0"
+            if user_ids:
+                await redis_client.delete(*(PRINCIPAL_KEY.format(version=version, user_id=u) for u in user_ids))
+        except Exception as e:
+            logger.warning(f"清除主体缓存失败: {e}")
+
+    async def invalidate_all(self):
+        self._local.clear()
+        self._catalog = None
+        try:
+            await redis_client.incr(VERSION_KEY)
+        except Exception as e:
+            logger.warning(f"更新主体缓存版本失败: {e}")
+
+
+principal_cache = PrincipalCache()
@@ -0,0 +1,68 @@
+"""
+RBAC 读模型：列表 / 详情按集合一次取出（联表 M2M），查询次数不随角色、权限、用户数量增长
+"""
+from tortoise.functions import Count
+from api_versions.v2.models import User, Role, Permission
+
+PERMISSION_FIELDS = ("id", "name", "code", "description")
+
+
+def _role_item(row: dict, prefix: str = "") -> dict:
+    name, description = row[f"{prefix}name"], row[f"{prefix}description"]
+    return {"id": row[f"{prefix}id"], "name": name, "display_name": description or name, "description": description}
+
+
+async def roles_with_permissions() -> list:
+    """角色列表（含权限与用户数）：2 次查询"""
+    roles = await Role.all().annotate(users_count=Count("users", distinct=True)).order_by("id").values(
+        "id", "name", "description", "created_at", "users_count"
+    )
+    permissions = {role["id"]: [] for role in roles}
+    rows = await Role.all().order_by("id", "permissions__id").values(
+        "id", "permissions__id", "permissions__name", "permissions__code"
+    )
+    for row in rows:
+        # 没有权限的角色联表结果为一行空值
+        if row["permissions__id"] is None:
+            continue
+        permissions.setdefault(row["id"], []).append({
+            "id": row["permissions__id"],
+            "name": row["permissions__name"],
+            "code": row["permissions__code"],
+        })
+    return [
+        {
+            "id": role["id"],
+            "name": role["name"],
+            "description": role["description"],
+            "permissions": permissions[role["id"]],
+            "users_count": role["users_count"],
+            "created_at": role["created_at"],
+        }
+        for role in roles
+    ]
+
+
+async def roles_by_user(user_ids: list) -> dict:
+    """一批用户的角色：1 次查询，返回 {user_id: [角色]}"""
+    roles = {user_id: [] for user_id in user_ids}
+    if not user_ids:
+        return roles
+    rows = await Role.filter(users__id__in=user_ids).order_by("id").values(
+        "id", "name", "description", user_id="users__id"
+    )
+    for row in rows:
+        roles[row["user_id"]].append(_role_item(row))
+    return roles
+
+
+async def user_permissions(user_id: int) -> list:
+    """用户通过角色获得的权限（去重）：1 次查询"""
+    return await Permission.filter(roles__users__id=user_id).distinct().order_by("id").values(*PERMISSION_FIELDS)
+
+
+async def users_page(query, offset: int, limit: int):
+    """用户分页（含角色）：3 次查询，返回 (总数, 用户列表, {user_id: [角色]})"""
+    total = await query.count()
+    users = await query.order_by("id").offset(offset).limit(limit)
+    return total, users, await roles_by_user([user.id for user in users])
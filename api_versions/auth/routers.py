@@ -12,6 +12,10 @@ from .schema import (
     UpdatePathPermissionSchema, PathPermissionResponseSchema
 )
 from api_versions.logs.utils import record_login_log, record_operation_log
+from .principal import Principal, principal_cache
+from . import rbac_queries
+from tortoise.queryset import Q
+from utils.image_variants import image_variants
 
 router = APIRouter()
 
@@ -102,20 +106,15 @@ async def get_user_info(request: Request):
         payload = jwt.decode(token, JWT_SECRET, algorithms=["HS256"])
     except jwt.PyJWTError:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token无效")
-    user_id = payload.get("user_id")
-    user = await User.get_or_none(id=user_id).prefetch_related("roles", "roles__permissions")
-    if not user:
+    # 角色与权限来自主体缓存，命中时不查询数据库
+    principal = await principal_cache.get(payload.get("user_id"))
+    if not principal:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="用户不存在")
-    # 组装用户信息
-    roles_objs = await user.roles.all()
-    roles = [r.name for r in roles_objs]
-    permissions = []
-    for r in roles_objs:
-        perms = await r.permissions.all()
-        permissions.extend([p.code for p in perms])
+    user = principal.user
+    roles = list(principal.roles)
     
     # 根据权限生成可访问的路由
-    unique_permissions = list(set(permissions))
+    unique_permissions = principal.permissions
     routes = []
     
     # 调试信息：打印用户权限和角色
@@ -229,14 +228,23 @@ async def get_user_info(request: Request):
         "username": user.username,
         "avatar": user.avatar,
         "img_url": user.get_img_url(request),  # 使用request构建完整的头像URL
+        "img_srcset": await image_variants.srcset(request, _avatar_path(user)),
         "roles": roles,
         "permissions": unique_permissions,
         "routes": final_routes,  # 去重
     })
 
+def _avatar_path(user) -> str:
+    """头像的静态文件路径（未设置时为默认头像），与 User.get_img_url 一致"""
+    return user.avatar or "avatar/default.jpg"
+
 # JWT依赖函数
-async def get_current_user(request: Request) -> User:
-    """从请求中获取当前用户"""
+async def get_principal(request: Request) -> Principal:
+    """从请求中解析当前主体（同一请求内只解析一次，用户与角色权限走主体缓存）"""
+    principal = getattr(request.state, "principal", None)
+    if principal is not None:
+        return principal
+
     token = request.headers.get("Authorization")
     if token and token.startswith("Bearer "):
         token = token[7:]
@@ -251,27 +259,20 @@ async def get_current_user(request: Request) -> User:
     except jwt.PyJWTError:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token无效")
     
-    user_id = payload.get("user_id")
-    user = await User.get_or_none(id=user_id)
-    if not user:
+    principal = await principal_cache.get(payload.get("user_id"))
+    if not principal:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="用户不存在")
-    
-    return user
+    request.state.principal = principal
+    return principal
+
+async def get_current_user(request: Request) -> User:
+    """从请求中获取当前用户（由缓存构造，不含密码哈希；角色判断使用 current_user.principal）"""
+    return (await get_principal(request)).user
 
 @router.get("/profile", summary="获取个人资料")
 async def get_profile(request: Request, current_user: User = Depends(get_current_user)):
     """获取当前用户的个人资料"""
-    await current_user.fetch_related("roles")
-    
-    # 构建角色信息
-    roles_data = []
-    for role in current_user.roles:
-        roles_data.append({
-            "id": role.id,
-            "name": role.name,
-            "display_name": role.description or role.name,
-            "description": role.description
-        })
+    roles_data = (await rbac_queries.roles_by_user([current_user.id]))[current_user.id]
     
     profile_data = {
         "id": current_user.id,
@@ -282,6 +283,7 @@ async def get_profile(request: Request, current_user: User = Depends(get_current
         "department": current_user.department,
         "avatar": current_user.avatar,
         "img_url": current_user.get_img_url(request),  # 使用request构建完整的头像URL
+        "img_srcset": await image_variants.srcset(request, _avatar_path(current_user)),
         "roles": roles_data,
         "created_at": current_user.created_at,
         "updated_at": current_user.updated_at
@@ -309,6 +311,7 @@ async def update_profile(
     
     if update_fields:
         await User.filter(id=current_user.id).update(**update_fields)
+        await principal_cache.invalidate_user(current_user.id)
     
     # 记录操作日志
     await record_operation_log(
@@ -331,6 +334,8 @@ async def update_avatar(
 ):
     """更新当前用户的头像"""
     await User.filter(id=current_user.id).update(avatar=avatar_data.avatar)
+    await principal_cache.invalidate_user(current_user.id)
+    image_variants.schedule(avatar_data.avatar)
 
     await record_operation_log(
         request=request,
@@ -351,8 +356,9 @@ async def change_password(
     current_user: User = Depends(get_current_user)
 ):
     """修改当前用户的密码"""
-    # 验证当前密码
-    if not current_user.verify_password(password_data.current_password):
+    # 验证当前密码（缓存中的用户不含密码哈希，重新读取）
+    user = await User.get(id=current_user.id)
+    if not user.verify_password(password_data.current_password):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="当前密码错误")
     
     # 更新密码
@@ -384,37 +390,25 @@ async def get_users(
 ):
     """获取用户列表（分页）"""
     # 检查权限 - 只有管理员可以访问
-    await current_user.fetch_related("roles")
-    is_admin = any(role.name == "admin" for role in current_user.roles)
+    is_admin = current_user.principal.has_role("admin")
     if not is_admin:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="权限不足")
     
     # 构建查询
-    query = User.all().prefetch_related("roles")
+    query = User.all()
     
     # 搜索条件
     if search:
-        query = query.filter(
-            username__icontains=search
-        ) | query.filter(
-            email__icontains=search
-        )
+        query = query.filter(Q(username__icontains=search) | Q(email__icontains=search))
     
-    # 分页
-    total = await query.count()
-    users = await query.offset((page - 1) * size).limit(size)
+    # 分页（当前页用户的角色一次查出）
+    total, users, user_roles = await rbac_queries.users_page(query, (page - 1) * size, size)
+    avatar_srcsets = await image_variants.srcsets(request, [_avatar_path(user) for user in users])
     
     # 构建响应数据
     users_data = []
     for user in users:
-        roles_data = []
-        for role in user.roles:
-            roles_data.append({
-                "id": role.id,
-                "name": role.name,
-                "display_name": role.description or role.name,
-                "description": role.description
-            })
+        roles_data = user_roles[user.id]
         
         users_data.append({
             "id": user.id,
@@ -425,6 +419,7 @@ async def get_users(
             "department": user.department,
             "avatar": user.avatar,
             "img_url": user.get_img_url(request),
+            "img_srcset": avatar_srcsets.get(_avatar_path(user)),
             "roles": roles_data,
             "is_active": True,  # 暂时固定为True，因为User模型还没有is_active字段
             "is_superuser": user.id == 1,  # 第一个用户为超级管理员
@@ -448,8 +443,7 @@ async def create_user(
 ):
     """创建新用户"""
     # 检查权限
-    await current_user.fetch_related("roles")
-    is_admin = any(role.name == "admin" for role in current_user.roles)
+    is_admin = current_user.principal.has_role("admin")
     if not is_admin:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="权限不足")
     
@@ -502,8 +496,7 @@ async def update_user(
 ):
     """更新用户信息"""
     # 检查权限
-    await current_user.fetch_related("roles")
-    is_admin = any(role.name == "admin" for role in current_user.roles)
+    is_admin = current_user.principal.has_role("admin")
     if not is_admin:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="权限不足")
     
@@ -543,6 +536,7 @@ async def update_user(
             roles = await Role.filter(id__in=user_data.role_ids)
             for role in roles:
                 await target_user.roles.add(role)
+    await principal_cache.invalidate_user(user_id)
     
     await record_operation_log(
         request=request,
@@ -564,8 +558,7 @@ async def delete_user(
 ):
     """删除用户"""
     # 检查权限
-    await current_user.fetch_related("roles")
-    is_admin = any(role.name == "admin" for role in current_user.roles)
+    is_admin = current_user.principal.has_role("admin")
     if not is_admin:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="权限不足")
     
@@ -584,6 +577,7 @@ async def delete_user(
     
     # 删除用户
     await target_user.delete()
+    await principal_cache.invalidate_user(user_id)
     
     await record_operation_log(
         request=request,
@@ -606,8 +600,7 @@ async def reset_user_password(
 ):
     """重置用户密码"""
     # 检查权限
-    await current_user.fetch_related("roles")
-    is_admin = any(role.name == "admin" for role in current_user.roles)
+    is_admin = current_user.principal.has_role("admin")
     if not is_admin:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="权限不足")
     
@@ -638,8 +631,7 @@ async def reset_user_password(
 async def get_permissions(current_user: User = Depends(get_current_user)):
     """获取所有权限列表"""
     # 检查权限（只有管理员才能查看）
-    await current_user.fetch_related("roles")
-    is_admin = any(role.name in ["admin", "super_admin"] for role in current_user.roles)
+    is_admin = current_user.principal.has_role("admin", "super_admin")
     if not is_admin:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="无权限访问")
     
@@ -663,8 +655,7 @@ async def create_permission(
 ):
     """创建新权限"""
     # 检查权限（只有超级管理员才能创建权限）
-    await current_user.fetch_related("roles")
-    is_super_admin = any(role.name == "super_admin" for role in current_user.roles)
+    is_super_admin = current_user.principal.has_role("super_admin")
     if not is_super_admin:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="无权限操作")
     
@@ -677,6 +668,7 @@ async def create_permission(
         code=permission_data["code"],
         description=permission_data.get("description", "")
     )
+    await principal_cache.invalidate_all()
     
     return success({
         "id": permission.id,
@@ -693,8 +685,7 @@ async def update_permission(
 ):
     """更新权限信息"""
     # 检查权限（只有超级管理员才能更新权限）
-    await current_user.fetch_related("roles")
-    is_super_admin = any(role.name == "super_admin" for role in current_user.roles)
+    is_super_admin = current_user.principal.has_role("super_admin")
     if not is_super_admin:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="无权限操作")
     
@@ -721,8 +712,7 @@ async def delete_permission(
 ):
     """删除权限"""
     # 检查权限（只有超级管理员才能删除权限）
-    await current_user.fetch_related("roles")
-    is_super_admin = any(role.name == "super_admin" for role in current_user.roles)
+    is_super_admin = current_user.principal.has_role("super_admin")
     if not is_super_admin:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="无权限操作")
     
@@ -736,6 +726,7 @@ async def delete_permission(
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="该权限正在被角色使用，无法删除")
     
     await permission.delete()
+    await principal_cache.invalidate_all()
     return success(message="权限删除成功")
 
 # ====== 角色管理API ======
@@ -744,34 +735,11 @@ async def delete_permission(
 async def get_roles(current_user: User = Depends(get_current_user)):
     """获取所有角色列表"""
     # 检查权限（只有管理员才能查看）
-    await current_user.fetch_related("roles")
-    is_admin = any(role.name in ["admin", "super_admin"] for role in current_user.roles)
+    is_admin = current_user.principal.has_role("admin", "super_admin")
     if not is_admin:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="无权限访问")
     
-    roles = await Role.all().prefetch_related("permissions", "users")
-    roles_data = []
-    for role in roles:
-        permissions_data = []
-        for perm in role.permissions:
-            permissions_data.append({
-                "id": perm.id,
-                "name": perm.name,
-                "code": perm.code
-            })
-        
-        users_count = len(role.users)
-        
-        roles_data.append({
-            "id": role.id,
-            "name": role.name,
-            "description": role.description,
-            "permissions": permissions_data,
-            "users_count": users_count,
-            "created_at": role.created_at
-        })
-    
-    return success(roles_data)
+    return success(await rbac_queries.roles_with_permissions())
 
 @router.post("/roles", summary="创建角色")
 async def create_role(
@@ -780,8 +748,7 @@ async def create_role(
 ):
     """创建新角色"""
     # 检查权限（只有管理员才能创建角色）
-    await current_user.fetch_related("roles")
-    is_admin = any(role.name in ["admin", "super_admin"] for role in current_user.roles)
+    is_admin = current_user.principal.has_role("admin", "super_admin")
     if not is_admin:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="无权限操作")
     
@@ -813,8 +780,7 @@ async def update_role(
 ):
     """更新角色信息"""
     # 检查权限（只有管理员才能更新角色）
-    await current_user.fetch_related("roles")
-    is_admin = any(role.name in ["admin", "super_admin"] for role in current_user.roles)
+    is_admin = current_user.principal.has_role("admin", "super_admin")
     if not is_admin:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="无权限操作")
     
@@ -842,6 +808,8 @@ async def update_role(
         if role_data["permission_ids"]:
             permissions = await Permission.filter(id__in=role_data["permission_ids"])
             await role.permissions.add(*permissions)
+    if update_fields or "permission_ids" in role_data:
+        await principal_cache.invalidate_all()
     
     return success(message="角色更新成功")
 
@@ -852,8 +820,7 @@ async def delete_role(
 ):
     """删除角色"""
     # 检查权限（只有管理员才能删除角色）
-    await current_user.fetch_related("roles")
-    is_admin = any(role.name in ["admin", "super_admin"] for role in current_user.roles)
+    is_admin = current_user.principal.has_role("admin", "super_admin")
     if not is_admin:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="无权限操作")
     
@@ -880,8 +847,7 @@ async def get_role_permissions(
 ):
     """获取指定角色的权限列表"""
     # 检查权限
-    await current_user.fetch_related("roles")
-    is_admin = any(role.name in ["admin", "super_admin"] for role in current_user.roles)
+    is_admin = current_user.principal.has_role("admin", "super_admin")
     if not is_admin:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="无权限访问")
     
@@ -908,8 +874,7 @@ async def set_role_permissions(
 ):
     """设置角色的权限"""
     # 检查权限（只有管理员才能设置角色权限）
-    await current_user.fetch_related("roles")
-    is_admin = any(role.name in ["admin", "super_admin"] for role in current_user.roles)
+    is_admin = current_user.principal.has_role("admin", "super_admin")
     if not is_admin:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="无权限操作")
     
@@ -925,6 +890,7 @@ async def set_role_permissions(
     if permission_ids:
         permissions = await Permission.filter(id__in=permission_ids)
         await role.permissions.add(*permissions)
+    await principal_cache.invalidate_all()
     
     return success(message="角色权限设置成功")
 
@@ -937,22 +903,17 @@ async def get_user_roles(
 ):
     """获取指定用户的角色列表"""
     # 检查权限
-    await current_user.fetch_related("roles")
-    is_admin = any(role.name in ["admin", "super_admin"] for role in current_user.roles)
+    is_admin = current_user.principal.has_role("admin", "super_admin")
     if not is_admin:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="无权限访问")
     
-    user = await User.get_or_none(id=user_id).prefetch_related("roles")
-    if not user:
+    if not await User.filter(id=user_id).exists():
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="用户不存在")
     
-    roles_data = []
-    for role in user.roles:
-        roles_data.append({
-            "id": role.id,
-            "name": role.name,
-            "description": role.description
-        })
+    roles_data = [
+        {"id": role["id"], "name": role["name"], "description": role["description"]}
+        for role in (await rbac_queries.roles_by_user([user_id]))[user_id]
+    ]
     
     return success(roles_data)
 
@@ -964,8 +925,7 @@ async def set_user_roles(
 ):
     """设置用户的角色"""
     # 检查权限（只有管理员才能设置用户角色）
-    await current_user.fetch_related("roles")
-    is_admin = any(role.name in ["admin", "super_admin"] for role in current_user.roles)
+    is_admin = current_user.principal.has_role("admin", "super_admin")
     if not is_admin:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="无权限操作")
     
@@ -981,6 +941,7 @@ async def set_user_roles(
     if role_ids:
         roles = await Role.filter(id__in=role_ids)
         await user.roles.add(*roles)
+    await principal_cache.invalidate_user(user_id)
     
     return success(message="用户角色设置成功")
 
@@ -991,31 +952,15 @@ async def get_user_permissions(
 ):
     """获取指定用户的直接权限列表（通过角色获得的权限）"""
     # 检查权限
-    await current_user.fetch_related("roles")
-    is_admin = any(role.name in ["admin", "super_admin"] for role in current_user.roles)
+    is_admin = current_user.principal.has_role("admin", "super_admin")
     if not is_admin:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="无权限访问")
     
-    user = await User.get_or_none(id=user_id).prefetch_related("roles", "roles__permissions")
-    if not user:
+    if not await User.filter(id=user_id).exists():
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="用户不存在")
     
-    # 收集用户通过角色获得的所有权限
-    permissions_data = []
-    permission_ids = set()
-    
-    for role in user.roles:
-        for permission in role.permissions:
-            if permission.id not in permission_ids:
-                permission_ids.add(permission.id)
-                permissions_data.append({
-                    "id": permission.id,
-                    "name": permission.name,
-                    "code": permission.code,
-                    "description": permission.description
-                })
-    
-    return success(permissions_data)
+    # 用户通过角色获得的所有权限（联表去重）
+    return success(await rbac_queries.user_permissions(user_id))
 
 @router.post("/users/{user_id}/permissions", summary="设置用户权限")
 async def set_user_permissions(
@@ -1025,8 +970,7 @@ async def set_user_permissions(
 ):
     """设置用户的直接权限（注意：这里暂时返回成功，因为当前架构中用户权限通过角色管理）"""
     # 检查权限（只有管理员才能设置用户权限）
-    await current_user.fetch_related("roles")
-    is_admin = any(role.name in ["admin", "super_admin"] for role in current_user.roles)
+    is_admin = current_user.principal.has_role("admin", "super_admin")
     if not is_admin:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="无权限操作")
     
@@ -1049,18 +993,11 @@ def check_permission(permission_code: str):
             if not current_user:
                 raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="未认证")
             
-            # 获取用户权限
-            await current_user.fetch_related("roles", "roles__permissions")
-            user_permissions = []
-            for role in current_user.roles:
-                for perm in role.permissions:
-                    user_permissions.append(perm.code)
-            
-            # 检查权限
-            if permission_code not in user_permissions:
+            # 检查权限（主体缓存中的权限位图）
+            principal = current_user.principal
+            if not principal.has_permission(permission_code):
                 # 检查是否为超级管理员（超级管理员拥有所有权限）
-                is_super_admin = any(role.name == "super_admin" for role in current_user.roles)
-                if not is_super_admin:
+                if not principal.has_role("super_admin"):
                     raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="权限不足")
             
             return await func(*args, **kwargs)
@@ -4,7 +4,8 @@ from typing import Optional
 
 from api_versions.auth.routers import get_current_user  # 复用现有的认证逻辑
 from api_versions.v2.models import User, SiteConfig
-from settings.config import AUDIO_DIR
+from settings.config import AUDIO_DIR, settings
+from utils.upload_pipeline import save_upload
 from api_versions.logs.utils import record_operation_log
 
 router = APIRouter()
@@ -41,9 +42,8 @@ async def get_site_config(request: Request):
     def _build_url(path_val: Optional[str]):
         if not path_val:
             return ""
-        import time
-        base_url = str(request.url_for("audio_files", path=path_val))
-        return f"{base_url}?t={int(time.time())}"
+        # URL 带文件版本号，替换后自动失效
+        return str(request.url_for("audio_files", path=path_val))
 
     return success({
         "title": cfg.title,
@@ -61,8 +61,7 @@ async def update_site_config(
     current_user: User = Depends(get_current_user),
 ):
     # 权限校验：仅管理员/超级管理员可修改
-    await current_user.fetch_related("roles")
-    is_admin = any(r.name in ["admin", "super_admin", "管理员", "超级管理员"] for r in current_user.roles)
+    is_admin = current_user.principal.has_role("admin", "super_admin", "管理员", "超级管理员")
     if not is_admin:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="无权限操作")
 
@@ -72,9 +71,7 @@ async def update_site_config(
         cfg.title = title
 
     async def _save_file(upload: UploadFile, filename: str) -> str:
-        target_path: Path = SITE_STATIC_DIR / filename
-        with open(target_path, "wb") as f:
-            f.write(await upload.read())
+        await save_upload(upload, SITE_STATIC_DIR, filename, max_bytes=settings.upload_max_image_mb * 1024 * 1024)
         # 返回相对于 static 目录的路径（不要带 static/ 前缀）
         return f"{SITE_STATIC_SUBDIR}/{filename}"
 
@@ -114,8 +111,7 @@ async def create_site_config(
     current_user: User = Depends(get_current_user),
 ):
     # 权限校验
-    await current_user.fetch_related("roles")
-    is_admin = any(r.name in ["admin", "super_admin", "管理员", "超级管理员"] for r in current_user.roles)
+    is_admin = current_user.principal.has_role("admin", "super_admin", "管理员", "超级管理员")
     if not is_admin:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="无权限操作")
 
@@ -126,9 +122,7 @@ async def create_site_config(
     cfg = SiteConfig(title=title)
 
     async def _save_file(upload: UploadFile, filename: str) -> str:
-        target_path: Path = SITE_STATIC_DIR / filename
-        with open(target_path, "wb") as f:
-            f.write(await upload.read())
+        await save_upload(upload, SITE_STATIC_DIR, filename, max_bytes=settings.upload_max_image_mb * 1024 * 1024)
         return f"{SITE_STATIC_SUBDIR}/{filename}"
 
     if logo is not None:
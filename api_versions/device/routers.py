@@ -4,7 +4,8 @@ from api_versions.v2.models import Device, App
 
 # 日志记录依赖
 from api_versions.auth.routers import get_current_user
-from api_versions.v2.models import OperationLog
+from core.batch_writer import operation_log_writer
+from utils.audio_format import invalidate_device_format
 from core.logger import logger
 
 
@@ -21,12 +22,12 @@ async def create_device(request: Request, device_data: DeviceCreateSchema):
             try:
                 current_user = await get_current_user(request)
                 username = current_user.username
-                is_admin = any(role.name in ["super_admin", "admin"] for role in await current_user.roles.all())
+                is_admin = current_user.principal.has_role("super_admin", "admin")
             except Exception:
                 username = "anonymous"
                 is_admin = False
 
-            await OperationLog.create(
+            operation_log_writer.submit(
                 username=username,
                 operation_type="CREATE",
                 operation_content=f"创建设备: {device.name}",
@@ -44,7 +45,7 @@ async def create_device(request: Request, device_data: DeviceCreateSchema):
     except  Exception as e:
         # 记录失败日志
         try:
-            await OperationLog.create(
+            operation_log_writer.submit(
                 username="anonymous",
                 operation_type="CREATE",
                 operation_content=f"创建设备失败: {device_data.name}",
@@ -115,18 +116,20 @@ async def update_device(request: Request, device_id:int, device_data: DeviceUpda
 
     update_data = device_data.model_dump(exclude_unset=True)
     await device.update_from_dict(update_data).save()
+    # 设备名或音频格式可能变化（其他 worker 依赖缓存过期）
+    invalidate_device_format()
 
     # 记录日志
     try:
         try:
             current_user = await get_current_user(request)
             username = current_user.username
-            is_admin = any(role.name in ["super_admin", "admin"] for role in await current_user.roles.all())
+            is_admin = current_user.principal.has_role("super_admin", "admin")
         except Exception:
             username = "anonymous"
             is_admin = False
 
-        await OperationLog.create(
+        operation_log_writer.submit(
             username=username,
             operation_type="UPDATE",
             operation_content=f"更新设备: {device.name}",
@@ -147,17 +150,18 @@ async def delete_device(request: Request, device_id: int):
     if not device:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="设备不存在")
     await device.delete()
+    invalidate_device_format()
 
     try:
         try:
             current_user = await get_current_user(request)
             username = current_user.username
-            is_admin = any(role.name in ["super_admin", "admin"] for role in await current_user.roles.all())
+            is_admin = current_user.principal.has_role("super_admin", "admin")
         except Exception:
             username = "anonymous"
             is_admin = False
 
-        await OperationLog.create(
+        operation_log_writer.submit(
             username=username,
             operation_type="DELETE",
             operation_content=f"删除设备: {device.name}",
@@ -199,12 +203,12 @@ async def bind_app(request: Request, device_id:int, app_id:int):
             try:
                 current_user = await get_current_user(request)
                 username = current_user.username
-                is_admin = any(role.name in ["super_admin", "admin"] for role in await current_user.roles.all())
+                is_admin = current_user.principal.has_role("super_admin", "admin")
             except Exception:
                 username = "anonymous"
                 is_admin = False
 
-            await OperationLog.create(
+            operation_log_writer.submit(
                 username=username,
                 operation_type="BIND",
                 operation_content=f"绑定应用: {device.name} -> {app.name}",
@@ -225,7 +229,7 @@ async def bind_app(request: Request, device_id:int, app_id:int):
     except Exception as e:
         # 记录失败日志
         try:
-            await OperationLog.create(
+            operation_log_writer.submit(
                 username="anonymous",
                 operation_type="BIND",
                 operation_content=f"绑定应用失败: device_id={device_id}, app_id={app_id}",
@@ -258,12 +262,12 @@ async def unbind_app(request: Request, device_id:int, app_id:int):
             try:
                 current_user = await get_current_user(request)
                 username = current_user.username
-                is_admin = any(role.name in ["super_admin", "admin"] for role in await current_user.roles.all())
+                is_admin = current_user.principal.has_role("super_admin", "admin")
             except Exception:
                 username = "anonymous"
                 is_admin = False
 
-            await OperationLog.create(
+            operation_log_writer.submit(
                 username=username,
                 operation_type="UNBIND",
                 operation_content=f"解绑应用: {device.name} -> {app.name}",
@@ -283,7 +287,7 @@ async def unbind_app(request: Request, device_id:int, app_id:int):
     except Exception as e:
         # 记录失败日志
         try:
-            await OperationLog.create(
+            operation_log_writer.submit(
                 username="anonymous",
                 operation_type="UNBIND",
                 operation_content=f"解绑应用失败: device_id={device_id}, app_id={app_id}",
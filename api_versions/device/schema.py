@@ -1,7 +1,7 @@
 from pydantic import BaseModel
 from tortoise.contrib.pydantic import pydantic_model_creator
 from api_versions.v2.models import Device, App
-from typing import List
+from typing import List, Literal
 from datetime import datetime
 
 
@@ -12,12 +12,14 @@ class DeviceCreateSchema(BaseModel):
     name: str
     description: str
     is_active: bool = True
+    audio_format: Literal["wav", "opus", "mp3"] = "wav"
 
 
 class DeviceUpdateSchema(BaseModel):
     name: str
     description: str
     is_active: bool = True
+    audio_format: Literal["wav", "opus", "mp3"] = "wav"
 
 
 
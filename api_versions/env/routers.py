@@ -55,6 +55,10 @@ def write_env(env_vars: List[EnvVar]):
     for k, v in new_settings.model_dump().items():
         setattr(settings_config.settings, k, v)
 
+    # 音色/语速/语言或TTS服务变化时，后台重新预渲染问候语音频
+    from utils.audio_pool import audio_pool
+    audio_pool.schedule_refresh()
+
 @router.get("/env", response_model=List[EnvVar], tags=["env"], summary="获取所有环境变量")
 async def list_env():
     return read_env()
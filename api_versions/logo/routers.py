@@ -4,10 +4,13 @@ from typing import List, Set, Optional
 from pathlib import Path
 import uuid, os
 from datetime import datetime
-from ..v2.models import Logo, OperationLog
+from ..v2.models import Logo
+from core.batch_writer import operation_log_writer
 from .schema import LogoOutWithURLSchema, LogoUpdateSchema
 import hashlib
 from core.logger import logger
+from settings.config import settings
+from utils.upload_pipeline import save_upload
 
 router = APIRouter()
 
@@ -25,18 +28,11 @@ def _generate_filename(ext: str) -> str:
 
 async def _save_logo_file(upload_file: UploadFile) -> str:
     """保存logo文件并返回相对路径"""
-    ext = os.path.splitext(upload_file.filename)[1].lower()
-    if ext not in ALLOWED_IMAGE_EXTS:
-        raise HTTPException(400, f"不支持的文件类型 {ext}")
-
-    content = await upload_file.read()
-    filename = _generate_filename(ext)
-    target_path = LOGO_DIR / filename
-    
-    with open(target_path, 'wb') as f:
-        f.write(content)
-    
-    return f"site/{filename}"
+    stored = await save_upload(
+        upload_file, LOGO_DIR, lambda ext, _: _generate_filename(ext),
+        allowed_exts=ALLOWED_IMAGE_EXTS, max_bytes=settings.upload_max_image_mb * 1024 * 1024,
+    )
+    return f"site/{stored.path.name}"
 
 def _create_logo_response(logo: Logo, request: Request) -> LogoOutWithURLSchema:
     """创建Logo响应对象"""
@@ -68,7 +64,7 @@ async def upload_logo(
     try:
         current_user = await get_current_user(request)
         username = current_user.username
-        is_admin = any(role.name in ["super_admin", "admin"] for role in await current_user.roles.all())
+        is_admin = current_user.principal.has_role("super_admin", "admin")
     except:
         username = "anonymous"
         is_admin = False
@@ -87,7 +83,7 @@ async def upload_logo(
 
     # 记录操作日志
     try:
-        await OperationLog.create(
+        operation_log_writer.submit(
             username=username,
             operation_type="CREATE",
             operation_content=f"上传Logo: {name}",
@@ -148,7 +144,7 @@ async def update_logo(
     try:
         current_user = await get_current_user(request)
         username = current_user.username
-        is_admin = any(role.name in ["super_admin", "admin"] for role in await current_user.roles.all())
+        is_admin = current_user.principal.has_role("super_admin", "admin")
     except:
         username = "anonymous"
         is_admin = False
@@ -164,7 +160,7 @@ async def update_logo(
 
     # 记录操作日志
     try:
-        await OperationLog.create(
+        operation_log_writer.submit(
             username=username,
             operation_type="UPDATE",
             operation_content=f"更新Logo: {logo.name}",
@@ -198,7 +194,7 @@ async def update_logo_file(
     try:
         current_user = await get_current_user(request)
         username = current_user.username
-        is_admin = any(role.name in ["super_admin", "admin"] for role in await current_user.roles.all())
+        is_admin = current_user.principal.has_role("super_admin", "admin")
     except:
         username = "anonymous"
         is_admin = False
@@ -229,7 +225,7 @@ async def update_logo_file(
 
     # 记录操作日志
     try:
-        await OperationLog.create(
+        operation_log_writer.submit(
             username=username,
             operation_type="UPDATE",
             operation_content=f"更新Logo文件: {logo.name}",
@@ -259,7 +255,7 @@ async def delete_logo(request: Request, logo_id: int):
     try:
         current_user = await get_current_user(request)
         username = current_user.username
-        is_admin = any(role.name in ["super_admin", "admin"] for role in await current_user.roles.all())
+        is_admin = current_user.principal.has_role("super_admin", "admin")
     except:
         username = "anonymous"
         is_admin = False
@@ -284,7 +280,7 @@ async def delete_logo(request: Request, logo_id: int):
 
     # 记录操作日志
     try:
-        await OperationLog.create(
+        operation_log_writer.submit(
             username=username,
             operation_type="DELETE",
             operation_content=f"删除Logo: {logo_name}",
@@ -313,7 +309,7 @@ async def toggle_logo_status(request: Request, logo_id: int):
     try:
         current_user = await get_current_user(request)
         username = current_user.username
-        is_admin = any(role.name in ["super_admin", "admin"] for role in await current_user.roles.all())
+        is_admin = current_user.principal.has_role("super_admin", "admin")
     except:
         username = "anonymous"
         is_admin = False
@@ -328,7 +324,7 @@ async def toggle_logo_status(request: Request, logo_id: int):
 
     # 记录操作日志
     try:
-        await OperationLog.create(
+        operation_log_writer.submit(
             username=username,
             operation_type="UPDATE",
             operation_content=f"{'启用' if new_status else '禁用'}Logo: {logo.name}",
@@ -2,14 +2,16 @@ import asyncio
 from fastapi import APIRouter, UploadFile, File, Form, Request, HTTPException
 from typing import List, Set
 from pathlib import Path
-import uuid, os
+import uuid
 from datetime import datetime
 from ..v2.models import MediaFile
 from ..v2.schema import MediaOutSchema, MediaOutWithURLSchema, MediaUpdateSchema
-import hashlib
 from utils.media_sync import _cleanup_duplicates
 from core.logger import logger
 from utils.media_tools import media_log_tools
+from utils.upload_pipeline import save_upload
+from utils.image_variants import image_variants
+from settings.config import settings
 
 
 router = APIRouter()
@@ -30,41 +32,34 @@ def _generate_filename(ext: str) -> str:
     prefix = datetime.utcnow().strftime("%Y_%m_%d")
     return f"{prefix}_{uuid.uuid4().hex[:8]}{ext}"
 
-async def _save_file_with_hash(upload_file: UploadFile, target_dir: Path, allowed: Set[str]):
-    """保存文件并返回 (relative_path, file_hash, content)"""
-    ext = os.path.splitext(upload_file.filename)[1].lower()
-    if ext not in allowed:
-        raise HTTPException(400, f"不支持的文件类型 {ext}")
-
-    content = await upload_file.read()
-    file_hash = hashlib.sha256(content).hexdigest()
-
-    # 若已存在同样hash，直接返回现有记录路径
+async def _existing_media_path(file_hash: str):
     existing = await MediaFile.get_or_none(file_hash=file_hash)
-    if existing:
-        return existing.file_path, file_hash, None  # 不再写入磁盘
+    return existing.file_path if existing else None
 
-    filename = _generate_filename(ext)
-    target_path = target_dir / filename
-    with open(target_path, 'wb') as f:
-        f.write(content)
-    return f"{target_dir.name}/{filename}", file_hash, content
+async def _save_file_with_hash(upload_file: UploadFile, target_dir: Path, allowed: Set[str], max_mb: int):
+    """流式保存文件并返回 (relative_path, file_hash, size)；已存在同样hash时直接返回现有记录路径，不再写入磁盘"""
+    stored = await save_upload(
+        upload_file, target_dir, lambda ext, _: _generate_filename(ext),
+        allowed_exts=allowed, max_bytes=max_mb * 1024 * 1024, dedupe=_existing_media_path,
+    )
+    rel = stored.path if stored.duplicate else f"{target_dir.name}/{stored.path.name}"
+    return rel, stored.sha256, stored.size
 
 @router.post("/upload/image", response_model=MediaOutWithURLSchema)
 async def upload_image(request: Request, file: UploadFile = File(...), name: str = Form(...), description: str | None = Form(None), orientation: str | None = Form(None), is_show: bool = Form(True)):
     from api_versions.auth.routers import get_current_user
-    from api_versions.v2.models import OperationLog
+    from core.batch_writer import operation_log_writer
 
     # 获取当前用户（如果已登录）
     try:
         current_user = await get_current_user(request)
         username = current_user.username
-        is_admin = any(role.name in ["super_admin", "admin"] for role in await current_user.roles.all())
+        is_admin = current_user.principal.has_role("super_admin", "admin")
     except:
         username = "anonymous"
         is_admin = False
 
-    rel, file_hash, _ = await _save_file_with_hash(file, IMG_DIR, ALLOWED_IMAGE_EXTS)
+    rel, file_hash, _ = await _save_file_with_hash(file, IMG_DIR, ALLOWED_IMAGE_EXTS, settings.upload_max_image_mb)
     m = await MediaFile.get_or_none(file_hash=file_hash)
     if m is None:
         # 可能已有同路径但缺hash
@@ -101,7 +96,7 @@ async def upload_image(request: Request, file: UploadFile = File(...), name: str
 
     # 记录操作日志
     try:
-        await OperationLog.create(
+        operation_log_writer.submit(
             username=username,
             operation_type="CREATE",
             operation_content=f"上传图片: {name}",
@@ -121,26 +116,24 @@ async def upload_image(request: Request, file: UploadFile = File(...), name: str
         # 操作日志记录失败不影响主要功能
         logger.warning(f"记录操作日志失败: {e}")
 
+    image_variants.schedule(rel)
     base = await MediaOutSchema.from_tortoise_orm(m)
-    return MediaOutWithURLSchema(**base.model_dump(), url=str(request.url_for("audio_files", path=rel)))
+    return MediaOutWithURLSchema(
+        **base.model_dump(), url=str(request.url_for("audio_files", path=rel)),
+        srcset=await image_variants.srcset(request, rel),
+    )
 
 @router.post("/upload/avatar")
 async def upload_avatar(request: Request, file: UploadFile = File(...), name: str = Form(...), description: str | None = Form(None)):
     """专门的头像上传接口，不保存到媒体管理数据库"""
-    ext = os.path.splitext(file.filename)[1].lower()
-    if ext not in ALLOWED_IMAGE_EXTS:
-        raise HTTPException(400, f"不支持的文件类型 {ext}")
-
-    content = await file.read()
-    filename = _generate_filename(ext)
-    target_path = AVATAR_DIR / filename
-    
     # 直接保存文件，不保存到MediaFile表
-    with open(target_path, 'wb') as f:
-        f.write(content)
-    
-    rel_path = f"avatar/{filename}"
+    stored = await save_upload(
+        file, AVATAR_DIR, lambda ext, _: _generate_filename(ext),
+        allowed_exts=ALLOWED_IMAGE_EXTS, max_bytes=settings.upload_max_image_mb * 1024 * 1024,
+    )
+    rel_path = f"avatar/{stored.path.name}"
     url = str(request.url_for("audio_files", path=rel_path))
+    image_variants.schedule(rel_path)
     
     return {
         "message": "头像上传成功",
@@ -151,7 +144,7 @@ async def upload_avatar(request: Request, file: UploadFile = File(...), name: st
 
 @router.post("/upload/video", response_model=MediaOutWithURLSchema)
 async def upload_video(request: Request, file: UploadFile = File(...), name: str = Form(...), description: str | None = Form(None), orientation: str | None = Form(None), is_show: bool = Form(True)):
-    rel, file_hash, _ = await _save_file_with_hash(file, VIDEO_DIR, ALLOWED_VIDEO_EXTS)
+    rel, file_hash, _ = await _save_file_with_hash(file, VIDEO_DIR, ALLOWED_VIDEO_EXTS, settings.upload_max_video_mb)
     m = await MediaFile.get_or_none(file_hash=file_hash)
     if m is None:
         m = await MediaFile.get_or_none(file_path=rel)
@@ -197,10 +190,14 @@ async def list_media(request: Request, media_type: str | None = None, orientatio
     if orientation:
         q = q.filter(orientation=orientation)
     items = await q.order_by("-created_at").all()
+    srcsets = await image_variants.srcsets(request, [m.file_path for m in items if m.media_type == "image"])
     res = []
     for m in items:
         base = await MediaOutSchema.from_tortoise_orm(m)
-        res.append(MediaOutWithURLSchema(**base.model_dump(), url=str(request.url_for("audio_files", path=m.file_path))) )
+        res.append(MediaOutWithURLSchema(
+            **base.model_dump(), url=str(request.url_for("audio_files", path=m.file_path)),
+            srcset=srcsets.get(m.file_path),
+        ))
     return res
 
 @router.patch("/media/{media_id}", response_model=MediaOutWithURLSchema)
@@ -216,7 +213,8 @@ async def update_media(media_id: int, data: MediaUpdateSchema, request: Request)
 
     # 记录日志
     asyncio.create_task(media_log_tools(request=request, m=m, operation_type="UPDATE", action="update_media", action_description="更新", media_id=media_id))
-    return MediaOutWithURLSchema(**base.model_dump(), url=str(request.url_for("audio_files", path=m.file_path)))
+    srcset = await image_variants.srcset(request, m.file_path) if m.media_type == "image" else None
+    return MediaOutWithURLSchema(**base.model_dump(), url=str(request.url_for("audio_files", path=m.file_path)), srcset=srcset)
 
 @router.delete("/media/{media_id}")
 async def delete_media(request: Request, media_id: int):
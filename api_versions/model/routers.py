@@ -1,14 +1,22 @@
 from fastapi import APIRouter, HTTPException, status, UploadFile, File, Form, Request, Depends
 from api_versions.v2.models import ModelItem, User
-from api_versions.v2.schema import ModelCreateSchema, ModelUpdateSchema, Model_Pydantic
+from api_versions.v2.schema import ModelCreateSchema, ModelUpdateSchema, ModelUploadInitSchema, Model_Pydantic
 import os
 import uuid
 from pathlib import Path
 from api_versions.logs.utils import record_operation_log
 from api_versions.auth.routers import get_current_user
+from settings.config import settings
+from utils.upload_pipeline import save_upload
+from utils.resumable_upload import model_uploads
+from utils.image_variants import image_variants
 
 router = APIRouter()
 
+# 与数据库中 local_path 的格式一致（相对于工作目录）
+MODELS_DIR = Path("static/models")
+THUMBNAILS_DIR = MODELS_DIR / "thumbnails"
+
 def format_file_size(file_size: int) -> str:
     """
     格式化文件大小为可读字符串
@@ -42,6 +50,29 @@ def get_full_url(request: Request, local_path: str) -> str:
     # 使用FastAPI的url_for生成完整URL
     return str(request.url_for('audio_files', path=file_path))
 
+async def _save_model_file(model_file: UploadFile):
+    """流式保存模型压缩包，按内容哈希命名（相同内容只存一份），返回 (本地路径, 文件大小)"""
+    # 验证文件格式
+    if not model_file.filename.lower().endswith('.zip'):
+        raise HTTPException(status_code=400, detail="模型文件必须是.zip格式")
+    stored = await save_upload(model_file, MODELS_DIR, max_bytes=settings.upload_max_model_mb * 1024 * 1024)
+    return str(MODELS_DIR / stored.path.name), stored.size
+
+async def _save_thumbnail_file(thumbnail_file: UploadFile) -> str:
+    stored = await save_upload(
+        thumbnail_file, THUMBNAILS_DIR, lambda ext, _: f"{uuid.uuid4()}{ext}",
+        max_bytes=settings.upload_max_image_mb * 1024 * 1024,
+    )
+    image_variants.schedule(str(THUMBNAILS_DIR / stored.path.name))
+    return str(THUMBNAILS_DIR / stored.path.name)
+
+async def _remove_model_file(local_path: str, exclude_id: int = None):
+    if not local_path or not os.path.exists(local_path):
+        return
+    if await ModelItem.filter(local_path=local_path).exclude(id=exclude_id).exists():
+        return
+    os.remove(local_path)
+
 @router.post("/models", status_code=status.HTTP_201_CREATED, summary="创建模型")
 async def create_model(
     request: Request,
@@ -61,45 +92,13 @@ async def create_model(
         local_path = None
         calculated_file_size = None
         if model_file:
-            # 验证文件格式
-            if not model_file.filename.lower().endswith('.zip'):
-                raise HTTPException(status_code=400, detail="模型文件必须是.zip格式")
-            
-            # 确保模型目录存在
-            models_dir = Path("static/models")
-            models_dir.mkdir(parents=True, exist_ok=True)
-            
-            # 生成唯一文件名
-            file_ext = Path(model_file.filename).suffix if model_file.filename else ""
-            unique_filename = f"{uuid.uuid4()}{file_ext}"
-            file_path = models_dir / unique_filename
-            
-            # 保存文件并计算大小
-            with open(file_path, "wb") as buffer:
-                content = await model_file.read()
-                buffer.write(content)
-                calculated_file_size = len(content)  # 计算文件大小
-            
-            local_path = str(file_path)
+            # 流式保存文件并计算大小
+            local_path, calculated_file_size = await _save_model_file(model_file)
         
         # 处理缩略图上传
         thumbnail_path = None
         if thumbnail_file:
-            # 确保缩略图目录存在
-            thumbnails_dir = Path("static/models/thumbnails")
-            thumbnails_dir.mkdir(parents=True, exist_ok=True)
-            
-            # 生成唯一文件名
-            file_ext = Path(thumbnail_file.filename).suffix if thumbnail_file.filename else ""
-            unique_filename = f"{uuid.uuid4()}{file_ext}"
-            file_path = thumbnails_dir / unique_filename
-            
-            # 保存文件
-            with open(file_path, "wb") as buffer:
-                content = await thumbnail_file.read()
-                buffer.write(content)
-            
-            thumbnail_path = str(file_path)
+            thumbnail_path = await _save_thumbnail_file(thumbnail_file)
         
         # 确定最终的文件大小：优先使用计算出的大小，否则使用用户输入的大小
         final_file_size = calculated_file_size if calculated_file_size else file_size
@@ -138,9 +137,95 @@ async def create_model(
             result_dict['thumbnail_url'] = get_full_url(request, result_dict['thumbnail'])
             
         return result_dict
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"创建模型失败: {str(e)}")
+
+# ------------------------------ 分块上传（可续传） ------------------------------
+
+async def _upload_session(upload_id: str, current_user: User) -> dict:
+    session = await model_uploads.session(upload_id)
+    if session["owner"] != current_user.username:
+        raise HTTPException(status_code=403, detail="无权操作该上传会话")
+    return session
+
+@router.post("/models/uploads", status_code=status.HTTP_201_CREATED, summary="创建模型分块上传会话")
+async def initiate_model_upload(data: ModelUploadInitSchema, current_user: User = Depends(get_current_user)):
+    if not data.filename.lower().endswith('.zip'):
+        raise HTTPException(status_code=400, detail="模型文件必须是.zip格式")
+    return await model_uploads.initiate(
+        filename=data.filename, size=data.size, owner=current_user.username,
+        max_bytes=settings.upload_max_model_mb * 1024 * 1024,
+    )
+
+@router.get("/models/uploads/{upload_id}", summary="查询分块上传进度（用于断点续传）")
+async def get_model_upload(upload_id: str, current_user: User = Depends(get_current_user)):
+    await _upload_session(upload_id, current_user)
+    return await model_uploads.status(upload_id)
+
+@router.put("/models/uploads/{upload_id}/chunks/{index}", summary="上传分块（可乱序、并行）")
+async def put_model_upload_chunk(upload_id: str, index: int, request: Request, current_user: User = Depends(get_current_user)):
+    await _upload_session(upload_id, current_user)
+    return await model_uploads.put_chunk(upload_id, index, request.stream())
+
+@router.post("/models/uploads/{upload_id}/complete", status_code=status.HTTP_201_CREATED, summary="完成分块上传并创建模型")
+async def complete_model_upload(
+    upload_id: str,
+    request: Request,
+    name: str = Form(...),
+    description: str = Form(None),
+    category: str = Form(...),
+    orientation: str = Form(None),
+    url: str = Form(None),
+    is_show: bool = Form(True),
+    sha256: str = Form(None),
+    thumbnail_file: UploadFile = File(None),
+    current_user: User = Depends(get_current_user)
+):
+    await _upload_session(upload_id, current_user)
+    target_path, file_size, digest = await model_uploads.complete(upload_id, MODELS_DIR, sha256)
+    local_path = str(MODELS_DIR / target_path.name)
+    try:
+        thumbnail_path = await _save_thumbnail_file(thumbnail_file) if thumbnail_file else None
+        item = await ModelItem.create(
+            name=name,
+            description=description,
+            category=category,
+            orientation=orientation,
+            local_path=local_path,
+            url=url,
+            thumbnail=thumbnail_path,
+            file_size=file_size,
+            is_show=is_show
+        )
     except Exception as e:
+        await _remove_model_file(local_path)
+        if isinstance(e, HTTPException):
+            raise
         raise HTTPException(status_code=400, detail=f"创建模型失败: {str(e)}")
 
+    await record_operation_log(
+        request=request,
+        username=current_user.username,
+        operation_type="CREATE",
+        operation_content=f"创建模型:{name}",
+        target_type="model",
+        target_id=item.id,
+        user=current_user,
+        details={"name": name, "description": description, "category": category, "orientation": orientation, "url": url, "file_size": file_size, "sha256": digest, "is_show": is_show},
+    )
+    result_dict = (await Model_Pydantic.from_tortoise_orm(item)).dict()
+    result_dict['local_url'] = get_full_url(request, local_path)
+    if result_dict.get('thumbnail'):
+        result_dict['thumbnail_url'] = get_full_url(request, result_dict['thumbnail'])
+    return result_dict
+
+@router.delete("/models/uploads/{upload_id}", status_code=status.HTTP_204_NO_CONTENT, summary="取消分块上传")
+async def abort_model_upload(upload_id: str, current_user: User = Depends(get_current_user)):
+    await _upload_session(upload_id, current_user)
+    await model_uploads.abort(upload_id)
+
 @router.get("/models", summary="获取模型列表")
 async def list_models(request: Request, category: str = None, orientation: str = None):
     # 构建查询条件
@@ -151,6 +236,7 @@ async def list_models(request: Request, category: str = None, orientation: str =
         query = query.filter(orientation=orientation)
     
     items = await Model_Pydantic.from_queryset(query.order_by("-created_at"))
+    thumbnail_srcsets = await image_variants.srcsets(request, [item.thumbnail for item in items if item.thumbnail])
     result = []
     
     for item in items:
@@ -160,6 +246,7 @@ async def list_models(request: Request, category: str = None, orientation: str =
             item_dict['local_url'] = get_full_url(request, item_dict['local_path'])
         if item_dict.get('thumbnail'):
             item_dict['thumbnail_url'] = get_full_url(request, item_dict['thumbnail'])
+            item_dict['thumbnail_srcset'] = thumbnail_srcsets.get(item_dict['thumbnail'])
         # 添加格式化的文件大小
         item_dict['file_size_formatted'] = format_file_size(item_dict.get('file_size'))
         result.append(item_dict)
@@ -180,6 +267,7 @@ async def get_model(request: Request, model_id: int):
         result_dict['local_url'] = get_full_url(request, result_dict['local_path'])
     if result_dict.get('thumbnail'):
         result_dict['thumbnail_url'] = get_full_url(request, result_dict['thumbnail'])
+        result_dict['thumbnail_srcset'] = await image_variants.srcset(request, result_dict['thumbnail'])
         
     return result_dict
 
@@ -223,53 +311,19 @@ async def update_model(
         
         # 处理模型文件上传
         if model_file:
-            # 验证文件格式
-            if not model_file.filename.lower().endswith('.zip'):
-                raise HTTPException(status_code=400, detail="模型文件必须是.zip格式")
-                
-            # 删除旧文件
-            if item.local_path and os.path.exists(item.local_path):
-                os.remove(item.local_path)
-            
-            # 确保模型目录存在
-            models_dir = Path("static/models")
-            models_dir.mkdir(parents=True, exist_ok=True)
-            
-            # 生成唯一文件名
-            file_ext = Path(model_file.filename).suffix if model_file.filename else ""
-            unique_filename = f"{uuid.uuid4()}{file_ext}"
-            file_path = models_dir / unique_filename
-            
-            # 保存文件并计算大小
-            with open(file_path, "wb") as buffer:
-                content = await model_file.read()
-                buffer.write(content)
-                # 如果上传了新文件，自动更新文件大小
-                update_data["file_size"] = len(content)
-            
-            update_data["local_path"] = str(file_path)
+            # 先保存新文件再删除旧文件，上传失败时保留原模型；如果上传了新文件，自动更新文件大小
+            old_path = item.local_path
+            update_data["local_path"], update_data["file_size"] = await _save_model_file(model_file)
+            if old_path != update_data["local_path"]:
+                await _remove_model_file(old_path, exclude_id=item.id)
         
         # 处理缩略图上传
         if thumbnail_file:
+            old_thumbnail = item.thumbnail
+            update_data["thumbnail"] = await _save_thumbnail_file(thumbnail_file)
             # 删除旧缩略图
-            if item.thumbnail and os.path.exists(item.thumbnail):
-                os.remove(item.thumbnail)
-            
-            # 确保缩略图目录存在
-            thumbnails_dir = Path("static/models/thumbnails")
-            thumbnails_dir.mkdir(parents=True, exist_ok=True)
-            
-            # 生成唯一文件名
-            file_ext = Path(thumbnail_file.filename).suffix if thumbnail_file.filename else ""
-            unique_filename = f"{uuid.uuid4()}{file_ext}"
-            file_path = thumbnails_dir / unique_filename
-            
-            # 保存文件
-            with open(file_path, "wb") as buffer:
-                content = await thumbnail_file.read()
-                buffer.write(content)
-            
-            update_data["thumbnail"] = str(file_path)
+            if old_thumbnail and os.path.exists(old_thumbnail):
+                os.remove(old_thumbnail)
         
         if update_data:
             await item.update_from_dict(update_data).save()
@@ -295,6 +349,8 @@ async def update_model(
             result_dict['thumbnail_url'] = get_full_url(request, result_dict['thumbnail'])
             
         return result_dict
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"更新模型失败: {str(e)}")
 
@@ -316,9 +372,8 @@ async def delete_model(model_id: int, request: Request, current_user: User = Dep
         )
         raise HTTPException(status_code=404, detail="模型不存在")
     
-    # 删除关联文件
-    if item.local_path and os.path.exists(item.local_path):
-        os.remove(item.local_path)
+    # 删除关联文件（模型文件按内容命名，仍被其他模型引用时保留）
+    await _remove_model_file(item.local_path, exclude_id=item.id)
     if item.thumbnail and os.path.exists(item.thumbnail):
         os.remove(item.thumbnail)
     
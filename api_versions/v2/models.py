@@ -1,4 +1,5 @@
 from tortoise import fields, models
+from tortoise.contrib.mysql.indexes import FullTextIndex
 
 class App(models.Model):
     """
@@ -22,10 +23,12 @@ class Device(models.Model):
     设备实体
     - name: 设备名称（唯一）
     - apps: 多对多关联到应用（通过DeviceApp中间表）
+    - audio_format: 该设备的 TTS 输出格式（wav / opus / mp3）
     """
     id = fields.IntField(pk=True)
     name = fields.CharField(max_length=255, unique=True)
     description = fields.CharField(max_length=255)
+    audio_format = fields.CharField(max_length=16, default="wav")
     created_at = fields.DatetimeField(auto_now_add=True)
     updated_at = fields.DatetimeField(auto_now=True)
     is_active = fields.BooleanField(default=True)
@@ -384,6 +387,7 @@ class AudioData(models.Model):
     """
     音频数据管理表
     - user_question: 用户问题
+    - question_hash: 用户问题MD5（分组分页用）
     - ai_response_text: 大模型回复文本
     - audio_file_path: 大模型回复音频路径地址
     - tts_started_at: TTS开始时间
@@ -393,16 +397,43 @@ class AudioData(models.Model):
     """
     id = fields.IntField(pk=True)
     user_question = fields.TextField(description="用户问题")
+    question_hash = fields.CharField(max_length=32, default="", description="用户问题MD5，用于分组")
     ai_response_text = fields.TextField(description="大模型回复文本")
     audio_file_path = fields.CharField(max_length=512, description="音频文件路径")
     tts_started_at = fields.DatetimeField(null=True, description="TTS开始时间")
     tts_completed_at = fields.DatetimeField(description="TTS完成时间")
-    created_at = fields.DatetimeField(auto_now_add=True, description="新增日期")
+    created_at = fields.DatetimeField(auto_now_add=True, index=True, description="新增日期")
     updated_at = fields.DatetimeField(auto_now=True, description="更新日期")
 
     class Meta:
         table = "audio_data"
         table_description = "音频数据管理表"
+        indexes = (
+            ("question_hash", "created_at"),
+            # 问答全文检索（ngram 分词，支持中文）
+            FullTextIndex(fields=("user_question", "ai_response_text"), name="ft_audio_data_qa", parser_name="ngram"),
+        )
+
+class StatsHourlyQuestion(models.Model):
+    """
+    对话统计小时汇总表（按 小时 × 问题 预聚合，供仪表盘按时间范围读取）
+    - hour: 所在小时（与 audio_data.created_at 同时区，整点）
+    - question_hash: 用户问题的 MD5
+    - segments: 该小时内该问题的回复片段数
+    - tts_segments: 有 TTS 耗时的片段数
+    - tts_ms: TTS 总耗时（毫秒）
+    """
+    id = fields.BigIntField(pk=True)
+    hour = fields.DatetimeField(index=True, description="所在小时")
+    question_hash = fields.CharField(max_length=32, description="用户问题MD5")
+    segments = fields.IntField(default=0, description="回复片段数")
+    tts_segments = fields.IntField(default=0, description="有TTS耗时的片段数")
+    tts_ms = fields.BigIntField(default=0, description="TTS总耗时（毫秒）")
+
+    class Meta:
+        table = "stats_hourly_question"
+        table_description = "对话统计小时汇总表"
+        unique_together = (("hour", "question_hash"),)
 
 class Logo(models.Model):
     """
@@ -3,9 +3,11 @@ import colorama
 from fastapi import APIRouter, Request, Depends, HTTPException, status, UploadFile, File, Form
 from fastapi.responses import StreamingResponse
 from core.logger import logger
-from utils.redis_tools import generate_cache_key, get_cached_sse_data, store_sse_bulk_data
+from utils.redis_tools import generate_cache_key, get_cached_sse_data, store_sse_bulk_data, END_OF_STREAM
 from core.services.v2 import stt_server, llm_server, tts_server, llm_server_other
 from core.redis_client import redis_client
+from core.audio_store import audio_store
+from core.speculative_llm import defer_until_commit
 import orjson
 import time
 from .schema import DeviceCreateSchema, DeviceUpdateSchema, AppWithKeySchema, Device_Pydantic, App_Pydantic, DeviceWithAppsSchema, MediaOutSchema, MediaOutWithURLSchema, MediaUpdateSchema
@@ -32,21 +34,19 @@ async def audio_to_text(result:str=Depends(stt_server.audio_to_text)):
 
 @router.post("/chat-messages-blocking", description="阻塞模式 llm", summary="阻塞模式 llm")
 async def chat_messages_blocking(request:Request, text:str):
-    from .statistics import record_chat_stats, record_online_user, record_response_time
+    from .statistics import record_turn_stats
     
     start_time = time.time()
     
-    # 记录在线用户
-    user_id = request.state.user_id or "anonymous"
-    await record_online_user(user_id)
-    
     result_json = await llm_server.chat_messages_block(request=request, text=text)
     
-    # 记录对话统计和响应时间
-    end_time = time.time()
-    response_time = (end_time - start_time) * 1000  # 转换为毫秒
-    await record_chat_stats()
-    await record_response_time(response_time)
+    # 记录对话统计、在线用户和响应时间（一次 pipeline）
+    response_time = (time.time() - start_time) * 1000  # 转换为毫秒
+    await record_turn_stats(
+        user_id=request.state.user_id or "anonymous",
+        device=getattr(request.state, "device", ""),
+        response_ms=response_time
+    )
     
     return result_json
 
@@ -225,7 +225,31 @@ async def llm_streaming(*, request:Request, text:str):
         media_type='text/event-stream',
         headers={"X-Stream-Data": "true"}
     )
-async def generate_stream(*, request, text, skip_question=False):
+def track_turn(request, text, response_ms=None):
+    """一轮对话的统计：热门问题 + 实时计数（均在后台执行）"""
+    from core.hot_topics import hot_topics
+    from .statistics import record_turn_stats
+    hot_topics.record(text)
+    asyncio.create_task(record_turn_stats(
+        user_id=request.state.user_id or "anonymous",
+        device=getattr(request.state, "device", ""),
+        response_ms=response_ms
+    ))
+
+async def generate_stream(*, request, text, skip_question=False, record_stats=True):
+    """
+    在 _generate_stream 外记录本轮统计，响应延迟取首个数据块的耗时。
+    record_stats=False 时不记录（推测执行的请求在提交时再记录）。
+    """
+    start_time = time.time()
+    tracked = not (text and record_stats)
+    async for data in _generate_stream(request=request, text=text, skip_question=skip_question):
+        if not tracked:
+            track_turn(request, text, (time.time() - start_time) * 1000)
+            tracked = True
+        yield data
+
+async def _generate_stream(*, request, text, skip_question=False):
     """
     生成流式响应的核心函数。
     它首先检查缓存，如果命中则直接返回缓存数据。
@@ -245,6 +269,7 @@ async def generate_stream(*, request, text, skip_question=False):
 
     if cached_data:
         logger.info(f"🎯  命中SSE缓存(哈希: {cache_key[-10:]})")
+        audio_store.touch(cached_data)
         for data in cached_data:
             if isinstance(data, str):
                 data = data.encode('utf-8')
@@ -263,7 +288,6 @@ async def generate_stream(*, request, text, skip_question=False):
 
     logger.info(f"💾  处理新的请求并进行缓存(哈希: {cache_key[-10:]})")
     buffer = []
-    buffer_size = 10
 
     # 流式处理LLM的响应
     async for data in llm_server.chat_messages_streaming_new(request=request, text=text, skip_question=skip_question):
@@ -271,28 +295,19 @@ async def generate_stream(*, request, text, skip_question=False):
         yield data_bytes
         buffer.append(data_bytes)
 
-        if len(buffer) >= buffer_size:
-            asyncio.create_task(_safe_store_and_log(store_sse_bulk_data(cache_key, buffer.copy())))
-            buffer.clear()
-
-    # 处理剩余的缓冲区
-    if buffer:
-        await _safe_store_and_log(store_sse_bulk_data(cache_key, buffer))
-
-    # 流式处理建议问题并完成缓存
-    param_buffer = []
+    # 流式处理建议问题
     async for parameter in llm_server_other.parameters_(request=request):
         parameter_bytes = parameter.encode('utf-8') if isinstance(parameter, str) else parameter
         yield parameter_bytes
-        param_buffer.append(parameter_bytes)
+        buffer.append(parameter_bytes)
 
-    # 将建议问题和结束标记写入缓存
-    if param_buffer:
-        async def _final_cache_write():
-            await store_sse_bulk_data(cache_key, param_buffer, append=True)
-            await redis_client.rpush(cache_key, b"__END_OF_STREAM__")
+    # 整轮完成后连同结束标记一次写入；中途被取消（打断 / 推测作废）时不写入，缓存中不会留下半截回答
+    async def _write_cache():
+        await _safe_store_and_log(store_sse_bulk_data(cache_key, buffer + [END_OF_STREAM], replace=True))
 
-        await _safe_store_and_log(_final_cache_write())
+    # 推测执行的流在提交后才写入共享缓存
+    if not defer_until_commit(_write_cache):
+        await _write_cache()
 
 @router.post("/tts", description="流模式主入口", summary="通过传递音频获取全部(流模式)")
 async def main_router_streaming(request: Request, text: str = Depends(stt_server.audio_to_text)):
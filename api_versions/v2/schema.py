@@ -60,6 +60,8 @@ class MediaOutSchema(Media_Pydantic):
 
 class MediaOutWithURLSchema(Media_Pydantic):
     url: str
+    # 图片的派生版本：{格式: "url 320w, url 640w"}，未生成时为空
+    srcset: dict[str, str] | None = None
     class Config:
         from_attributes = True
 
@@ -79,6 +81,10 @@ class ModelCreateSchema(BaseModel):
     thumbnail: str | None = None
     is_show: bool = True
 
+class ModelUploadInitSchema(BaseModel):
+    filename: str
+    size: int
+
 class ModelUpdateSchema(BaseModel):
     name: str | None = None
     description: str | None = None
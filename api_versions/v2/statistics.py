@@ -5,6 +5,7 @@ from datetime import datetime, timedelta
 from fastapi import APIRouter, Request, HTTPException
 from core.logger import logger
 from core.redis_client import redis_client
+from settings.config import settings
 from .models import Device, App, MediaFile
 from typing import Dict, List, Any
 import os
@@ -16,26 +17,12 @@ router = APIRouter()
 async def get_dashboard_data(request: Request):
     """获取仪表盘概览数据"""
     try:
-        # 从AudioData表获取今日对话数
-        from api_versions.v2.models import AudioData
-        from settings.config import GREETING_LIST
-        
-        today = datetime.now().date()
-        today_start = datetime.combine(today, datetime.min.time())
-        today_end = datetime.combine(today, datetime.max.time())
-        
-        # 获取今日的所有音频数据，排除问候语
-        today_audio_data = await AudioData.filter(
-            created_at__gte=today_start,
-            created_at__lte=today_end
-        ).exclude(user_question__in=GREETING_LIST).values('user_question')
-        
-        # 按问题分组统计（去重），就像AudioData.vue中的逻辑一样
-        unique_questions = set()
-        for item in today_audio_data:
-            unique_questions.add(item['user_question'])
-        
-        today_chats = len(unique_questions)
+        from core import stats_rollup
+
+        # 今日对话数（按问题去重）与最近24小时平均TTS耗时，均读取小时汇总表
+        now = datetime.now()
+        today_start = datetime.combine(now.date(), datetime.min.time())
+        today_chats = await stats_rollup.distinct_questions(today_start, today_start + timedelta(days=1))
         
         # 获取设备数量
         device_count = await Device.all().count()
@@ -43,26 +30,8 @@ async def get_dashboard_data(request: Request):
         # 获取全部应用数量
         app_count = await App.all().count()
         
-        # 从AudioData表获取平均TTS响应时间
-        # 获取最近100条有TTS耗时数据的记录
-        recent_audio_data = await AudioData.filter(
-            tts_started_at__isnull=False,
-            tts_completed_at__isnull=False
-        ).exclude(user_question__in=GREETING_LIST).order_by('-created_at').limit(100)
-        
-        if recent_audio_data:
-            total_duration = 0
-            count = 0
-            for audio_data in recent_audio_data:
-                if audio_data.tts_started_at and audio_data.tts_completed_at:
-                    # 计算TTS耗时（毫秒）
-                    duration_seconds = (audio_data.tts_completed_at - audio_data.tts_started_at).total_seconds()
-                    total_duration += duration_seconds * 1000  # 转换为毫秒
-                    count += 1
-            
-            avg_response_time = total_duration / count if count > 0 else 0
-        else:
-            avg_response_time = 0
+        next_hour = now.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+        avg_response_time = await stats_rollup.avg_tts_ms(next_hour - timedelta(hours=24), next_hour)
         
         # 获取系统状态
         system_status = await get_system_status()
@@ -85,61 +54,34 @@ async def get_dashboard_data(request: Request):
 
 @router.get("/chat-trends", description="获取对话趋势数据", summary="对话趋势")
 async def get_chat_trends(request: Request, period: str = "24h"):
-    """获取对话趋势数据"""
+    """获取对话趋势数据（读取小时汇总表）"""
     try:
-        from api_versions.v2.models import AudioData
-        from settings.config import GREETING_LIST
+        from core import stats_rollup
         
+        now = datetime.now()
         if period == "24h":
-            # 获取24小时数据
+            # 24小时数据：每小时去重后的问题数
+            end_hour = now.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+            start_hour = end_hour - timedelta(hours=24)
+            counts = await stats_rollup.hourly_question_counts(start_hour, end_hour)
             data = []
-            now = datetime.now()
             for i in range(24):
-                hour_time = now - timedelta(hours=23-i)
-                # 如果数据库存储的是UTC时间，需要将查询时间转换为UTC
-                hour_start_utc = hour_time.replace(minute=0, second=0, microsecond=0) - timedelta(hours=8)
-                hour_end_utc = hour_start_utc + timedelta(hours=1)
-                
-                # 从AudioData表获取该小时的对话数（按问题分组）
-                hour_audio_data = await AudioData.filter(
-                    created_at__gte=hour_start_utc,
-                    created_at__lt=hour_end_utc
-                ).exclude(user_question__in=GREETING_LIST)
-                
-                # 按问题去重统计
-                unique_questions = set()
-                for audio_data in hour_audio_data:
-                    unique_questions.add(audio_data.user_question)
-                count = len(unique_questions)
-                
+                hour_time = start_hour + timedelta(hours=i)
                 data.append({
                     "time": hour_time.strftime("%H:00"),
-                    "count": count
+                    "count": counts.get(hour_time, 0)
                 })
         else:  # 7d
-            # 获取7天数据
+            # 7天数据：每天去重后的问题数
+            end_day = datetime.combine(now.date(), datetime.min.time()) + timedelta(days=1)
+            start_day = end_day - timedelta(days=7)
+            counts = await stats_rollup.daily_question_counts(start_day, end_day)
             data = []
-            now = datetime.now()
             for i in range(7):
-                day_time = now - timedelta(days=6-i)
-                day_start = datetime.combine(day_time.date(), datetime.min.time())
-                day_end = datetime.combine(day_time.date(), datetime.max.time())
-                
-                # 从AudioData表获取该天的对话数（按问题分组）
-                day_audio_data = await AudioData.filter(
-                    created_at__gte=day_start,
-                    created_at__lte=day_end
-                ).exclude(user_question__in=GREETING_LIST).values('user_question')
-                
-                # 按问题去重统计
-                unique_questions = set()
-                for item in day_audio_data:
-                    unique_questions.add(item['user_question'])
-                count = len(unique_questions)
-                
+                day_time = start_day + timedelta(days=i)
                 data.append({
                     "time": day_time.strftime("%m/%d"),
-                    "count": count
+                    "count": counts.get(day_time.date(), 0)
                 })
         
         return {
@@ -153,47 +95,17 @@ async def get_chat_trends(request: Request, period: str = "24h"):
 
 @router.get("/user-activity", description="获取用户活跃度分布", summary="用户活跃度")
 async def get_user_activity(request: Request):
-    """获取用户活跃度分布"""
+    """获取用户活跃度分布（最近7天，读取小时汇总表）"""
     try:
-        from api_versions.v2.models import AudioData
-        from settings.config import GREETING_LIST
-        
-        # 获取最近7天的数据进行统计
-        seven_days_ago = datetime.now() - timedelta(days=7)
+        from core import stats_rollup
         
-        # 获取所有音频数据，排除问候语
-        audio_data_list = await AudioData.filter(
-            created_at__gte=seven_days_ago
-        ).exclude(user_question__in=GREETING_LIST)
+        end_hour = datetime.now().replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+        buckets = await stats_rollup.activity_buckets(end_hour - timedelta(days=7), end_hour)
         
-        # 统计不同时段的活跃度（按问题分组去重）
-        morning_questions = set()    # 9-12点
-        afternoon_questions = set()  # 14-18点
-        evening_questions = set()    # 19-23点
-        other_questions = set()      # 其他时间
-        
-        for audio_data in audio_data_list:
-            created_at = audio_data.created_at
-            question = audio_data.user_question
-            
-            # 如果数据库存储的是UTC时间，需要转换为本地时间
-            # UTC时间 + 8小时 = 本地时间
-            local_time = created_at + timedelta(hours=8)
-            hour = local_time.hour
-            
-            if 9 <= hour <= 12:
-                morning_questions.add(question)
-            elif 14 <= hour <= 18:
-                afternoon_questions.add(question)
-            elif 19 <= hour <= 23:
-                evening_questions.add(question)
-            else:
-                other_questions.add(question)
-        
-        morning_count = len(morning_questions)
-        afternoon_count = len(afternoon_questions)
-        evening_count = len(evening_questions)
-        other_count = len(other_questions)
+        morning_count = buckets.get("morning", 0)
+        afternoon_count = buckets.get("afternoon", 0)
+        evening_count = buckets.get("evening", 0)
+        other_count = buckets.get("other", 0)
         
         return {
             "data": [
@@ -208,36 +120,24 @@ async def get_user_activity(request: Request):
         logger.error(f"获取用户活跃度数据失败: {e}")
         raise HTTPException(status_code=500, detail=f"获取用户活跃度数据失败: {str(e)}")
 
-@router.get("/topics", description="获取热门话题统计", summary="热门话题")
-async def get_topics(request: Request):
-    """获取热门话题统计"""
+@router.get("/topics", description="获取热门话题统计：window 为统计窗口（小时），mode=trending 时按半衰期衰减排名", summary="热门话题")
+async def get_topics(request: Request, limit: int = 5, window: int = 24 * 7, mode: str = "window"):
+    """获取热门话题统计（Redis 有序集合，不扫描 audio_data）"""
     try:
-        from api_versions.v2.models import AudioData
-        from settings.config import GREETING_LIST
-        from tortoise.queryset import Q
-        
-        # 从AudioData表获取所有用户问题，排除问候语
-        audio_data_list = await AudioData.filter().exclude(
-            user_question__in=GREETING_LIST
-        ).values('user_question')
+        from core.hot_topics import hot_topics
         
-        # 获取所有不同的问题
-        unique_questions = set()
-        for item in audio_data_list:
-            question = item['user_question']
-            unique_questions.add(question)
-        
-        # 将问题转换为列表并排序（按字母顺序或长度）
-        questions_list = list(unique_questions)
-        questions_list.sort()  # 按字母顺序排序
+        if mode == "trending":
+            rows = await hot_topics.trending(limit)
+        else:
+            rows = await hot_topics.top(limit, window)
         
-        # 取前5个问题，每个问题显示为被问了1次
-        topics_data = []
-        for i, question in enumerate(questions_list[:5]):
-            topics_data.append({
-                "name": question[:20] + "..." if len(question) > 20 else question,  # 限制显示长度
-                "value": 1  # 每个不同的问题算作1次
-            })
+        topics_data = [
+            {
+                "name": row["name"][:20] + "..." if len(row["name"]) > 20 else row["name"],  # 限制显示长度
+                "value": row["value"]
+            }
+            for row in rows
+        ]
         
         # 如果数据不足5个，用默认数据补充
         if len(topics_data) < 5:
@@ -257,6 +157,84 @@ async def get_topics(request: Request):
         logger.error(f"获取热门话题数据失败: {e}")
         raise HTTPException(status_code=500, detail=f"获取热门话题数据失败: {str(e)}")
 
+@router.get("/write-behind", description="获取写后队列状态（当前 worker）", summary="写后队列状态")
+async def get_write_behind_status(request: Request):
+    """各写后队列的积压、溢写与刷写耗时"""
+    from core.batch_writer import writers_snapshot
+    return {"data": writers_snapshot()}
+
+@router.get("/tts-endpoints", description="获取TTS节点负载与健康状态（当前 worker）", summary="TTS节点状态")
+async def get_tts_endpoints(request: Request):
+    from core.tts_pool import tts_pool
+    return {"data": tts_pool.snapshot()}
+
+@router.get("/resources", description="获取系统资源采样历史：scope=worker 为当前 worker，scope=cluster 为所有 worker（需开启 RESOURCE_SAMPLE_REDIS）", summary="系统资源时间序列")
+async def get_resources(request: Request, scope: str = "worker", minutes: int = 10):
+    from core.resource_sampler import resource_sampler
+    since = int(time.time()) - minutes * 60
+    if scope == "cluster":
+        if not settings.resource_sample_redis:
+            raise HTTPException(status_code=400, detail="未开启 RESOURCE_SAMPLE_REDIS，无法获取集群数据")
+        return {"data": {
+            "latest": await resource_sampler.cluster_latest(),
+            "history": await resource_sampler.cluster_history(since)
+        }}
+    return {"data": {
+        "worker": resource_sampler.worker,
+        "latest": await resource_sampler.latest(),
+        "history": resource_sampler.history(since)
+    }}
+
+@router.get("/realtime", description="获取实时统计：在线用户（滑动窗口）、今日独立用户 / 设备（HyperLogLog）、响应延迟直方图", summary="实时统计")
+async def get_realtime_stats(request: Request, hours: int = 1):
+    from core.realtime_metrics import realtime_metrics
+    return {"data": {
+        "onlineUsers": await realtime_metrics.online_users(),
+        "todayUsers": await realtime_metrics.unique_users(1),
+        "todayDevices": await realtime_metrics.unique_devices(1),
+        "latency": await realtime_metrics.latency(max(1, min(hours, 24 * 7)))
+    }}
+
+@router.get("/speculative-llm", description="获取LLM推测执行的命中、节省与浪费时间（当前 worker）", summary="LLM推测执行统计")
+async def get_speculative_llm(request: Request):
+    from core.speculative_llm import speculative_stats
+    return {"data": speculative_stats.snapshot()}
+
+@router.get("/archive", description="获取按月的对话统计：片段数与去重问题数来自小时汇总表（含已归档的对话），另附各月归档量", summary="按月统计与归档")
+async def get_archive_stats(request: Request, months: int = 12):
+    try:
+        from core import stats_rollup
+        from core.retention import archived_months
+
+        months = max(1, min(months, 120))
+        now = datetime.now()
+        end = (now.replace(day=1, hour=0, minute=0, second=0, microsecond=0) + timedelta(days=32)).replace(day=1)
+        start = end
+        for _ in range(months):
+            start = (start - timedelta(days=1)).replace(day=1)
+        totals = await stats_rollup.monthly_totals(start, end)
+        archived = await archived_months()
+
+        data = []
+        month = start
+        while month < end:
+            key = month.strftime("%Y-%m")
+            data.append({
+                "month": key,
+                **totals.get(key, {"segments": 0, "questions": 0}),
+                "archived": archived.get(key, {"rows": 0, "files": 0, "bytes": 0}),
+            })
+            month = (month + timedelta(days=32)).replace(day=1)
+        return {"retentionDays": settings.retention_days, "data": data}
+    except Exception as e:
+        logger.error(f"获取按月统计失败: {e}")
+        raise HTTPException(status_code=500, detail=f"获取按月统计失败: {str(e)}")
+
+@router.get("/audio-store", description="获取生成音频的占用与最近一次回收结果（需开启 AUDIO_GC_ENABLE）", summary="音频存储")
+async def get_audio_store(request: Request):
+    from core.audio_store import audio_store
+    return {"enabled": settings.audio_gc_enable, "data": await audio_store.report()}
+
 async def get_system_status() -> Dict[str, bool]:
     """获取系统状态"""
     try:
@@ -293,38 +271,15 @@ async def get_system_status() -> Dict[str, bool]:
         }
 
 async def get_system_resources() -> Dict[str, int]:
-    """获取系统资源使用情况"""
+    """获取系统资源使用情况（读取后台采样的最新样本，不阻塞）"""
     try:
-        # 获取CPU使用率
-        cpu_percent = psutil.cpu_percent(interval=1)
-        
-        # 获取内存使用率
-        memory = psutil.virtual_memory()
-        memory_percent = memory.percent
-        
-        # 获取磁盘使用率（Windows系统使用C盘）
-        try:
-            disk = psutil.disk_usage('C:' if os.name == 'nt' else '/')
-            disk_percent = (disk.used / disk.total) * 100
-        except:
-            disk_percent = 0
-        
-        # 获取GPU使用率
-        gpu_percent = 0
-        try:
-            import GPUtil
-            gpus = GPUtil.getGPUs()
-            if gpus:
-                gpu_percent = int(gpus[0].load * 100)
-        except:
-            # 如果没有GPU或获取失败，设为0
-            gpu_percent = 0
-        
+        from core.resource_sampler import resource_sampler
+        sample = await resource_sampler.latest()
         return {
-            "cpu": int(cpu_percent),
-            "memory": int(memory_percent),
-            "disk": int(disk_percent),
-            "gpu": gpu_percent
+            "cpu": sample["cpu"],
+            "memory": sample["memory"],
+            "disk": sample["disk"],
+            "gpu": sample["gpu"]
         }
         
     except Exception as e:
@@ -336,55 +291,11 @@ async def get_system_resources() -> Dict[str, int]:
             "gpu": 0
         }
 
-# 辅助函数：记录对话统计
-async def record_chat_stats():
-    """记录对话统计数据"""
-    try:
-        now = datetime.now()
-        
-        # 记录今日对话数
-        today_key = f"stats:chats:{now.strftime('%Y-%m-%d')}"
-        await redis_client.incr(today_key)
-        await redis_client.expire(today_key, 86400 * 7)  # 保存7天
-        
-        # 记录小时对话数
-        hour_key = f"stats:chats:hour:{now.strftime('%Y-%m-%d:%H')}"
-        await redis_client.incr(hour_key)
-        await redis_client.expire(hour_key, 86400 * 2)  # 保存2天
-        
-        # 记录用户活跃度
-        hour = now.hour
-        if 9 <= hour <= 12:
-            await redis_client.incr("stats:activity:morning")
-        elif 14 <= hour <= 18:
-            await redis_client.incr("stats:activity:afternoon")
-        elif 19 <= hour <= 23:
-            await redis_client.incr("stats:activity:evening")
-        else:
-            await redis_client.incr("stats:activity:other")
-            
-    except Exception as e:
-        logger.error(f"记录对话统计失败: {e}")
-
-# 辅助函数：记录响应时间
-async def record_response_time(response_time: float):
-    """记录响应时间"""
-    try:
-        response_times_key = "stats:response_times"
-        await redis_client.lpush(response_times_key, str(response_time))
-        await redis_client.ltrim(response_times_key, 0, 99)  # 只保留最近100次
-    except Exception as e:
-        logger.error(f"记录响应时间失败: {e}")
-
-# 辅助函数：记录在线用户
-async def record_online_user(user_id: str):
-    """记录在线用户"""
-    try:
-        online_users_key = "stats:online_users"
-        await redis_client.sadd(online_users_key, user_id)
-        await redis_client.expire(online_users_key, 300)  # 5分钟过期
-    except Exception as e:
-        logger.error(f"记录在线用户失败: {e}")
+# 辅助函数：记录一轮对话（对话数 / 独立用户 / 在线用户 / 响应延迟，一次 pipeline）
+async def record_turn_stats(*, user_id: str, device: str = "", response_ms: float = None):
+    """记录一轮对话的实时统计"""
+    from core.realtime_metrics import realtime_metrics
+    await realtime_metrics.record_turn(user_id=user_id, device=device, response_ms=response_ms)
 
 # 辅助函数：记录话题统计
 async def record_topic_stats(topic_type: str):
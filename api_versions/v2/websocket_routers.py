@@ -1,71 +1,330 @@
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Request
-from core.services.v2 import stt_server, llm_server
-from core.logger import logger
+import asyncio
+import aiofiles
+import mimetypes
 import orjson
-from typing import Dict
+import os
+from urllib.parse import urlparse
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+from starlette.websockets import WebSocketState
+from core.services.v2 import stt_server
+from core.speculative_llm import Speculator
+from core.logger import logger
+from settings.config import settings, AUDIO_DIR
 
 
 router = APIRouter()
 
+LINK_EVENTS = {"image_link", "audio_link", "video_link", "generic_link"}
+SUPPORTED_FORMATS = ('mp3', 'mp4', 'mpeg', 'mpga', 'm4a', 'wav', 'webm')
+
+
+class WebSocketRequest:
+    """
+    让 WebSocket 连接可以直接传给 HTTP 流程（tts_servers / chat_messages_streaming_new）
+    - state 与 user_context_middleware 注入的字段一致（WebSocket 不经过 http 中间件）
+    - url_for 返回 http(s) 地址，而不是 ws(s)
+    """
+
+    def __init__(self, websocket: WebSocket):
+        self._websocket = websocket
+        self.headers = websocket.headers
+        self.client = websocket.client
+        self.state = websocket.state
+
+        # 浏览器无法给 WebSocket 设置请求头，同名 query 参数作为补充
+        def param(name, default=""):
+            return websocket.headers.get(name) or websocket.query_params.get(name) or default
+
+        self.state.user_id = param("user_id", "anonymous")
+        self.state.reference_id = param("reference_id") or None
+        self.state.api_key = param("dify_api_key")
+        self.state.mode = param("mode")
+        self.state.tts_speed = param("tts_speed", 1.2)
+        self.state.translate = param("translate", "zh")
+        self.state.greeting = param("greeting")
+        self.state.audio_format = param("audio_format")
+        self.state.device = param("device")
+        self.state.streaming_lock = asyncio.Lock()
+
+    def url_for(self, name: str, **path_params) -> str:
+        url = str(self._websocket.url_for(name, **path_params))
+        return "http" + url[2:] if url.startswith("ws") else url
+
+    async def is_disconnected(self) -> bool:
+        return self._websocket.client_state != WebSocketState.CONNECTED
 
-class ConnectionManager:
-    def __init__(self):
-        self.active_connections = {}
 
-    async def connect(self, websocket:WebSocket, user_id:str):
-        await websocket.accept()
-        self.active_connections[user_id] = websocket
-    
-    def disconnect(self, user_id: str):
-        if user_id in self.active_connections:
-            del self.active_connections[user_id]
+class VoiceSession:
+    """
+    单个 WebSocket 连接上的语音会话（全双工）
+    客户端 -> 服务端：
+      - 二进制帧：当前一句话的音频数据
+      - {"type": "start", "format": "wav"}  开始一句话（可省略，默认 wav）；配置了 STT_STREAM_URL 时音频边收边识别
+      - {"type": "end"}                     一句话结束，开始 STT -> 纠错 -> LLM -> TTS
+      - {"type": "text", "text": "..."}     直接以文本提问，跳过 STT
+      - {"type": "cancel"}                  打断当前回答
+      - {"type": "ping"}
+    服务端 -> 客户端：
+      - stt_partial / stt_result / message / link / audio_segment(+紧随一个二进制音频帧) / suggested_questions / turn_end / cancelled / error / pong
+    在回答过程中开始新的一句话（start 或新的音频帧）即视为打断（barge-in）
+    """
 
-    async def send_message(self, message:Dict, user_id:str):
-        if user_id in self.active_connections:
-            await self.active_connections[user_id].send_json(message)
+    def __init__(self, websocket: WebSocket):
+        self.websocket = websocket
+        self.request = WebSocketRequest(websocket)
+        self.audio = bytearray()
+        self.audio_format = "wav"
+        self.turn = 0
+        self.turn_task = None
+        self.stt_stream = None
+        self.speculator = None
+        self._send_lock = asyncio.Lock()
 
+    # ------------------------------ 发送 ------------------------------
 
+    async def send_json(self, message: dict):
+        async with self._send_lock:
+            await self.websocket.send_text(orjson.dumps(message).decode())
 
-manager = ConnectionManager()
+    async def send_audio(self, header: dict, audio: bytes):
+        # JSON 头和二进制帧在同一把锁内连续发送，客户端按顺序配对
+        async with self._send_lock:
+            await self.websocket.send_text(orjson.dumps(header).decode())
+            await self.websocket.send_bytes(audio)
 
+    # ------------------------------ 打断 ------------------------------
 
-async def handle_llm_streaming(request:Request, text:str, user_id:str):
-    async for chunk in llm_server.chat_messages_streaming(request=request, text=text):
+    @property
+    def answering(self) -> bool:
+        return self.turn_task is not None and not self.turn_task.done()
+
+    async def cancel_turn(self, reason: str):
+        if not self.answering:
+            return
+        self.turn_task.cancel()
         try:
-            data = orjson.loads(chunk.split(b"data: ")[1])
-            await manager.send_message({
-                "type": data.get("event", "message"),
-                "data": data
-            }, user_id=user_id)
+            await self.turn_task
+        except (asyncio.CancelledError, Exception):
+            pass
+        logger.info(f"🛑 用户 {self.request.state.user_id} 打断第 {self.turn} 轮回答: {reason}")
+        await self.send_json({"type": "cancelled", "turn": self.turn, "reason": reason})
+
+    # ------------------------------ 接收 ------------------------------
+
+    async def on_audio(self, data: bytes):
+        if self.answering:
+            await self.cancel_turn("barge_in")
+        if len(self.audio) + len(data) > settings.max_file_size:
+            self.audio.clear()
+            await self.close_stt_stream()
+            await self.send_json({"type": "error", "data": {"message": "最大支持15MB上传"}})
+            return
+        self.audio += data
+        if self.stt_stream is not None:
+            await self.stt_stream.feed(data)
+
+    async def on_control(self, message: dict):
+        msg_type = message.get("type")
+        if msg_type == "start":
+            if self.answering:
+                await self.cancel_turn("barge_in")
+            self.audio.clear()
+            audio_format = str(message.get("format") or "wav").lower()
+            self.audio_format = audio_format if audio_format in SUPPORTED_FORMATS else "wav"
+            await self._open_stt_stream()
+        elif msg_type == "end":
+            audio, self.audio = self.audio, bytearray()
+            stt_stream, self.stt_stream = self.stt_stream, None
+            speculator, self.speculator = self.speculator, None
+            if audio:
+                self._start_turn(audio=audio, stt_stream=stt_stream, speculator=speculator)
+            else:
+                if stt_stream is not None:
+                    await stt_stream.close()
+                if speculator is not None:
+                    await speculator.close()
+        elif msg_type == "text":
+            if self.answering:
+                await self.cancel_turn("barge_in")
+            self._start_turn(text=message.get("text") or "")
+        elif msg_type == "cancel":
+            await self.cancel_turn("cancel")
+        elif msg_type == "ping":
+            await self.send_json({"type": "pong"})
+        else:
+            await self.send_json({"type": "error", "data": {"message": f"未知消息类型: {msg_type}"}})
+
+    def _start_turn(self, *, audio: bytes = None, text: str = None, stt_stream=None, speculator=None):
+        self.turn += 1
+        self.turn_task = asyncio.create_task(
+            self._run_turn(self.turn, audio=audio, text=text, stt_stream=stt_stream, speculator=speculator)
+        )
+
+    async def _open_stt_stream(self):
+        """开始一句话时连接上游流式 STT，中间结果以 stt_partial 推给客户端"""
+        await self.close_stt_stream()
+        if not settings.stt_stream_url:
+            return
+        turn = self.turn + 1
+        file_name = f"ws.{self.audio_format}"
+
+        if settings.llm_speculative_enable:
+            from api_versions.v2.routers import generate_stream
+            self.speculator = Speculator(
+                lambda text: generate_stream(request=self.request, text=text, skip_question=True, record_stats=False)
+            )
+        speculator = self.speculator
+
+        async def on_partial(text: str):
+            if speculator is not None:
+                speculator.on_partial(text)
+            await self.send_json({"type": "stt_partial", "turn": turn, "data": {"text": text}})
+
+        self.stt_stream = stt_server.STTStream(
+            self.request,
+            file_name=file_name,
+            content_type=mimetypes.guess_type(file_name)[0],
+            on_partial=on_partial
+        )
+        await self.stt_stream.open()
+
+    async def close_stt_stream(self):
+        if self.stt_stream is not None:
+            await self.stt_stream.close()
+            self.stt_stream = None
+        if self.speculator is not None:
+            await self.speculator.close()
+            self.speculator = None
+
+    # ------------------------------ 一轮对话 ------------------------------
+
+    async def _run_turn(self, turn: int, *, audio: bytes = None, text: str = None, stt_stream=None, speculator=None):
+        from api_versions.v2.routers import generate_stream, track_turn
+
+        speculative = None
+        try:
+            if stt_stream is not None:
+                # 识别已与说话过程重叠，这里只等最终结果
+                text = await stt_stream.finish()
+                await self.send_json({"type": "stt_result", "turn": turn, "data": {"text": text}})
+            elif audio is not None:
+                file_name = f"ws.{self.audio_format}"
+                text = await stt_server.audio_to_text_ws(
+                    request=self.request,
+                    file_content=audio,
+                    file_name=file_name,
+                    content_type=mimetypes.guess_type(file_name)[0]
+                )
+                await self.send_json({"type": "stt_result", "turn": turn, "data": {"text": text}})
+
+            # 中间结果与最终结果一致时，直接提交提前开始的 LLM 流
+            speculative = await speculator.resolve(text) if speculator is not None else None
+            if speculative is not None:
+                track_turn(self.request, text)
+                stream = speculative.stream()
+            else:
+                stream = generate_stream(request=self.request, text=text, skip_question=audio is not None)
+
+            seq = 0
+            async for chunk in stream:
+                data = _parse_sse(chunk)
+                if data is None:
+                    continue
+                event = data.get("event", "message")
+                if event in LINK_EVENTS:
+                    await self.send_json({"type": "link", "turn": turn, "data": data})
+                elif data.get("url"):
+                    seq += 1
+                    await self._send_segment(turn, seq, data)
+                else:
+                    await self.send_json({"type": event, "turn": turn, "data": data})
+
+            await self.send_json({"type": "turn_end", "turn": turn})
+        except asyncio.CancelledError:
+            raise
+        except WebSocketDisconnect:
+            pass
         except Exception as e:
-            logger.error(f"websocket消息解析失败{e}")
-        
-    
+            logger.error(f"websocket 第 {turn} 轮处理失败: {e}")
+            if self.websocket.client_state == WebSocketState.CONNECTED:
+                await self.send_json({"type": "error", "turn": turn, "data": {"message": str(e)}})
+        finally:
+            if stt_stream is not None:
+                await stt_stream.close()
+            if speculator is not None:
+                await speculator.close()
+            if speculative is not None:
+                await speculative.cancel()
+
+    async def _send_segment(self, turn: int, seq: int, data: dict):
+        """一段回答文本 + 对应音频：本地音频直接以二进制帧推送，省去客户端再发一次 HTTP 请求"""
+        url = data["url"]
+        header = {"type": "audio_segment", "turn": turn, "seq": seq, "data": data}
+        audio = await _read_local_audio(url)
+        if audio is None:
+            header["binary"] = False
+            await self.send_json(header)
+            return
+        header["binary"] = True
+        # URL 可能带 ?v= 版本号，扩展名取自路径部分
+        header["format"] = os.path.splitext(urlparse(str(url)).path)[1].lstrip(".")
+        header["bytes"] = len(audio)
+        await self.send_audio(header, audio)
+
+
+def _parse_sse(chunk):
+    if isinstance(chunk, str):
+        chunk = chunk.encode()
+    if not chunk.startswith(b"data:"):
+        return None
+    try:
+        return orjson.loads(chunk[5:].strip())
+    except Exception as e:
+        logger.error(f"websocket消息解析失败{e}")
+        return None
+
+
+async def _read_local_audio(url: str):
+    path = urlparse(str(url)).path
+    if not path.startswith("/static/"):
+        return None
+    file_path = AUDIO_DIR / path[len("/static/"):]
+    try:
+        async with aiofiles.open(file_path, "rb") as f:
+            return await f.read()
+    except OSError:
+        return None
+
 
-@router.websocket("/ws/chat")
-async def websocket_chat(*, request:Request, websocket: WebSocket):
-    user_id = request.state.user_id
-    await manager.connect(websocket, user_id)
+@router.websocket("/ws/voice")
+async def websocket_voice(websocket: WebSocket):
+    await websocket.accept()
+    session = VoiceSession(websocket)
+    user_id = session.request.state.user_id
+    logger.info(f"🔌 websocket 语音会话建立: {user_id}")
 
     try:
         while True:
-            # 接受客户端数据
-            data = await websocket.receive_bytes()
-
-            # STT处理
-            text = await stt_server
-            await manager.send_message({
-                "type": "stt_result",
-                "data": {"text": text}
-            }, user_id=user_id)
-
-            # 触发LLM处理
-            await handle_llm_streaming(websocket, text, user_id)
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+            if message.get("bytes") is not None:
+                await session.on_audio(message["bytes"])
+            elif message.get("text") is not None:
+                try:
+                    control = orjson.loads(message["text"])
+                except orjson.JSONDecodeError:
+                    control = None
+                if not isinstance(control, dict):
+                    await session.send_json({"type": "error", "data": {"message": "消息必须是 JSON 对象"}})
+                    continue
+                await session.on_control(control)
     except WebSocketDisconnect:
-        logger.error(f"客户端断开链接: {user_id}")
+        pass
     except Exception as e:
         logger.error(f"websocket处理失败: {e}")
-        await manager.send_message({
-            "type": "error",
-            "data": {"message": str(e)}
-        }, user_id=user_id)
\ No newline at end of file
+    finally:
+        if session.turn_task and not session.turn_task.done():
+            session.turn_task.cancel()
+        await session.close_stt_stream()
+        logger.info(f"🔌 客户端断开链接: {user_id}")
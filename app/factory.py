@@ -2,7 +2,6 @@ import asyncio
 from pathlib import Path
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
 from .lifespan import lifespan
 from core.logger import logger
 from tortoise.contrib.fastapi import register_tortoise
@@ -58,6 +57,8 @@ def create_app() -> FastAPI:
         tts_speed = request.headers.get("tts_speed", 1.2)
         translate = request.headers.get("translate", "zh")
         greeting = request.headers.get("greeting", "")
+        audio_format = request.headers.get("audio_format", "")
+        device = request.headers.get("device", "")
 
         logger.info(f"请求头: {request.headers}")
 
@@ -68,18 +69,22 @@ def create_app() -> FastAPI:
         request.state.tts_speed = tts_speed
         request.state.translate = translate
         request.state.greeting = greeting
+        request.state.audio_format = audio_format
+        request.state.device = device
 
         request.state.streaming_lock = asyncio.Lock()
 
         response = await call_next(request)
         return response
 
-    # 使用配置中的静态文件目录
-    app.mount("/static", StaticFiles(directory=str(AUDIO_DIR)), name="audio_files")
+    # 使用配置中的静态文件目录（带版本号的 URL 与内容哈希命名的文件长期缓存，其余按 ETag 协商）
+    from core.static_files import ImmutableStaticFiles, StaticMount
+    app.router.routes.append(StaticMount("/static", app=ImmutableStaticFiles(directory=str(AUDIO_DIR)), name="audio_files"))
     
     # 按功能模块独立注册路由，避免统一的"管理API"分组
     from api_versions.v1.routers import router as v1_router
     from api_versions.v2.routers import router as v2_router
+    from api_versions.v2.websocket_routers import router as v2_ws_router
     from api_versions.v3.routers import router as v3_router
     from api_versions.utils.routers import router as utils_router
     from api_versions.api.routers import router as api_router
@@ -98,6 +103,7 @@ def create_app() -> FastAPI:
 
     # 数字人核心接口和工具接口
     app.include_router(router=v2_router, prefix="/v2", tags=['数字人核心接口'])
+    app.include_router(router=v2_ws_router, prefix="/v2", tags=['数字人核心接口'])
     app.include_router(router=utils_router, prefix="/utils", tags=['工具接口'], include_in_schema=False)
     app.include_router(router=v1_router, prefix="/v1", tags=['V1版本（已弃用）'], include_in_schema=False)
     app.include_router(router=v3_router, prefix="/v3", tags=['数字人核心接口'])
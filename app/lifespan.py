@@ -20,8 +20,66 @@ async def shutdown():
         print("❌ TTS会话资源已清理")
     except Exception as e:
         print(f"⚠️ TTS会话清理失败: {e}")
+
+    try:
+        from core.hot_topics import hot_topics_warmer
+        await hot_topics_warmer.stop()
+    except Exception as e:
+        print(f"⚠️ 热门问题预缓存停止失败: {e}")
+
+    try:
+        from core.resource_sampler import resource_sampler
+        await resource_sampler.stop()
+    except Exception as e:
+        print(f"⚠️ 系统资源采样停止失败: {e}")
+
+    try:
+        from core.audio_store import audio_store
+        await audio_store.stop()
+    except Exception as e:
+        print(f"⚠️ 音频回收任务停止失败: {e}")
+
+    try:
+        from utils.image_variants import image_variants
+        image_variants.stop()
+    except Exception as e:
+        print(f"⚠️ 图片派生进程池关闭失败: {e}")
+
+    try:
+        from utils.resumable_upload import model_uploads
+        await model_uploads.stop()
+    except Exception as e:
+        print(f"⚠️ 上传会话清理任务停止失败: {e}")
+
+    try:
+        from core.services.v2.stt_server import cleanup_stt_session
+        await cleanup_stt_session()
+    except Exception as e:
+        print(f"⚠️ STT会话清理失败: {e}")
     
     if settings.enable_database:
+        try:
+            from utils.media_sync import media_syncer
+            await media_syncer.stop()
+        except Exception as e:
+            print(f"⚠️ 媒体同步任务停止失败: {e}")
+        try:
+            from core.retention import retention_archiver
+            await retention_archiver.stop()
+        except Exception as e:
+            print(f"⚠️ 音频数据归档任务停止失败: {e}")
+        try:
+            from core.stats_rollup import rollup_compactor
+            await rollup_compactor.stop()
+        except Exception as e:
+            print(f"⚠️ 统计汇总任务停止失败: {e}")
+        # 先排空写后队列，再关闭数据库连接
+        try:
+            from core.batch_writer import stop_writers
+            await stop_writers()
+            print("❌ 写后队列已排空")
+        except Exception as e:
+            print(f"⚠️ 写后队列排空失败: {e}")
         await Tortoise.close_connections()
         print("❌ 数据库连接已关闭")
 
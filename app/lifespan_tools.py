@@ -11,6 +11,19 @@ async def init_start_lifespan():
     await check_redis_connection()
     await db_connect()
 
+    # 系统资源后台采样，仪表盘只读取最新样本
+    from core.resource_sampler import resource_sampler
+    resource_sampler.start()
+
+    # 生成音频的磁盘预算回收
+    if settings.audio_gc_enable:
+        from core.audio_store import audio_store
+        audio_store.start()
+
+    # 模型包分块上传的过期会话清理
+    from utils.resumable_upload import model_uploads
+    model_uploads.start()
+
     # 在数据库连接成功后执行迁移检查
     if settings.enable_database:
         logger.info("🔄 开始检查数据库迁移状态...")
@@ -20,10 +33,26 @@ async def init_start_lifespan():
         else:
             logger.info("✅ 数据库迁移检查完成")
             # 同步静态资源到数据库
-            from utils.media_sync import sync_media_files, check_and_fix_duplicate_hashes
-            await sync_media_files()
-            # 检查并修复重复的file_hash
-            await check_and_fix_duplicate_hashes()
+            from utils.media_sync import sync_media_files, check_and_fix_duplicate_hashes, media_syncer
+            if settings.media_sync_mode == "background":
+                media_syncer.start()
+            else:
+                await sync_media_files()
+                # 检查并修复重复的file_hash
+                await check_and_fix_duplicate_hashes()
+
+        # 仪表盘小时汇总的回填与压实（先于写后落库启动）
+        from core.stats_rollup import rollup_compactor
+        rollup_compactor.start()
+
+        # 启动日志 / 音频数据的写后批量落库
+        from core.batch_writer import start_writers
+        start_writers()
+
+        # 音频数据冷归档
+        if settings.retention_enable:
+            from core.retention import retention_archiver
+            retention_archiver.start()
 
     await check_greeting_status()
 
@@ -43,6 +72,11 @@ async def init_start_lifespan():
     else:
         print("❌ 开场白缓存未开启")
 
+    # 热门问题预缓存
+    if settings.hot_topics_warm_enable:
+        from core.hot_topics import hot_topics_warmer
+        hot_topics_warmer.start()
+
 
 
 
@@ -97,4 +131,10 @@ async def db_connect():
 
 async def check_greeting_status():
     status = '✅ 随机回复已打开' if settings.greeting_enable else '❌ 随机回复已关闭'
-    print(status)
\ No newline at end of file
+    print(status)
+
+    # 问候语音频池在后台预渲染，不阻塞启动；未就绪前问候语走实时TTS
+    from utils.audio_pool import audio_pool
+    audio_pool.index_clips()
+    if settings.greeting_enable:
+        asyncio.create_task(audio_pool.warm_up())
\ No newline at end of file
@@ -0,0 +1,85 @@
+"""
+TTS 输出格式对比：体积 / 码率 / 编码耗时 / 客户端解码耗时 / 弱网下载耗时
+
+用法：
+    python benchmarks/bench_audio_formats.py [wav文件 ...] [--repeat 5] [--link-kbps 1000]
+
+不传文件时使用 static/fail 下的 wav 作为语音样本。需要本机安装 ffmpeg。
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from settings.config import FAIL_DIR  # noqa: E402
+from utils.audio_format import AUDIO_FORMATS, audio_ext, encoder_args  # noqa: E402
+
+
+def _run(cmd):
+    start = time.perf_counter()
+    subprocess.run(cmd, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return (time.perf_counter() - start) * 1000
+
+
+def _duration_seconds(path: Path) -> float:
+    out = subprocess.run(
+        ["ffprobe", "-v", "error", "-show_entries", "format=duration", "-of", "csv=p=0", str(path)],
+        check=True, capture_output=True, text=True
+    )
+    return float(out.stdout.strip())
+
+
+def bench_file(src: Path, repeat: int, link_kbps: int, tmp_dir: Path):
+    duration = _duration_seconds(src)
+    rows = []
+    for audio_format in AUDIO_FORMATS:
+        encoded = tmp_dir / f"{src.stem}{audio_ext(audio_format)}"
+        decoded = tmp_dir / f"{src.stem}_{audio_format}.pcm"
+        encode_ms, decode_ms = [], []
+        for _ in range(repeat):
+            encode_ms.append(_run(["ffmpeg", "-y", "-i", str(src), *encoder_args(audio_format), str(encoded)]))
+            # 模拟客户端解码为 PCM
+            decode_ms.append(_run(["ffmpeg", "-y", "-i", str(encoded), "-f", "s16le", "-ar", "16000", "-ac", "1", str(decoded)]))
+        size = encoded.stat().st_size
+        rows.append({
+            "format": audio_format,
+            "bytes": size,
+            "kbps": size * 8 / 1000 / duration,
+            "download_ms": size * 8 / link_kbps,
+            "encode_ms": statistics.median(encode_ms),
+            "decode_ms": statistics.median(decode_ms),
+        })
+    return duration, rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("files", nargs="*", type=Path)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--link-kbps", type=int, default=1000, help="模拟链路带宽（kbit/s），用于估算下载耗时")
+    args = parser.parse_args()
+
+    files = args.files or sorted(FAIL_DIR.glob("*.wav"))
+    if not files:
+        sys.exit("没有可用的 wav 样本")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for src in files:
+            duration, rows = bench_file(src, args.repeat, args.link_kbps, Path(tmp))
+            baseline = rows[0]["bytes"]
+            print(f"\n{src.name}  ({duration:.2f}s, 链路 {args.link_kbps} kbit/s)")
+            print(f"{'format':<6} {'bytes':>9} {'ratio':>6} {'kbps':>7} {'download':>10} {'encode':>9} {'decode':>9}")
+            for r in rows:
+                print(
+                    f"{r['format']:<6} {r['bytes']:>9} {r['bytes'] / baseline:>6.2f} {r['kbps']:>7.1f} "
+                    f"{r['download_ms']:>8.0f}ms {r['encode_ms']:>7.1f}ms {r['decode_ms']:>7.1f}ms"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+流式 STT：本地桩服务下，说完话到拿到最终文本的等待时间（整段上传 vs 流式）
+
+用法：
+    python benchmarks/bench_stt_stream.py [--utterances 20] [--seconds 3] [--rtf 0.3]
+
+桩 STT 按实时率 rtf 消耗识别时间（1 秒音频需要 rtf 秒）：
+    POST /audio-to-text —— 收完整段音频后才开始识别
+    WS   /stream        —— 每收到一块音频就识别这一块并推回 partial，收到 end 后推回 final
+客户端按真实语速每 100ms 发送一块音频，分别统计 "说完 -> 最终文本" 的 p50 / p95。
+协议与 core.services.v2.stt_server.STTStream 一致。
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import aiohttp
+from aiohttp import web
+
+CHUNK_MS = 100
+BYTES_PER_SECOND = 16000 * 2
+
+
+def _stub_app(rtf: float) -> web.Application:
+    async def audio_to_text(request):
+        form = await request.post()
+        audio = form["file"].file.read()
+        await asyncio.sleep(len(audio) / BYTES_PER_SECOND * rtf)
+        return web.json_response({"text": "今天天气怎么样"})
+
+    async def stream(request):
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        received = 0
+        async for msg in ws:
+            if msg.type == aiohttp.WSMsgType.BINARY:
+                received += len(msg.data)
+                await asyncio.sleep(len(msg.data) / BYTES_PER_SECOND * rtf)
+                await ws.send_json({"type": "partial", "text": f"今天天气{received // BYTES_PER_SECOND}"})
+            elif msg.type == aiohttp.WSMsgType.TEXT and msg.json().get("type") == "end":
+                await ws.send_json({"type": "final", "text": "今天天气怎么样"})
+                break
+        await ws.close()
+        return ws
+
+    app = web.Application()
+    app.router.add_post("/audio-to-text", audio_to_text)
+    app.router.add_get("/stream", stream)
+    return app
+
+
+async def _speak(seconds: float):
+    """按真实语速产出音频块"""
+    chunk = b"\0" * (BYTES_PER_SECOND * CHUNK_MS // 1000)
+    for _ in range(int(seconds * 1000 / CHUNK_MS)):
+        await asyncio.sleep(CHUNK_MS / 1000)
+        yield chunk
+
+
+async def buffered(session, base_url, seconds) -> float:
+    audio = bytearray()
+    async for chunk in _speak(seconds):
+        audio += chunk
+    end_of_speech = time.perf_counter()
+    form = aiohttp.FormData()
+    form.add_field("file", value=bytes(audio), filename="ws.wav", content_type="audio/wav")
+    async with session.post(f"{base_url}/audio-to-text", data=form) as resp:
+        await resp.json()
+    return time.perf_counter() - end_of_speech
+
+
+async def streaming(session, base_url, seconds) -> float:
+    async with session.ws_connect(f"{base_url}/stream") as ws:
+        await ws.send_json({"type": "start", "format": "wav"})
+        final = asyncio.get_running_loop().create_future()
+
+        async def reader():
+            async for msg in ws:
+                data = msg.json()
+                if data.get("type") == "final":
+                    final.set_result(data["text"])
+                    return
+
+        reader_task = asyncio.create_task(reader())
+        async for chunk in _speak(seconds):
+            await ws.send_bytes(chunk)
+        end_of_speech = time.perf_counter()
+        await ws.send_json({"type": "end"})
+        await final
+        elapsed = time.perf_counter() - end_of_speech
+        reader_task.cancel()
+        return elapsed
+
+
+def _percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--utterances", type=int, default=20)
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--rtf", type=float, default=0.3)
+    args = parser.parse_args()
+
+    runner = web.AppRunner(_stub_app(args.rtf))
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    base_url = f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}"
+    try:
+        async with aiohttp.ClientSession() as session:
+            print(f"{'mode':<10} {'p50':>8} {'p95':>8} {'mean':>8}")
+            for name, func in (("buffered", buffered), ("streaming", streaming)):
+                waits = await asyncio.gather(*(func(session, base_url, args.seconds) for _ in range(args.utterances)))
+                waits_ms = [w * 1000 for w in waits]
+                print(
+                    f"{name:<10} {_percentile(waits_ms, 0.5):>6.0f}ms {_percentile(waits_ms, 0.95):>6.0f}ms "
+                    f"{statistics.mean(waits_ms):>6.0f}ms"
+                )
+    finally:
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,87 @@
+"""
+TTS 文本规范化：金标准校验 + 新旧实现耗时对比
+
+用法：
+    python benchmarks/bench_tts_normalizer.py [--rounds 2000]
+
+先逐条校验 data/tts_normalizer_golden.jsonl，任一不一致即退出码 1；
+再对比旧的多遍处理（CLEANUP_TABLE / normalize_text_numbers / normalize_time_expressions /
+emoji / 空白 / 成人替换）与 TTSNormalizer 无缓存、有缓存三种情况下的单条耗时。
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import emoji  # noqa: E402
+from core.services.v2.llm_server import CLEANUP_TABLE  # noqa: E402
+from utils.llm_tools import normalize_time_expressions  # noqa: E402
+from utils.tools import normalize_text_numbers  # noqa: E402
+from utils.tts_normalizer import TTSNormalizer  # noqa: E402
+
+GOLDEN_PATH = Path(__file__).parent / "data" / "tts_normalizer_golden.jsonl"
+PRONUNCIATIONS = {"成人": "晨人"}
+
+
+def load_golden():
+    with open(GOLDEN_PATH, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def check_golden(cases) -> int:
+    failed = 0
+    normalizers = {
+        flag: TTSNormalizer(pronunciations=PRONUNCIATIONS, numbers_to_chinese=flag)
+        for flag in (True, False)
+    }
+    for case in cases:
+        output = normalizers[case["numbers_to_chinese"]].normalize(case["input"], case["markdown"])
+        if output != case["expected"]:
+            failed += 1
+            print(f"✗ {case['input']!r}\n    期望: {case['expected']!r}\n    实际: {output!r}")
+    print(f"金标准: {len(cases) - failed}/{len(cases)} 通过")
+    return failed
+
+
+def legacy_pipeline(text: str) -> str:
+    """改造前 llm_server -> tts_servers -> text_to_audio_ffmpeg_speed 的处理顺序"""
+    text = text.translate(CLEANUP_TABLE).replace("-", " ")
+    text = normalize_text_numbers(text)
+    text = normalize_time_expressions(text)
+    text = emoji.replace_emoji(text, replace="")
+    text = " ".join(text.split())
+    return text.replace("成人", "晨人")
+
+
+def timeit(func, texts, rounds) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for text in texts:
+            func(text)
+    return (time.perf_counter() - start) * 1e6 / (rounds * len(texts))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=2000)
+    args = parser.parse_args()
+
+    cases = load_golden()
+    if check_golden(cases):
+        sys.exit(1)
+
+    texts = [case["input"] for case in cases if case["markdown"]]
+    uncached = TTSNormalizer(pronunciations=PRONUNCIATIONS, numbers_to_chinese=True, cache_size=0)
+    cached = TTSNormalizer(pronunciations=PRONUNCIATIONS, numbers_to_chinese=True)
+
+    print(f"\n{'实现':<16} {'us/条':>8}")
+    print(f"{'旧流程(多遍)':<16} {timeit(legacy_pipeline, texts, args.rounds):>8.1f}")
+    print(f"{'单遍(无缓存)':<16} {timeit(lambda t: uncached.normalize(t, True), texts, args.rounds):>8.1f}")
+    print(f"{'单遍(LRU命中)':<16} {timeit(lambda t: cached.normalize(t, True), texts, args.rounds):>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
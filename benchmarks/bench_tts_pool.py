@@ -0,0 +1,112 @@
+"""
+TTS 节点池：本地桩服务下的尾延迟对比（对冲开 / 关）
+
+用法：
+    python benchmarks/bench_tts_pool.py [--requests 400] [--concurrency 8]
+
+启动三个本地桩 TTS 服务：
+    fast  —— 稳定 40~60ms
+    tail  —— 通常 40~60ms，10% 概率卡 2s（模拟 GPU 抖动）
+    flaky —— 30% 概率返回 500
+分别在关闭 / 开启对冲时统计 p50 / p95 / p99 和失败数。
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import aiohttp
+from aiohttp import web
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from settings.config import settings  # noqa: E402
+from core.tts_pool import TTSEndpointPool, TTS_PATH  # noqa: E402
+
+FAKE_AUDIO = b"RIFF" + b"\0" * 3200
+
+
+def _stub_app(kind: str) -> web.Application:
+    async def tts(request):
+        await request.read()
+        if kind == "flaky" and random.random() < 0.3:
+            return web.Response(status=500)
+        delay = random.uniform(0.04, 0.06)
+        if kind == "tail" and random.random() < 0.1:
+            delay = 2.0
+        await asyncio.sleep(delay)
+        return web.Response(body=FAKE_AUDIO, content_type="audio/wav")
+
+    app = web.Application()
+    app.router.add_post(TTS_PATH, tts)
+    return app
+
+
+async def _start_stubs():
+    runners, base_urls = [], []
+    for kind in ("fast", "tail", "flaky"):
+        runner = web.AppRunner(_stub_app(kind))
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        runners.append(runner)
+        base_urls.append(f"http://127.0.0.1:{port}")
+    return runners, base_urls
+
+
+def _percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+async def _run(pool, session, total, concurrency):
+    latencies, failures = [], 0
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        nonlocal failures
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                await pool.synthesize(session, {"text": "你好"})
+                latencies.append((time.perf_counter() - start) * 1000)
+            except Exception:
+                failures += 1
+
+    await asyncio.gather(*(one() for _ in range(total)))
+    return latencies, failures
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    runners, base_urls = await _start_stubs()
+    settings.tts_urls = ",".join(base_urls)
+    settings.tts_hedge_min_delay = 0.1
+    try:
+        async with aiohttp.ClientSession() as session:
+            print(f"{'hedge':<6} {'p50':>8} {'p95':>8} {'p99':>8} {'mean':>8} {'fail':>5} {'hedges':>7}")
+            for hedge in (False, True):
+                settings.tts_hedge_enable = hedge
+                pool = TTSEndpointPool()
+                latencies, failures = await _run(pool, session, args.requests, args.concurrency)
+                print(
+                    f"{str(hedge):<6} {_percentile(latencies, 0.5):>6.0f}ms {_percentile(latencies, 0.95):>6.0f}ms "
+                    f"{_percentile(latencies, 0.99):>6.0f}ms {statistics.mean(latencies):>6.0f}ms {failures:>5} {pool.hedges:>7}"
+                )
+                for endpoint in pool.snapshot()["endpoints"]:
+                    print(f"    {endpoint}")
+    finally:
+        for runner in runners:
+            await runner.cleanup()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
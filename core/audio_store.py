@@ -0,0 +1,218 @@
+import asyncio
+import os
+import re
+import time
+import orjson
+from core.logger import logger
+from core.redis_client import redis_client
+from settings.config import settings, AUDIO_DIR
+
+# static 根目录下参与回收的文件：以 md5 命名的生成音频与以 sha256 命名的 STT 上传归档；
+# 子目录中的问候语 / 失败提示 / 站点资源不参与回收
+_GENERATED_PATTERN = re.compile(r"^(?:[0-9a-f]{32}\.(?:wav|ogg|mp3)|[0-9a-f]{64}\.[0-9A-Za-z]+)$")
+_URL_PATTERN = re.compile(rb"/static/([0-9a-f]{32}\.(?:wav|ogg|mp3))")
+
+# 最后访问时间（缓存命中时更新）与缓存引用（score 为引用该文件的缓存过期时间），均为有序集合
+ACCESS_KEY = "audio:store:access"
+PIN_KEY = "audio:store:pinned"
+GC_LOCK_KEY = "audio:store:gc"
+REPORT_KEY = "audio:store:report"
+# 超出预算时回收到预算的该比例，避免每轮只删几个文件
+_LOW_WATERMARK = 0.9
+# 访问记录保留时间，超过后按文件修改时间计算
+_ACCESS_RETENTION = 86400 * 30
+_QUERY_CHUNK = 500
+
+
+def referenced_files(data) -> set:
+    """从 SSE / TTS 缓存内容中提取引用的音频文件名"""
+    if data is None:
+        return set()
+    if isinstance(data, (list, tuple, set)):
+        names = set()
+        for item in data:
+            names |= referenced_files(item)
+        return names
+    if isinstance(data, str):
+        data = data.encode()
+    elif not isinstance(data, bytes):
+        data = orjson.dumps(data)
+    return {name.decode() for name in _URL_PATTERN.findall(data)}
+
+
+def _scan() -> list:
+    """static 根目录下的生成音频与 STT 归档：[(文件名, 字节数, 修改时间)]"""
+    files = []
+    with os.scandir(AUDIO_DIR) as entries:
+        for entry in entries:
+            if not _GENERATED_PATTERN.match(entry.name) or not entry.is_file(follow_symlinks=False):
+                continue
+            try:
+                stat = entry.stat(follow_symlinks=False)
+            except FileNotFoundError:
+                continue
+            files.append((entry.name, stat.st_size, stat.st_mtime))
+    return files
+
+
+def _unlink(names: list) -> list:
+    removed = []
+    for name in names:
+        try:
+            os.remove(AUDIO_DIR / name)
+            removed.append(name)
+        except FileNotFoundError:
+            removed.append(name)
+        except Exception as e:
+            logger.warning(f"删除音频文件失败: {name} {e}")
+    return removed
+
+
+class AudioStore:
+    """
+    生成音频（含 STT 上传归档）的磁盘预算与回收
+    - 写入 SSE / TTS 缓存时登记引用（到缓存过期为止），缓存命中时记录访问时间（各 worker 内存中合并，按周期批量写入）
+    - 后台任务按 audio_gc_interval 扫描 static 根目录；总大小超过 audio_gc_budget_mb 时
+      先回收没有 AudioData 记录引用的文件，再按最近访问时间从旧到新回收，直到低于预算
+    - 仍被缓存引用或不足 audio_gc_min_age 秒的文件不回收；删除在线程池中分批执行
+    """
+
+    def __init__(self):
+        self._touched = set()
+        self._task = None
+
+    # ------------------------------ 引用与访问 ------------------------------
+
+    def pin(self, pipe, data, ttl: int = None):
+        """在调用方的 pipeline 中登记缓存引用"""
+        names = referenced_files(data)
+        if names:
+            expire_at = time.time() + (ttl or settings.cache_expiry)
+            pipe.zadd(PIN_KEY, {name: expire_at for name in names}, gt=True)
+
+    async def pin_now(self, data, ttl: int = None):
+        try:
+            async with redis_client.pipeline(transaction=False) as pipe:
+                self.pin(pipe, data, ttl)
+                await pipe.execute()
+        except Exception as e:
+            logger.warning(f"登记音频缓存引用失败: {e}")
+
+    def touch(self, data):
+        self._touched |= referenced_files(data)
+
+    async def flush_touched(self):
+        if not self._touched:
+            return
+        touched, self._touched = self._touched, set()
+        now = time.time()
+        try:
+            await redis_client.zadd(ACCESS_KEY, {name: now for name in touched}, gt=True)
+        except Exception as e:
+            logger.warning(f"记录音频访问时间失败: {e}")
+
+    # ------------------------------ 回收 ------------------------------
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        await self.flush_touched()
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(settings.audio_gc_interval)
+            await self.flush_touched()
+            try:
+                if await redis_client.set(GC_LOCK_KEY, "1", nx=True, ex=int(settings.audio_gc_interval)):
+                    await self.collect()
+            except Exception as e:
+                logger.warning(f"音频文件回收失败: {e}")
+
+    async def collect(self) -> dict:
+        loop = asyncio.get_running_loop()
+        now = time.time()
+        files = await loop.run_in_executor(None, _scan)
+        total = sum(size for _, size, _ in files)
+        budget = settings.audio_gc_budget_mb * 1024 * 1024
+        report = {"ts": int(now), "files": len(files), "bytes": total, "budget": budget, "evicted": 0, "freed": 0}
+
+        if total > budget:
+            victims = await self._victims(files, now, total - int(budget * _LOW_WATERMARK))
+            for start in range(0, len(victims), settings.audio_gc_batch_size):
+                batch = victims[start:start + settings.audio_gc_batch_size]
+                removed = set(await loop.run_in_executor(None, _unlink, [name for name, _ in batch]))
+                if removed:
+                    await redis_client.zrem(ACCESS_KEY, *removed)
+                report["evicted"] += len(removed)
+                report["freed"] += sum(size for name, size in batch if name in removed)
+                await asyncio.sleep(0)
+            report["bytes"] -= report["freed"]
+            logger.info(f"🧹 音频文件回收: {report['evicted']} 个, 释放 {report['freed'] / 1024 / 1024:.1f}MB")
+
+        await redis_client.zremrangebyscore(PIN_KEY, "-inf", now)
+        await redis_client.zremrangebyscore(ACCESS_KEY, "-inf", now - _ACCESS_RETENTION)
+        await redis_client.hset(REPORT_KEY, mapping=report)
+        return report
+
+    async def _victims(self, files: list, now: float, to_free: int) -> list:
+        """待回收文件 [(文件名, 字节数)]：无数据库记录引用的优先，其次按最近访问时间从旧到新"""
+        names = [name for name, _, _ in files]
+        accessed, pinned = {}, {}
+        for start in range(0, len(names), _QUERY_CHUNK):
+            chunk = names[start:start + _QUERY_CHUNK]
+            async with redis_client.pipeline(transaction=False) as pipe:
+                pipe.zmscore(ACCESS_KEY, chunk)
+                pipe.zmscore(PIN_KEY, chunk)
+                access_scores, pin_scores = await pipe.execute()
+            accessed.update(zip(chunk, access_scores))
+            pinned.update(zip(chunk, pin_scores))
+
+        candidates = []
+        for name, size, mtime in files:
+            last_access = max(mtime, accessed.get(name) or 0)
+            if now - last_access < settings.audio_gc_min_age or (pinned.get(name) or 0) > now:
+                continue
+            candidates.append((name, size, last_access))
+
+        referenced = await self._db_referenced([name for name, _, _ in candidates])
+        candidates.sort(key=lambda c: (c[0] in referenced, c[2]))
+
+        victims, freed = [], 0
+        for name, size, _ in candidates:
+            if freed >= to_free:
+                break
+            victims.append((name, size))
+            freed += size
+        return victims
+
+    @staticmethod
+    async def _db_referenced(names: list) -> set:
+        if not settings.enable_database or not names:
+            return set()
+        from tortoise import Tortoise
+
+        conn = Tortoise.get_connection("default")
+        referenced = set()
+        for start in range(0, len(names), _QUERY_CHUNK):
+            paths = [f"static/{name}" for name in names[start:start + _QUERY_CHUNK]]
+            rows = await conn.execute_query_dict(
+                f"SELECT DISTINCT `audio_file_path` FROM `audio_data` "
+                f"WHERE `audio_file_path` IN ({', '.join(['%s'] * len(paths))})",
+                paths
+            )
+            referenced |= {row["audio_file_path"][len("static/"):] for row in rows}
+        return referenced
+
+    async def report(self) -> dict:
+        return {field: int(value) for field, value in (await redis_client.hgetall(REPORT_KEY)).items()}
+
+
+audio_store = AudioStore()
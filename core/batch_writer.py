@@ -0,0 +1,333 @@
+import asyncio
+import os
+import re
+import time
+import uuid
+import orjson
+from datetime import datetime
+from pathlib import Path
+from tortoise import Tortoise, fields, timezone
+from tortoise.transactions import in_transaction
+from core.logger import logger
+from settings.config import BASE_DIR, settings
+
+SPILL_DIR = BASE_DIR / "spill"
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class BatchWriter:
+    """
+    写后批量落库队列（进程内）
+    - submit() 只入队不等待，队列满时溢写到磁盘 jsonl，不阻塞请求
+    - 后台任务按 条数 / 时间 触发 bulk_create
+    - MySQL 变慢或不可用时整批溢写，恢复后自动回放
+    - 溢写文件按进程区分（spill/<Model>.<pid>.jsonl），回放前改名为 <Model>.<pid>-<id>.replaying 认领；
+      启动时同时认领已退出进程留下的溢写 / 回放文件，进程在回放中途崩溃的记录下次启动继续回放（至少一次）
+    """
+
+    def __init__(self, model_name: str, *, batch_size: int, flush_interval: float, max_queue: int):
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self._spill_pattern = re.compile(rf"^{re.escape(model_name)}(?:\.(\d+)(?:-\w+)?)?\.(?:jsonl|replaying)$")
+        self._task = None
+        # 已出队、尚未交给 _flush 的记录：确定没有写入，停止时补写
+        self._pending: list = []
+        # 正在执行的 _flush：停止时等待其完成（失败时其自身会溢写），不重复写入
+        self._flushing = None
+        self._spill_lock = asyncio.Lock()
+        self._spill_tasks = set()
+        self.metrics = {
+            "submitted": 0,
+            "flushed": 0,
+            "spilled": 0,
+            "replayed": 0,
+            "dropped": 0,
+            "flush_count": 0,
+            "flush_errors": 0,
+            "last_flush_ms": 0.0,
+            "max_flush_ms": 0.0,
+            "total_flush_ms": 0.0,
+        }
+
+    @property
+    def spill_path(self) -> Path:
+        # gunicorn 预加载时模块在主进程中导入，pid 在使用时取
+        return SPILL_DIR / f"{self.model_name}.{os.getpid()}.jsonl"
+
+    @property
+    def model(self):
+        return Tortoise.apps["models"][self.model_name]
+
+    def _with_auto_now(self, record: dict) -> dict:
+        """auto_now_add 字段在入队时取值，避免记录时间被推迟到落库时刻"""
+        for name, field in self.model._meta.fields_map.items():
+            if isinstance(field, fields.DatetimeField) and field.auto_now_add and record.get(name) is None:
+                record[name] = timezone.now()
+        return record
+
+    def submit(self, **record):
+        """入队一条记录，队列满时溢写到磁盘"""
+        if not settings.enable_database or not Tortoise._inited:
+            self.metrics["dropped"] += 1
+            return
+        record = self._with_auto_now(record)
+        self.metrics["submitted"] += 1
+        try:
+            self.queue.put_nowait(record)
+        except asyncio.QueueFull:
+            task = asyncio.create_task(self._spill([record]))
+            self._spill_tasks.add(task)
+            task.add_done_callback(self._spill_tasks.discard)
+
+    # ------------------------------ 后台刷写 ------------------------------
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """停止后台任务并把队列中剩余的记录全部落库"""
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        if self._flushing is not None and not self._flushing.done():
+            await asyncio.wait([self._flushing])
+        pending, self._pending = self._pending, []
+        await self._flush(pending)
+        while not self.queue.empty():
+            await self._flush(self._take_batch())
+        if self._spill_tasks:
+            await asyncio.wait(self._spill_tasks)
+
+    def _take_batch(self) -> list:
+        batch = []
+        while len(batch) < self.batch_size and not self.queue.empty():
+            batch.append(self.queue.get_nowait())
+        return batch
+
+    async def _flush_shielded(self, batch: list) -> bool:
+        """任务被取消时刷写继续完成，避免取消后无法判断是否已写入"""
+        self._flushing = asyncio.ensure_future(self._flush(batch))
+        return await asyncio.shield(self._flushing)
+
+    async def _run(self):
+        # 上次运行遗留的溢写记录先回放
+        await self._replay_spill()
+        while True:
+            batch = self._pending
+            batch.append(await self.queue.get())
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout=timeout))
+                except asyncio.TimeoutError:
+                    break
+            self._pending = []
+            flushed = await self._flush_shielded(batch)
+            if flushed and self.queue.empty():
+                await self._replay_spill()
+
+    async def _bulk_create(self, batch: list):
+        model = self.model
+        await model.bulk_create([model(**record) for record in batch])
+
+    async def _flush(self, batch: list) -> bool:
+        if not batch:
+            return True
+        start = time.perf_counter()
+        try:
+            await self._bulk_create(batch)
+        except Exception as e:
+            self.metrics["flush_errors"] += 1
+            logger.warning(f"批量写入 {self.model_name} 失败，{len(batch)} 条记录溢写到磁盘: {e}")
+            await self._spill(batch)
+            return False
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        self.metrics["flushed"] += len(batch)
+        self.metrics["flush_count"] += 1
+        self.metrics["last_flush_ms"] = elapsed_ms
+        self.metrics["total_flush_ms"] += elapsed_ms
+        self.metrics["max_flush_ms"] = max(self.metrics["max_flush_ms"], elapsed_ms)
+        return True
+
+    # ------------------------------ 磁盘溢写 ------------------------------
+
+    def _write_spill(self, records: list):
+        SPILL_DIR.mkdir(parents=True, exist_ok=True)
+        with open(self.spill_path, "ab") as f:
+            f.write(b"".join(orjson.dumps(record) + b"\n" for record in records))
+
+    async def _spill(self, records: list):
+        if not records:
+            return
+        try:
+            async with self._spill_lock:
+                await asyncio.get_running_loop().run_in_executor(None, self._write_spill, records)
+            self.metrics["spilled"] += len(records)
+        except Exception as e:
+            self.metrics["dropped"] += len(records)
+            logger.error(f"{self.model_name} 溢写磁盘失败，丢弃 {len(records)} 条记录: {e}")
+
+    def _load_record(self, line: bytes) -> dict:
+        record = orjson.loads(line)
+        for name, field in self.model._meta.fields_map.items():
+            if isinstance(field, fields.DatetimeField) and isinstance(record.get(name), str):
+                record[name] = datetime.fromisoformat(record[name])
+        return record
+
+    def _claim_spill_files(self) -> list:
+        """
+        认领待回放的文件：本进程的溢写文件，以及已退出进程（或旧版不带 pid）的溢写 / 回放文件；
+        改名是原子操作，多个 worker 同时认领同一文件时只有一个成功
+        """
+        if not SPILL_DIR.exists():
+            return []
+        pid = os.getpid()
+        claimed = []
+        for path in sorted(SPILL_DIR.iterdir()):
+            match = self._spill_pattern.match(path.name)
+            if not match:
+                continue
+            owner = int(match.group(1)) if match.group(1) else None
+            if owner == pid:
+                if path.suffix == ".replaying":
+                    # pid 被复用：上一个同 pid 进程留下的回放文件
+                    claimed.append(path)
+                    continue
+            elif owner is not None and _pid_alive(owner):
+                continue
+            target = SPILL_DIR / f"{self.model_name}.{pid}-{uuid.uuid4().hex[:8]}.replaying"
+            try:
+                path.replace(target)
+            except FileNotFoundError:
+                continue
+            claimed.append(target)
+        return claimed
+
+    def _read_spill_file(self, path: Path) -> list:
+        return [line for line in path.read_bytes().splitlines() if line.strip()]
+
+    async def _replay_spill(self):
+        """数据库恢复后回放溢写文件"""
+        loop = asyncio.get_running_loop()
+        async with self._spill_lock:
+            try:
+                paths = await loop.run_in_executor(None, self._claim_spill_files)
+            except Exception as e:
+                logger.warning(f"认领 {self.model_name} 溢写文件失败: {e}")
+                return
+        for path in paths:
+            if not await self._replay_file(path):
+                break
+
+    async def _replay_file(self, path: Path) -> bool:
+        loop = asyncio.get_running_loop()
+        try:
+            lines = await loop.run_in_executor(None, self._read_spill_file, path)
+        except Exception as e:
+            logger.warning(f"读取 {self.model_name} 溢写文件失败: {e}")
+            return False
+
+        records = []
+        for line in lines:
+            try:
+                records.append(self._load_record(line))
+            except Exception as e:
+                self.metrics["dropped"] += 1
+                logger.warning(f"{self.model_name} 溢写记录损坏，已丢弃: {e}")
+
+        replayed, done, i = 0, True, 0
+        try:
+            while i < len(records):
+                batch = records[i:i + self.batch_size]
+                flushed = await self._flush_shielded(batch)
+                i += len(batch)
+                if not flushed:
+                    # _flush 失败时已重新溢写当前批次，剩余批次一起写回
+                    done = False
+                    break
+                replayed += len(batch)
+                self.metrics["replayed"] += len(batch)
+        except asyncio.CancelledError:
+            # 停止时：等进行中的批次完成，未回放的记录写回本进程的溢写文件
+            # 进行中的批次成功则已写入，失败则已由 _flush 溢写，两种情况都只需写回其后的记录
+            await asyncio.wait([self._flushing])
+            await self._spill(records[i + self.batch_size:])
+            await loop.run_in_executor(None, path.unlink, True)
+            raise
+        await self._spill(records[i:])
+        await loop.run_in_executor(None, path.unlink, True)
+        logger.info(f"{self.model_name} 溢写记录回放{'完成' if done else '中断'}: {replayed} 条")
+        return done
+
+    def snapshot(self) -> dict:
+        flush_count = self.metrics["flush_count"]
+        return {
+            **self.metrics,
+            "queue_depth": self.queue.qsize(),
+            "queue_capacity": self.queue.maxsize,
+            "spill_file_bytes": self.spill_path.stat().st_size if self.spill_path.exists() else 0,
+            "avg_flush_ms": self.metrics["total_flush_ms"] / flush_count if flush_count else 0.0,
+        }
+
+
+class AudioDataWriter(BatchWriter):
+    """AudioData 落库时在同一事务内累加统计小时汇总，二者始终一致（包括溢写回放）"""
+
+    async def _bulk_create(self, batch: list):
+        from core.stats_rollup import upsert_rollup, question_hash
+        model = self.model
+        for record in batch:
+            record.setdefault("question_hash", question_hash(record.get("user_question")))
+        async with in_transaction() as conn:
+            await model.bulk_create([model(**record) for record in batch], using_db=conn)
+            await upsert_rollup(conn, batch)
+
+
+def _create_writer(model_name: str, writer_class=BatchWriter) -> BatchWriter:
+    return writer_class(
+        model_name,
+        batch_size=settings.write_behind_batch_size,
+        flush_interval=settings.write_behind_flush_interval,
+        max_queue=settings.write_behind_max_queue,
+    )
+
+
+audio_data_writer = _create_writer("AudioData", AudioDataWriter)
+operation_log_writer = _create_writer("OperationLog")
+
+WRITERS = [audio_data_writer, operation_log_writer]
+
+
+def start_writers():
+    for writer in WRITERS:
+        writer.start()
+
+
+async def stop_writers():
+    for writer in WRITERS:
+        try:
+            await writer.stop()
+        except Exception as e:
+            logger.error(f"{writer.model_name} 队列排空失败: {e}")
+
+
+def writers_snapshot() -> dict:
+    return {writer.model_name: writer.snapshot() for writer in WRITERS}
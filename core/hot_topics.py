@@ -0,0 +1,187 @@
+import asyncio
+import math
+import time
+from datetime import datetime, timedelta
+from core.logger import logger
+from core.redis_client import redis_client
+from settings.config import settings, GREETING_LIST
+from utils.redis_tools import normalize_question
+
+# 每小时一个有序集合：member 为规范化后的问题，score 为次数
+BUCKET_KEY = "hot:q:{hour}"
+# 前向衰减的全局热度：越新的提问增量越大，等价于旧提问按半衰期衰减
+DECAY_KEY = "hot:q:decay"
+DECAY_EPOCH_KEY = "hot:q:decay:epoch"
+# 时间窗口合并结果的短期缓存
+WINDOW_KEY = "hot:q:window:{hours}"
+WINDOW_CACHE_SECONDS = 60
+# 前向衰减的指数超过该值时整体缩放，避免 score 溢出
+_RESCALE_EXPONENT = 50
+
+# 基准与进程内缓存一致时累加并裁剪，否则不写入并返回当前基准（基准缺失时以调用方的为准）
+_INCREMENT_SCRIPT = """
+local epoch = redis.call('GET', KEYS[2])
+if not epoch then
+    redis.call('SET', KEYS[2], ARGV[1])
+elseif epoch ~= ARGV[1] then
+    return epoch
+end
+redis.call('ZINCRBY', KEYS[1], ARGV[2], ARGV[3])
+redis.call('ZREMRANGEBYRANK', KEYS[1], 0, -tonumber(ARGV[4]) - 1)
+return false
+"""
+
+# 把衰减基准移到当前时刻（所有 score 乘以 e^-exponent），基准已被其他 worker 移动时不做处理；返回当前基准
+_RESCALE_SCRIPT = """
+local epoch = redis.call('GET', KEYS[2])
+if epoch and epoch ~= ARGV[1] then
+    return epoch
+end
+redis.call('ZUNIONSTORE', KEYS[1], 1, KEYS[1], 'WEIGHTS', ARGV[2])
+redis.call('SET', KEYS[2], ARGV[3])
+return ARGV[3]
+"""
+
+
+def _hour_key(value: datetime) -> str:
+    return BUCKET_KEY.format(hour=value.strftime("%Y%m%d%H"))
+
+
+class HotTopics:
+    """
+    热门问题 Top-K（Redis 有序集合，所有 worker 共享）
+    - record(): 每轮对话一次，写入当前小时桶与全局衰减集合，桶内只保留 hot_topics_bucket_size 个成员
+    - top(n, window_hours): 窗口内各小时桶合并后缓存 60 秒，读取为 O(log N + n)
+    - trending(n): 按半衰期衰减后的热度排名
+    """
+
+    def __init__(self):
+        # 衰减基准缓存在进程内；写入由脚本校验基准，其他 worker 缩放后返回新基准
+        self._epoch = None
+        self._increment_script = redis_client.register_script(_INCREMENT_SCRIPT)
+        self._rescale_script = redis_client.register_script(_RESCALE_SCRIPT)
+
+    def record(self, question: str):
+        topic = normalize_question(question)
+        if not topic or topic in GREETING_LIST or len(topic) > settings.hot_topics_max_length:
+            return
+        asyncio.create_task(self._record(topic))
+
+    @staticmethod
+    def _exponent(epoch: str) -> float:
+        return (time.time() - float(epoch)) / (settings.hot_topics_half_life_hours * 3600) * math.log(2)
+
+    async def _current_epoch(self) -> str:
+        if self._epoch is None:
+            await redis_client.set(DECAY_EPOCH_KEY, int(time.time()), nx=True)
+            self._epoch = await redis_client.get(DECAY_EPOCH_KEY)
+        exponent = self._exponent(self._epoch)
+        if exponent > _RESCALE_EXPONENT:
+            # 多个 worker 同时缩放时只有基准仍为 self._epoch 的那次生效
+            self._epoch = await self._rescale_script(
+                keys=[DECAY_KEY, DECAY_EPOCH_KEY], args=[self._epoch, math.exp(-exponent), int(time.time())]
+            )
+        return self._epoch
+
+    async def _record(self, topic: str):
+        try:
+            bucket = _hour_key(datetime.now())
+            epoch = await self._current_epoch()
+            async with redis_client.pipeline(transaction=False) as pipe:
+                pipe.zincrby(bucket, 1, topic)
+                pipe.zremrangebyrank(bucket, 0, -settings.hot_topics_bucket_size - 1)
+                pipe.expire(bucket, int(timedelta(days=settings.hot_topics_retention_days).total_seconds()))
+                await self._increment_script(
+                    keys=[DECAY_KEY, DECAY_EPOCH_KEY],
+                    args=[epoch, math.exp(self._exponent(epoch)), topic, settings.hot_topics_bucket_size],
+                    client=pipe,
+                )
+                *_, current = await pipe.execute()
+            if current is not None:
+                # 基准已被其他 worker 缩放：按新基准重新计算增量
+                self._epoch = current
+                await self._increment_script(
+                    keys=[DECAY_KEY, DECAY_EPOCH_KEY],
+                    args=[current, math.exp(self._exponent(current)), topic, settings.hot_topics_bucket_size],
+                )
+        except Exception as e:
+            logger.warning(f"记录热门问题失败: {e}")
+
+    async def top(self, n: int = 5, window_hours: int = 24) -> list:
+        """最近 window_hours 小时内被问最多的 n 个问题"""
+        window_hours = max(1, min(window_hours, settings.hot_topics_retention_days * 24))
+        window_key = WINDOW_KEY.format(hours=window_hours)
+        if not await redis_client.exists(window_key):
+            now = datetime.now()
+            buckets = [_hour_key(now - timedelta(hours=i)) for i in range(window_hours)]
+            async with redis_client.pipeline(transaction=True) as pipe:
+                pipe.zunionstore(window_key, buckets)
+                pipe.expire(window_key, WINDOW_CACHE_SECONDS)
+                await pipe.execute()
+        rows = await redis_client.zrevrange(window_key, 0, n - 1, withscores=True)
+        return [{"name": topic, "value": int(score)} for topic, score in rows]
+
+    async def trending(self, n: int = 5) -> list:
+        """按衰减后的热度排名，score 换算为当前时刻的等效次数"""
+        async with redis_client.pipeline(transaction=True) as pipe:
+            pipe.zrevrange(DECAY_KEY, 0, n - 1, withscores=True)
+            pipe.get(DECAY_EPOCH_KEY)
+            rows, epoch = await pipe.execute()
+        if not rows or epoch is None:
+            return []
+        self._epoch = epoch
+        current = math.exp(self._exponent(epoch))
+        return [{"name": topic, "value": round(score / current, 2)} for topic, score in rows]
+
+
+hot_topics = HotTopics()
+
+
+class HotTopicsWarmer:
+    """
+    把热门问题交给预缓存：热门问题与开场白建议问题一样使用共享缓存 key，
+    并按 hot_topics_warm_interval 为默认应用的男声 / 女声预生成回答
+    """
+
+    def __init__(self):
+        self._task = None
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def _run(self):
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.warning(f"热门问题预缓存失败: {e}")
+            await asyncio.sleep(settings.hot_topics_warm_interval)
+
+    async def refresh(self):
+        from utils.redis_tools import update_hot_questions
+        from utils.spider.init_opening_statement import cache_suggested_question
+
+        rows = await hot_topics.top(settings.hot_topics_warm_top, settings.hot_topics_warm_window_hours)
+        questions = [row["name"] for row in rows if row["value"] >= settings.hot_topics_warm_min_count]
+        update_hot_questions(questions)
+        # 所有 worker 都更新本地热门集合，预生成回答只需一个 worker 执行
+        if not questions or not await redis_client.set(
+            "hot:q:warm_lock", "1", nx=True, ex=int(settings.hot_topics_warm_interval)
+        ):
+            return
+        for question in questions:
+            for reference_id in ("man", "woman"):
+                await cache_suggested_question(settings.api_key, reference_id, question)
+        logger.info(f"🔥 热门问题预缓存检查完成: {questions}")
+
+
+hot_topics_warmer = HotTopicsWarmer()
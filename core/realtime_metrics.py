@@ -0,0 +1,149 @@
+import bisect
+import time
+from datetime import datetime, timedelta
+from core.logger import logger
+from core.redis_client import redis_client
+from settings.config import settings
+
+# 延迟直方图桶上限（毫秒），最后一个桶为 +Inf
+LATENCY_BUCKETS_MS = (50, 100, 200, 300, 500, 750, 1000, 1500, 2000, 3000, 5000, 10000)
+_INF = "+Inf"
+
+CHATS_DAY_KEY = "stats:chats:{day}"
+CHATS_HOUR_KEY = "stats:chats:hour:{day}:{hour}"
+ACTIVITY_KEY = "stats:activity:{bucket}"
+USERS_DAY_KEY = "stats:uv:day:{day}"
+USERS_HOUR_KEY = "stats:uv:hour:{day}:{hour}"
+DEVICES_DAY_KEY = "stats:dv:day:{day}"
+LATENCY_HOUR_KEY = "stats:latency:{day}:{hour}"
+# 在线用户：有序集合，score 为最后活跃时间，按滑动窗口统计
+ONLINE_KEY = "stats:online"
+
+DAY_TTL = 86400 * 8
+HOUR_TTL = 86400 * 2
+
+
+def _activity_bucket(hour: int) -> str:
+    if 9 <= hour <= 12:
+        return "morning"
+    if 14 <= hour <= 18:
+        return "afternoon"
+    if 19 <= hour <= 23:
+        return "evening"
+    return "other"
+
+
+def _latency_bucket(response_ms: float) -> str:
+    index = bisect.bisect_left(LATENCY_BUCKETS_MS, response_ms)
+    return str(LATENCY_BUCKETS_MS[index]) if index < len(LATENCY_BUCKETS_MS) else _INF
+
+
+class RealtimeMetrics:
+    """
+    实时计数（Redis，所有 worker 共享），每轮对话只发一次 pipeline
+    - 对话数：按天 / 小时计数，时段活跃度
+    - 独立用户 / 设备：按天、小时分桶的 HyperLogLog
+    - 在线用户：滑动窗口有序集合，窗口外的成员在写入时清理
+    - 响应延迟：按小时分桶的固定边界直方图（含 count / sum）
+    """
+
+    async def record_turn(self, *, user_id: str, device: str = "", response_ms: float = None):
+        now = datetime.now()
+        day, hour = now.strftime("%Y-%m-%d"), now.strftime("%H")
+        timestamp = time.time()
+        try:
+            async with redis_client.pipeline(transaction=False) as pipe:
+                chats_day = CHATS_DAY_KEY.format(day=day)
+                chats_hour = CHATS_HOUR_KEY.format(day=day, hour=hour)
+                pipe.incr(chats_day)
+                pipe.expire(chats_day, DAY_TTL)
+                pipe.incr(chats_hour)
+                pipe.expire(chats_hour, HOUR_TTL)
+                pipe.incr(ACTIVITY_KEY.format(bucket=_activity_bucket(now.hour)))
+
+                users_day = USERS_DAY_KEY.format(day=day)
+                users_hour = USERS_HOUR_KEY.format(day=day, hour=hour)
+                pipe.pfadd(users_day, user_id)
+                pipe.expire(users_day, DAY_TTL)
+                pipe.pfadd(users_hour, user_id)
+                pipe.expire(users_hour, HOUR_TTL)
+                if device:
+                    devices_day = DEVICES_DAY_KEY.format(day=day)
+                    pipe.pfadd(devices_day, device)
+                    pipe.expire(devices_day, DAY_TTL)
+
+                pipe.zadd(ONLINE_KEY, {user_id: timestamp})
+                pipe.zremrangebyscore(ONLINE_KEY, "-inf", timestamp - settings.online_window_seconds)
+
+                if response_ms is not None:
+                    latency = LATENCY_HOUR_KEY.format(day=day, hour=hour)
+                    pipe.hincrby(latency, _latency_bucket(response_ms), 1)
+                    pipe.hincrby(latency, "count", 1)
+                    pipe.hincrbyfloat(latency, "sum", round(response_ms, 3))
+                    pipe.expire(latency, DAY_TTL)
+                await pipe.execute()
+        except Exception as e:
+            logger.error(f"记录实时统计失败: {e}")
+
+    # ------------------------------ 读取 ------------------------------
+
+    async def online_users(self) -> int:
+        return await redis_client.zcount(ONLINE_KEY, time.time() - settings.online_window_seconds, "+inf")
+
+    async def unique_users(self, days: int = 1) -> int:
+        today = datetime.now().date()
+        keys = [USERS_DAY_KEY.format(day=(today - timedelta(days=i)).isoformat()) for i in range(days)]
+        return await redis_client.pfcount(*keys)
+
+    async def unique_devices(self, days: int = 1) -> int:
+        today = datetime.now().date()
+        keys = [DEVICES_DAY_KEY.format(day=(today - timedelta(days=i)).isoformat()) for i in range(days)]
+        return await redis_client.pfcount(*keys)
+
+    async def latency(self, hours: int = 1) -> dict:
+        """合并最近 hours 个小时桶的直方图，按桶内线性插值估算分位数"""
+        now = datetime.now()
+        async with redis_client.pipeline(transaction=False) as pipe:
+            for i in range(hours):
+                t = now - timedelta(hours=i)
+                pipe.hgetall(LATENCY_HOUR_KEY.format(day=t.strftime("%Y-%m-%d"), hour=t.strftime("%H")))
+            histograms = await pipe.execute()
+
+        buckets = {str(b): 0 for b in LATENCY_BUCKETS_MS}
+        buckets[_INF] = 0
+        count, total = 0, 0.0
+        for histogram in histograms:
+            for field, value in histogram.items():
+                if field == "count":
+                    count += int(value)
+                elif field == "sum":
+                    total += float(value)
+                elif field in buckets:
+                    buckets[field] += int(value)
+
+        return {
+            "count": count,
+            "avg_ms": round(total / count, 1) if count else 0,
+            "p50_ms": self._quantile(buckets, count, 0.5),
+            "p95_ms": self._quantile(buckets, count, 0.95),
+            "p99_ms": self._quantile(buckets, count, 0.99),
+            "buckets": buckets,
+        }
+
+    @staticmethod
+    def _quantile(buckets: dict, count: int, q: float):
+        if not count:
+            return 0
+        rank = q * count
+        seen, lower = 0, 0
+        for upper in LATENCY_BUCKETS_MS:
+            in_bucket = buckets[str(upper)]
+            if seen + in_bucket >= rank:
+                return round(lower + (upper - lower) * (rank - seen) / in_bucket, 1)
+            seen += in_bucket
+            lower = upper
+        # 落在 +Inf 桶中，只能给出下界
+        return LATENCY_BUCKETS_MS[-1]
+
+
+realtime_metrics = RealtimeMetrics()
@@ -0,0 +1,154 @@
+import asyncio
+import os
+import socket
+import time
+from collections import deque
+import orjson
+import psutil
+from core.logger import logger
+from core.redis_client import redis_client
+from settings.config import settings
+
+# 集群模式下各 worker 的最新样本（hash，field 为 worker 标识）与历史（list）
+LATEST_KEY = "stats:resources:latest"
+HISTORY_KEY = "stats:resources:history:{worker}"
+
+
+class ResourceSampler:
+    """
+    后台系统资源采样（每个 worker 一个）
+    - 按 resource_sample_interval 采集 CPU / 内存 / 磁盘 / GPU / 进程 RSS / 连接数 / 事件循环延迟
+    - 最近 resource_sample_history 个样本保存在内存环形缓冲中，仪表盘直接读取最新样本
+    - 开启 resource_sample_redis 时同时写入 Redis，供集群视图读取
+    """
+
+    def __init__(self):
+        self.worker = None
+        self.samples = deque(maxlen=settings.resource_sample_history)
+        self._process = None
+        self._gpu = None
+        self._task = None
+
+    def start(self):
+        if self._task is None or self._task.done():
+            # gunicorn 预加载时模块在 fork 前导入，进程信息在启动采样时再取
+            self.worker = f"{socket.gethostname()}:{os.getpid()}"
+            self._process = psutil.Process(os.getpid())
+            # 首次调用只建立 CPU 基线，之后的 cpu_percent(None) 返回两次调用之间的使用率
+            psutil.cpu_percent(interval=None)
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        interval = settings.resource_sample_interval
+        while True:
+            expected = loop.time() + interval
+            await asyncio.sleep(interval)
+            # 实际唤醒时间与预期的差值即事件循环延迟
+            loop_lag_ms = max(loop.time() - expected, 0) * 1000
+            try:
+                sample = await loop.run_in_executor(None, self._collect)
+            except Exception as e:
+                logger.warning(f"系统资源采样失败: {e}")
+                continue
+            sample["loop_lag_ms"] = round(loop_lag_ms, 1)
+            self.samples.append(sample)
+            if settings.resource_sample_redis:
+                await self._publish(sample)
+
+    def _gpu_percent(self) -> int:
+        # GPUtil 只导入一次，不可用时后续不再尝试
+        if self._gpu is False:
+            return 0
+        try:
+            if self._gpu is None:
+                import GPUtil
+                self._gpu = GPUtil
+            gpus = self._gpu.getGPUs()
+            return int(gpus[0].load * 100) if gpus else 0
+        except Exception:
+            self._gpu = False
+            return 0
+
+    def _collect(self) -> dict:
+        """同步采集（在线程池中执行，GPUtil 会调用 nvidia-smi 子进程）"""
+        try:
+            disk = psutil.disk_usage('C:' if os.name == 'nt' else '/')
+            disk_percent = disk.used / disk.total * 100
+        except Exception:
+            disk_percent = 0
+        process = self._process or psutil.Process(os.getpid())
+        try:
+            # psutil 6 起 connections 更名为 net_connections
+            net_connections = getattr(process, "net_connections", None) or process.connections
+            connections = len(net_connections(kind="inet"))
+        except Exception:
+            connections = 0
+        return {
+            "ts": int(time.time()),
+            "cpu": int(psutil.cpu_percent(interval=None)),
+            "memory": int(psutil.virtual_memory().percent),
+            "disk": int(disk_percent),
+            "gpu": self._gpu_percent(),
+            "rss_mb": round(process.memory_info().rss / 1024 / 1024, 1),
+            "connections": connections,
+        }
+
+    async def _publish(self, sample: dict):
+        payload = orjson.dumps({**sample, "worker": self.worker})
+        history_key = HISTORY_KEY.format(worker=self.worker)
+        ttl = int(settings.resource_sample_interval * settings.resource_sample_history)
+        try:
+            async with redis_client.pipeline(transaction=False) as pipe:
+                pipe.hset(LATEST_KEY, self.worker, payload)
+                pipe.lpush(history_key, payload)
+                pipe.ltrim(history_key, 0, settings.resource_sample_history - 1)
+                pipe.expire(history_key, ttl)
+                await pipe.execute()
+        except Exception as e:
+            logger.warning(f"系统资源样本写入Redis失败: {e}")
+
+    async def latest(self) -> dict:
+        """最新样本；采样任务尚未产出时即时采集一次（不阻塞事件循环）"""
+        if self.samples:
+            return self.samples[-1]
+        sample = await asyncio.get_running_loop().run_in_executor(None, self._collect)
+        sample["loop_lag_ms"] = 0.0
+        return sample
+
+    def history(self, since: int = 0) -> list:
+        return [sample for sample in self.samples if sample["ts"] >= since]
+
+    async def cluster_latest(self) -> list:
+        """各 worker 的最新样本，超过 3 个采样周期未更新的视为已退出"""
+        stale_before = time.time() - settings.resource_sample_interval * 3
+        latest = await redis_client.hgetall(LATEST_KEY)
+        samples, stale = [], []
+        for worker, payload in latest.items():
+            sample = orjson.loads(payload)
+            if sample["ts"] < stale_before:
+                stale.append(worker)
+            else:
+                samples.append(sample)
+        if stale:
+            await redis_client.hdel(LATEST_KEY, *stale)
+        return sorted(samples, key=lambda s: s["worker"])
+
+    async def cluster_history(self, since: int = 0) -> dict:
+        history = {}
+        for sample in await self.cluster_latest():
+            payloads = await redis_client.lrange(HISTORY_KEY.format(worker=sample["worker"]), 0, -1)
+            points = [orjson.loads(p) for p in reversed(payloads)]
+            history[sample["worker"]] = [p for p in points if p["ts"] >= since]
+        return history
+
+
+resource_sampler = ResourceSampler()
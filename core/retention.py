@@ -0,0 +1,213 @@
+import asyncio
+import gzip
+import os
+import time
+import zipfile
+from datetime import datetime, timedelta
+from pathlib import Path
+import orjson
+from tortoise import Tortoise
+from core.logger import logger
+from core.redis_client import redis_client
+from settings.config import settings, BASE_DIR, AUDIO_DIR, FAIL_DIR, GREETING_DIR
+
+# 各月份的归档汇总（hash，field 为 YYYY-MM），供统计接口读取
+ARCHIVE_MONTHS_KEY = "stats:archive:months"
+ARCHIVE_LOCK_KEY = "stats:archive:lock"
+
+ARCHIVE_COLUMNS = (
+    "id", "user_question", "question_hash", "ai_response_text", "audio_file_path",
+    "tts_started_at", "tts_completed_at", "created_at", "updated_at",
+)
+
+_SELECT_SQL = (
+    f"SELECT {', '.join(f'`{c}`' for c in ARCHIVE_COLUMNS)} FROM `audio_data` "
+    "WHERE `id` > %s AND `created_at` < %s ORDER BY `id` LIMIT %s"
+)
+
+
+def archive_dir() -> Path:
+    return Path(settings.retention_archive_dir) if settings.retention_archive_dir else BASE_DIR / "archive"
+
+
+def retention_cutoff() -> datetime:
+    """早于该时间（UTC，整点）的 audio_data 记录会被归档；按整点切分，已归档小时的汇总不再被重算"""
+    cutoff = datetime.utcnow() - timedelta(days=max(settings.retention_days, 1))
+    return cutoff.replace(minute=0, second=0, microsecond=0)
+
+
+def _audio_path(audio_file_path: str):
+    """记录中的音频路径（static/xxx）转为本地文件；问候语 / 失败提示等共享音频不归档"""
+    if not audio_file_path:
+        return None
+    path = (BASE_DIR / audio_file_path).resolve()
+    if AUDIO_DIR.resolve() not in path.parents:
+        return None
+    if GREETING_DIR.resolve() in path.parents or FAIL_DIR.resolve() in path.parents:
+        return None
+    return path
+
+
+def _write_rows(target: Path, rows: list) -> Path:
+    """
+    按列写入压缩文件：安装了 pyarrow 时为 Parquet（zstd），否则退化为 gzip 压缩的 JSON Lines
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        target = target.with_suffix(".jsonl.gz")
+        with gzip.open(target, "wb") as f:
+            for row in rows:
+                f.write(orjson.dumps(row) + b"\n")
+        return target
+
+    table = pa.Table.from_pydict({column: [row[column] for row in rows] for column in ARCHIVE_COLUMNS})
+    target = target.with_suffix(".parquet")
+    pq.write_table(table, target, compression="zstd")
+    return target
+
+
+def _write_batch(month: str, rows: list) -> dict:
+    """同步写入一批记录及其音频（在线程池中执行），返回写入统计"""
+    month_dir = archive_dir() / month
+    month_dir.mkdir(parents=True, exist_ok=True)
+    name = f"part-{rows[0]['id']}-{rows[-1]['id']}"
+    data_file = _write_rows(month_dir / name, rows)
+
+    files, size = 0, data_file.stat().st_size
+    audio_paths = [p for p in (_audio_path(row["audio_file_path"]) for row in rows) if p and p.is_file()]
+    if audio_paths:
+        # 音频本身已是压缩格式（opus / mp3）时再压缩收益很小，wav 仍可明显缩小
+        zip_path = month_dir / f"{name}.audio.zip"
+        with zipfile.ZipFile(zip_path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+            for path in audio_paths:
+                zf.write(path, arcname=path.relative_to(AUDIO_DIR.resolve()).as_posix())
+                files += 1
+        size += zip_path.stat().st_size
+    return {"rows": len(rows), "files": files, "bytes": size}
+
+
+def _remove_files(paths: list):
+    for path in paths:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"删除已归档音频失败: {path} {e}")
+
+
+class RetentionArchiver:
+    """
+    audio_data 冷数据归档（后台任务，Redis 锁保证同一时刻只有一个 worker 执行）
+    - 早于 retention_days 天的记录按 id 顺序分批读取，按月写入压缩列式文件，引用的音频打包到同目录
+    - 每批写完后按主键 DELETE ... WHERE id IN (...) 删除，批间暂停 retention_batch_pause 秒，不长时间持锁
+    - 仪表盘读取的小时汇总表不删除，已归档的对话仍计入统计；各月归档量记录在 Redis
+    """
+
+    def __init__(self):
+        self._task = None
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def _run(self):
+        while True:
+            try:
+                await self.archive()
+            except Exception as e:
+                logger.warning(f"音频数据归档失败: {e}")
+            await asyncio.sleep(settings.retention_interval)
+
+    async def archive(self) -> int:
+        lock_ttl = int(settings.retention_interval)
+        if not await redis_client.set(ARCHIVE_LOCK_KEY, "1", nx=True, ex=lock_ttl):
+            return 0
+        try:
+            archived = await self._archive_before(retention_cutoff())
+        finally:
+            await redis_client.delete(ARCHIVE_LOCK_KEY)
+        if archived:
+            logger.info(f"🗄️ 音频数据归档完成: {archived} 条")
+        return archived
+
+    async def _archive_before(self, cutoff: datetime) -> int:
+        conn = Tortoise.get_connection("default")
+        loop = asyncio.get_running_loop()
+        last_id, archived = 0, 0
+        while True:
+            rows = await conn.execute_query_dict(_SELECT_SQL, [last_id, cutoff, settings.retention_batch_size])
+            if not rows:
+                return archived
+            last_id = rows[-1]["id"]
+            await redis_client.expire(ARCHIVE_LOCK_KEY, int(settings.retention_interval))
+
+            months = {}
+            for row in rows:
+                months.setdefault(row["created_at"].strftime("%Y-%m"), []).append(row)
+            for month, month_rows in months.items():
+                written = await loop.run_in_executor(None, _write_batch, month, month_rows)
+                await self._record_month(month, written)
+
+            ids = [row["id"] for row in rows]
+            await conn.execute_query(
+                f"DELETE FROM `audio_data` WHERE `id` IN ({', '.join(['%s'] * len(ids))})", ids
+            )
+            await self._remove_unreferenced(conn, rows)
+            archived += len(rows)
+            await asyncio.sleep(settings.retention_batch_pause)
+
+    @staticmethod
+    async def _remove_unreferenced(conn, rows: list):
+        """删除已归档的音频文件；仍被未归档记录或未过期的 SSE / TTS 缓存引用的保留"""
+        from core.audio_store import PIN_KEY
+
+        file_paths = {row["audio_file_path"] for row in rows if _audio_path(row["audio_file_path"])}
+        if not file_paths:
+            return
+        referenced = await conn.execute_query_dict(
+            f"SELECT DISTINCT `audio_file_path` FROM `audio_data` "
+            f"WHERE `audio_file_path` IN ({', '.join(['%s'] * len(file_paths))})",
+            list(file_paths)
+        )
+        file_paths -= {row["audio_file_path"] for row in referenced}
+        if not file_paths:
+            return
+        # 与 AudioStore 一致：缓存引用登记的是相对 static 的文件名，score 为缓存过期时间
+        paths = {_audio_path(p): _audio_path(p).relative_to(AUDIO_DIR.resolve()).as_posix() for p in file_paths}
+        now = time.time()
+        pin_scores = await redis_client.zmscore(PIN_KEY, list(paths.values()))
+        paths = [path for (path, _), score in zip(paths.items(), pin_scores) if (score or 0) <= now]
+        await asyncio.get_running_loop().run_in_executor(None, _remove_files, paths)
+
+    @staticmethod
+    async def _record_month(month: str, written: dict):
+        try:
+            async with redis_client.pipeline(transaction=False) as pipe:
+                for field, value in written.items():
+                    pipe.hincrby(ARCHIVE_MONTHS_KEY, f"{month}:{field}", value)
+                await pipe.execute()
+        except Exception as e:
+            logger.warning(f"记录归档统计失败: {e}")
+
+
+retention_archiver = RetentionArchiver()
+
+
+async def archived_months() -> dict:
+    """各月份已归档的记录数 / 音频数 / 字节数"""
+    months = {}
+    for field, value in (await redis_client.hgetall(ARCHIVE_MONTHS_KEY)).items():
+        month, _, name = field.rpartition(":")
+        months.setdefault(month, {"rows": 0, "files": 0, "bytes": 0})[name] = int(value)
+    return months
@@ -18,7 +18,8 @@ from core.services.v2.llm_server_other import mixin_llm_server
 from core.redis_client import redis_client
 from settings.config import TEXT_LIST, settings
 from utils.llm_tools import get_tag_url, ollama_llm, is_real_image
-from utils.tools import normalize_text_numbers, greeting
+from utils.tools import greeting
+from utils.tts_normalizer import normalize_tts_text
 from utils.tts_tools import tts_servers
 from utils.translate_tools import translate
 from utils.zhiyun_translate import translate_youdao_async
@@ -286,9 +287,7 @@ async def chat_messages_streaming_new(*, request, text, **kwargs):
                                         translate_text = foobar_text
 
                                     # 文本清理和处理
-                                    text_clean = translate_text.translate(CLEANUP_TABLE).replace("-", " ")
-                                    if settings.numbers_to_chinese:
-                                        text_clean = normalize_text_numbers(text_clean)
+                                    text_clean = normalize_tts_text(translate_text, markdown=True)
 
                                     # TTS调用（符号+长度门槛）
                                     tts_url = None
@@ -305,7 +304,8 @@ async def chat_messages_streaming_new(*, request, text, **kwargs):
                                                     request=request, 
                                                     text=text_for_tts,
                                                     user_question=question,
-                                                    ai_response_text=translate_text
+                                                    ai_response_text=translate_text,
+                                                    normalized=True
                                                 ),
                                                 timeout=60.0
                                             )
@@ -361,9 +361,7 @@ async def chat_messages_streaming_new(*, request, text, **kwargs):
                             translate_text = foobar_text
 
                         # 文本清理和处理
-                        text_clean = translate_text.translate(CLEANUP_TABLE).replace("-", " ")
-                        if settings.numbers_to_chinese:
-                            text_clean = normalize_text_numbers(text_clean)
+                        text_clean = normalize_tts_text(translate_text, markdown=True)
 
                         # TTS调用（与流式一致：必须以指定符号结尾且长度达到阈值）
                         tts_url = None
@@ -379,7 +377,8 @@ async def chat_messages_streaming_new(*, request, text, **kwargs):
                                         request=request,
                                         text=text_for_tts,
                                         user_question=question,
-                                        ai_response_text=translate_text
+                                        ai_response_text=translate_text,
+                                        normalized=True
                                     ),
                                     timeout=20.0
                                 )
@@ -16,28 +16,81 @@ from core.decorators.async_tools import async_timer
 from core.redis_client import redis_client
 
 
+# 上传读取分块大小
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+STT_CONNECTION_TIMEOUT = aiohttp.ClientTimeout(total=30, connect=3)
+
+# STT 专用会话，复用连接池
+_stt_session = None
+
+async def get_stt_session():
+    global _stt_session
+    if _stt_session is None or _stt_session.closed:
+        _stt_session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=50, ttl_dns_cache=300, keepalive_timeout=60),
+            timeout=STT_CONNECTION_TIMEOUT
+        )
+    return _stt_session
+
+async def cleanup_stt_session():
+    global _stt_session
+    if _stt_session and not _stt_session.closed:
+        await _stt_session.close()
+    _stt_session = None
+
 # ------------------------------------------------------------------------------
 async def _audio_to_text_request(request, file_content, file_name, content_type):
+    """file_content 可以是 bytes / memoryview，直接作为 multipart 字段发送，不再复制"""
     start_time = time.time()
-    headers = headers = get_headers(request).copy()
+    headers = get_headers(request).copy()
     logger.debug(f"headers: {headers}")
     form = aiohttp.FormData()
     form.add_field("file", value=file_content, filename=file_name, content_type=content_type)
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                urls['audio-to-text'],
-                headers=headers,
-                data=form,
-            ) as response:
-                json_data = await response.json()
-                elapsed = time.time() - start_time
-                return json_data.get("text", "")
+        session = await get_stt_session()
+        async with session.post(
+            urls['audio-to-text'],
+            headers=headers,
+            data=form,
+        ) as response:
+            json_data = await response.json()
+            return json_data.get("text", "")
     except Exception as e:
         elapsed = time.time() - start_time
         logger.error(f"❌ STT服务器错误 {e}，耗时: {elapsed:.3f}秒")  # TODO 发邮件通知
         return ''
 
+async def read_upload(audio_file: UploadFile):
+    """
+    分块读取上传文件，边读边计算 sha256，超过大小限制立即中止
+    返回 (内容缓冲区, sha256)
+    """
+    size = getattr(audio_file, "size", None)
+    if size is not None and size > settings.max_file_size:
+        raise AudioExceptions(415, "最大支持15MB上传")
+
+    hasher = hashlib.sha256()
+    buffer = bytearray()
+    while True:
+        chunk = await audio_file.read(UPLOAD_CHUNK_SIZE)
+        if not chunk:
+            break
+        if len(buffer) + len(chunk) > settings.max_file_size:
+            raise AudioExceptions(415, "最大支持15MB上传")
+        hasher.update(chunk)
+        buffer += chunk
+    return buffer, hasher.hexdigest()
+
+def _archive_name(audio_sha256: str, file_name: str) -> str:
+    """按内容哈希归档，相同音频只保存一份"""
+    ext = file_name.rsplit(".", 1)[-1] if "." in file_name else "wav"
+    return f"{audio_sha256}.{ext}"
+
+def _log_task_error(task: asyncio.Task):
+    if not task.cancelled() and task.exception():
+        logger.error(f"❌ 音频文件保存失败: {task.exception()}")
+
 # @async_timer
 async def audio_to_text(request: Request, audio_file: UploadFile = File(...)):
     total_start_time = time.time()
@@ -47,43 +100,61 @@ async def audio_to_text(request: Request, audio_file: UploadFile = File(...)):
         logger.error("❌ 上传的音频格式不正确")
         raise AudioExceptions(400, "格式不正确 仅支持mp3, mp4, mpeg, mpga, m4a, wav, webm")
 
+    # 边读边算哈希（唯一标识）用于缓存
+    file_content, audio_sha256 = await read_upload(audio_file)
 
-    file_content = await audio_file.read()
-    
-    if len(file_content) > settings.max_file_size:
-        raise AudioExceptions(415, "最大支持15MB上传")
+    return await transcribe(
+        request=request,
+        file_content=file_content,
+        audio_sha256=audio_sha256,
+        file_name=file_name,
+        content_type=audio_file.content_type,
+        start_time=total_start_time
+    )
 
-    # 计算音频哈希值（唯一标识）用于缓存
-    audio_sha256 = hashlib.sha256(file_content).hexdigest()
+async def transcribe(*, request, file_content, audio_sha256, file_name, content_type, start_time=None):
+    """查缓存 -> 调用STT -> 后台归档 + 写缓存"""
+    start_time = start_time or time.time()
 
-    # 检查缓存是否存在
+    # 单次 GET 判断缓存（空字符串也是有效缓存）
     cache_key = f"stt:{audio_sha256}"
-    is_cached = await redis_client.exists(cache_key)
-    
-    if is_cached:
-        cached_text = await redis_client.get(cache_key)
-        logger.info(f"🎯 命中STT缓存(哈希: {audio_sha256[:10]})，总耗时: {time.time() - total_start_time:.3f}秒")
+    cached_text = await redis_client.get(cache_key)
+    if cached_text is not None:
+        logger.info(f"🎯 命中STT缓存(哈希: {audio_sha256[:10]})，总耗时: {time.time() - start_time:.3f}秒")
         return cached_text
 
-    # 无缓存时调用STT获取文本内容 发起请求获取结果
+    # 归档原始上传内容（与缓存 key 的哈希对应），不归档 VAD 裁剪后的音频
+    archive_name, archive_content = _archive_name(audio_sha256, file_name), file_content
+
+    # VAD：纯静音 / 噪声直接返回空文本，有语音时只上传语音区间
+    if settings.stt_vad_enable:
+        from utils.vad import trim_silence
+        try:
+            loop = asyncio.get_running_loop()
+            vad_content, vad_file_name = await loop.run_in_executor(None, trim_silence, memoryview(file_content), file_name)
+        except Exception as e:
+            logger.warning(f"VAD 处理失败，上传原始音频: {e}")
+        else:
+            if vad_content is None:
+                asyncio.create_task(redis_client.set(name=cache_key, value="", ex=settings.cache_expiry))
+                return ''
+            if vad_file_name != file_name:
+                content_type = "audio/wav"
+            file_content, file_name = vad_content, vad_file_name
+
+    # 无缓存时调用STT获取文本内容，缓冲区以 memoryview 形式发送，不额外复制
     text = await _audio_to_text_request(
         request=request,
-        file_content=file_content,
+        file_content=memoryview(file_content),
         file_name=file_name,
-        content_type=audio_file.content_type
+        content_type=content_type
     )
     # 处理STT结果
     if text:
-        
-        # 并行处理：同时保存文件和发送STT请求
-        save_file_task = asyncio.create_task(save_audio_file(file_name, file_content))
-        
-        # 等待保存任务完成
-        try:
-            await save_file_task
-            logger.debug("📁 音频文件保存完成")
-        except Exception as e:
-            logger.error(f"❌ 音频文件保存失败: {e}")
+        # 后台归档音频文件，不阻塞返回
+        save_file_task = asyncio.create_task(save_audio_file(archive_name, archive_content))
+        save_file_task.add_done_callback(_log_task_error)
+
         text = text.strip("？?。.>")
         logger.info(f"💾 新增STT缓存(哈希: {audio_sha256[:10]})")
         asyncio.create_task(redis_client.set(
@@ -99,40 +170,137 @@ async def audio_to_text(request: Request, audio_file: UploadFile = File(...)):
 # ------------------------------------------------------------------------------
 
 
-# websocket tts接口
-async def audio_to_text_ws(file_content: bytes):
-    audio_sha256 = hashlib.sha256(file_content).hexdigest()
+# websocket 接口：整段语音已在内存中
+async def audio_to_text_ws(*, request, file_content: bytes, file_name: str = "ws.wav", content_type: str = None):
+    return await transcribe(
+        request=request,
+        file_content=file_content,
+        audio_sha256=hashlib.sha256(file_content).hexdigest(),
+        file_name=file_name,
+        content_type=content_type
+    )
 
-    if await redis_client.exists(f"stt:{audio_sha256}"):
-        return await redis_client.get(f"stt:{audio_sha256}")
-    
-    # 保存临时文件 （根据实际需求调整）
-    file_name = get_file_name()
-    async with aiofiles.open(AUDIO_DIR / file_name, "wb") as f:
-        await f.write(file_content)
-    
-    text = await _audio_to_text_request_ws(file_content, file_name)
+# ------------------------------------------------------------------------------
 
-    await redis_client.setex(
-        name=f"stt:{audio_sha256}",
-        value=text,
-        ex=settings.cache_expiry # 秒
 
-    )
-    return text
+class STTStream:
+    """
+    流式 STT：用户说话的同时把音频分块转发给上游（STT_STREAM_URL，WebSocket），
+    上游识别出的中间结果通过 on_partial 回调推给客户端，说完后只需等待最终结果。
+    上游协议：
+      -> {"type": "start", "format": "wav"} / 二进制音频帧 / {"type": "end"}
+      <- {"type": "partial", "text": "..."} / {"type": "final", "text": "..."}
+    上游不可用或出错时回退到整段识别（transcribe），音频始终在本地缓冲一份。
+    """
+
+    def __init__(self, request, file_name: str = "ws.wav", content_type: str = None, on_partial=None):
+        self.request = request
+        self.file_name = file_name
+        self.content_type = content_type
+        self.on_partial = on_partial
+        self.buffer = bytearray()
+        self.partial_text = ""
+        self._hasher = hashlib.sha256()
+        self._ws = None
+        self._reader = None
+        self._final = asyncio.get_running_loop().create_future()
+
+    async def open(self):
+        try:
+            session = await get_stt_session()
+            self._ws = await session.ws_connect(
+                settings.stt_stream_url,
+                headers=get_headers(self.request),
+                heartbeat=20
+            )
+            await self._ws.send_json({"type": "start", "format": self.file_name.rsplit(".", 1)[-1]})
+        except Exception as e:
+            logger.warning(f"流式STT连接失败，将回退整段识别: {e}")
+            self._fail(e)
+            return
+        self._reader = asyncio.create_task(self._read())
+
+    async def feed(self, chunk: bytes):
+        self._hasher.update(chunk)
+        self.buffer += chunk
+        if self._ws is None or self._final.done():
+            return
+        try:
+            await self._ws.send_bytes(chunk)
+        except Exception as e:
+            logger.warning(f"流式STT发送失败: {e}")
+            self._fail(e)
+
+    async def finish(self) -> str:
+        """音频结束：等待上游最终结果，失败时用缓冲的整段音频回退"""
+        start_time = time.time()
+        audio_sha256 = self._hasher.hexdigest()
+        text = None
+        try:
+            if self._ws is not None and not self._final.done():
+                await self._ws.send_json({"type": "end"})
+            text = await asyncio.wait_for(asyncio.shield(self._final), timeout=settings.stt_stream_final_timeout)
+        except Exception as e:
+            logger.warning(f"流式STT未返回最终结果，回退整段识别: {e}")
+        finally:
+            await self.close()
+
+        if text is None:
+            return await transcribe(
+                request=self.request,
+                file_content=self.buffer,
+                audio_sha256=audio_sha256,
+                file_name=self.file_name,
+                content_type=self.content_type,
+                start_time=start_time
+            )
+
+        text = text.strip("？?。.>")
+        logger.info(f"🎙️ 流式STT最终结果，说完后等待 {time.time() - start_time:.3f}秒: {text}")
+        if text:
+            save_file_task = asyncio.create_task(save_audio_file(_archive_name(audio_sha256, self.file_name), self.buffer))
+            save_file_task.add_done_callback(_log_task_error)
+        asyncio.create_task(redis_client.set(name=f"stt:{audio_sha256}", value=text, ex=settings.cache_expiry))
+        return text
+
+    async def close(self):
+        if self._reader is not None and not self._reader.done():
+            self._reader.cancel()
+        if self._ws is not None and not self._ws.closed:
+            await self._ws.close()
+        if not self._final.done():
+            self._final.cancel()
+
+    async def _read(self):
+        try:
+            async for msg in self._ws:
+                if msg.type != aiohttp.WSMsgType.TEXT:
+                    continue
+                data = msg.json()
+                if data.get("type") == "partial":
+                    text = data.get("text", "")
+                    if text and text != self.partial_text:
+                        self.partial_text = text
+                        if self.on_partial is not None:
+                            await self.on_partial(text)
+                elif data.get("type") == "final":
+                    if not self._final.done():
+                        self._final.set_result(data.get("text", ""))
+                    return
+            self._fail(ConnectionError("上游STT连接已关闭"))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"流式STT接收失败: {e}")
+            self._fail(e)
+
+    def _fail(self, error: Exception):
+        if not self._final.done():
+            self._final.set_exception(error)
+            # 由 finish 统一处理，避免 "exception was never retrieved"
+            self._final.exception()
 
 
-async def _audio_to_text_request_ws(file_content, file_name):
-    # 这里保持原有逻辑 但需要调整为适合websocket的调用方式
-    form = aiohttp.FormData()
-    form.add_field("file", file_content, filename=file_name)
-    async with aiohttp.clientsession() as session:
-        async with session.post(
-            urls['audio-to-text'],
-            data=form,
-        ) as response:
-            return await response.json().get("text", "")
-        
 # 辅助函数：保存音频文件
 async def save_audio_file(file_name, file_content):
     async with aiofiles.open(AUDIO_DIR / file_name, "wb") as f:
@@ -13,10 +13,12 @@ from io import BytesIO
 from settings.config import AUDIO_DIR
 
 from core.dependencies import urls
+from core.tts_pool import tts_pool, TTSUnavailable
 from settings.config import settings
 from core.logger import logger
 from core.decorators.async_tools import async_timer
 from core.redis_client import redis_client
+from core.audio_store import audio_store
 import functools
 
 # 连接超时配置
@@ -70,23 +72,42 @@ async def cleanup_tts_session():
 # 建立局部线程池（最多并发 8 个音频处理任务）
 TTS_THREAD_POOL = concurrent.futures.ThreadPoolExecutor(max_workers=8)
 
-async def save_audio_to_db(kwargs, text, file_name, tts_start_time):
-    """异步保存音频数据到数据库，不阻塞主流程"""
+async def encode_output(wav_path: Path, audio_format) -> Path:
+    """已生成的 wav 按协商格式在音频线程池中转码，失败时保留 wav"""
+    from utils.audio_format import transcode_file
+
+    if not audio_format or audio_format == "wav":
+        return wav_path
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(TTS_THREAD_POOL, transcode_file, wav_path, audio_format)
+    except Exception as e:
+        logger.warning(f"音频转码失败，返回 wav: {e}")
+        return wav_path
+
+def save_audio_to_db(kwargs, text, file_name, tts_start_time):
+    """音频数据交给写后队列批量落库，不阻塞主流程；推测执行的回答在提交后才落库"""
+    # 问候语池等非对话音频（save_to_db=False）不记录
+    if kwargs.get("save_to_db") is False:
+        return
     try:
-        from api_versions.v2.models import AudioData
+        from core.batch_writer import audio_data_writer
+        from core.speculative_llm import defer_until_commit
         from datetime import datetime
         
         user_question = kwargs.get('user_question', text[:100] + '...' if len(text) > 100 else text)
         ai_response_text = kwargs.get('ai_response_text', text)
         tts_started_at = kwargs.get('tts_started_at', tts_start_time)
         
-        await AudioData.create(
+        record = dict(
             user_question=user_question,
             ai_response_text=ai_response_text,
             audio_file_path=f"static/{file_name}",
             tts_started_at=tts_started_at,
             tts_completed_at=datetime.now()
         )
+        if not defer_until_commit(lambda: audio_data_writer.submit(**record)):
+            audio_data_writer.submit(**record)
     except Exception as e:
         logger.warning(f"保存音频数据到数据库失败: {e}")
 
@@ -121,8 +142,7 @@ async def text_to_audio_old(*, request, text, **kwargs):
     logger.debug(f"{__name__} data: {data}")
 
     session = await get_tts_session()
-    async with session.post(url=urls['text-to-audio'], json=data) as resp:
-        audio_bytes = await resp.read()
+    audio_bytes = await tts_pool.synthesize(session, data)
 
     loop = asyncio.get_event_loop()
 
@@ -157,39 +177,33 @@ async def text_to_audio_old(*, request, text, **kwargs):
     # await redis_client.setex(cache_key, settings.cache_expiry, str(url))
 
     # 自动保存音频数据到数据库
-    try:
-        from api_versions.v2.models import AudioData
-        from datetime import datetime
-        
-        # 从请求状态或kwargs中获取用户问题和AI回复
-        user_question = kwargs.get('user_question', text[:100] + '...' if len(text) > 100 else text)
-        ai_response_text = kwargs.get('ai_response_text', text)
-        tts_started_at = kwargs.get('tts_started_at', datetime.now())
-        
-        await AudioData.create(
-            user_question=user_question,
-            ai_response_text=ai_response_text,
-            audio_file_path=f"static/{file_name}",
-            tts_started_at=tts_started_at,
-            tts_completed_at=datetime.now()
-        )
-        # logger.info(f"音频数据已保存到数据库: {file_name}")
-    except Exception as e:
-        logger.warning(f"保存音频数据到数据库失败: {e}")
+    save_audio_to_db(kwargs, text, file_name, tts_start_time)
 
     return str(url)
 
 async def text_to_audio_(*, request, text, **kwargs):
+    from utils.tts_normalizer import normalize_tts_text
+
+    # 与 tts_servers 一致：调用方已规范化的文本（normalized=True）不再处理，避免二次规范化
+    if not kwargs.pop("normalized", False):
+        text = normalize_tts_text(text)
     # 生成缓存key
     reference_id = kwargs.get('reference_id') or request.state.reference_id
     tts_speed = request.state.tts_speed or settings.local_tts_speed
-    cache_key = f"tts_cache:{hashlib.md5(f'{text}_{reference_id}_{tts_speed}'.encode()).hexdigest()}"
+    if not kwargs.get('audio_format'):
+        from utils.audio_format import resolve_audio_format
+        kwargs['audio_format'] = await resolve_audio_format(request)
+    audio_format = kwargs['audio_format']
+    # wav 保持原有 key，已有缓存继续有效
+    cache_text = f'{text}_{reference_id}_{tts_speed}' if audio_format == "wav" else f'{text}_{reference_id}_{tts_speed}_{audio_format}'
+    cache_key = f"tts_cache:{hashlib.md5(cache_text.encode()).hexdigest()}"
     
     # 检查缓存
     try:
         cached_result = await redis_client.get(cache_key)
         if cached_result:
             logger.debug(f"TTS缓存命中: {cache_key}")
+            audio_store.touch(cached_result)
             return {"url": cached_result}
     except Exception as e:
         logger.warning(f"读取TTS缓存失败: {e}")
@@ -203,6 +217,7 @@ async def text_to_audio_(*, request, text, **kwargs):
         # 存储到缓存
         try:
             await redis_client.setex(cache_key, settings.cache_expiry, str(url))
+            await audio_store.pin_now(str(url))
             logger.debug(f"TTS结果已缓存: {cache_key}")
         except Exception as e:
             logger.warning(f"存储TTS缓存失败: {e}")
@@ -254,11 +269,12 @@ async def text_to_audio_aliyun(*, request, text, voice="longxiaochun", **kwargs)
     file_name = f"{get_file_name()}.wav"
     async with aiofiles.open(AUDIO_DIR / file_name, 'wb') as f:
         await f.write(buffer.read())
-        url = request.url_for("audio_files", path=file_name)
-        # 删除临时文件
-        import os
-        os.unlink(temp_file_path)
-        return str(url)
+    # 删除临时文件
+    import os
+    os.unlink(temp_file_path)
+    audio_path = await encode_output(AUDIO_DIR / file_name, kwargs.get('audio_format'))
+    url = request.url_for("audio_files", path=audio_path.name)
+    return str(url)
 
 async def text_to_audio_qwen(*, request, text, **kwargs):
     """
@@ -304,19 +320,15 @@ async def text_to_audio_qwen(*, request, text, **kwargs):
     #     print(f"下载失败：{str(e)}")
 
 async def text_to_audio_ffmpeg_speed(*, request, text, **kwargs):
-    from utils.tools import get_file_name, remove_emojis
+    from utils.tools import get_file_name
+    from utils.audio_format import audio_ext, encoder_args, normalize_audio_format
     from datetime import datetime
     import time
 
     # 总计时开始
     total_start_time = time.time()
     
-    text = await remove_emojis(text)
-    if len(text) < 1:
-        return None
-    
-    text = " ".join(text.split())
-    text = text.replace("成人", "晨人")
+    # emoji / 空白 / 发音替换已在 normalize_tts_text 中统一处理
     # 二次判空：去除空白后为空则直接跳过，避免空音频进入后续流程
     if not text:
         logger.warning("TTS文本清理后为空，已跳过本次生成")
@@ -329,6 +341,7 @@ async def text_to_audio_ffmpeg_speed(*, request, text, **kwargs):
 
     reference_id = kwargs.get('reference_id') or request.state.reference_id
     prosody_speed = request.state.tts_speed or settings.local_tts_speed  # 默认语速倍速
+    audio_format = normalize_audio_format(kwargs.get('audio_format')) or "wav"
 
     data = {
         "text": text,
@@ -346,10 +359,13 @@ async def text_to_audio_ffmpeg_speed(*, request, text, **kwargs):
     api_start_time = time.time()
     logger.info(f"🎙️ 开始调用TTS API，文本长度: {len(text)}，语速: {prosody_speed}x")
 
-    # 请求 TTS 接口 - 使用专用会话优化
+    # 请求 TTS 接口 - 使用专用会话，多节点负载均衡 + 对冲
     session = await get_tts_session()
-    async with session.post(url=urls['text-to-audio'], json=data) as resp:
-        audio_bytes = await resp.read()
+    try:
+        audio_bytes = await tts_pool.synthesize(session, data)
+    except TTSUnavailable as e:
+        logger.error(f"TTS API 调用失败: {e}")
+        return None
     # 校验TTS API返回音频有效性，避免空输入导致FFmpeg无输出文件
     if not audio_bytes or len(audio_bytes) == 0:
         logger.warning("TTS API 返回空音频数据，已跳过本次生成")
@@ -375,18 +391,15 @@ async def text_to_audio_ffmpeg_speed(*, request, text, **kwargs):
             temp_input.write(audio_bytes)
             input_path = Path(temp_input.name)
 
-        output_path = input_path.with_name(input_path.stem + "_fast.wav")
+        output_path = input_path.with_name(input_path.stem + "_fast" + audio_ext(audio_format))
 
-        # FFmpeg 命令：变速、转采样、单声道，优化参数
+        # FFmpeg 命令：变速、转采样、单声道，并在同一次处理中编码为目标格式
         cmd = [
             "ffmpeg", "-y",
             "-loglevel", "quiet",
             "-i", str(input_path),
             "-filter:a", f"atempo={prosody_speed}",
-            "-ar", "16000",
-            "-ac", "1",
-            "-f", "wav",  # 明确指定格式
-            "-acodec", "pcm_s16le",  # 明确指定编解码器
+            *encoder_args(audio_format),
             str(output_path)
         ]
 
@@ -412,7 +425,7 @@ async def text_to_audio_ffmpeg_speed(*, request, text, **kwargs):
         buffer = BytesIO(output_path.read_bytes())
 
         # 保存最终音频到本地
-        file_name = f"{get_file_name()}.wav"
+        file_name = f"{get_file_name()}{audio_ext(audio_format)}"
         async with aiofiles.open(AUDIO_DIR / file_name, "wb") as f:
             await f.write(buffer.read())
 
@@ -427,8 +440,8 @@ async def text_to_audio_ffmpeg_speed(*, request, text, **kwargs):
 
         url = request.url_for("audio_files", path=file_name)
         
-        # 数据库保存（异步，不阻塞返回）
-        asyncio.create_task(save_audio_to_db(kwargs, text, file_name, tts_start_time))
+        # 数据库保存（写后队列，不阻塞返回）
+        save_audio_to_db(kwargs, text, file_name, tts_start_time)
         
         total_elapsed = time.time() - total_start_time
         logger.info(f"🎵 TTS总耗时: {total_elapsed:.2f}秒 (API: {api_elapsed:.2f}s, FFmpeg: {ffmpeg_elapsed:.2f}s, I/O: {io_elapsed:.2f}s)")
@@ -510,26 +523,11 @@ async def text_to_audio_edge(*, request, text: str, **kwargs):
         logger.error(f"Edge TTS失败: {e}, 文本: {clean_text[:50]}...")
         return None
 
+    audio_path = await encode_output(wav_path, kwargs.get('audio_format'))
+
     # 自动保存音频数据到数据库
-    try:
-        from api_versions.v2.models import AudioData
-        from datetime import datetime
-        
-        user_question = kwargs.get('user_question', text[:100] + '...' if len(text) > 100 else text)
-        ai_response_text = kwargs.get('ai_response_text', text)
-        tts_started_at = kwargs.get('tts_started_at', datetime.now())
-        
-        await AudioData.create(
-            user_question=user_question,
-            ai_response_text=ai_response_text,
-            audio_file_path=f"static/{wav_path.name}",
-            tts_started_at=tts_started_at,
-            tts_completed_at=datetime.now()
-        )
-        # logger.info(f"音频数据已保存到数据库: {wav_path.name}")
-    except Exception as e:
-        logger.warning(f"保存音频数据到数据库失败: {e}")
+    save_audio_to_db(kwargs, text, audio_path.name, tts_start_time)
 
     # 返回URL
-    return str(request.url_for("audio_files", path=wav_path.name))
+    return str(request.url_for("audio_files", path=audio_path.name))
 
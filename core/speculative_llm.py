@@ -0,0 +1,196 @@
+import asyncio
+import contextvars
+import re
+import time
+from core.logger import logger
+from settings.config import settings
+
+_DONE = object()
+_PUNCTUATION_PATTERN = re.compile(r"[\W_]+")
+
+
+def normalize_transcript(text: str) -> str:
+    """比较中间结果与最终结果时忽略标点、空白和大小写"""
+    return _PUNCTUATION_PATTERN.sub("", text or "").lower()
+
+
+class SpeculativeStats:
+    """推测执行计数（当前 worker），用于评估是否值得开启"""
+
+    def __init__(self):
+        self.started = 0
+        self.committed = 0
+        self.cancelled = 0
+        # 命中时 LLM 提前于最终识别结果开始的时间
+        self.saved_ms = 0.0
+        # 被取消的推测请求已占用的上游时间
+        self.wasted_ms = 0.0
+
+    def snapshot(self) -> dict:
+        return {
+            "enabled": settings.llm_speculative_enable,
+            "stable_ms": settings.llm_speculative_stable_ms,
+            "started": self.started,
+            "committed": self.committed,
+            "cancelled": self.cancelled,
+            "hit_rate": round(self.committed / self.started, 3) if self.started else None,
+            "saved_ms": round(self.saved_ms, 1),
+            "wasted_ms": round(self.wasted_ms, 1),
+        }
+
+
+speculative_stats = SpeculativeStats()
+
+
+class _Deferred(list):
+    committed = False
+
+
+# 推测执行中的副作用（共享 SSE 缓存写入、AudioData 落库）先登记，提交后才执行，作废时丢弃
+_deferred = contextvars.ContextVar("speculative_deferred", default=None)
+
+
+def defer_until_commit(action) -> bool:
+    """
+    推测执行的流中调用：登记 action（无参可调用对象，可返回协程）并返回 True；
+    不在推测执行中或已提交时返回 False，由调用方立即执行
+    """
+    pending = _deferred.get()
+    if pending is None or pending.committed:
+        return False
+    pending.append(action)
+    return True
+
+
+async def _run_deferred(action):
+    try:
+        result = action()
+        if asyncio.iscoroutine(result):
+            await result
+    except Exception as e:
+        logger.warning(f"推测执行提交后的操作失败: {e}")
+
+
+class SpeculativeRun:
+    """对一条中间识别结果提前发起的 LLM 流，输出先缓冲，确认后再交给客户端"""
+
+    def __init__(self, text: str, stream_factory):
+        self.text = text
+        self.key = normalize_transcript(text)
+        self.started_at = time.monotonic()
+        self.finished_at = None
+        self._queue = asyncio.Queue()
+        self._deferred = _Deferred()
+        self._task = asyncio.create_task(self._produce(stream_factory(text)))
+
+    async def _produce(self, stream):
+        # 任务有独立的上下文，流中（含其创建的子任务）登记的副作用都记在本次推测上
+        _deferred.set(self._deferred)
+        try:
+            async for chunk in stream:
+                await self._queue.put(chunk)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            await self._queue.put(e)
+        finally:
+            self.finished_at = time.monotonic()
+            self._queue.put_nowait(_DONE)
+
+    async def stream(self):
+        """先吐出已缓冲的输出，再继续跟随仍在进行的 LLM 流"""
+        while True:
+            item = await self._queue.get()
+            if item is _DONE:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+
+    async def commit(self):
+        """推测命中：执行已登记的副作用，之后的副作用直接执行"""
+        self._deferred.committed = True
+        actions, self._deferred[:] = list(self._deferred), []
+        for action in actions:
+            await _run_deferred(action)
+
+    def elapsed_ms(self) -> float:
+        return ((self.finished_at or time.monotonic()) - self.started_at) * 1000
+
+    async def cancel(self):
+        if self._task.done():
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except (asyncio.CancelledError, Exception):
+            pass
+
+
+class Speculator:
+    """
+    推测执行：中间识别结果稳定 llm_speculative_stable_ms 后，用它提前开始 LLM 流并缓冲输出；
+    最终识别结果与之一致（忽略标点）则直接提交缓冲，否则取消后按最终结果重新请求。
+    注意：被取消的推测请求可能已在 Dify 会话中留下一条消息。
+    """
+
+    def __init__(self, stream_factory):
+        self._stream_factory = stream_factory
+        self._timer = None
+        self._pending_text = ""
+        self.run = None
+
+    def on_partial(self, text: str):
+        key = normalize_transcript(text)
+        if not key:
+            return
+        if self.run is not None and self.run.key == key:
+            return
+        if self.run is not None:
+            # 用户还在说，已开始的推测作废
+            asyncio.create_task(self._discard(self.run))
+            self.run = None
+        if self._timer is not None:
+            self._timer.cancel()
+        self._pending_text = text
+        self._timer = asyncio.get_running_loop().call_later(
+            settings.llm_speculative_stable_ms / 1000, self._start
+        )
+
+    def _start(self):
+        self._timer = None
+        speculative_stats.started += 1
+        self.run = SpeculativeRun(self._pending_text, self._stream_factory)
+        logger.info(f"🔮 中间结果稳定，提前请求LLM: {self._pending_text}")
+
+    async def resolve(self, final_text: str):
+        """拿到最终识别结果：一致返回推测流，否则取消并返回 None"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        run, self.run = self.run, None
+        if run is None:
+            return None
+        if run.key == normalize_transcript(final_text):
+            head_start_ms = (time.monotonic() - run.started_at) * 1000
+            speculative_stats.committed += 1
+            speculative_stats.saved_ms += head_start_ms
+            logger.info(f"🔮 推测命中，LLM 提前 {head_start_ms:.0f}ms")
+            await run.commit()
+            return run
+        await self._discard(run)
+        return None
+
+    async def close(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self.run is not None:
+            await self._discard(self.run)
+            self.run = None
+
+    @staticmethod
+    async def _discard(run: SpeculativeRun):
+        speculative_stats.cancelled += 1
+        speculative_stats.wasted_ms += run.elapsed_ms()
+        await run.cancel()
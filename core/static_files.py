@@ -0,0 +1,93 @@
+"""
+/static 的缓存策略：
+- 文件名即内容哈希 / 只写一次的文件（生成的音频、模型压缩包、图片派生文件）与带有效版本号（?v=）的请求
+  返回 Cache-Control: immutable，其余文件返回 no-cache，由 ETag 协商（If-None-Match → 304）
+- 文件名含内容哈希的文件使用该哈希作为强 ETag
+- Range / If-None-Match 由 Starlette 的 FileResponse / StaticFiles 处理；服务器支持 pathsend 扩展时由其零拷贝发送
+- StaticMount 让 request.url_for("audio_files", path=...) 自动带上版本号，调用方无需改动
+"""
+import os
+import re
+import time
+from starlette.datastructures import Headers, QueryParams, URLPath
+from starlette.responses import FileResponse
+from starlette.routing import Mount
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from settings.config import AUDIO_DIR
+
+# 只写一次的文件：group(1) 为内容哈希 / 唯一名，直接用作 ETag
+_WRITE_ONCE_PATTERNS = (
+    re.compile(r"^([0-9a-f]{32})\.(?:wav|ogg|mp3)$"),
+    re.compile(r"^models/([0-9a-f]{64})\.zip$"),
+    re.compile(r"^derived/[0-9a-f]{2}/([0-9a-f]{64}-\d+)\.(?:webp|avif)$"),
+)
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "public, no-cache"
+
+# url_for 在事件循环中同步调用，版本号在进程内缓存一小段时间，避免每次生成 URL 都 stat
+VERSION_CACHE_TTL = 5
+VERSION_CACHE_MAX = 4096
+_version_cache = {}
+
+
+def _write_once_tag(path: str):
+    for pattern in _WRITE_ONCE_PATTERNS:
+        match = pattern.match(path)
+        if match:
+            return match.group(1)
+    return None
+
+
+def _version(stat_result: os.stat_result) -> str:
+    """版本号：修改时间与大小变化即变化"""
+    return f"{stat_result.st_mtime_ns:x}{stat_result.st_size:x}"
+
+
+def static_version(path: str):
+    """静态文件 URL 的版本号；文件名已是内容哈希或文件不存在时返回 None"""
+    path = path.lstrip("/")
+    if _write_once_tag(path):
+        return None
+    now = time.monotonic()
+    cached = _version_cache.get(path)
+    if cached and cached[0] > now:
+        return cached[1]
+    try:
+        version = _version(os.stat(AUDIO_DIR / path))
+    except (OSError, ValueError):
+        version = None
+    if len(_version_cache) >= VERSION_CACHE_MAX:
+        _version_cache.clear()
+    _version_cache[path] = (now + VERSION_CACHE_TTL, version)
+    return version
+
+
+class ImmutableStaticFiles(StaticFiles):
+
+    def file_response(self, full_path, stat_result, scope, status_code: int = 200):
+        response = FileResponse(full_path, status_code=status_code, stat_result=stat_result)
+        path = self.get_path(scope).replace(os.sep, "/")
+        tag = _write_once_tag(path)
+        if tag:
+            response.headers["etag"] = f'"{tag}"'
+        if tag or QueryParams(scope.get("query_string", b"")).get("v") == _version(stat_result):
+            response.headers["cache-control"] = IMMUTABLE_CACHE_CONTROL
+        else:
+            response.headers["cache-control"] = REVALIDATE_CACHE_CONTROL
+
+        if self.is_not_modified(response.headers, Headers(scope=scope)):
+            return NotModifiedResponse(response.headers)
+        return response
+
+
+class StaticMount(Mount):
+    """url_for 生成的静态文件 URL 附带 ?v=版本号"""
+
+    def url_path_for(self, name: str, **path_params) -> URLPath:
+        url_path = super().url_path_for(name, **path_params)
+        if name == self.name and "path" in path_params:
+            version = static_version(str(path_params["path"]))
+            if version:
+                return URLPath(f"{url_path}?v={version}", protocol=url_path.protocol, host=url_path.host)
+        return url_path
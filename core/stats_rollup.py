@@ -0,0 +1,250 @@
+import asyncio
+import hashlib
+from datetime import datetime, timedelta
+from tortoise import Tortoise
+from tortoise.transactions import in_transaction
+from core.logger import logger
+from core.redis_client import redis_client
+from settings.config import settings, GREETING_LIST
+
+ROLLUP_TABLE = "stats_hourly_question"
+# 需要重算的小时（直接增删 audio_data 的路径写入），各 worker 的压实任务共同消费
+DIRTY_HOURS_KEY = "stats:rollup:dirty"
+BACKFILL_LOCK_KEY = "stats:rollup:backfill"
+# 回填成功后才写入的持久标记；写后落库会先于回填写入汇总表，不能以表是否为空判断
+BACKFILLED_KEY = "stats:rollup:backfilled"
+# 数据库存 UTC，仪表盘按北京时间展示
+LOCAL_OFFSET = timedelta(hours=8)
+
+_UPSERT_SQL = (
+    f"INSERT INTO `{ROLLUP_TABLE}` (`hour`, `question_hash`, `segments`, `tts_segments`, `tts_ms`) VALUES {{values}} "
+    "ON DUPLICATE KEY UPDATE `segments` = `segments` + VALUES(`segments`), "
+    "`tts_segments` = `tts_segments` + VALUES(`tts_segments`), `tts_ms` = `tts_ms` + VALUES(`tts_ms`)"
+)
+
+_RECOMPUTE_SQL = (
+    f"INSERT INTO `{ROLLUP_TABLE}` (`hour`, `question_hash`, `segments`, `tts_segments`, `tts_ms`) "
+    "SELECT DATE_FORMAT(`created_at`, '%%Y-%%m-%%d %%H:00:00'), MD5(`user_question`), COUNT(*), "
+    "COUNT(`tts_started_at`), COALESCE(SUM(TIMESTAMPDIFF(MICROSECOND, `tts_started_at`, `tts_completed_at`)) DIV 1000, 0) "
+    "FROM `audio_data` WHERE `created_at` >= %s AND `created_at` < %s{exclude} "
+    "GROUP BY 1, 2"
+)
+
+
+def hour_floor(value: datetime) -> datetime:
+    return value.replace(minute=0, second=0, microsecond=0, tzinfo=None)
+
+
+def question_hash(question: str) -> str:
+    """与 MySQL MD5(user_question) 一致"""
+    return hashlib.md5((question or "").encode("utf-8")).hexdigest()
+
+
+def _aggregate(records: list) -> dict:
+    """一批 AudioData 记录按 (小时, 问题) 预聚合"""
+    rows = {}
+    greetings = set(GREETING_LIST)
+    for record in records:
+        question = record.get("user_question") or ""
+        created_at = record.get("created_at")
+        if question in greetings or created_at is None:
+            continue
+        key = (hour_floor(created_at), question_hash(question))
+        row = rows.setdefault(key, [0, 0, 0])
+        row[0] += 1
+        started, completed = record.get("tts_started_at"), record.get("tts_completed_at")
+        if started and completed:
+            row[1] += 1
+            row[2] += int((completed - started).total_seconds() * 1000)
+    return rows
+
+
+async def upsert_rollup(conn, records: list):
+    """写入 AudioData 时同事务累加小时汇总"""
+    rows = _aggregate(records)
+    if not rows:
+        return
+    values, params = [], []
+    for (hour, q_hash), (segments, tts_segments, tts_ms) in rows.items():
+        values.append("(%s, %s, %s, %s, %s)")
+        params.extend([hour, q_hash, segments, tts_segments, tts_ms])
+    await conn.execute_query(_UPSERT_SQL.format(values=", ".join(values)), params)
+
+
+async def recompute_range(start: datetime, end: datetime):
+    """从 audio_data 重算 [start, end) 内各小时的汇总（幂等）"""
+    start, end = hour_floor(start), hour_floor(end)
+    if end <= start:
+        return
+    exclude = f" AND `user_question` NOT IN ({', '.join(['%s'] * len(GREETING_LIST))})" if GREETING_LIST else ""
+    async with in_transaction() as conn:
+        await conn.execute_query(f"DELETE FROM `{ROLLUP_TABLE}` WHERE `hour` >= %s AND `hour` < %s", [start, end])
+        await conn.execute_query(_RECOMPUTE_SQL.format(exclude=exclude), [start, end, *GREETING_LIST])
+
+
+def mark_dirty(*created_at: datetime):
+    """直接增删 audio_data 后登记受影响的小时，由压实任务重算"""
+    hours = {hour_floor(value).isoformat() for value in created_at if value}
+    if hours:
+        asyncio.create_task(_mark_dirty(hours))
+
+
+async def _mark_dirty(hours: set):
+    try:
+        await redis_client.sadd(DIRTY_HOURS_KEY, *hours)
+    except Exception as e:
+        logger.warning(f"登记统计汇总待重算小时失败: {e}")
+
+
+async def reset_rollup():
+    """audio_data 被整表清空时同步清空汇总"""
+    conn = Tortoise.get_connection("default")
+    await conn.execute_query(f"DELETE FROM `{ROLLUP_TABLE}`")
+    await redis_client.delete(DIRTY_HOURS_KEY)
+
+
+class RollupCompactor:
+    """
+    小时汇总的后台压实任务
+    - 未回填过则回填最近 stats_rollup_backfill_days 天（Redis 锁保证只有一个 worker 执行，失败后下个周期重试）
+    - 每 stats_rollup_interval 秒重算被登记为脏的小时
+    """
+
+    def __init__(self):
+        self._task = None
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def _run(self):
+        backfilled = False
+        while True:
+            if not backfilled:
+                try:
+                    backfilled = await self.backfill()
+                except Exception as e:
+                    logger.warning(f"统计汇总回填失败: {e}")
+            await asyncio.sleep(settings.stats_rollup_interval)
+            try:
+                await self.compact_dirty()
+            except Exception as e:
+                logger.warning(f"统计汇总压实失败: {e}")
+
+    async def backfill(self) -> bool:
+        """未回填过则回填，返回是否已完成（其他 worker 正在回填时返回 False，稍后重试）"""
+        if await redis_client.exists(BACKFILLED_KEY):
+            return True
+        if not await redis_client.set(BACKFILL_LOCK_KEY, "1", nx=True, ex=600):
+            return False
+        try:
+            end = hour_floor(datetime.utcnow()) + timedelta(hours=1)
+            start = end - timedelta(days=settings.stats_rollup_backfill_days)
+            await recompute_range(start, end)
+            await redis_client.set(BACKFILLED_KEY, end.isoformat())
+            logger.info(f"✅ 统计汇总回填完成: {start} ~ {end}")
+            return True
+        finally:
+            await redis_client.delete(BACKFILL_LOCK_KEY)
+
+    async def compact_dirty(self):
+        from core.retention import retention_cutoff
+        while True:
+            hour = await redis_client.spop(DIRTY_HOURS_KEY)
+            if hour is None:
+                return
+            start = datetime.fromisoformat(hour)
+            # 已归档的小时 audio_data 中已无记录，重算会清空其汇总
+            if settings.retention_enable and start < retention_cutoff():
+                continue
+            try:
+                await recompute_range(start, start + timedelta(hours=1))
+            except Exception:
+                await redis_client.sadd(DIRTY_HOURS_KEY, hour)
+                raise
+
+
+rollup_compactor = RollupCompactor()
+
+
+# ------------------------------ 仪表盘读取 ------------------------------
+
+def _local_to_utc(value: datetime) -> datetime:
+    return value - LOCAL_OFFSET
+
+
+async def _query(sql: str, params: list) -> list:
+    conn = Tortoise.get_connection("default")
+    return await conn.execute_query_dict(sql, params)
+
+
+async def distinct_questions(start_local: datetime, end_local: datetime) -> int:
+    """[start, end) 内去重后的问题数"""
+    rows = await _query(
+        f"SELECT COUNT(DISTINCT `question_hash`) AS `count` FROM `{ROLLUP_TABLE}` WHERE `hour` >= %s AND `hour` < %s",
+        [_local_to_utc(start_local), _local_to_utc(end_local)]
+    )
+    return int(rows[0]["count"]) if rows else 0
+
+
+async def hourly_question_counts(start_local: datetime, end_local: datetime) -> dict:
+    """按小时去重的问题数，键为本地整点时间"""
+    rows = await _query(
+        f"SELECT `hour`, COUNT(*) AS `count` FROM `{ROLLUP_TABLE}` WHERE `hour` >= %s AND `hour` < %s GROUP BY `hour`",
+        [_local_to_utc(start_local), _local_to_utc(end_local)]
+    )
+    return {row["hour"] + LOCAL_OFFSET: int(row["count"]) for row in rows}
+
+
+async def daily_question_counts(start_local: datetime, end_local: datetime) -> dict:
+    """按本地日期去重的问题数"""
+    rows = await _query(
+        f"SELECT DATE(`hour` + INTERVAL 8 HOUR) AS `day`, COUNT(DISTINCT `question_hash`) AS `count` "
+        f"FROM `{ROLLUP_TABLE}` WHERE `hour` >= %s AND `hour` < %s GROUP BY `day`",
+        [_local_to_utc(start_local), _local_to_utc(end_local)]
+    )
+    return {row["day"]: int(row["count"]) for row in rows}
+
+
+async def activity_buckets(start_local: datetime, end_local: datetime) -> dict:
+    """按本地时段（上午 / 下午 / 晚上 / 其他）去重的问题数"""
+    rows = await _query(
+        "SELECT CASE "
+        "WHEN HOUR(`hour` + INTERVAL 8 HOUR) BETWEEN 9 AND 12 THEN 'morning' "
+        "WHEN HOUR(`hour` + INTERVAL 8 HOUR) BETWEEN 14 AND 18 THEN 'afternoon' "
+        "WHEN HOUR(`hour` + INTERVAL 8 HOUR) BETWEEN 19 AND 23 THEN 'evening' "
+        "ELSE 'other' END AS `bucket`, COUNT(DISTINCT `question_hash`) AS `count` "
+        f"FROM `{ROLLUP_TABLE}` WHERE `hour` >= %s AND `hour` < %s GROUP BY `bucket`",
+        [_local_to_utc(start_local), _local_to_utc(end_local)]
+    )
+    return {row["bucket"]: int(row["count"]) for row in rows}
+
+
+async def avg_tts_ms(start_local: datetime, end_local: datetime) -> float:
+    rows = await _query(
+        f"SELECT SUM(`tts_ms`) AS `tts_ms`, SUM(`tts_segments`) AS `tts_segments` "
+        f"FROM `{ROLLUP_TABLE}` WHERE `hour` >= %s AND `hour` < %s",
+        [_local_to_utc(start_local), _local_to_utc(end_local)]
+    )
+    if not rows or not rows[0]["tts_segments"]:
+        return 0.0
+    return float(rows[0]["tts_ms"]) / float(rows[0]["tts_segments"])
+
+
+async def monthly_totals(start_local: datetime, end_local: datetime) -> dict:
+    """按本地月份的回复片段数与去重问题数（汇总表不随归档删除，包含已归档的对话）"""
+    rows = await _query(
+        "SELECT DATE_FORMAT(`hour` + INTERVAL 8 HOUR, '%%Y-%%m') AS `month`, SUM(`segments`) AS `segments`, "
+        f"COUNT(DISTINCT `question_hash`) AS `questions` FROM `{ROLLUP_TABLE}` "
+        "WHERE `hour` >= %s AND `hour` < %s GROUP BY `month`",
+        [_local_to_utc(start_local), _local_to_utc(end_local)]
+    )
+    return {row["month"]: {"segments": int(row["segments"] or 0), "questions": int(row["questions"])} for row in rows}
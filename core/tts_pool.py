@@ -0,0 +1,187 @@
+import asyncio
+import time
+from collections import deque
+from core.logger import logger
+from settings.config import settings
+
+TTS_PATH = "/v1/tts"
+# 样本不足时的对冲等待时间（秒）
+_COLD_HEDGE_DELAY = 3.0
+_MIN_HEDGE_SAMPLES = 20
+_EWMA_ALPHA = 0.2
+
+
+class TTSUnavailable(Exception):
+    """所有 TTS 节点均请求失败"""
+
+
+class TTSEndpoint:
+    """单个 TTS 节点的负载与健康状态（进程内）"""
+
+    def __init__(self, base_url: str):
+        self.base_url = base_url.rstrip("/")
+        self.url = f"{self.base_url}{TTS_PATH}"
+        self.inflight = 0
+        self.ewma_ms = None
+        self.consecutive_failures = 0
+        self.ejected_until = 0.0
+        self.requests = 0
+        self.failures = 0
+        self.backup_wins = 0
+
+    @property
+    def healthy(self) -> bool:
+        return time.monotonic() >= self.ejected_until
+
+    def score(self) -> float:
+        # 没有样本的节点优先，之后按 (在途数 + 1) × EWMA 延迟选择
+        return (self.inflight + 1) * (self.ewma_ms or 0.0)
+
+    def record_success(self, elapsed_ms: float):
+        self.ewma_ms = elapsed_ms if self.ewma_ms is None else (
+            _EWMA_ALPHA * elapsed_ms + (1 - _EWMA_ALPHA) * self.ewma_ms
+        )
+        self.consecutive_failures = 0
+        self.ejected_until = 0.0
+
+    def record_failure(self):
+        self.failures += 1
+        self.consecutive_failures += 1
+        if self.consecutive_failures >= settings.tts_eject_failures:
+            # 被动健康检查：连续失败后摘除一段时间，到期后放少量流量试探，再失败立即重新摘除
+            self.ejected_until = time.monotonic() + settings.tts_eject_seconds
+            logger.warning(f"TTS 节点 {self.base_url} 连续失败 {self.consecutive_failures} 次，摘除 {settings.tts_eject_seconds}s")
+
+    def snapshot(self) -> dict:
+        return {
+            "url": self.base_url,
+            "healthy": self.healthy,
+            "inflight": self.inflight,
+            "ewma_ms": round(self.ewma_ms, 1) if self.ewma_ms is not None else None,
+            "requests": self.requests,
+            "failures": self.failures,
+            "consecutive_failures": self.consecutive_failures,
+            "backup_wins": self.backup_wins,
+        }
+
+
+class TTSEndpointPool:
+    """
+    TTS 多节点负载均衡
+    - 按 在途数 × EWMA 延迟 选择节点
+    - 首个请求超过 p95 截止时间仍未返回时，向另一节点发对冲请求，先返回者胜出
+    - 连续失败的节点被动摘除
+    """
+
+    def __init__(self):
+        self._endpoints: dict = {}
+        self._config = None
+        self._latencies = deque(maxlen=500)
+        self.hedges = 0
+
+    def _sync_endpoints(self):
+        """TTS_URLS 为空时使用 TTS_URL；配置热加载后保留已有节点的统计"""
+        config = (settings.tts_urls, settings.tts_url)
+        if config == self._config:
+            return
+        base_urls = [u.strip().rstrip("/") for u in (settings.tts_urls or "").split(",") if u.strip()]
+        base_urls = base_urls or [settings.tts_url.rstrip("/")]
+        self._endpoints = {url: self._endpoints.get(url) or TTSEndpoint(url) for url in dict.fromkeys(base_urls)}
+        self._config = config
+        logger.info(f"TTS 节点池: {list(self._endpoints)}")
+
+    @property
+    def endpoints(self) -> list:
+        self._sync_endpoints()
+        return list(self._endpoints.values())
+
+    def pick(self, exclude=()):
+        candidates = [e for e in self.endpoints if e not in exclude]
+        if not candidates:
+            return None
+        healthy = [e for e in candidates if e.healthy]
+        if healthy:
+            return min(healthy, key=TTSEndpoint.score)
+        # 全部被摘除时不直接失败，选最早恢复的节点
+        return min(candidates, key=lambda e: e.ejected_until)
+
+    def hedge_delay(self) -> float:
+        if len(self._latencies) < _MIN_HEDGE_SAMPLES:
+            return max(_COLD_HEDGE_DELAY, settings.tts_hedge_min_delay)
+        ordered = sorted(self._latencies)
+        p95 = ordered[int(len(ordered) * 0.95) - 1] / 1000
+        return max(p95, settings.tts_hedge_min_delay)
+
+    async def _attempt(self, endpoint: TTSEndpoint, session, payload: dict) -> bytes:
+        endpoint.inflight += 1
+        endpoint.requests += 1
+        start = time.perf_counter()
+        try:
+            async with session.post(url=endpoint.url, json=payload) as resp:
+                if resp.status >= 500:
+                    raise TTSUnavailable(f"{endpoint.base_url} 返回 {resp.status}")
+                audio_bytes = await resp.read()
+            if not audio_bytes:
+                raise TTSUnavailable(f"{endpoint.base_url} 返回空音频")
+        except asyncio.CancelledError:
+            # 对冲落败被取消，不计入失败
+            raise
+        except Exception:
+            endpoint.record_failure()
+            raise
+        finally:
+            endpoint.inflight -= 1
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        endpoint.record_success(elapsed_ms)
+        self._latencies.append(elapsed_ms)
+        return audio_bytes
+
+    async def synthesize(self, session, payload: dict) -> bytes:
+        """向最合适的节点请求合成，返回原始音频字节"""
+        primary = self.pick()
+        tasks = {asyncio.create_task(self._attempt(primary, session, payload)): primary}
+        tried = [primary]
+        last_error = None
+        hedge_at = time.monotonic() + self.hedge_delay() if settings.tts_hedge_enable else None
+
+        try:
+            while tasks:
+                timeout = max(hedge_at - time.monotonic(), 0) if hedge_at else None
+                done, _ = await asyncio.wait(tasks, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+
+                for task in done:
+                    endpoint = tasks.pop(task)
+                    if task.exception() is None:
+                        if endpoint is not primary:
+                            endpoint.backup_wins += 1
+                        return task.result()
+                    last_error = task.exception()
+                    logger.warning(f"TTS 节点 {endpoint.base_url} 请求失败: {last_error}")
+
+                # 超过截止时间（对冲），或已有请求失败（重试）时，换一个节点再发一次
+                hedging = not done
+                if hedging or not tasks:
+                    backup = self.pick(exclude=tried)
+                    if backup is not None:
+                        if hedging:
+                            self.hedges += 1
+                            logger.info(f"TTS 节点 {primary.base_url} 超过 {self.hedge_delay():.2f}s 未返回，对冲到 {backup.base_url}")
+                        tasks[asyncio.create_task(self._attempt(backup, session, payload))] = backup
+                        tried.append(backup)
+                    # 每个请求最多对冲一次
+                    hedge_at = None
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        raise TTSUnavailable(f"TTS 节点全部失败: {last_error}")
+
+    def snapshot(self) -> dict:
+        return {
+            "hedge_delay_s": round(self.hedge_delay(), 3),
+            "hedges": self.hedges,
+            "endpoints": [e.snapshot() for e in self.endpoints],
+        }
+
+
+tts_pool = TTSEndpointPool()
@@ -0,0 +1,274 @@
+from tortoise import BaseDBAsyncClient
+
+RUN_IN_TRANSACTION = True
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        CREATE TABLE IF NOT EXISTS `app` (
+    `id` INT NOT NULL PRIMARY KEY AUTO_INCREMENT,
+    `name` VARCHAR(255) NOT NULL UNIQUE,
+    `description` VARCHAR(255) NOT NULL,
+    `created_at` DATETIME(6) NOT NULL,
+    `updated_at` DATETIME(6) NOT NULL,
+    `api_key` VARCHAR(255) NOT NULL UNIQUE
+) CHARACTER SET utf8mb4 COMMENT='应用主表';
+CREATE TABLE IF NOT EXISTS `audio_data` (
+    `id` INT NOT NULL PRIMARY KEY AUTO_INCREMENT,
+    `user_question` LONGTEXT NOT NULL COMMENT '用户问题',
+    `ai_response_text` LONGTEXT NOT NULL COMMENT '大模型回复文本',
+    `audio_file_path` VARCHAR(512) NOT NULL COMMENT '音频文件路径',
+    `tts_started_at` DATETIME(6) COMMENT 'TTS开始时间',
+    `tts_completed_at` DATETIME(6) NOT NULL COMMENT 'TTS完成时间',
+    `created_at` DATETIME(6) NOT NULL COMMENT '新增日期',
+    `updated_at` DATETIME(6) NOT NULL COMMENT '更新日期'
+) CHARACTER SET utf8mb4 COMMENT='音频数据管理表';
+CREATE TABLE IF NOT EXISTS `device` (
+    `id` INT NOT NULL PRIMARY KEY AUTO_INCREMENT,
+    `name` VARCHAR(255) NOT NULL UNIQUE,
+    `description` VARCHAR(255) NOT NULL,
+    `created_at` DATETIME(6) NOT NULL,
+    `updated_at` DATETIME(6) NOT NULL,
+    `is_active` BOOL NOT NULL
+) CHARACTER SET utf8mb4 COMMENT='设备表';
+CREATE TABLE IF NOT EXISTS `device_app` (
+    `id` INT NOT NULL PRIMARY KEY AUTO_INCREMENT,
+    `app_id` INT NOT NULL,
+    `device_id` INT NOT NULL,
+    UNIQUE KEY `uid_device_app_device__554ba4` (`device_id`, `app_id`),
+    CONSTRAINT `fk_device_a_app_0160826c` FOREIGN KEY (`app_id`) REFERENCES `app` (`id`) ON DELETE CASCADE,
+    CONSTRAINT `fk_device_a_device_0949943f` FOREIGN KEY (`device_id`) REFERENCES `device` (`id`) ON DELETE CASCADE
+) CHARACTER SET utf8mb4 COMMENT='设备应用关联表';
+CREATE TABLE IF NOT EXISTS `login_log` (
+    `id` INT NOT NULL PRIMARY KEY AUTO_INCREMENT,
+    `username` VARCHAR(64) NOT NULL COMMENT '登录用户名',
+    `ip_address` VARCHAR(45) NOT NULL COMMENT 'IP地址',
+    `login_location` VARCHAR(255) COMMENT '登录地址',
+    `status` VARCHAR(20) NOT NULL COMMENT '操作状态',
+    `device_name` VARCHAR(255) COMMENT '设备名称',
+    `browser` VARCHAR(255) COMMENT '浏览器',
+    `os` VARCHAR(255) COMMENT '操作系统',
+    `login_message` VARCHAR(500) COMMENT '登录信息',
+    `login_time` DATETIME(6) NOT NULL COMMENT '登录时间',
+    `is_admin` BOOL NOT NULL COMMENT '是否管理员'
+) CHARACTER SET utf8mb4 COMMENT='登录日志表';
+CREATE TABLE IF NOT EXISTS `logo` (
+    `id` INT NOT NULL PRIMARY KEY AUTO_INCREMENT,
+    `name` VARCHAR(255) NOT NULL COMMENT '图标名称',
+    `file_path` VARCHAR(512) NOT NULL COMMENT '图标文件路径',
+    `description` VARCHAR(500) COMMENT '描述信息',
+    `update_log` LONGTEXT COMMENT '更新日志',
+    `is_active` BOOL NOT NULL COMMENT '是否启用',
+    `created_at` DATETIME(6) NOT NULL COMMENT '创建日期',
+    `updated_at` DATETIME(6) NOT NULL COMMENT '更新日期'
+) CHARACTER SET utf8mb4 COMMENT='Logo管理表';
+CREATE TABLE IF NOT EXISTS `media_file` (
+    `id` INT NOT NULL PRIMARY KEY AUTO_INCREMENT,
+    `name` VARCHAR(255) NOT NULL,
+    `file_path` VARCHAR(512) NOT NULL,
+    `file_hash` VARCHAR(64) UNIQUE,
+    `description` VARCHAR(255),
+    `media_type` VARCHAR(10) NOT NULL,
+    `orientation` VARCHAR(20) COMMENT '媒体方向：horizontal/vertical',
+    `is_show` BOOL NOT NULL,
+    `is_delete` BOOL NOT NULL,
+    `created_at` DATETIME(6) NOT NULL,
+    `updated_at` DATETIME(6) NOT NULL
+) CHARACTER SET utf8mb4 COMMENT='媒体文件表 (图片 / 视频)';
+CREATE TABLE IF NOT EXISTS `model_item` (
+    `id` INT NOT NULL PRIMARY KEY AUTO_INCREMENT,
+    `name` VARCHAR(255) NOT NULL UNIQUE,
+    `description` VARCHAR(255),
+    `category` VARCHAR(10) NOT NULL COMMENT '模型类别: male/female/other',
+    `orientation` VARCHAR(20) COMMENT '模型方向: horizontal/vertical',
+    `local_path` VARCHAR(512) COMMENT '本地模型路径（自动生成）',
+    `url` VARCHAR(512) COMMENT '云端模型URL',
+    `thumbnail` VARCHAR(512) COMMENT '模型缩略图路径',
+    `file_size` BIGINT COMMENT '模型文件大小（字节）',
+    `is_show` BOOL NOT NULL,
+    `created_at` DATETIME(6) NOT NULL,
+    `updated_at` DATETIME(6) NOT NULL
+) CHARACTER SET utf8mb4 COMMENT='模型信息表';
+CREATE TABLE IF NOT EXISTS `operation_log` (
+    `id` INT NOT NULL PRIMARY KEY AUTO_INCREMENT,
+    `username` VARCHAR(64) NOT NULL COMMENT '操作用户名',
+    `operation_type` VARCHAR(20) NOT NULL COMMENT '操作类型',
+    `operation_content` VARCHAR(500) NOT NULL COMMENT '操作内容',
+    `target_type` VARCHAR(50) COMMENT '目标类型',
+    `target_id` VARCHAR(50) COMMENT '目标ID',
+    `ip_address` VARCHAR(45) NOT NULL COMMENT 'IP地址',
+    `status` VARCHAR(20) NOT NULL COMMENT '操作状态',
+    `details` JSON COMMENT '详细信息',
+    `operation_time` DATETIME(6) NOT NULL COMMENT '操作时间',
+    `is_admin` BOOL NOT NULL COMMENT '是否管理员'
+) CHARACTER SET utf8mb4 COMMENT='操作日志表';
+CREATE TABLE IF NOT EXISTS `path_permission` (
+    `id` INT NOT NULL PRIMARY KEY AUTO_INCREMENT,
+    `path` VARCHAR(255) NOT NULL COMMENT '路径',
+    `name` VARCHAR(64) NOT NULL COMMENT '权限名称',
+    `description` VARCHAR(255) COMMENT '权限描述',
+    `type` VARCHAR(10) NOT NULL COMMENT '权限类型: user/role',
+    `target_id` INT NOT NULL COMMENT '目标ID (用户ID或角色ID)',
+    `is_active` BOOL NOT NULL COMMENT '是否启用',
+    `created_at` DATETIME(6) NOT NULL,
+    `updated_at` DATETIME(6) NOT NULL,
+    UNIQUE KEY `uid_path_permis_path_0f9772` (`path`, `type`, `target_id`)
+) CHARACTER SET utf8mb4 COMMENT='路径权限表';
+CREATE TABLE IF NOT EXISTS `permission` (
+    `id` INT NOT NULL PRIMARY KEY AUTO_INCREMENT,
+    `name` VARCHAR(64) NOT NULL,
+    `code` VARCHAR(64) NOT NULL UNIQUE,
+    `description` VARCHAR(255),
+    `created_at` DATETIME(6) NOT NULL,
+    `updated_at` DATETIME(6) NOT NULL
+) CHARACTER SET utf8mb4 COMMENT='权限表';
+CREATE TABLE IF NOT EXISTS `role` (
+    `id` INT NOT NULL PRIMARY KEY AUTO_INCREMENT,
+    `name` VARCHAR(64) NOT NULL UNIQUE,
+    `description` VARCHAR(255),
+    `created_at` DATETIME(6) NOT NULL,
+    `updated_at` DATETIME(6) NOT NULL
+) CHARACTER SET utf8mb4 COMMENT='角色表';
+CREATE TABLE IF NOT EXISTS `site_config` (
+    `id` INT NOT NULL PRIMARY KEY AUTO_INCREMENT,
+    `title` VARCHAR(255),
+    `logo_path` VARCHAR(512),
+    `favicon_path` VARCHAR(512),
+    `updated_at` DATETIME(6) NOT NULL
+) CHARACTER SET utf8mb4 COMMENT='站点配置表';
+CREATE TABLE IF NOT EXISTS `user` (
+    `id` INT NOT NULL PRIMARY KEY AUTO_INCREMENT,
+    `username` VARCHAR(64) NOT NULL UNIQUE,
+    `password_hash` VARCHAR(128) NOT NULL,
+    `avatar` VARCHAR(255) COMMENT '头像路径',
+    `email` VARCHAR(100) COMMENT '邮箱',
+    `phone` VARCHAR(20) COMMENT '手机号',
+    `gender` VARCHAR(10) NOT NULL COMMENT '性别: male/female/unknown',
+    `department` VARCHAR(100) COMMENT '所属部门',
+    `created_at` DATETIME(6) NOT NULL,
+    `updated_at` DATETIME(6) NOT NULL
+) CHARACTER SET utf8mb4 COMMENT='用户表';
+CREATE TABLE IF NOT EXISTS `wake_word` (
+    `id` INT NOT NULL PRIMARY KEY AUTO_INCREMENT,
+    `word` VARCHAR(255) NOT NULL UNIQUE,
+    `description` VARCHAR(255),
+    `created_at` DATETIME(6) NOT NULL,
+    `updated_at` DATETIME(6) NOT NULL
+) CHARACTER SET utf8mb4;
+CREATE TABLE IF NOT EXISTS `aerich` (
+    `id` INT NOT NULL PRIMARY KEY AUTO_INCREMENT,
+    `version` VARCHAR(255) NOT NULL,
+    `app` VARCHAR(100) NOT NULL,
+    `content` JSON NOT NULL
+) CHARACTER SET utf8mb4;
+CREATE TABLE IF NOT EXISTS `role_permission` (
+    `role_id` INT NOT NULL,
+    `permission_id` INT NOT NULL,
+    FOREIGN KEY (`role_id`) REFERENCES `role` (`id`) ON DELETE CASCADE,
+    FOREIGN KEY (`permission_id`) REFERENCES `permission` (`id`) ON DELETE CASCADE,
+    UNIQUE KEY `uidx_role_permis_role_id_7454bb` (`role_id`, `permission_id`)
+) CHARACTER SET utf8mb4;
+CREATE TABLE IF NOT EXISTS `user_role` (
+    `user_id` INT NOT NULL,
+    `role_id` INT NOT NULL,
+    FOREIGN KEY (`user_id`) REFERENCES `user` (`id`) ON DELETE CASCADE,
+    FOREIGN KEY (`role_id`) REFERENCES `role` (`id`) ON DELETE CASCADE,
+    UNIQUE KEY `uidx_user_role_user_id_d0bad3` (`user_id`, `role_id`)
+) CHARACTER SET utf8mb4;"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        """
+
+
+MODELS_STATE = (
+    "eJztXW13m8YS/is6+mSf41aAePU3J3Za3yZxTuLc9rTp0VnBInMjgSpQHLfNf787Cwu7vB"
+    "lkK0IS+eDYMLPAM8vuzLOzwz/DReDgefjjxXI5PB/8M/TRApNf+MNngyGiZ5ODcCBC0zmV"
+    "Q4nANIxWyI7IIRfNQ0wOOTi0V94y8gIfBD+tNWypn9aGppif1ioeTz+tTVM3QdsJbKLu+b"
+    "NY0FCwTX4im4gYuqmKqtrUwqQBVxt/8n8YwP2eD3ISquSQ3y1X+rR2XQmOaIoLF5XiIxZo"
+    "cveXb0Af20TcJJJwd2vf+2uNJ1Eww9EdXpF7/ONPctjzHfwVh+zP5eeJ6+G5I6DoOdAAPT"
+    "6JHpb02LUfvaKC8ODTiR3M1ws/E14+RHeBn0p7fgRHZ9jHKxRhaD5arQFffz2fJ1ZgkMd3"
+    "monEt8jpONhF6zlYCbTjG8iODSeTtze3kw9Xt5PJsGBBpsHZKjlkBz5Yn9xqSJ9+Brfwgy"
+    "KrhmqOddUkIvQ20yPGt/jSGTCxIoXn7e3wGz2PIhRLUIwzUOn/BVhf3qFVOa5MPocsueU8"
+    "sgzH7kK7QF8nc+zPojvAU9NqgPzvxfuXP1+8PyFSp3DJgLyf8Tv7NjmlxOcA7Qxd/s5agJ"
+    "xTex6s2YEM7GxwOQy07RUGPCYoKoJ9Sc5E3gKXAy5q5vB2EtUf2S/7iD55QOfGnz8k71gN"
+    "+LfXb64+3F68eQeXW4ThX3OK38XtFZxR6NGH3NETPWentJHBr9e3Pw/gz8HvN2+vKLxBGM"
+    "1W9IqZ3O3vQ7gntI6CiR/cT5DDDQfsKENNsPp66WxodVGzt3pXrM4w4sye3H1mdbT0Jp/x"
+    "Q5tRlVPpZ6+q8RS8L/cz5yrAgSmyP9+jlTMRzvDGWJIH/OLZOCwa5EWi/OqX93iOKua0xE"
+    "O+pI0kfvKevWzfWH9jR1m3BQQDJajCtHhqoSxKYa6E+A3yH24D+El7/jW5A+TbZX6agPPe"
+    "9fkqiM+SB5vkAq7sMVfQ9chQz/XYGMdgRY0A40KK8CQOHlILJSehl8dnortVsJ7dcRpJ5E"
+    "aQJhfGUTwSXXx4eXFJB79JPuSgnWKBfDSjh+Bxv51lgeLa8QIyd6FhWRSZnjyrjSVBbOIw"
+    "uQYhpWW4Y/LTtGQStGmGBKGbTqJDY4rIEUOV9Mogs6kqhIrrEK8mpDOFLFhMwkRlbJAmNI"
+    "xpQ1QUeRMyYyyJuUnEiL9GNLS0FCKnI4U0rBkmiWo13cFwHOJUXTPhrKHYVJ9i4HpzPFmi"
+    "6O5xdf45TNJ9yXGXhszGWIKfqgTNRlE4IW/YKvYdzge3tx9AEOJhzYI4W9dcHZ7FVZm4HS"
+    "yW0C94halpw2PLUl4h80bhjnVtCg2bEKjrGtbg8WSXIpn6L1ROJ9qJdCbXx9zdi7mFN6CI"
+    "7y3p6RUOa16xy5HhsOrNzo8ftWN9qa969dut4KYyL+bkzcVvp4Kr+vrm7U9MnPN6Xr6+eZ"
+    "ELHvNjTRu7lOl23DRNh9GOGksc2FtFAUXVjptKnFzBMCqG6SKboJoZSYwYNFlpEDEQqcqI"
+    "gZ4T7SLOjG3j8aL2M8TkycSxbTPV+ABPf4W6HZsXKZm8x7NJR8jr7w89M6xx746vLxwfKT"
+    "us8tkbDtP7Sdr1VG1VX6iMyw62L1QRuC3IxSeSZrX0SkILlXArGWFUTaw4mUwDUsWcTmOv"
+    "2qgkT3iR8vV4QaLRejzwWzHdISNo1bXS32WDeJOmpAGtoVBag1usj1u0JJA0XdtICVm4gO"
+    "IkHEXM5dCL9fxC9/iFfk2/X9M/FLSPz3089NXd3lE8Rqs3WdP3wgnxprwvJZPXiyCYY+RX"
+    "+AW8Xs7kU6K4LSuziW17K51lVn1xc/NaMOiL6zxj+vHNi6v3JzK1JBHy4vXI2HHYaIE/W+"
+    "XsF/i3uMBfjm/r1f0N4d2rpf3kGfPr+nyKhLi0n63e59f1hUX/py3txzNZg+CzIkNceD0e"
+    "C0EnLdLFhQiSz+7mosEG4SkJMnF9AyyELI8WITQlOmNJg0BWmTJ9w3anoCOT3zVbg2tMNV"
+    "iBmk410JQRl7xVEm7+wUflBJU/+/hzh/Fn9qo1BDZTeBzcPZgongffwuzbClJBp0e1yvnJ"
+    "g1xE+FWwwt7M/wVvP7euo/4NTLPoPh08xa5VOi3mMnWXz4DqYbmMeUizAbAcz93w5K+Dme"
+    "eTH2WeSnqu1lGZg9Rknog18FMM3QCnwNU0tliiuU41dV4nznINGYnOy/KJSZRQJ7LeEkJV"
+    "Es2G54Prd/mcP/YkNkrTFrn2RFnSl6M1pd911XYonQ9b8JSpTo5Ikjw4Cdc28VLDkYu8OX"
+    "ZO4x109K16hPIngtNVcE8eizbvqLC1zrLBEdPjRw6KF6bOlYEdN3uQBbk6MXr+OVQXQ5KJ"
+    "pHOiwJPk5cR8RYi/nYXnx1mIsBhBfDtdzP7UVM3s1wq656uxN6QNlc3rdJnHHta/9A2XYA"
+    "WOW1cbUNy6WslwwynRucuGnTYmELU6bQRxLN0EdLXJuoJavaygFlYVxNG8DfBFzY3A/05Z"
+    "aVWz1CZW2MryTjxVtjFAptHpXl8192+EvNQEeKkad6m4hpk6G+3WMAW1bvf8cg+qMz0/ce"
+    "PawM+pdBv6vF/aGdCDVkNNsPkw8/2gLnX0OwO4EG20n2c5xW6boTyI2sQMmtRktCdS1Xn5"
+    "UmG8zyK5tuvpoub+rKcXyIF2Gdh7usreJLeCReslC7mPLbIzte+4xp4eaZlzW89C7MkC/J"
+    "bJvWBYTuwFj5J6QTM+D9pqsH+4XEwoSKW7kElvFtkwcXMvJ1a+U6qkVlVWnyrPf8W5REBf"
+    "lu+vpVxjwn/R/JM8AUZ+ujHv0FNf3aO+dpsmu72dnaXvSmc8wo02be7Tds3HB6GN3MJtbN"
+    "fcYSrz9wuQSof3znjm2RxTtEBNIQBBq+MGKJ03n+yFbWVf+eFnoA7rPJRdusXHnfQP84Yi"
+    "Q7hKFI5mn2C/FaDfM7one0bfYMdDrzz6yIWYOTt5Vhc4L0CMlh5pFj6T0QBZSrIdVPQlSX"
+    "w8OGG+pqGoxmA0oIy7HlcKOS0E2fWNpXtJqxrM8nfTmHxsuVmxi6y5OObQFVnPLblPLQQy"
+    "qlUbw6uu49D0X5PVqzZ012R7WPmiXOSGbJCnxWssU6F5N5498haz0Vfy78f/LWfN4/2kOW"
+    "2M6WbaMYKi2QaCBmK7watzPvAWpH8M/h188Rwc0HyblYf9KM0KEkGe0meVY/TsOyL7d0CE"
+    "56MveEVuFc3rLkucivAuuC+QCjZNZrDGTCjOFyuIKQp5QEvXVWZb04XHzB3vN/D2zES3ci"
+    "Z7DmI3SG+FYaCg3aGwPdJM6VmC2w7tSX/+DLKDZ3G6NHRkvkAbrEWtAxw85CbUmFzNjMkF"
+    "Yozzq9ognVPrcK8ueOS8syijEmdxIw7/2XPHEre0PUPGtDrNj3Vgh3YO7GQ7SGu4M71uL9"
+    "d3DPHj4x6bD/n7ySz1LOMxWr3rfCL8dx3hxbCMT0xPntXyibQwgsfkGvCJfL1nnvuq2F5X"
+    "J85TgUIZ6U2+F8c3wPFzUAufvCizYPWQlzJsmtynKNPByQLN8cjF9L8ACKzTEmJOuETqaw"
+    "1OSvys0zpWDrZ+zFO2kn5pINlYwV+hyFOaMobqewoCXlOTXVYbFjCCLoV9Z5QQmLGpRxSz"
+    "aYbZejWnBCkGNtZAcIHskh/fv6676+huvZj6yJsXcHQVC25I1xj5KyZL0Vg89P4u2FmgfG"
+    "kxcc2W3NTmtHyDqZhKcv+MrcUSkMCuklbF5XEx4xSwqWUwAllX1Ck7q5k6LRhhWTXsqK6P"
+    "ccyO9sRmT2x2CdqDrkx4fEQQm5jaIM3rdJkEGlbNteeDwly7CSnRs0VPNUnmwZwPOssUZa"
+    "5SG5uIWh03STP3z6x1/6xNrLWV1RriYbaxVCLebRNVusudQT31zdtgLyh12wJNw43OGCSN"
+    "eUpIV29WGQQIahuV3NrRVNImkGtopDiOsBRlPDYUaaybmmoYmimlAUXxVF1k8eL6JwguBB"
+    "OWkuX9ykTPk+8++thPxrTnyY/R6h3nyW+W0AeIKSrq0Annz+rY8oBJtqlHx5dXaFCPrk48"
+    "X49OqNxQUo8uu9848zRf64HG5GQGH5y8fH9FOsno4zvoK6PLq9dXt1enYhOkr0Yk0s23os"
+    "km3ON0SinVCK1mOEovZ+g43cjGXw4eYhSXghkRuGO6Gmhb1TrlmvEcsZHry8er7G1YOS8i"
+    "f4Rx1TwMWccYspazBYvByX8+3LyFuxjDM7uSm0OHlbgTzdeXuDsM0vnAS9zVjSObhFTPn6"
+    "AojmSt+LmC5j4ZIx0zu0HHFWaDzSzBKe+RMbKZbiOaYRtbf7npthXzI6p1m/sp9yE2M0Ej"
+    "C9QYoAL/sjn3UfRL597OYn992Q3E+1qnO6h12pfY3Mlsm0QlRdwhFqlaiE9V8vyIZ0eDfw"
+    "dzL+wUjVwebjXDvwZvQEhgRgqlHfJVHM5EygMayJd2EKO9tuxVUXt/GKwCL9GXwutL4fWl"
+    "8M5SDvEdiu7e4dXCC8MYtgLLmJM4q+MZIXNhshSFm3yhi0sZ0A11DHu0Nan6q1w14kBYsQ"
+    "TVTI7WC4Bt8qPwIYzwYoT9L6dCFi/XjLhBP5+tywmK2bopU8lJ5KlDygpyPEUmezZYkbeO"
+    "3rXlKLDqaCj8+Xp2EZ4va/f6kqWQZm1dX54+rVzfH0OWlsKirywc6D85tkuOr22S0T7s4x"
+    "4+NTliK3mPh1ibYFg1+HWDPz34vN5h1ZzSmV7fmqTbE7q6dJ4+p+uUI5iMNzHA82f31jB1"
+    "lTNnHVHXqQ8gDjdwYxqa5Zm/Q9lXR+wzr3byihx6Dk6feXWMVu945tUjjEhTNqQ1EdKA/C"
+    "gjPOpZDEp+ZIXz6JhOyQCb3HKBsXBp7UIT8o347ctnKXOhYhPDTzyO5dj3zjVFoXU7kXNa"
+    "QSH0LMHRbj/d9Si55SgV3qQ24DL5g9vb2xMA+72xt3evD8zR6t3rY7T67t3rrHcBlVaSCv"
+    "IG+Q+3AfykXeuawI58u2xWTLzu9wklt1ez4zf2xrCj2fXjCka50II95ArP6YuVrvGkoUQM"
+    "ZbCiVviMHxjECduXGig5lSkmAtHdKljP7lI1MUghYkntPJhdLz68vLikfW+Sd6W/1cZP9D"
+    "FKIif2eNUxEyNeGy0bcyulVUvFORE+WuLP5aKlNOyhcRIHPi1zbsmI1WSPf88CqD7y6SOf"
+    "LkHbO+e9c947511103rn/Bit3iXnPO9XPs1FF4nxvZop2zrq4qPm3fUs5hEd9YI3nnfXOU"
+    "/+GRz1ktEkxKvnsPTHEO+fN9TWxuwhm1oXwG1lV6rAIp5nCr0+eBF+GfiuV1oygDt7VheG"
+    "hUQOgGKCDaIxAzlQ3kiC4myWrEI45eq4MjKrE08L8Mjwu2ar8LkqbGviF7Liqrq6ocuwGw"
+    "M+Fxd/757VjI28KM6oNVxNZheMt+NZpmXGBW1nQVLPFj7ETWQtQ7PirTRidaDyD3HRhBXu"
+    "DKyNJZ/iSjN04aZoGOmiLx6BNLneq/iv3Je7212+jza7F23SXtcmGEoV+jCoURiUvrNtQB"
+    "aUDg/o7ZSC48arNljn9Xq4mxWg7AO9PtD7nklO1L0t8RGZ21vtHa6ZRBO3kNvuVOUK5kTy"
+    "1aLylV3KKHoUhvcBQQQ+nUdJ+qmts/wkTbXBecKSTTUVJLHzsSOpSShOiEJfyKy+ijn+sQ"
+    "onaDK+8FEAvEi+JGBJCKrtT6cyvQHyzsXJVLRqv25AppU2dg04SV43J978pUu0yGTh0w1r"
+    "/zPpIH5S02mJVtGClaxSwPvVbA3DJbEJ21cxhYiGIeULEtnSRu8ids9F7EZRpoNemBDGgz"
+    "Y4FxQPMP9NVswmu1QUs3qbCpwTEY/HzjZQZxrfzUMcJl+ZiS89Sk7Ax7KH7ZAfVk0R+elt"
+    "Z2ESnafamCNV6LC/PuSn3U2glhsVs5JrilnJxWJWdO5vNcgwhW5DnXdlNurbz15cJnam2s"
+    "CdaXy/wXyYeHTtx5XMRRS/OMI3uPNdiZmP2sYQolbnO3+J392ZMadPBqhGfz/Zgj4Z4Bit"
+    "vnuOqM/UfdZM3WyFvXGOLrdu/KTF4Xi8qOX8fkWf8a8kvB2W8H7pubM67u+eSE3umdhjBG"
+    "A1/D0p1S1Sipm0qS/H5A+OjOo/T7nvYPe+8aF5Sb1vfIxW371vXOJLffs/G+9h+w=="
+)
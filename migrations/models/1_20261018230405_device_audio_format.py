@@ -0,0 +1,107 @@
+from tortoise import BaseDBAsyncClient
+
+RUN_IN_TRANSACTION = True
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        ALTER TABLE `device` ADD `audio_format` VARCHAR(16) NOT NULL DEFAULT 'wav';"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        ALTER TABLE `device` DROP COLUMN `audio_format`;"""
+
+
+MODELS_STATE = (
+    "eJztXVtz27YS/isaPdkzbiVSvPrNiZ3Wp0mcSZzTTpuOhhdQ5olEqiJlx23z3w8WIEiAN5"
+    "OyZVEy8+DYxC4v34LA7ofF8p/hInTRPPrxbLkcng7+GQbWAuFf+MMng6FFWpODcCC27DmR"
+    "sxIBO4pXlhPjQ541jxA+5KLIWfnL2A8DEPyyVpGpfFnrqmx8WStoYn9ZG4ZmgLYbOljdD2"
+    "ZUUJeRg39aDhbRNUMRVVXbRPgEnjr5EvwwgPs9HeQklLGLfze98Ze1543hiCp7cNExPWKC"
+    "Jnd/+RNoEweLG1gS7m4d+H+t0TQOZyi+QSt8j3/8iQ/7gYu+oYj9ufw69Xw0dwUUfRdOQI"
+    "5P4/slOXYZxG+IIDy4PXXC+XoRZMLL+/gmDFJpP4jh6AwFaGXFCE4fr9aAb7CezxMrMMjp"
+    "nWYi9BY5HRd51noOVgJtegPZseF0+v7qevrp4no6HRYsyDQ4WyWHnDAA6+NbjcjTz+AWfp"
+    "AlRVeMiaYYWITcZnpE/04vnQFDFQk876+H30m7FVtUgmCcgUr+L8D6+sZalePK5HPI4lvO"
+    "I8tw7C60C+vbdI6CWXwDeKpqDZD/Pfv4+uezj0dY6hguGeL3k76z75MmmbYB2hm6/J21AD"
+    "mn9jRYswMZ2NngchhoOysEeEytuAj2OW6J/QUqB1zUzOHtJqo/sl/2EX38gO5VML9P3rEa"
+    "8K8v3118uj579wEut4iiv+YEv7PrC2iRydH73NEjLWen9CSDXy+vfx7An4Pfr95fEHjDKJ"
+    "6tyBUzuevfh3BP1joOp0F4N7VcbjhgRxlqgtXXS3dDq4uavdW7YnWGEWf25O4zq1tLf/oV"
+    "3bcZVTmVfvaqGk/B+/K+cq4CHLAt5+udtXKnQgtvjCV+wFvfQVHRIK8S5Te/fERzq2JOSz"
+    "zkc3KSxE/es5ftO+tv7CjrtoBgKIdVmBabFvKiFOZKiN9Zwf11CD9Jz7/Ed2AFTpmfJuC8"
+    "d32+CuKT5MGmuYAre8wVdD081HM9luIYrogRYFxIEZ7S4CG1UNIIvZy2xDercD274TSSyA"
+    "0jjS+MYjoSnX16fXZOBr9pPuQgnWJhBdaMHILH/X6SBYpr1w/x3GUNy6LItPGkNpYEsanL"
+    "5BqElKbuTfBPw5Rw0KbqYwjdNBwd6raFj+jKWKsMMpuqQqi4jtBqijtTxILFJEyUJzo+hY"
+    "oQORERtfwpnjGW2Nw4YkTfYhJamjKW0ywZn1jVDRzVqpqL4DjEqZpqQKsuO0SfYOD5czRd"
+    "WvHNw+r8cxi4++LjHgmZ9ckYfipjOG0cR1P8hq2o73A6uL7+BIIQD6smxNma6mnwLJ7CxJ"
+    "1wsYR+wSvYhgOPLY3zCpk3CnesqTac2IBAXVORCo8neQTJ1H8hchrWTqQzuT7m7l7MLbwB"
+    "RXyvcU+vcFjzil2ODIdVb3Z+/Kgd60t91YvfrgU3lXkxR+/OfjsWXNW3V+9/YuKc1/P67d"
+    "WrXPCYH2va2KVMt+OmaTqMdtRY4sDeKgooqnbcVOLkCoZREEwX2QTVzEhixKBKcoOIAUtV"
+    "RgykTbSLODO2jceL2k8QkycTx7bNVOMDPP4V6nZsXqRk8h7PJh0hr78/9Mywxr17eX3h5Z"
+    "GywyqfveEwvZ+kXU/VVvWFyrjsYPtCFYHbglx8JGlWS68ktFAJt5IRRtXEipvJNCBVDNum"
+    "XrVeSZ7wIuXr8YJEo/V44Lco3SFZcFbPTH+XdOxNGmMVaA2Z0BrcYj09ozkGScNz9JSQhQ"
+    "vIbsJRUC4nuxh1qcPVgjIRhg29nL9pSDwA1gMaPXMCd+HhK2jGxCFek0evfGfdDkaDcLmO"
+    "8H+L5YReoqcwukdh9GkDfdrAoaDND18bMAmp3vPhPcQD5fBZAJe0BnhLeTcigxua+iSNw1"
+    "6u7z3/l2j1JkkafjTF7rF/W+IqvArDObKCCi+M18uZ3MaK27IycyO2t3RdZtVXV1dvBYO+"
+    "usxT4J/fvbrA4yyxJBby6QIzddM2ytjIlq37jI0tZmyU49s6XWNDePcqVyN5xnyiBp/zIu"
+    "ZqZOkY+UQNIYvjcbkadCZrwCZUpPwLr8dDnMK0Rf6/QAnw6fpceN+Ab1DQGNWfgHEC1eE/"
+    "1pmMVWAmZJvp645ng44Esb6jwjVsFZYUbVsFTcnisvFKgvs/eJoFo/JnH+3vMNrPXrWGwG"
+    "YKD4O7BxPF0+BbmH1bQSro9KhWOT95kIsIvwlXyJ8Fv6DtJ0t21L+Bada6SwdPsWuVTou5"
+    "1OvlE6B6WC5jHtJsACzHczcLH2/DmR/gH2WeStpW66jMQWo6T8Qa+Cm6poNT4KkqW/1SPb"
+    "d6LaROnCWPslURXpbPNCMrJFjWX0KoiqPZ6HRw+SGfxMmexLHSPFTufKIs7svxmqynaIrj"
+    "kvUZ2FMp2xo+Mh5Lg6No7WAvNRp5lj9H7jHdEkneqgfWcLCgvQrv8GOR07sK7JU0HXDENP"
+    "rIYfHCxLnSketlD7LAV8dGzz+H4iHIGhprnCjwJHk5MQEV4m934Qc0rRRWl7Bvp4npvKqi"
+    "Gv3KTPd8NfaGtGGyeZ0urxoM61/6hmvqAsGtKQ0Ibk2pJLihSXTusmGnjQlErU4bQRxLNw"
+    "FdabKKo1Qv4iiFNRxxNG8DfFFzI/CfKc2wapbaxApbWUyjU2UbA2Qane71VXP/RsiPmwA/"
+    "rsZ9XFwxTp2NdivGglq3e365B9WZnp+4cW3g51S6DX3eL+0M6GGroSbcfJh5PqhLHf3OAC"
+    "5EG+3nWU6x22YoD6I2MYM6bjLaY6nqjRbjwnifRXJt19NFzf1ZTy+QA+1S6vd0lb1JbgWL"
+    "1ksWch9aZGdqz7jGnh5pmURdz0LsyQL8lsm9cFhO7IUPknphMz4PztVgQ3i5mFBhTPNga4"
+    "RRZMPE3dqcWPnWt5LiY1nBsTz/RXOJgL4s3zBNuMaE/yL5J3kCDP/0KO/QU1/do752m5S8"
+    "va26pe9KZzzCjXbh7tP+24cHoY3cwm3sv91h4vjzBUilw3tnPPNsjilaoKayg6DVcQOUzp"
+    "uP9sK2Uijg8DNQh3Ueyi7d4ped9A/zhixBuIrITreXsfGz3wrQbwLek03A75DrW2988siF"
+    "mDlrPKkLnBcgRmrJNAuf8WhgmXKyv1f0JXF8PDhivqYuK/pgNCCMu0ZLvxwXguz6k6Wbg6"
+    "tOmOXvpjH5xPSy6iXZ6WjMocmSlltyt00LZBSzNoZXPNcl6b8GK0Cua57BNiXzVdbwDTkg"
+    "T6oRmYZM8m58Z+QvZqNv+N+P/1vOmsf7yenUCSK7oycWVEHXLTgBtRu8OqcDf4H7x+Dfwa"
+    "3vopDk26x8FMRpVpAIsk2eVaLoOTdY9u8QC89Ht2iFb9Wa110WOxXRTXhXIBUcksxgTpgQ"
+    "zRcriMkyfkBT0xRmW8ODx8wd77dL98xEt3Imew5iN0hvhWEgoN1YUXukmdKTBLcdqgDw9B"
+    "lkB8/idGnoyHyBNliLWgc4eEhNqDGpmhmTCsQY51e1QTqn1uFeXfDIeWdRskqcxY04/CfP"
+    "HUvc0vYMGdPqND/WgR3aObCT7SCt4c70ur1c3zHEXx732HzI309mqWcZX6LVu84nwn+XMV"
+    "oMy/jEtPGklk8khRF8JteAT+QLePPcV8X2ujpxngoU6oJv8gFA/gQcPwcfN8Avyixc3eel"
+    "dIck98myPThaWHM08hD5LwQC67iEmBMukfpag6MSP+u4jpWDrR/zlK0kn45INlbwVyjylI"
+    "aEoJyibAGvqUoeK/YLGEGXQoE7SghMauoRwczOMFuv5oQgRcDG6hZcILvk549v6+46vlkv"
+    "7MDy5wUcPdmEG9JURv6KyVIkFo/8vwt2FihfUh1edVhhRla+wZANObl/xtaiMZDAnpyWOe"
+    "ZxMWgKmG3qjEDWZMVmraqhkYIRplnDjmraBFF2tCc2e2KzS9AedB3Il0cEsYmpDdK8TpdJ"
+    "oGHVXHs6KMy1m5ASPVv0WJNkHszpoLNMUeYqtbGJqNVxkzRz/4xa98/cxFpbWa3BHmYbSy"
+    "Xi3TZRpbvcGdRT37wN9oJSty3QNNzojEHSmKeEdPVnlUGAoLZRya0dTSVtArmGRqJxhCnL"
+    "k4kujyeaoSq6rhrjNKAoNtVFFq8uf4LgQjBhKVner0z0PPnuo4/9ZEx7nvwlWr3jPPnVEv"
+    "oANkVFHTqh/aSOLQ+ZZJt6dHx5hQb16OrE8/XohMoNJfXosvulmaf5Wg8kJscz+ODo9ccL"
+    "3ElGnz9AXxmdX7y9uL44Fk+B+2qMI938WVTJgHu0bUKpxtZqhuL0crqG0o1s/OXgIUa0FM"
+    "wIw03paqBtFfOYO43viie5PH+4yt6GlfNi/EeUfEoIso4RZC1nCxaDo/98unrPfz8ohw4r"
+    "cSeary9xdxik84GXuKsbRzYJqZ4+QVEcyVrxcwXNfTJGOmZ2g44rzAabWYJT3iNjZDPdRj"
+    "TDNrb+ctNtK+ZHVOs291PuQ2xmgkYWqDFABf5lc+6D6JfOvZ3F/vK8G4j3tU53UOu0L7G5"
+    "k9k2iUqKuEMsUrUQn6rk+RHfiQf/DuZ+1CkauTzcaoZ/Dd6AkMCMFEo75Ks4nIiUB5wgX9"
+    "pBjPbasldF7f1hsAq8RF8Kry+F15fCO0k5xA9WfPMBrRZ+FFHYCixjTuKkjmeEzIXpUhRu"
+    "8oUuLmVA05UJ7NFWx9Vf5aoRB8KKJahmcqReAGyTH0X3UYwWIxTcHgtZvNxpxA36+WxdTl"
+    "DM1k2ZSk4iTx0SVpDjKTLZk8EKv3Xkrk1XhlVHXebb69lFeL7svJfnLIU0O9fl+fHjyvX9"
+    "MWRpKSz6ysKB/pNju+T42iYZ7cM+7uFjkyO2kvd4iLUJhlWDXzf404PP6x1WzSmd6fWtSb"
+    "o9oatL5+lTsk45gsl4EwM8fXZvDVNXOXPWEXWd+gDicAM3pqFZnvg7lH11xD7zaievyKHn"
+    "4PSZVy/R6h3PvHqAEWnKhrQmQhqQH2WERz2LQciPrHAeGdMJGeDgWy4wFh6pXWhAvhG/ff"
+    "kkZS4UZCD4iSZUjn3vXJVlUrfTco8rKISeJXix2093PUpuOUqFN6kNuEz+4Pb29gTAfm/s"
+    "7d3rA3O0evf6JVp99+511ruASitJBXlnBffXIfwkXesSw24FTtmsmHjdHxNKbq9mx+/sjW"
+    "FHs+vTCka50II95ArNyYuVrvGkoQSFMlwRK3xF9wzihO1LDZQ0ZYqJQHyzCtezm1RNDFKw"
+    "WFI7D2bXs0+vz85J35vmXenvtfETeYySyIk9XnXMxIjXRsvG3Epp1VJxToSPlvi2XLSUhj"
+    "0kTuLAJ2XOTcliNdnp71kA1Uc+feTTJWh757x3znvnvKtuWu+cv0Srd8k5z/uVj3PRRWJ8"
+    "r2bKto66+Kh5dz2LeURHveCN5911zpN/Ake9ZDSJ0OopLP05QvvnDbW1MXvIptYFcFvZlS"
+    "iwiOeJQq9Pfoxeh4Hnl5YM4FpP6sKwCMsBUEywQTSmWy6UNxpDcTZTUiCc8jRUGZnViacF"
+    "eCT4XXUU+FwVclTxC1m0qq6maxLsxoDPxdHv3bOasbEf04xa3VMldkG6Hc80TIMWtJ2FST"
+    "1b+BA3ljV11aRbacTqQOUf4iIJK1wLrI0ln+JKM3ThpkgY6Vm3PoY0ud4b+lfuy93tLt9H"
+    "m92LNkmvaxMMpQp9GNQoDErf2TYgC0qHB/R2SsFx41UbrPN6PdzNClD2gV4f6D1nkhNxb0"
+    "t8ROb2VnuHaybRxC3ktjtVuYI5kXy1qHxllzKK3oqiuxAjAp/OIyS97WgsP0lVHHCe0Ngh"
+    "mrI1Zu3UkVTHFk2Ism7xrL6iHP9EgQaSjC98FAAtki8JmGMLqu3btkRuAL9zNJmKVO3XdM"
+    "i0UieeDo34dXPp5i9tTIpMFj7dsA6+4g4SJDWdltYqXrCSVTJ4v6qjIrgkMmD7KiIQkTCk"
+    "fEEiW9roXcTuuYjdKMp00AsTwnjQBueC4gHmv0my0WSXimxUb1OBNhFxOna2gTrTeDYPcZ"
+    "h8ZYZeepQ0wMeyh+2QH1ZNEfnpbWdhEpmn2pgjVeiwvz7kp91NoJYaFbOSaopZScViVmTu"
+    "bzXIMIVuQ513ZTbq209eXIY6U23gzjSebzAfJh5d+3ElcxHFL47wJ9z5rsTMR21jCFGr85"
+    "2/xO/uzJjTJwNUo7+fbEGfDPASrb57jqjP1H3STN1shb1xji63bvyoxWE6XtRyfr9aX9Gv"
+    "OLwdlvB+adtJHfd3h6Wmd0zsIQKwGv6elOoWKcVM2tSXY/IHR0b1n6fcd7B73/jQvKTeN3"
+    "6JVt+9b1ziS33/P31v9sA="
+)
@@ -0,0 +1,126 @@
+from tortoise import BaseDBAsyncClient
+
+RUN_IN_TRANSACTION = True
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        CREATE TABLE IF NOT EXISTS `stats_hourly_question` (
+    `id` BIGINT NOT NULL PRIMARY KEY AUTO_INCREMENT,
+    `hour` DATETIME(6) NOT NULL COMMENT '所在小时',
+    `question_hash` VARCHAR(32) NOT NULL COMMENT '用户问题MD5',
+    `segments` INT NOT NULL COMMENT '回复片段数',
+    `tts_segments` INT NOT NULL COMMENT '有TTS耗时的片段数',
+    `tts_ms` BIGINT NOT NULL COMMENT 'TTS总耗时（毫秒）',
+    UNIQUE KEY `uid_stats_hourl_hour_1f2f40` (`hour`, `question_hash`),
+    KEY `idx_stats_hourl_hour_191e29` (`hour`)
+) CHARACTER SET utf8mb4 COMMENT='对话统计小时汇总表';
+        ALTER TABLE `audio_data` ADD INDEX `idx_audio_data_created_510d1f` (`created_at`);"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        ALTER TABLE `audio_data` DROP INDEX `idx_audio_data_created_510d1f`;
+        DROP TABLE IF EXISTS `stats_hourly_question`;"""
+
+
+MODELS_STATE = (
+    "eJztXVtz2ziy/isqPdlV3oiieM2bEzs7PpvEObHmzNZOtlS8gDI3kqiRqHi8u/nvBw0QJM"
+    "CbSVmyIJl5cGyyGyS7QeDrD43mf/rzyEez9ZvL5bL/tvef/sKZI/wLf/ii13fI2eQgHIgd"
+    "d0bknETAXccrx4vxocCZrRE+5KO1twqXcRgtQPDbRke29m1j6qr1baOhkfttY1mGBdp+5G"
+    "H1cDGlgqaKPPzT8bCIaViaqKq7NsINBPro2+IvPbjft72chKb4+Hc7UL5tgkCBI7oawEUV"
+    "esQGTe7+8g0YIw+LW1gS7m6zCP/YoEkcTVF8j1b4Hn//Jz4cLnz0J1qzP5ffJ0GIZr5gxd"
+    "CHBsjxSfy4JMduFvEHIggP7k68aLaZLzLh5WN8Hy1S6XARw9EpWqCVEyNoPl5twL6LzWyW"
+    "eIGZnN5pJkJvkdPxUeBsZuAl0KY3kB3rTyafb8eTu+vxZNIveJBpcL5KDnnRAryPb3VNnn"
+    "4Kt/AXdaiZmjUyNAuLkNtMj5g/6aUzw1BFYp7P4/5Pct6JHSpBbJwZlfxfMOv7e2dVblcm"
+    "n7MsvuW8ZZkd5TXt3PlzMkOLaXwP9tT1GkP+3+XX979cfj3DUudwyQi/n/Sd/ZycUuk5sH"
+    "ZmXf7OWhg5p7YbW7MDmbGzweU0rO2tENhj4sRFY1/hM3E4R+UGFzVz9vYT1Tfsl2O0Pn5A"
+    "/3Yxe0zesRrjj28+Xd+NLz99gcvN1+s/ZsR+l+NrOKOSo4+5o2dGzk9pI73fbsa/9ODP3j"
+    "9uP18T80breLoiV8zkxv/owz05mziaLKKHieNzwwE7yqwmeH2z9Lf0uqjZeV0WrzMbcW5P"
+    "7j7zurMMJ9/RY5tRlVPpZq+q8RTQV/CdgwpwwHW87w/Oyp8IZ3hnLPED/gg9tC465F2i/O"
+    "FvX9HMqZjTEoR8RRpJcPKRvWw/WX9jR1m3BQtGalRl0+KpuTovNXOliT85i8dxBD9Jz7/B"
+    "d+AsvDKcJtj56Pp8lYkvkgeb5AKu7DFX0PXwUM/1WGrHaEWcAONCauEJDR5SDyUnoZfTM/"
+    "H9KtpM7zmNJHLDlsYXRjEdiS7v3l9ekcFvkg85SKeYOwtnSg7B4/68yALFjR9GeO5y+mVR"
+    "ZHryojaWBLGJz+QahJS2GYzwT8se4qBNNxUI3QwcHZqug4+YmmJUBplNVSFU3KzRaoI705"
+    "oFi0mYqI5M3ISOEGmIiDrhBM8YS+xuHDGiP2MSWtoqljMcFTesmxaOanXDR3Ac4lRDt+Cs"
+    "qXpEn9ggCGdosnTi+6fV+eewcPfFxwMSMpsjBX5qCjQbx+sJfsNWFDu87Y3HdyAI8bBuQ5"
+    "xt6IEBzxJoTNyL5kvoF7yCa3nw2EMlr5ChUbhjQ3ehYQsCdUNHOjzeMCCWTPELkTOwdiKd"
+    "yXUxt3wxt/AGFO07xj29ArDmFWWODPtVb3Z+/Kgd60ux6vXfxwJMZSjm7NPl388FqPrx9v"
+    "NfmTiHet5/vH2XCx7zY00bv5TpSu6apsOopM4SB/ZWUUBRVXJXiZMrOEZDMF1kE1QzJ4kR"
+    "gz5UG0QMWKoyYiDnRL+IM2PbeLyovYOYPJk49u2mGgzw/FdI7ti8SMnkEc82HSGvfzz0TL"
+    "8G3r2+vnBcpOwOYGa/CrI3HKWPk7PrmNqqvlAZlp1sX6jib1twi8/kzGrZlYQVKqFWMr6o"
+    "mlfxM5kGnIrluhRUm5XcCS9SvhwvSDRajgd6i7IdQwdaDez096GJwaSl6MBqqITV4NbqaY"
+    "u2ApJW4JkpHwsXUP2EoqBUTnYxiqij1ZwSEZYLvZy/acg7ANIDTgb2CO4iwFcwrJFHQFNA"
+    "r/zg/OgNetFys8b/zZcjeomOwZCPweiyBrqsgVOxNj98bUEkpHovZ+8+Hij7L2LwodHA3s"
+    "M8jMjMDae6HI3TXq3vkP9r9HqTHI1wPcHwOPxRAhXeRdEMOYsKFMbr5VzuYsV9eZnBiP2t"
+    "XJd59d3t7UfBoe9u8gz4r5/eXeNxlngSC4V0fZnCtK0SNrJV6y5hY48JG+X2bZ2tsaV5jy"
+    "pVI3nGfJ4Gn/Iipmpk2Rj5PA0hieN5qRp0JmvAJlRk/Auvx1OcwqRF+r9ACfDZ+lx434Bv"
+    "0JCC6htgnEB1+I91RooOzITqMn3TC1zQGUKs7+lwDVeHFUXX1UFz6HDJeCXB/e88zYKt8s"
+    "8u2j9gtJ+9ag0Nmyk8bdwjmCh2Y9/C7NvKpIJOZ9Uq8JM3ctHCH6IVCqeLv6H950pKim9g"
+    "mnUe0sFT7Fql02Iu83q5A6ueFmTMmzQbAMvteZiFj4/RNFzgH2VIJT1XC1RmIDWZJWINcI"
+    "ppmAAKAl1nq1964FevhdSJs9xRtirCy/KJZmSFBMuGSwhVcTS7ftu7+ZLP4WRP4jlpGirX"
+    "niiL+3K8Iesphub5ZH0GtlSqroGPKMqwd7beeBilrgeBE86Qf053RJK36ok1HCzorqIH/F"
+    "ikeV+DrZK2B0DMoI8cFS9MwJWJ/CB7kDm+OnZ6/jm0AEHSkGJwosCT5OXE/FOIv/15uKBZ"
+    "pbC6hLGdIWbz6ppudSsz8mE19oa0YbJ5HZlXDfr1L33DNXWB4Da0BgS3oVUS3HBKBHfZsN"
+    "PGBaKW1E4Qx9JtjK41WcXRqhdxtMIajjiatzF8UXMr479QlmHVLLWNF/aymEanyjYOyDSk"
+    "7vVVc/9WlleaGF6ptrtSXDFOwUa7FWNBTe6eX46gpOn5CYxrY35ORW7T53GpNEaPWg010f"
+    "bDzMuZuhToS2NwIdpoP89yinK7oTyI2sYNutJktMdS1fsslMJ4n0VybdfTRc3jWU8vkAPt"
+    "MuqPdJW9SW4Fi9ZLFnKfWmRnai+4xp4eaZlEXc9CHMkC/J7JvahfTuxFT5J6UTM+D9pqsB"
+    "+8XEwoMGYEsDXCKrJh4mZtTqx851tJ7bGs3lie/6K5REBflu+XJlxjwn+R/JM8AYZ/BpR3"
+    "6Kgv+aivwyYl72+nbum7Ig0i3GoT7jFtv316ENoKFu5j++0BE8dfLkAqHd6lQebZHFP0QE"
+    "1hB0FLcgeUzpvPRmF7qRNw+hmo/TqEckhY/LqT/mHeUIcQriKy0+11bPzstgJ0m4CPZBPw"
+    "J+SHzoeQPHIhZs5OXtQFznMQI6VkmoXPeDRwbDXZ3ytiSRwf984Y1jRVzewNeoRxN2jll/"
+    "NCkF3fWLo5uKrBLH83jclHdpAVL8maozGHoQ6N3JK7azsgo9m1MbwW+D5J/7VY/XHTCCy2"
+    "KZkvsoZvyAN5UozItlSSdxN6g3A+HfyJ/73513LaPN5PmtNHiOyOHjlQBN10oAHqN3h13v"
+    "bCOe4fvf/2foQ+iki+zSpEizjNChKN7JJnHVLrefdY9t8RFp4NfqAVvlVnVndZDCrW99FD"
+    "gVTwSDKDPWJCNF+sIKaq+AFtw9CYb60AHjN3vNsu3TETcuVMdhzEYSy9F4aBGO3eWbe3NF"
+    "PaSXArUQWA3WeQnTyLI9PQkWGBNrYWtU5w8Bg2ocaG1czYsECMcbiqjaVzahL36gIi58Hi"
+    "0CkBi1tx+DvPHUtgaXuGjGlJzY9JsEM7Z+xkO0hrc2d6ci/XS2bx18c9Nh/yj5NZ6ljG1+"
+    "h12flE+O8mRvN+GZ+Ynryo5RNJYYSQyTXgE/n63Tz3VbG9rk6cpwKFsuDbfP+Pb4Dj5+Db"
+    "BvhFmUarx7yU6ZHkPlV1e2dzZ4YGASL/RUBgnZcQc8IlUqzVOyvBWed1rBxs/ZilbCX5ck"
+    "SysYK/QpGntIYIyimqDvCa+jBgtX7BRtCl0MIfJAQmdfWA2MzNbLZZzQhBioCNNR24QHbJ"
+    "X79+rLvr+H4zdxdOOCvYMVBtuCFDZ+SvmCxFYvF1+O+CnwXKlxSH1z1WmJGVb7BUS03un7"
+    "G1SAESOFDTKse8XSyaAubaJiOQDVVz2VndMkjBCNuuYUcNY4QoO9oRmx2xKZNpT7oO5Osj"
+    "gtjE1MbSvI7MJFC/aq592yvMtduQEh1b9FyXZAjmbU9apiiDSm18ImpJ7pJm8M+qhX/2Nt"
+    "7ay2oNRphtPJWIy+2iSrgsjdVTbN7G9oKS3B5oGm5I45A05ikhXcNpZRAgqG1VcutAU0mb"
+    "QK6hk2gcYavqaGSqysiwdM00dUtJA4riqbrI4t3NXyG4EFxYSpZ3KxMdT3746OM4GdOOJ3"
+    "+NXpecJ79dQh/ArqioQyecv6hjyyMm2aYeHV9eoUE9ujrxfD06oXJDST267H5p5mm+1gOJ"
+    "yfEM3jt7//Uad5LBr1+grwyurj9ej6/PxSZwX41xpJtvRR9acI+uSyjV2FlNUZxezjRQup"
+    "GNvxw8xICWghlgc1O6GmhbzT7nmgl9sZGbq6er7G1ZOS/Gf6yTTwlB1jGCrOVswaJ39j93"
+    "t5/57wflrMNK3Inu60rcnQbpfOIl7urGkW1Cqt0nKIojWSt+rqB5TM5Ix0w56LjCbLCdJz"
+    "jlI3JGNtNtRTPsY+svN922Yn5ENbm5n3IMsZ0LGnmgxgEV9i+bc5+0funcK63tb67ksHhX"
+    "6/QAtU67EpsHmW2TqKRod4hFqhbiU5U8PxJ6ce+/vVm4lopGLg+3mtm/xt5gIYEZKZR2yF"
+    "dxuBApD2ggX9pBjPbasldF7eNhsAq8RFcKryuF15XCu0g5xC9OfP8Frebhek3NVmAZcxIX"
+    "dTwjZC5MlqJwky90cSkDhqmNYI+2rlR/latGHAgrlqCayZF6AbBNfrB+XMdoPkCLH+dCFi"
+    "/XjLhBP5+tywmK2bopU8lJ5KlDwgpyPEUme9Fb4beO3LXtq7DqaKr8+Xp2EZ4va/fmiqWQ"
+    "Zm3dXJ0/r1zf732WlsKirywc6D45dkiOr22S0THs4+4/NzliL3mPp1iboF81+MnBn558Xm"
+    "+/ak6Rpte3JumOhK4unaffknXKAUzG2zhg99m9NUxd5cxZR9RJ9QHE/hYwpqFbdvwdyq46"
+    "Ypd5dZBX5NRzcLrMq9fodckzr55gRJqyIa2JkAbkRxnhUc9iEPIjK5xHxnRCBnj4lguMRU"
+    "BqF1qQb8RvX75ImQsNWQh+ohGVY98711WV1O10/PMKCqFjCV7t9tNDj5J7jlLhTWpjXCZ/"
+    "cnt7OwLguDf2dvD6xIBWB69fo9cPD6+z3gVUWkkqyCdn8TiO4CfpWjfY7M7CK5sVE9T9Na"
+    "Hkjmp2/MneGHY0uz6tYJQLLdhDrtCMvFjpGk8aSlBTRivihe/okZk4YftSByWnMsVEIL5f"
+    "RZvpfaomBilYLKmdB7Pr5d37yyvS9yZ5KP2zNn4ij1ESObHHq46ZGPHaaNmYWymtWirOif"
+    "DREn8uFy2lYQ+JkzjjkzLn9tBhNdnp71kA1UU+XeQjk2k7cN6B8w6cywrTOnD+Gr0uEzjP"
+    "48rnQXSRGD+qmbItUBcfNQ/Xs5hHBOoFNJ6H6xyS3wFQLxlN1mi1C0//ukbHh4ba+pg9ZF"
+    "PvgnFb+ZUosIhnR6HXXRij99EiCEtLBnBnL+rCsDWWA0MxwQbRmOn4UN5IgeJs9lCDcCow"
+    "UGVkVieeFuAZwu+6p8HnqpCni1/IolV1DdMYwm4M+Fwc/d49qxkbhzHNqDUDfcguSLfj2Z"
+    "Zt0YK20yipZwsf4saytqnbdCuNWB2o/ENcJGGFOwNrY8mnuNIMXbgpEkYGzo8QmzS53gf6"
+    "V+7L3e0u30Wb8kWbpNe1CYZShS4MahQGpe9sGyMLSqdn6P2UguPGqza2zut15m5WgLIL9L"
+    "pA7yWTnO4wTln/Em1Ws8f/3aB1XJHtVCZWjx1BYXJPNCZ/8CpNvvpKIY4LMM9EfsAK49O6"
+    "jHT/puFpsHdKGbmV6HKbZhjqNEaK3eNF8R+K4puADnVAdIAe4Q8LNqBZiu6Q9QMr+yqr7Z"
+    "IEKYe1axp+0q5QW2ljjZQRwX/wuxtACvrINzIECzYkCVqqRrbVq5b4BPR+MQ5GPWfjh9EE"
+    "UMmbjO3rkRtL973qI0j/ojdp6KbG4De7HPMV+f5gfqta9uj027S9T1c6KVuFpnOE39OkBJ"
+    "Uu3iEtPUKP51uAJ/cBINtk7UUl3nBdndwc3VKH+xHfvmFiz4zHd3ApZWiyiySfyq1oYI5V"
+    "qU7iak4zcbiLoDwrWQ6q+Szs733wB5wUDPW83W91RVVPDHK/SEXUamDOnNdmZmU6LzOn7s"
+    "An/arBIj9Gtk7il3xiLVJd4kvaAr8WFGVOgexXjdJ4eG7mcxHajpog21E1sB0VcC0bwFtw"
+    "DbzKy21fUlpbvm7+amj8HW9T4mfMFgbPq8lsdAABeD5vAgEO54N5ifXrpvpMR17TE6O3wV"
+    "AyIQNJYi6ypFASZLGlhuqoasMkmlDx3IxQRb/nRPIVevPVNMvSopz1+iHCFmHhgu56BtsT"
+    "omse4A+keERTdRR2npL3uuLQTSjODwzYVjSvagQxgUI2QAsfYkPz5OtttuLAF85cd0huAL"
+    "8oKImPoJi/CeGNPgpMOInfGJ8W3DAUUti/8Lm8zeI7xg6LpI7u0lnFc1YmmEIoT4e5VEEW"
+    "mVeJicjST3kSWJZO1tHy8tHychTCPelkMGE8aGPngqLMgHtLcw9Vq0llANWqLg0A50SL07"
+    "GzjakzjRdj5fvJlz3ppQfJiTf/Wk777QF36RSxTZyzl6UpMk+1cUeqIPEaSZ+fdrcx9bBR"
+    "AeFhTQHhYbGAMJn7Ww0yTEFuU+ehzFZ9e+cFPSmYamPuTOPlBvN+gujajysZRBS/8sg3eP"
+    "BKMBlGbeMIUUv6zl+Cu6UZc7oE7GrrH+cKbZeA/Rq9fvh1+W535E53R2ZZzY33RXK5us9K"
+    "yKXjRS3n95vzHf2Gw9t+Ce+Xnruo4/4esNTkgYk9RQBWm78jpeQipZhLm2I5Jn9yZNReov"
+    "Fuc2K3OVEK6x8nSuqw8Wv0+uGxcQmW+vn/QiAvXA=="
+)
@@ -0,0 +1,120 @@
+from tortoise import BaseDBAsyncClient
+
+RUN_IN_TRANSACTION = True
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        ALTER TABLE `audio_data` ADD `question_hash` VARCHAR(32) NOT NULL COMMENT '用户问题MD5，用于分组' DEFAULT '';
+        UPDATE `audio_data` SET `question_hash` = MD5(`user_question`);
+        ALTER TABLE `audio_data` ADD INDEX `idx_audio_data_questio_9d7c33` (`question_hash`, `created_at`);"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        ALTER TABLE `audio_data` DROP INDEX `idx_audio_data_questio_9d7c33`;
+        ALTER TABLE `audio_data` DROP COLUMN `question_hash`;"""
+
+
+MODELS_STATE = (
+    "eJztXVtz2ziy/isqPdlV3ojinXlzYmfHu3GcE3t2tjaZUvECytxIokak4vHu5r8fNECQAG"
+    "8mZcmiZObBsclukOwGga8/NJr/Hc5DD82iN+fL5fDt4L/DhT1H+Bf+8NlgaJOzyUE4ENvO"
+    "jMjZiYATxSvbjfEh355FCB/yUOSugmUchAsQ/LbWkKV+WxuabH5bq0hxvq1NUzdB2wtdrB"
+    "4splTQkJGLf9ouFjF0UxVVNcdCuAFfU74t/jKA+307yEmokod/t3zp29r3JTiiyT5cVKJH"
+    "LNDk7i/fgK64WNzEknB360XwxxpN4nCK4nu0wvf49Xd8OFh46E8UsT+X3yd+gGaeYMXAgw"
+    "bI8Un8uCTHrhbxByIID+5M3HC2ni8y4eVjfB8uUulgEcPRKVqglR0jaD5ercG+i/VslniB"
+    "mZzeaSZCb5HT8ZBvr2fgJdCmN5AdG04mn27uJreXd5PJsOBBpsH5KjnkhgvwPr7ViDz9FG"
+    "7hL/JYNVRT0VUTi5DbTI8YP+mlM8NQRWKeT3fDn+S8HdtUgtg4Myr5v2DW9/f2qtyuTD5n"
+    "WXzLecsyO3bXtHP7z8kMLabxPdhT02oM+Y/zL+9/Of9ygqVO4ZIhfj/pO/spOSXTc2DtzL"
+    "r8nbUwck5tO7ZmBzJjZ4PLcVjbXSGwx8SOi8a+wGfiYI7KDS5q5uztJapv2C+HaH38gN7N"
+    "YvaYvGM1xr+7ur68vTu//gyXm0fRHzNiv/O7Szgjk6OPuaMnes5PaSOD367ufhnAn4N/3X"
+    "y6JOYNo3i6IlfM5O7+NYR7stdxOFmEDxPb44YDdpRZTfD6eult6HVRs/d6V7zObMS5Pbn7"
+    "zOv2Mph8R49tRlVOpZ+9qsZTQF/+dw4qwAHHdr8/2CtvIpzhnbHED/gjcFFUdMi7RPnD37"
+    "+gmV0xpyUI+YI0kuDkA3vZfrL+xo6ybgsWDOWwyqbFU3N5XmrmShNf24vHuxB+kp5/he/A"
+    "XrhlOE2w88H1+SoTnyUPNskFXNljrqDr4aGe67HUjuGKOAHGhdTCExo8pB5KTkIvp2fi+1"
+    "W4nt5zGknkhi2NL4xiOhKd374/vyCD3yQfcpBOMbcX9pQcgsf9eZYFimsvCPHcZQ/Losj0"
+    "5FltLAliE4/JNQgpLcNX8E/TGuOgTTMkCN10HB0ajo2PGKqkVwaZTVUhVFxHaDXBnSliwW"
+    "ISJsqKgZvQECINEVEmNbm3o/tq0esLLY1NZbiUgVyV/W6ZhsYUWbRqBxM8Ey1xN8KRKPoz"
+    "JiGrJeNGdVvGN6wZJo6WNd1DcBziX10z4awhu0Sf2NYPZmiytOP7p9V5+5j4tcDHfRKKG4"
+    "oEP1UJmo3jaILf3BXFJG8Hd3e3IAhxtmZB/K5rPjyR5qtM3A3nS+hvvIJjumCjsZRXyFAu"
+    "3LGuOdCwCQSAriENHm/sEw+luIjI6Vg7kc7kmsXyX4eCC0GJg9q/96H+S4b6wotXtO8dfh"
+    "EqcHJescsB6bBqlMgPW7VTTClEvvznnYCOGXg6uT7/56mAkD/efPorE+fA1vuPN+9yMWvh"
+    "/WiKZguKL+eU4XBLLmEDt5sxmSbiB/FmPhOhsCI3QMKKXAmE4ZToo/x00ebdKdPt+OvTdC"
+    "bs5guVm5tbBYhF1Y67SsRd4BgVwYyfYYxN3iBt3OQVwlKV7xA5J/pFBDdtqZqi9hbommRy"
+    "37WbamDc81+hbtM2RbYuD1o36Qh5/cNh7oY1CP319YXD4uu3EAoMq6KuhqP0YdK5PYlf1R"
+    "cqI+uj7QtV1H4L2vmZdGot8ZYQhiWsW0YlVlNuXibTgG4zHYeCaqOSVuNFyjM1BIlGmRrA"
+    "fFLCamxDq76V/j42MJg0JY1wZ4SY4tI4aIuWBJKm7xopVQ8XkL2EZaIsX3YxiqjD1ZxySa"
+    "YDvZy/aUhJAd4KTvqWAnfh4yvopuIS0OTTKz/YPwajQbhcR/i/+VKhl2hGQvUsU59QcshL"
+    "cn1Cyb6szQ9fGxAJqd4LUnN4oGzJzm1o8LHewN7jPIzIzA2n+vSd407k6JH/a/R6k/SdIJ"
+    "pgeBz8KIEK78JwhuxFBQrj9XIud7DirrzMYMTukhrKvPru5uaj4NB3V3kG/Nfrd5d4nCWe"
+    "xEIBTT2gMG2jXJ4soaHP5dlhLk+5fVsn8mxo3oPK4kmeMZ/Cw2dDiVk8WaJOPoVHyO95Xh"
+    "YPnckasAkVm0GE1+MpTmHSYmeIQAnwGzm48L4B36AiCdU3wDiB6vAf6yiSBsyE7DB9w/Ud"
+    "0BlDrO9qcA1HgxVFxyGLwWOby9MsCe6/8jQLtsrvfbS/x2g/e9UaGjZTeNq4BzBRbMe+hd"
+    "m3lUkFnd6qVeAnb+SihT+EKxRMF39Hu0+j7Si+gWnWfkgHT7FrlU6LuaT85RaselyQMW/S"
+    "bAAst+d+Fj4+htNggX+UIZX0XC1QmYHUZJaINcAphm4AKPA1ja1+ab5XvRZSJ87SitmqCC"
+    "/LZ56RFRIsGywhVMXRbPR2cPU5n4bLnsS10wxlrj1RFvfleE3WU3TV9cj6DCSzyY6Oj0jS"
+    "eHASrV2MUqORbwcz5J3SzbLkrXpiDQcLOqvwAT8Wad5TYRet5QIQ0+kjh8ULE3BlIM/PHm"
+    "SOr46dnn8O1UeQNCTpnCjwJHk5MYUY4m9vHixoYjCsLmFsp4uJ3pqqmf3KTPewGntD2jDZ"
+    "vE6XVw2G9S99wzV1geDW1QYEt65WEtxwSgR32bDTxgWiVqedII6lmxhdbbKKo1Yv4qiFNR"
+    "xxNG9j+KLmRsZ/oSzDqllqEy/sZDGNTpVtHJBpdLrXV839G1leamJ4qdruUnHFOAUb7VaM"
+    "BbVu9/xyBNWZnp/AuDbm51S6bfo8Lu2M0cNWQ024+TDzcqYuBfqdMbgQbbSfZznFbruhPI"
+    "jaxA2a1GS0x1LV+yykwnifRXJt19NFzcNZTy+QA+0y6g90lb1JbgWL1ksWcp9aZGdqL7jG"
+    "nh5pmURdz0IcyAL8jsm9cFhO7IVPknphMz4P2mpQKqBcTKg9p/uwNcIssmHifntOrHznW0"
+    "lZuqwUXZ7/orlEQF+Wb3knXGPCf5H8kzwBhn/6lHfoqa/uUV/7TUre3U7d0nelM4hwo024"
+    "h7T99ulBaCNYuIvtt3tMHH+5AKl0eO8MMs/mmKIHaopvCFodd0DpvPlsFLaTOgHHn4E6rE"
+    "Mo+4TFrzvpH+YNeQzhKiI73V7Hxs9+K0C/CfhANgFfIy+wPwTkkQsxc3byrC5wnoMYKSXT"
+    "LHzGo4Ftycn+XhFL4vh4cMKwpiGrxmA0IIy7Tiu/nBaC7PrG0s3BVQ1m+btpTK5Yfla8JG"
+    "uOxhy6PNZzS+6OZYOMatXG8KrveST912Sl6Q3dN9mmZL5OHq0RpfqkGJFlyiTvJnBHwXw6"
+    "+hP/e/Pv5bR5vJ80pymI7I5WbKiPb9jQAPUbvDpvB8Ec94/B/wY/Ag+FJN9mFaBFnGYFiU"
+    "Z2yLOOqfXceyz7nxALz0Y/0Arfqj2ruywGFdF9+FAgFVySzGApTIjmixXEZBk/oKXrKvOt"
+    "6cNj5o7326V7ZqJbOZM9B7EfS++EYSBGa1vFUFDaSnDboQoA288gO3oWp0tDR4YF2tha1D"
+    "rCwWPchBobVzNj4wIxxuGqNpbOqXW4VxcQOQ8Wx3YJWNyIw9967lgCS9szZEyr0/xYB3Zo"
+    "54ydbAdpbe5Mr9vL9R2z+OvjHpsP+YfJLPUs42v0etf5RPjvKkbzYRmfmJ48q+UTSWGEgM"
+    "k14BP5+t0891Wxva5OnKcChbLgm3wakm+A4+fg8xT4RZmGq8e8lOGS5D5ZdgYnc3uGRj4i"
+    "/4VAYJ2WEHPCJVKsNTgpwVmndawcbP2YpWwl+fhHsrGCv0KRpzTHCMopyjbwmtrYZ7V+wU"
+    "bQpdDCGyUEJnX1iNjMyWy2Xs0IQYqAjTVsuEB2yV+/fKy76/h+PXcWdjAr2NGXLbghXWPk"
+    "r5gsRWLxKPhPwc8C5UuKw2suK8zIyjeYsikn98/YWiQBCezLaZVj3i4mTQFzLIMRyLqsOu"
+    "ysZuqkYIRl1bCjuq4gyo72xGZPbHbJtEddB/L1EUFsYmpjaV6nyyTQsGqufTsozLWbkBI9"
+    "W/Rcl2QI5u2gs0xRBpXa+ETU6rhLmsE/sxb+WZt4ayerNRhhtvFUIt5tF1XC5c5YPcXmbW"
+    "wvKHXbA03Djc44JI15SkjXYFoZBAhqG5Xc2tNU0iaQa+gkGkdYsqwohiwpuqmphqGZUhpQ"
+    "FE/VRRbvrv4KwYXgwlKyvF+Z6Hny/Ucfh8mY9jz5a/R6x3nymyX0AeyKijp0wvmzOrY8ZJ"
+    "Jt6tHx5RUa1KOrE8/XoxMqN5TUo8vul2ae5ms9kJgcz+CDk/dfLnEnGf36GfrK6OLy4+Xd"
+    "5anYBO6rMY50861oYxPu0XEIpRrbqymK08sZOko3svGXg4cY0VIwI2xuSlcDbatap1wzgS"
+    "c2cnXxdJW9DSvnxfiPKPmUEP1IrM4vWAxO/nZ784n/flDOOqzEnei+vsTdcZDOR17irm4c"
+    "2SSk2n6CojiSteLnCpqH5Ix0zOwGHVeYDTbzBKd8QM7IZrqNaIZdbP3lpttWzI+o1m3upx"
+    "xDbOaCRh6ocUCF/cvm3CetXzr3dtb2VxfdsHhf63QPtU77Ept7mW2TqKRod4hFqhbiU5U8"
+    "PxK48eB/g1kQdYpGLg+3mtm/xt5gIYEZKZR2yFdxOBMpD2ggX9pBjPbasldF7cNhsAq8RF"
+    "8Kry+F15fCO0s5xM92fP8ZreZBFFGzFVjGnMRZHc8ImQuTpSjc5AtdXMqAbqgK7NHWpOqv"
+    "ctWIA2HFElQzOVIvALbJj6LHKEbzEVr8OBWyeLlmxA36+WxdTlDM1k2ZSk4iTx0SVpDjKT"
+    "LZs8EKv3Xkri1PhlVHQ+bP17OL8HxZu1cXLIU0a+vq4vR55fq+DllaCou+snCg/+TYPjm+"
+    "tklGh7CPe/jc5Iid5D0eY22CYdXg1w3+9OjzeodVc0pnen1rku5A6OrSefotWaccwWS8iQ"
+    "O2n91bw9RVzpx1RF2nPoA43ADGNHTLlr9D2VdH7DOv9vKKHHsOTp959Rq93vHMqycYkaZs"
+    "SGsipAH5UUZ41LMYhPzICueRMZ2QAS6+5QJj4ZPahSbkG/Hbl89S5kJFJoKfSKFy7Hvnmi"
+    "yTup22d1pBIfQswavdfrrvUXLHUSq8SW2My+SPbm9vTwAc9sbeHl4fGdDq4fVr9Pr+4XXW"
+    "u4BKK0kFubYXj3ch/CRd6wqb3V64ZbNigrq/JJTcQc2OP9kbw45m16cVjHKhBXvIFZqRFy"
+    "td40lDCWrKcEW88B09MhMnbF/qoORUppgIxPercD29T9XEIAWLJbXzYHY9v31/fkH63iQP"
+    "pX/Wxk/kMUoiJ/Z41TETI14bLRtzK6VVS8U5ET5a4s/loqU07CFxEmd8UubcGtusJjv9PQ"
+    "ug+sinj3y6ZNoenPfgvAfnXYVpPTh/jV7vEjjP48rnQXSRGD+ombItUBcfNQ/Xs5hHBOoF"
+    "NJ6H6xyS3wJQLxlNIrTahqd/jdDhoaG2PmYP2dS7YNxWfiUKLOLZUuh1G8Tofbjwg9KSAd"
+    "zZs7owLMJyYCgm2CAaM2wPyhtJUJzNGqsQTvk6qozM6sTTAjxj+F1zVfhcFXI18QtZtKqu"
+    "buhj2I0Bn4uj37tnNWPjIKYZtYavjdkF6XY8y7RMWtB2Gib1bOFD3FjWMjSLbqURqwOVf4"
+    "iLJKxwZ2BtLPkUV5qhCzdFwkjf/hFgkybX+0D/yn25u93l+2ize9Em6XVtgqFUoQ+DGoVB"
+    "6TvbxsiC0vEZejel4Ljxqo2t83q9uZsVoOwDvT7Qe8kkp1uMU6JfwvVq9vh/axTFFdlOZW"
+    "L12BEUJvdEY/IHr9Lkq68U4jgA8wzk+awwPq3LSPdv6q4Ke6ckxalEl5s0w1CnrkjWgBfF"
+    "f0iSZwA61ADRAXqEP0zYgGZKmk3WD8zsq6yWQxKkbNauoXtJu0JtpbWpSArBf/C740MKuu"
+    "LpGYIFG5IELVkl2+plU3wCer8YB6OBvfaCcAKo5E3G9g3IjaX7XjUF0r/oTeqaoTL4zS7H"
+    "fEW+P5jfqpY9Ov027eD6QiNlq9B0jvB7mpSg0sQ7pKVH6PF8C/DkHgBki6y9yMQbjqORm6"
+    "Nb6nA/4tvXDeyZu7tbuJQ0NthFkk/lVjQwx6pUJ3E1p5k43EFQnpUsB9V8FvbrEPwBJwVD"
+    "PW/3W11R1SOD3C9SEbUamDPntZlZmc7LzKlb8MmwarDIj5Gtk/g7PrEWqS7xJW2BXwuKXU"
+    "6BHFaN0nh4buZzEdoqTZCtUg1slQKuZQN4C66BV3m57UtSa8vXzV8Njb/lbUr8jNnC4Hm1"
+    "LhsdQACez5tAgP35YF5i/bqpPtPprumJ0dtgqC4hg47EXGRJoSTIYksN1VHVmkk0oeK5Ga"
+    "GKfs+J5Cv05qtplqVF2VH0EGKLsHBBc1yd7QnRVBfwB5JcoinbEjtPyXtNsukmFPsHBmwr"
+    "mlelQEwgkQ3QwofY0Dz5epsl2fCFM8cZkxvALwpK4iMo5m9AeKMpvgEn8Rvj0YIbukQK+x"
+    "c+l7defMfYYZHU0V3aq3jOygRTCOVqMJdKyCTzKjERWfopTwLL0sl6Wr57tHw3CuEedTKY"
+    "MB60sXNBscuAe0Nzj2WzSWUA2awuDQDnRIvTsbONqTONF2Plh8mXPemlR8mJN/9eToftAX"
+    "fpFLFJnLOTpSkyT7VxR6rQ4TWSIT/tbmLqcaMCwuOaAsLjYgFhMve3GmSYQrdNnYcyG/Xt"
+    "rRf0pGCqjbkzjZcbzIcJoms/rmQQUfzKI9/g3ivBZBi1jSNErc53/hLc3Zkxp0/Arrb+Ya"
+    "7Q9gnYr9Hr+1+X73dHbnV3ZJbV3HhfJJer+6yEXDpe1HJ+v9nf0W84vB2W8H7pubM67u8B"
+    "S00emNhTBGC1+XtSqlukFHNpUyzH5I+OjNpJNN5vTuw3J3bC+oeJknps/Bq9vn9sXIKlfv"
+    "4/htLaJA=="
+)
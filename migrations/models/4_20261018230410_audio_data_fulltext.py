@@ -0,0 +1,118 @@
+from tortoise import BaseDBAsyncClient
+
+RUN_IN_TRANSACTION = True
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        ALTER TABLE `audio_data` ADD FULLTEXT INDEX `ft_audio_data_qa` (`user_question`, `ai_response_text`) WITH PARSER ngram;"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        ALTER TABLE `audio_data` DROP INDEX `ft_audio_data_qa`;"""
+
+
+MODELS_STATE = (
+    "eJztXWtzm0rS/isqPsVV3hghrvnmxM4e78Zx3ljZs7XJKYrLILORhI6E4nh389/f6RkGZr"
+    "gZZMlCMvng2NA9QPcw8/QzPc1/pVnko+nq9fliIb0Z/FeaOzOEf+EPnw4kh5xNDsKB2HGn"
+    "RM5JBNxVvHS8GB8KnOkK4UM+WnnLcBGH0RwEv601ZKnf1oammN/WKhq539amqZug7UceVg"
+    "/nEypoKMjDPx0Pixi6qYqqmmsh3ECgjb7N/zKA+30zyEmoso9/twL52zoIZDiiKQFcVKZH"
+    "LNDk7i/fgD7ysLiJJeHu1vPwzzWy42iC4ju0xPf49Q98OJz76CdasT8X3+0gRFNfsGLoQw"
+    "PkuB0/LMixq3n8ngjCg7u2F03Xs3kmvHiI76J5Kh3OYzg6QXO0dGIEzcfLNdh3vp5OEy8w"
+    "k9M7zUToLXI6Pgqc9RS8BNr0BrJjkm1/vBnbt5dj25YKHmQanK+SQ140B+/jW12Rp5/ALf"
+    "xFGaqGao501cQi5DbTI8YveunMMFSRmOfjWPpFzjuxQyWIjTOjkv8LZn135yzL7crkc5bF"
+    "t5y3LLNjd007c37aUzSfxHdgT02rMeQ/zj+/++388yssdQKXjPD7Sd/Zj8kphZ4Da2fW5e"
+    "+shZFzatuxNTuQGTsbXI7D2t4SgT1sJy4a+wKficMZKje4qJmzt5+ovma/HKL18QP6N/Pp"
+    "Q/KO1Rh/fHV9eTs+v/4El5utVn9Oif3Ox5dwRiFHH3JHX+k5P6WNDH6/Gv82gD8H/7r5eE"
+    "nMG63iyZJcMZMb/0uCe3LWcWTPo3vb8bnhgB1lVhO8vl74G3pd1Oy93hWvMxtxbk/uPvO6"
+    "swjt7+ihzajKqfSzV9V4Cugr+M5BBTjgOt73e2fp28IZ3hkL/IA/Qg+tig55myi///tnNH"
+    "Uq5rQEIV+QRhKcfGAv2y/W39hR1m3BgpESVdm0eGqmzErNXGnia2f+MI7gJ+n5V/gOnLlX"
+    "htMEOx9cn68y8WnyYHYu4MoecwldDw/1XI+ldoyWxAkwLqQWtmnwkHooOQm9nJ6J75bRen"
+    "LHaSSRG7Y0vjCK6Uh0fvvu/IIMfnY+5CCdYubMnQk5BI/76zQLFNd+GOG5y5HKosj05Glt"
+    "LAlits/kGoSUlhGM8E/TGuKgTTNkCN10HB0aroOPGKqsVwaZTVUhVFyv0NLGnWnFgsUkTF"
+    "RGBm5CQ4g0RESZlH3nrO6qRa8vtDQ2VeBSBvJU9rtlGhpTZNGqE9p4JlrgboQjUfQzJiGr"
+    "peBGdUfBN6wZJo6WNd1HcBziX10z4ayheESf2DYIp8heOPHd4+q8fUz8WuDjAQnFjZEMP1"
+    "UZmo3jlY3f3CXFJG8G4/EtCEKcrVkQv+taAE+kBSoT96LZAvobr+CaHthoKOcVMpQLd6xr"
+    "LjRsAgGga0iDxxsGxEMpLiJyOtZOpDO5ZrH8V0lwIShxUPsPmNCzgU4SegbptTk/gYaEfi"
+    "7wwRUWSQdM9oYEsZ11e/tP0vPZyPf+y4cP48t/jiXSBH4Z4CDFKZ/OP99efh7MJ0tnJv3q"
+    "+Yfn5B8KPhftO8auqgDvecUuR8lS1dCVH0tr571S3J506RSyM0T36vr8nycCbP9w8/GvTJ"
+    "xDgO8+3LzNBdKFl7YpxC4oPp9TJGlLLmGziZfRqybiZ5ZmPhPx+UhpAM9HSiU6h1Oijwpj"
+    "Y4t3p0y3469P0+m5my9UDjC0ilqLqh13lQgGwTEqAhiSAZ9N3iBt2OQVwlKV7xA5J/pFRF"
+    "xt+aOi9hY4pGRy37WbarDl01+hbnNJRQoxj6Q36Qh5/cOhE6WasOHl9YXDWkTYQiggVYWC"
+    "DUfpw+SY+5WFqr5QGe4fbV+oWm9owYU/keOtZQMTFrOECsz4zWoe0M9kGnCAputSUG1Ucn"
+    "28SHn6iCDRKH0E6FjKog0daDWw0t+HBgaTpqwRQo+wZVxuCW3RkkHSDDwjXT+ACyh+Qn1R"
+    "6jG7GEXU0XJGCS7ThV7O3zTkyQCZBicDawR3EeAr6ObII6ApoFe+d34MzgbRYr3C/80WI3"
+    "qJZsxYzzL1WS6HvE7YZ7nsy9r88LUBkZDqPSM1hwfKluzchgYf6g3sPczDiMzccKrPKTru"
+    "7JIe+b9ErzfJKQpXNobH4Y8SqPA2iqbImVegMF4v53IXK+7KywxG7C7Tosyrb29uPggOfX"
+    "uVZ8C/XL+9xOMs8SQWCmk+BIVpGyUYZVkWfYLRDhOMyu3bOrtoQ/MeVGpR8oz5vCI+RUtM"
+    "Lcqyh/J5RULS0dNSi+hM1oBNqNihIrwej3EKdovtKgIlwO8u4cL7BnyDimRU3wDjBKrDf6"
+    "wzkjVgJhSX6Rte4ILOEGJ9T4NruBqsKLouWQweOlzyaElw/5WnWbBV/uij/T1G+9mr1tCw"
+    "mcLjxj2AiWI79i3Mvq1MKuj0Vq0CP3kjFy38PlqicDL/O9p9bm9H8Q1Ms859OniKXat0Ws"
+    "ztFFhswarHBRnzJs0GwHJ77mfh40M0Cef4RxlSSc/VApUpSNnTRKwBTjF0A0BBoGls9UsL"
+    "/Oq1kDpxluvMVkV4WT7zjKyQYNlwAaEqpLa+GVx9yucGsyfxnDRtmmtPlMV9OV6T9RRd9X"
+    "yyPgPJbIqr4yOyPBy8Wq09jFJXZ4ETTpF/QnfwkrfqkTUcLOguo3v8WKR5X4WtvZYHQEyn"
+    "jxwVL0zAlYH8IHuQGb46dnr+OdQAQdKQrHOiwJPk5cS8Zoi//Vk4p9nKsLqEsZ0uZp9rqm"
+    "b2KzPdw2rsDWnDZPM6XV41kOpf+oZr6gLBrasNCG5drSS44ZQI7rJhp40LRK1OO0EcSzcx"
+    "utpkFUetXsRRC2s44mjexvBFzY2M/0xZhlWz1CZe2MliGp0q2zgg0+h0r6+a+zeyvNzE8H"
+    "K13eXiinEKNtqtGAtq3e755QiqMz0/gXFtzM+pdNv0eVzaGaNHrYaaaPNh5vlMXQr0O2Nw"
+    "IdpoP89yit12Q3kQtYkbNLnJaI+lqvdZyIXxPovk2q6ni5qHs55eIAfaZdQf6Cp7k9wKFq"
+    "2XLOQ+tsjO1J5xjT090jKJup6FOJAF+B2Te5FUTuxFj5J6UTM+D9pqUL+gXEwoiKcHsDXC"
+    "LLJhYhEATqx851tJrbysPl6e/6K5REBflu/DJ1xjwn+R/JM8AYZ/BpR36Kmv7lFf+01K3t"
+    "1O3dJ3pTOIcKNNuIe0/fbxQWgjWLiL7bd7TBx/vgCpdHjvDDLP5piiB2qKbwhaHXdA6bz5"
+    "ZBS2kzoBx5+BKtUhlH3C4ped9A/zhjKEcBWRnW4vY+NnvxWg3wR8IJuAr5EfOu9D8siFmD"
+    "k7eVoXOM9AjJSSaRY+49HAsZRkf6+IJXF8PHjFsKahqMbgbEAYd51WfjkpBNn1jaWbg6sa"
+    "zPJ305h8ZAVZ8ZKsORpz6MpQzy25u5YDMqpVG8Orge+T9F+T1cs39MBkm5L54n20RpQakG"
+    "JElqmQvJvQOwtnk7Of+N/rfy8mzeP9pDlthMju6JEDRfsNBxqgfoNX580gnOH+Mfjf4Efo"
+    "o4jk2yxDNI/TrCDRyC551iG1nneHZf8TYeHp2Q+0xLfqTOsui0HF6i66L5AKHklmsEZMiO"
+    "aLFcQUBT+gpesq860ZwGPmjvfbpXtmols5kz0HsR9L74RhIEZrW8VQUNpKcNuhCgDbzyA7"
+    "ehanS0NHhgXa2FrUOsLBY9iEGhtWM2PDAjHG4ao2ls6pdbhXFxA5DxaHTglY3IjD33ruWA"
+    "JL2zNkTKvT/FgHdmjnjJ1sB2lt7kyv28v1HbP4y+Memw/5h8ks9SzjS/R61/lE+O8qRjOp"
+    "jE9MT57W8omkMELI5BrwiXz9bp77qtheVyfOU4FCWfBNvlfJN8Dxc/DNDPyiTKLlQ17K8E"
+    "hyn6K4g1czZ4rOAkT+i4DAOikh5oRLpFhr8KoEZ53UsXKw9WOaspXkiyTJxgr+CkWe0hwi"
+    "KKeoOMBrasOA1foFG0GXQnP/LCEwqavPiM3czGbr5ZQQpAjYWMOBC2SX/PL5Q91dx3frmT"
+    "t3wmnBjoFiwQ3pGiN/xWQpEouvwv8U/CxQvqQ4vOaxwoysfIOpmEpy/4ytRTKQwIGSVjnm"
+    "7WLSFDDXMhiBrCuqy85qpk4KRlhWDTuq6yNE2dGe2OyJzS6Z9qjrQL48IohNTG0szet0mQ"
+    "SSqubaN4PCXLsJKdGzRU91SYZg3gw6yxRlUKmNT0StjrukGfwza+GftYm3drJagxFmG08l"
+    "4t12USVc7ozVU2zexvaCUrc90DTc6IxD0pinhHQNJ5VBgKC2UcmtPU0lbQK5hk6icYSlKK"
+    "ORocgj3dRUw9BMOQ0oiqfqIou3V3+F4EJwYSlZ3q9M9Dz5/qOPw2RMe578JXq94zz5zQL6"
+    "AHZFRR064fxpHVseMck29ej48goN6tHViefr0QmVG0rq0WX3SzNP87UeSEyOZ/DBq3efL3"
+    "EnOfvyCfrK2cXlh8vx5YnYBO6rMY50861oQxPu0XUJpRo7ywmK08sZOko3svGXg4c4o6Vg"
+    "zrC5KV0NtK1qnXDNhL7YyNXF41X2NqycF+M/VsmnhOhHYnV+wWLw6m+3Nx/57wflrMNK3I"
+    "nu60vcHQfpfOQl7urGkU1Cqu0nKIojWSt+rqB5SM5Ix8xu0HGF2WAzT3DKB+SMbKbbiGbY"
+    "xdZfbrptxfyIat3mfsoxxGYuaOSBGgdU2L9szn3U+qVzb2dtf3XRDYv3tU73UOu0L7G5l9"
+    "k2iUqKdodYpGohPlXJ8yOhFw/+N5iGq07RyOXhVjP719gbLCQwI4XSDvkqDqci5QEN5Es7"
+    "iNFeW/aqqH04DFaBl+hL4fWl8PpSeKcph/jJie8+oeUsXK2o2QosY07itI5nhMwFeyEKN/"
+    "lCF5cyoBvqCPZoa3L1V7lqxIGwYgmqmRypFwDb5M9WD6sYzc7Q/MeJkMXLNSNu0M9n63KC"
+    "YrZuylRyEnnqkLCCHE+RyZ4OlvitI3dt+QqsOhoKf76eXYTny9q9umAppFlbVxcnTyvX91"
+    "ViaSks+srCgf6TY/vk+NomGR3CPm7pqckRO8l7PMbaBFLV4NcN/vTo83qlqjmlM72+NUl3"
+    "IHR16Tz9hqxTnsFkvIkDtp/dW8PUVc6cdURdpz6AKG0AYxq6ZcvfoeyrI/aZV3t5RY49B6"
+    "fPvHqJXu945tUjjEhTNqQ1EdKA/CgjPOpZDEJ+ZIXzyJhOyAAP33KBsQhI7UIT8o347cun"
+    "KXOhIhPBTzSicux755qikLqdjn9SQSH0LMGL3X6671Fyx1EqvEltjMvkj25vb08AHPbG3h"
+    "5eHxnQ6uH1S/T6/uF11ruASitJBbl25g/jCH6SrnWFze7MvbJZMUHdnxNK7qBmx1/sjWFH"
+    "s+vTCka50II95BJNyYuVrvGkoQQ1ZbQkXviOHpiJE7YvdVByKlNMBOK7ZbSe3KVqYpCCxZ"
+    "LaeTC7nt++O78gfc/OQ+lftfETeYySyIk9XnXMxIjXRsvG3Epp1VJxToSPlvhzuWgpDXtI"
+    "nMQZn5Q5t4YOq8lOf88CqD7y6SOfLpm2B+c9OO/BeVdhWg/OX6LXuwTO87jyaRBdJMYPaq"
+    "ZsC9TFR83D9SzmEYF6AY3n4TqH5LcA1EtGkxVabsPTX1bo8NBQWx+zh2zqXTBuK78SBRbx"
+    "bCn0ug1j9C6aB2FpyQDu7GldGLbCcmAoJtggGjMcH8obyVCczRqqEE4FOqqMzOrE0wI8Q/"
+    "hd81T4XBXyNPELWbSqrm7oQ9iNAZ+Lo9+7ZzVj4zCmGbVGoA3ZBel2PMu0TFrQdhIl9Wzh"
+    "Q9xY1jI0i26lEasDlX+IiySscGdgbSz5FFeaoQs3RcLIwPkRYpMm13tP/8p9ubvd5ftos3"
+    "vRJul1bYKhVKEPgxqFQek728bIgtLxGXo3peC48aqNrfN6vbmbFaDsA70+0HvOJKdbjFNW"
+    "v0Xr5fTh/9ZoFVdkO5WJ1WNHULDviIb9J6/S5KuvFOK4APMM5AesMD6ty0j3b+qeCnun5J"
+    "FbiS43aYahTn0kWwNeFP8hy74B6FADRAfoEf4wYQOaKWsOWT8ws6+yWi5JkHJYu4buJ+0K"
+    "tZXW5kgeEfwHv7sBpKCPfD1DsGBDkqClqGRbvWKKT0DvF+NgNHDWfhjZgEpeZ2zfgNxYuu"
+    "9VG0H6F71JXTNUBr/Z5ZivyPcH81vVsken36YdXF9opGwVmswQfk+TElSaeIe09Ag9nm8B"
+    "ntwHgGyRtReFeMN1NXJzdEsd7kd8+7qBPTMe38Kl5KHBLpJ8KreigRlWpTqJqznNxOEugv"
+    "KsZDmo5rOwXyXwB5wUDPW03W91RVWPDHI/S0XUamDOnNdmZmU6zzOnbsEnUtVgkR8jWyfx"
+    "d3xiLVJd4kvaAr8WFLucAilVjdJ4eG7mcxHajpog21E1sB0VcC0bwFtwDbzK821fkltbvm"
+    "7+amj8LW9T4mfMFgbPq3XZ6AAC8HzeBALszwezEuvXTfWZTndNT4zeBkN1CRl0JOYiSwol"
+    "QRZbaqiOqtZMogkVz80IVfR7TiRfoTdfTbMsLcpZre4jbBEWLmiup7M9IZrqAf5Askc0FU"
+    "dm5yl5r8kO3YTi/MCAbUnzqkYQE8hkA7TwITY0S77eZskOfOHMdYfkBvCLgpL4CIr5GxDe"
+    "aKPAgJP4jfFpwQ1dJoX9C5/LW8+/Y+wwT+roLpxlPGNlgimE8jSYS2VkknmVmIgs/ZQngW"
+    "XpZD0t3z1avhuFcI86GUwYD9rYuaDYZcC9obmHitmkMoBiVpcGgHOixenY2cbUmcazsfJS"
+    "8mVPeumz5MTrfy8mUnvAXTpFbBLn7GRpisxTbdyRKnR4jUTip91NTD1sVEB4WFNAeFgsIE"
+    "zm/laDDFPotqnzUGajvr31gp4UTLUxd6bxfIO5lCC69uNKBhHFrzzyDe69EkyGUds4QtTq"
+    "fOcvwd2dGXP6BOxq6x/mCm2fgP0Svb7/dfl+d+RWd0dmWc2N90VyubpPSsil40Ut5/e78x"
+    "39jsNbqYT3S8+d1nF/91jKvmdijxGA1ebvSalukVLMpU2xHJM/OjJqJ9F4vzmx35zYCesf"
+    "JkrqsfFL9Pr+sXEJlvr1/7FaCks="
+)
@@ -6,6 +6,8 @@ AUDIO_DIR = BASE_DIR / 'static'
 AUDIO_DIR.mkdir(exist_ok=True, parents=True)
 FAIL_DIR = AUDIO_DIR / 'fail'
 FAIL_DIR.mkdir(exist_ok=True, parents=True)
+GREETING_DIR = AUDIO_DIR / 'greeting'
+GREETING_DIR.mkdir(exist_ok=True, parents=True)
 SETTINGS_DIR = BASE_DIR / 'settings'
 PROMPT_PATH = SETTINGS_DIR / 'prompt.txt'
 
@@ -15,7 +17,26 @@ class Settings(BaseSettings):
     model_name: str
     api_key: str
     max_file_size: int
+    # STT 前的语音检测与静音裁剪
+    stt_vad_enable: bool = True
+    stt_vad_margin_db: float = 10.0
+    stt_vad_min_speech_ms: int = 250
+    stt_vad_padding_ms: int = 200
+    # 流式 STT 上游（WebSocket），为空时 websocket 语音会话仍整段上传识别
+    stt_stream_url: str = ""
+    stt_stream_final_timeout: float = 5.0
+    # 推测执行：流式 STT 中间结果稳定后提前请求 LLM
+    llm_speculative_enable: bool = False
+    llm_speculative_stable_ms: int = 400
     tts_url: str
+    # 多个 TTS 节点（逗号分隔的 base url），为空时只用 tts_url
+    tts_urls: str = ""
+    # 首个请求超过 p95 延迟（不低于该下限，秒）时向另一节点发对冲请求
+    tts_hedge_enable: bool = True
+    tts_hedge_min_delay: float = 1.0
+    # 被动健康检查：连续失败次数与摘除时长（秒）
+    tts_eject_failures: int = 3
+    tts_eject_seconds: float = 30.0
     reference_id: str
     zhiyun_app_key: str
     zhiyun_app_secret: str
@@ -33,6 +54,10 @@ class Settings(BaseSettings):
     # TTS服务
     tts_service: str 
     local_tts_speed: float
+    # 输出音频格式 wav / opus / mp3，可被请求头 audio_format 或设备配置覆盖
+    audio_format: str = "wav"
+    opus_bitrate: str = "24k"
+    mp3_bitrate: str = "48k"
 
     # redis
     redis_host: str = "localhost"
@@ -48,6 +73,65 @@ class Settings(BaseSettings):
     # 信号量
     semaphore: int = 3
 
+    # 写后批量落库（AudioData / 操作日志 / 登录日志）
+    write_behind_batch_size: int = 200
+    write_behind_flush_interval: float = 1.0
+    write_behind_max_queue: int = 10000
+    # 仪表盘小时汇总：脏小时重算间隔（秒）、汇总表为空时回填的天数
+    stats_rollup_interval: float = 60.0
+    stats_rollup_backfill_days: int = 8
+    # 系统资源后台采样：间隔（秒）、内存中保留的样本数、是否写入 Redis 供集群视图
+    resource_sample_interval: float = 5.0
+    resource_sample_history: int = 720
+    resource_sample_redis: bool = False
+    # 热门问题：桶内最多保留的问题数、小时桶保留天数、衰减半衰期（小时）、计入的问题最大长度
+    hot_topics_bucket_size: int = 2000
+    hot_topics_retention_days: int = 8
+    hot_topics_half_life_hours: float = 24.0
+    hot_topics_max_length: int = 100
+    # 热门问题预缓存（共享缓存 key，回答对所有用户相同，默认关闭）
+    hot_topics_warm_enable: bool = False
+    hot_topics_warm_top: int = 10
+    hot_topics_warm_window_hours: int = 24
+    hot_topics_warm_min_count: int = 3
+    hot_topics_warm_interval: float = 600.0
+    # 在线用户滑动窗口（秒）
+    online_window_seconds: int = 300
+    # 音频数据冷归档：保留天数、检查间隔（秒）、每批记录数、批间暂停（秒）、归档目录（为空时为 archive/）
+    retention_enable: bool = False
+    retention_days: int = 180
+    retention_interval: float = 3600.0
+    retention_batch_size: int = 500
+    retention_batch_pause: float = 0.5
+    retention_archive_dir: str = ""
+    # 生成音频的磁盘预算回收：预算（MB）、检查间隔（秒）、最短保留时间（秒）、每批删除的文件数
+    audio_gc_enable: bool = False
+    audio_gc_budget_mb: int = 2048
+    audio_gc_interval: float = 600.0
+    audio_gc_min_age: float = 900.0
+    audio_gc_batch_size: int = 200
+    # 认证主体缓存：进程内有效期（秒）、Redis 中的有效期（秒）
+    principal_cache_ttl: float = 5.0
+    principal_cache_redis_ttl: int = 300
+    # 上传大小上限（MB）：图片（含头像 / logo / 缩略图）、视频、模型压缩包
+    upload_max_image_mb: int = 20
+    upload_max_video_mb: int = 1024
+    upload_max_model_mb: int = 4096
+    # 模型包分块上传：分块大小（MB）、会话有效期（秒，期间无新分块即过期）、暂存清理间隔（秒）
+    model_upload_chunk_mb: int = 8
+    model_upload_session_ttl: int = 86400
+    model_upload_cleanup_interval: float = 3600.0
+    # 媒体目录同步：startup 启动时阻塞执行，background 启动后在后台执行；后台模式的重新扫描间隔（秒，0 为只执行一次）、哈希计算线程数
+    media_sync_mode: str = "startup"
+    media_sync_interval: float = 0.0
+    media_sync_workers: int = 4
+    # 图片派生文件（缩略图 / WebP）：宽度档位、输出格式（webp、avif）、编码质量、进程池大小
+    image_variant_enable: bool = True
+    image_variant_widths: str = "320,640,1280"
+    image_variant_formats: str = "webp"
+    image_variant_quality: int = 80
+    image_variant_workers: int = 2
+
     # 最大上下文长度
     max_conversation_rounds: int
 
@@ -81,6 +165,11 @@ class Settings(BaseSettings):
     # greeting
     greeting_enable: bool
 
+    # 问候语音频池预渲染范围（逗号分隔），语速为空时使用 local_tts_speed
+    greeting_voices: str = "man,woman"
+    greeting_speeds: str = ""
+    greeting_languages: str = "zh"
+
     greeting_en: bool
 
     # 切分长度
@@ -96,6 +185,11 @@ class Settings(BaseSettings):
     # 数字转中文
     numbers_to_chinese: bool
 
+    # TTS 发音替换（逗号分隔的 原词:替换词），如 "成人:晨人,AI:A I"
+    tts_pronunciations: str = "成人:晨人"
+    # TTS 文本规范化结果的 LRU 缓存条数
+    tts_normalize_cache_size: int = 4096
+
     # 纠错大模型
     correct_api_key: str
 
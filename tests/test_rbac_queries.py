@@ -0,0 +1,173 @@
+"""
+RBAC 读接口的查询次数回归测试：角色 / 权限 / 用户数量增加时，执行的 SQL 条数不变
+"""
+import importlib.util
+import pytest
+
+pytest.importorskip("tortoise")
+pytest.importorskip("pydantic_settings")
+
+from conftest import QueryCounter, run, sqlite_db  # noqa: E402
+
+# 每个角色取 3 个不同权限，规模至少为 3
+SIZES = (3, 9)
+
+
+async def _seed(n: int) -> int:
+    """n 个权限、n 个角色（每个角色 3 个权限）、n 个用户（每个用户 2 个角色）和一个管理员，返回管理员 id"""
+    from api_versions.v2.models import Permission, Role, User
+
+    permissions = [await Permission.create(name=f"权限{i}", code=f"perm:{i}") for i in range(n)]
+    roles = []
+    for i in range(n):
+        role = await Role.create(name=f"role{i}")
+        await role.permissions.add(*(permissions[(i + k) % n] for k in range(3)))
+        roles.append(role)
+    for i in range(n):
+        user = await User.create(username=f"user{i}", password_hash="x")
+        await user.roles.add(roles[i], roles[(i + 1) % n])
+
+    admin_role = await Role.create(name="admin")
+    await admin_role.permissions.add(*permissions)
+    admin = await User.create(username="admin", password_hash="x")
+    await admin.roles.add(admin_role, *roles)
+    return admin.id
+
+
+def _query_counts(scenario) -> list:
+    """每个规模下执行 scenario(conn, admin_id) 的 SQL 条数"""
+    async def measure(n: int) -> int:
+        async with sqlite_db() as conn:
+            admin_id = await _seed(n)
+            return await scenario(conn, admin_id)
+
+    return [run(measure(n)) for n in SIZES]
+
+
+def _assert_constant(scenario, expected: int = None):
+    counts = _query_counts(scenario)
+    assert len(set(counts)) == 1, f"查询次数随数据量增长: {dict(zip(SIZES, counts))}"
+    if expected is not None:
+        assert counts[0] == expected
+
+
+def test_roles_with_permissions_query_count():
+    from api_versions.auth import rbac_queries
+
+    async def scenario(conn, admin_id):
+        with QueryCounter(conn) as counter:
+            roles = await rbac_queries.roles_with_permissions()
+        assert all(len(role["permissions"]) >= 3 for role in roles)
+        return counter.count
+
+    _assert_constant(scenario, expected=2)
+
+
+def test_roles_by_user_query_count():
+    from api_versions.auth import rbac_queries
+    from api_versions.v2.models import User
+
+    async def scenario(conn, admin_id):
+        user_ids = await User.all().values_list("id", flat=True)
+        with QueryCounter(conn) as counter:
+            roles = await rbac_queries.roles_by_user(list(user_ids))
+        assert len(roles[admin_id]) > 1
+        return counter.count
+
+    _assert_constant(scenario, expected=1)
+
+
+def test_user_permissions_query_count():
+    from api_versions.auth import rbac_queries
+
+    async def scenario(conn, admin_id):
+        with QueryCounter(conn) as counter:
+            permissions = await rbac_queries.user_permissions(admin_id)
+        assert len({p["code"] for p in permissions}) == len(permissions)
+        return counter.count
+
+    _assert_constant(scenario, expected=1)
+
+
+def test_users_page_query_count():
+    from api_versions.auth import rbac_queries
+    from api_versions.v2.models import User
+
+    async def scenario(conn, admin_id):
+        with QueryCounter(conn) as counter:
+            total, users, roles = await rbac_queries.users_page(User.all(), 0, 100)
+        assert total == len(users) and all(roles[user.id] for user in users)
+        return counter.count
+
+    _assert_constant(scenario, expected=3)
+
+
+def test_principal_load_query_count():
+    """/user 与所有鉴权依赖在缓存未命中时的数据库加载"""
+    from api_versions.auth.principal import PrincipalCache
+
+    async def scenario(conn, admin_id):
+        cache = PrincipalCache()
+        with QueryCounter(conn) as counter:
+            principal = await cache._load(admin_id, None)
+        assert principal.is_admin and principal.permissions
+        return counter.count
+
+    _assert_constant(scenario, expected=3)
+
+
+# ------------------------------ 接口层 ------------------------------
+
+needs_routers = pytest.mark.skipif(importlib.util.find_spec("jwt") is None, reason="auth 路由依赖 PyJWT")
+
+
+class _Request:
+    """接口只用到 url_for 构建头像 URL"""
+
+    def url_for(self, name, **path_params):
+        return f"http://testserver/static/{path_params['path']}"
+
+
+async def _admin_user(admin_id):
+    from api_versions.auth.principal import PrincipalCache
+
+    return (await PrincipalCache()._load(admin_id, None)).user
+
+
+@needs_routers
+def test_get_roles_endpoint_query_count():
+    from api_versions.auth.routers import get_roles
+
+    async def scenario(conn, admin_id):
+        admin = await _admin_user(admin_id)
+        with QueryCounter(conn) as counter:
+            await get_roles(current_user=admin)
+        return counter.count
+
+    _assert_constant(scenario)
+
+
+@needs_routers
+def test_get_users_endpoint_query_count():
+    from api_versions.auth.routers import get_users
+
+    async def scenario(conn, admin_id):
+        admin = await _admin_user(admin_id)
+        with QueryCounter(conn) as counter:
+            await get_users(request=_Request(), page=1, size=100, search=None, current_user=admin)
+        return counter.count
+
+    _assert_constant(scenario)
+
+
+@needs_routers
+def test_get_user_permissions_endpoint_query_count():
+    from api_versions.auth.routers import get_user_permissions
+
+    async def scenario(conn, admin_id):
+        admin = await _admin_user(admin_id)
+        with QueryCounter(conn) as counter:
+            await get_user_permissions(user_id=admin_id, current_user=admin)
+        return counter.count
+
+    _assert_constant(scenario)
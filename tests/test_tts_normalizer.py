@@ -0,0 +1,51 @@
+"""
+TTS 文本规范化：benchmarks/data/tts_normalizer_golden.jsonl 金标准逐条校验
+"""
+import json
+from pathlib import Path
+import pytest
+
+pytest.importorskip("emoji")
+pytest.importorskip("pydantic_settings")
+pytest.importorskip("loguru")
+
+from settings.config import settings  # noqa: E402
+from utils import tts_normalizer  # noqa: E402
+from utils.tts_normalizer import normalize_tts_text  # noqa: E402
+
+GOLDEN_PATH = Path(__file__).resolve().parent.parent / "benchmarks" / "data" / "tts_normalizer_golden.jsonl"
+# 与 benchmarks/bench_tts_normalizer.py 一致
+PRONUNCIATIONS = "成人:晨人"
+
+
+def _golden_cases():
+    with open(GOLDEN_PATH, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+@pytest.fixture
+def configure(monkeypatch):
+    def apply(numbers_to_chinese: bool):
+        monkeypatch.setattr(settings, "tts_pronunciations", PRONUNCIATIONS)
+        monkeypatch.setattr(settings, "numbers_to_chinese", numbers_to_chinese)
+    return apply
+
+
+@pytest.mark.parametrize("case", _golden_cases(), ids=lambda case: case["input"][:30])
+def test_golden(case, configure):
+    configure(case["numbers_to_chinese"])
+    assert normalize_tts_text(case["input"], markdown=case["markdown"]) == case["expected"]
+
+
+def test_digits_skip_emoji_library(configure, monkeypatch):
+    configure(False)
+    calls = []
+    monkeypatch.setattr(tts_normalizer.emoji, "replace_emoji", lambda text, replace="": calls.append(text) or text)
+    assert normalize_tts_text("电话 12345 #3 *7") == "电话 12345 #3 *7"
+    assert calls == []
+
+
+@pytest.mark.parametrize("text", ["按1️⃣号键", "按1⃣号键", "按#️⃣号键"])
+def test_keycap_removed(text, configure):
+    configure(False)
+    assert normalize_tts_text(text) == "按号键"
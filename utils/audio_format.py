@@ -0,0 +1,104 @@
+import subprocess
+import time
+from pathlib import Path
+from core.logger import logger
+from settings.config import settings
+
+WAV = "wav"
+
+# 客户端可协商的输出格式：扩展名 + FFmpeg 编码参数（均为 16kHz 单声道，与 WAV 一致）
+AUDIO_FORMATS = {
+    "wav": {"ext": ".wav", "codec": ["-f", "wav", "-acodec", "pcm_s16le"]},
+    "opus": {"ext": ".ogg", "codec": ["-f", "ogg", "-acodec", "libopus", "-application", "voip"]},
+    "mp3": {"ext": ".mp3", "codec": ["-f", "mp3", "-acodec", "libmp3lame"]},
+}
+
+# 设备音频格式的进程内缓存：device_name -> (format, 过期时间)
+_DEVICE_FORMAT_TTL = 60
+_device_format_cache: dict = {}
+
+
+def normalize_audio_format(value):
+    """统一格式名，不支持的返回 None"""
+    if not value:
+        return None
+    value = str(value).strip().lower()
+    if value in ("ogg", "ogg_opus", "opus"):
+        return "opus"
+    return value if value in AUDIO_FORMATS else None
+
+
+def audio_ext(audio_format: str) -> str:
+    return AUDIO_FORMATS[audio_format]["ext"]
+
+
+def encoder_args(audio_format: str) -> list:
+    """FFmpeg 输出参数（不含输出路径）"""
+    args = ["-ar", "16000", "-ac", "1", *AUDIO_FORMATS[audio_format]["codec"]]
+    if audio_format == "opus":
+        args += ["-b:a", settings.opus_bitrate]
+    elif audio_format == "mp3":
+        args += ["-b:a", settings.mp3_bitrate]
+    return args
+
+
+def invalidate_device_format(device_name: str = None):
+    """设备配置变更后清除缓存"""
+    if device_name is None:
+        _device_format_cache.clear()
+    else:
+        _device_format_cache.pop(device_name, None)
+
+
+async def _device_audio_format(device_name: str):
+    cached = _device_format_cache.get(device_name)
+    if cached and cached[1] > time.monotonic():
+        return cached[0]
+
+    audio_format = None
+    if settings.enable_database:
+        try:
+            from api_versions.v2.models import Device
+            rows = await Device.filter(name=device_name).values_list("audio_format", flat=True)
+            audio_format = normalize_audio_format(rows[0]) if rows else None
+        except Exception as e:
+            logger.warning(f"读取设备音频格式失败: {e}")
+    _device_format_cache[device_name] = (audio_format, time.monotonic() + _DEVICE_FORMAT_TTL)
+    return audio_format
+
+
+async def resolve_audio_format(request) -> str:
+    """
+    确定本次请求的输出格式，结果缓存在 request.state 上
+    优先级：请求头 audio_format > 设备配置 > 全局默认
+    """
+    state = request.state
+    resolved = getattr(state, "resolved_audio_format", None)
+    if resolved:
+        return resolved
+
+    audio_format = normalize_audio_format(getattr(state, "audio_format", None))
+    device_name = getattr(state, "device", None)
+    if not audio_format and device_name:
+        audio_format = await _device_audio_format(device_name)
+    audio_format = audio_format or normalize_audio_format(settings.audio_format) or WAV
+
+    try:
+        state.resolved_audio_format = audio_format
+    except Exception:
+        pass
+    return audio_format
+
+
+def transcode_file(src: Path, audio_format: str) -> Path:
+    """
+    把已生成的 WAV 转成目标格式（同步，需放在线程池中执行）
+    成功后删除源文件并返回新路径
+    """
+    dst = src.with_suffix(audio_ext(audio_format))
+    cmd = ["ffmpeg", "-y", "-loglevel", "quiet", "-i", str(src), *encoder_args(audio_format), str(dst)]
+    result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    if result.returncode != 0 or not dst.exists():
+        raise RuntimeError(f"音频转码失败 {src.name} -> {audio_format}: {(result.stderr or '').strip()}")
+    src.unlink(missing_ok=True)
+    return dst
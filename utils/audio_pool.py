@@ -0,0 +1,281 @@
+import asyncio
+import os
+import random
+import time
+import orjson
+from urllib.parse import urlparse
+from core.logger import logger
+from settings.config import settings, AUDIO_DIR, FAIL_DIR, GREETING_DIR, GREETING_LIST
+
+MANIFEST_PATH = GREETING_DIR / "manifest.json"
+# 请求头可以携带任意音色/语速，限制懒渲染的组合数量，防止池无限增长
+MAX_COMBINATIONS = 64
+# 渲染失败的组合按指数退避后再重试（秒）
+RETRY_BASE_SECONDS = 60
+RETRY_MAX_SECONDS = 3600
+
+
+def _split_setting(value: str) -> list:
+    return [item.strip() for item in (value or "").split(",") if item.strip()]
+
+
+def normalize_speed(speed) -> str:
+    """语速统一成字符串 key，避免 1.2 / "1.2" / "1.20" 被当成不同组合"""
+    try:
+        return f"{float(speed):g}"
+    except (TypeError, ValueError):
+        return f"{float(settings.local_tts_speed):g}"
+
+
+def normalize_language(language: str) -> str:
+    if not language or language in ("zh", "zh-CHS"):
+        return "zh"
+    return language
+
+
+class AudioPool:
+    """
+    问候语 / 等待音频池
+    - 问候语按 音色 × 语速 × 语言 预渲染，请求时直接从内存取，不再走一次 TTS
+    - static/fail 下的 think/fail 音频只在启动时扫描一次
+    """
+
+    def __init__(self):
+        # (voice, speed, language, audio_format) -> [(text, path)]，path 为 static 下相对路径或完整 URL
+        self._greetings: dict = {}
+        # kind(fail/think) -> voice -> [path]
+        self._clips: dict = {}
+        self._rendering: set = set()
+        # 渲染失败的组合 -> (下次允许重试的时间, 连续失败次数)
+        self._failed: dict = {}
+        self._fingerprint = None
+        self._warm_task = None
+
+    # ------------------------------ fail / think ------------------------------
+
+    def index_clips(self):
+        """扫描 static/fail，按 类型 + 音色 建立索引"""
+        clips = {}
+        try:
+            file_list = sorted(os.listdir(FAIL_DIR))
+        except FileNotFoundError:
+            file_list = []
+        for file_name in file_list:
+            parts = os.path.splitext(file_name)[0].split("_")
+            kind = "think" if "think" in parts else "fail"
+            voice = next((p for p in parts if p not in ("think", "fail") and not p.isdigit()), "")
+            clips.setdefault(kind, {}).setdefault(voice, []).append(f"fail/{file_name}")
+        self._clips = clips
+        logger.debug(f"fail 音频索引完成: { {k: {v: len(l) for v, l in d.items()} for k, d in clips.items()} }")
+
+    def random_clip(self, kind: str, voice_id: str):
+        if not self._clips:
+            self.index_clips()
+        candidates = self._clips.get(kind, {}).get(voice_id)
+        return random.choice(candidates) if candidates else None
+
+    # ------------------------------ 问候语 ------------------------------
+
+    @staticmethod
+    def _voices() -> list:
+        return _split_setting(settings.greeting_voices) or [settings.reference_id]
+
+    @staticmethod
+    def _speeds() -> list:
+        return [normalize_speed(speed) for speed in _split_setting(settings.greeting_speeds) or [settings.local_tts_speed]]
+
+    def _combinations(self):
+        from utils.audio_format import normalize_audio_format
+
+        voices = self._voices()
+        speeds = self._speeds()
+        languages = _split_setting(settings.greeting_languages) or ["zh"]
+        audio_format = normalize_audio_format(settings.audio_format) or "wav"
+        return [
+            (voice, speed, normalize_language(language), audio_format)
+            for voice in voices for speed in speeds for language in languages
+        ]
+
+    def _current_fingerprint(self):
+        return (settings.tts_service, tuple(GREETING_LIST), tuple(self._combinations()))
+
+    @staticmethod
+    def _key_str(key) -> str:
+        return "|".join(key)
+
+    def _load_manifest(self):
+        """读取上次渲染结果，TTS 服务和文案没变时可直接复用磁盘上的音频"""
+        try:
+            manifest = orjson.loads(MANIFEST_PATH.read_bytes())
+        except Exception:
+            return
+        if manifest.get("tts_service") != settings.tts_service:
+            return
+        for key_str, entries in manifest.get("greetings", {}).items():
+            key = tuple(key_str.split("|"))
+            if len(key) != 4:
+                continue
+            valid = [
+                (text, path) for text, path in entries
+                if text in GREETING_LIST or key[2] != "zh"
+                if path.startswith(("http://", "https://")) or (AUDIO_DIR / path).exists()
+            ]
+            if valid:
+                self._greetings[key] = valid
+
+    def _save_manifest(self):
+        manifest = {
+            "tts_service": settings.tts_service,
+            "greetings": {self._key_str(k): v for k, v in self._greetings.items()},
+        }
+        try:
+            tmp_path = MANIFEST_PATH.with_suffix(".tmp")
+            tmp_path.write_bytes(orjson.dumps(manifest))
+            os.replace(tmp_path, MANIFEST_PATH)
+        except Exception as e:
+            logger.warning(f"保存问候语音频清单失败: {e}")
+
+    @staticmethod
+    def _to_pool_path(url: str) -> str:
+        """TTS 返回的本地 URL 统一移入 static/greeting，避免被清理缓存时一并删除"""
+        parsed = urlparse(url)
+        if not parsed.path.startswith("/static/"):
+            return url
+        rel_path = parsed.path[len("/static/"):]
+        src = AUDIO_DIR / rel_path
+        dst = GREETING_DIR / os.path.basename(rel_path)
+        try:
+            os.replace(src, dst)
+        except OSError as e:
+            logger.warning(f"问候语音频移动失败，保留原路径: {e}")
+            return rel_path
+        return f"{GREETING_DIR.name}/{dst.name}"
+
+    async def _render_one(self, key, text: str):
+        from utils.tts_tools import tts_servers
+        from utils.zhiyun_translate import translate_youdao_async
+        from utils.spider.init_opening_statement import MockRequest
+
+        voice, speed, language, audio_format = key
+        if language != "zh":
+            translated = await translate_youdao_async(text=text, tgt_lang=language)
+            text = translated if translated and translated.strip() else text
+
+        mock_request = MockRequest(settings.api_key, voice, speed)
+        url = await tts_servers(
+            func_name=settings.tts_service,
+            request=mock_request,
+            text=text,
+            reference_id=voice,
+            user_question=text,
+            audio_format=audio_format,
+            save_to_db=False,
+        )
+        if not url:
+            return None
+        return text, self._to_pool_path(str(url))
+
+    def _mark_failed(self, key):
+        failures = self._failed.get(key, (0, 0))[1] + 1
+        delay = min(RETRY_BASE_SECONDS * 2 ** (failures - 1), RETRY_MAX_SECONDS)
+        self._failed[key] = (time.monotonic() + delay, failures)
+        logger.warning(f"问候语组合 {key} 渲染失败（第 {failures} 次），{delay} 秒后再重试")
+
+    def _may_render(self, key) -> bool:
+        """懒渲染只针对配置中的音色 / 语速，失败的组合退避期内不重试"""
+        voice, speed, _, _ = key
+        if voice not in self._voices() or speed not in self._speeds():
+            return False
+        if key in self._rendering or len(self._greetings) + len(self._rendering) >= MAX_COMBINATIONS:
+            return False
+        retry_at, _ = self._failed.get(key, (0, 0))
+        return time.monotonic() >= retry_at
+
+    async def render_key(self, key):
+        """渲染某个 音色 × 语速 × 语言 组合下的全部问候语"""
+        if key in self._rendering:
+            return
+        self._rendering.add(key)
+        try:
+            results = await asyncio.gather(
+                *(self._render_one(key, text) for text in GREETING_LIST),
+                return_exceptions=True
+            )
+            entries = [r for r in results if r and not isinstance(r, Exception)]
+            for r in results:
+                if isinstance(r, Exception):
+                    logger.warning(f"问候语预渲染失败 {key}: {r}")
+            if entries:
+                self._greetings[key] = entries
+                self._failed.pop(key, None)
+                self._save_manifest()
+                logger.info(f"✅ 问候语音频已就绪 {key}: {len(entries)} 条")
+            else:
+                self._mark_failed(key)
+        except Exception:
+            self._mark_failed(key)
+            raise
+        finally:
+            self._rendering.discard(key)
+
+    async def warm_up(self):
+        """启动 / 配置变更时预渲染全部组合，已有的组合直接复用"""
+        self.index_clips()
+        if not settings.greeting_enable:
+            return
+        fingerprint = self._current_fingerprint()
+        if fingerprint != self._fingerprint:
+            self._greetings.clear()
+            self._failed.clear()
+            self._load_manifest()
+            self._fingerprint = fingerprint
+
+        pending = [key for key in self._combinations() if key not in self._greetings]
+        if not pending:
+            logger.info("✅ 问候语音频池已是最新")
+            return
+
+        semaphore = asyncio.Semaphore(settings.semaphore)
+
+        async def _guarded(key):
+            async with semaphore:
+                await self.render_key(key)
+
+        logger.info(f"🔄 开始预渲染问候语音频，共 {len(pending)} 个组合")
+        await asyncio.gather(*(_guarded(key) for key in pending), return_exceptions=True)
+
+    def schedule_refresh(self):
+        """配置热加载后调用：组合或 TTS 服务变化时后台重新预渲染"""
+        if self._current_fingerprint() == self._fingerprint:
+            return
+        if self._warm_task and not self._warm_task.done():
+            self._warm_task.cancel()
+        try:
+            self._warm_task = asyncio.get_running_loop().create_task(self.warm_up())
+        except RuntimeError:
+            # 不在事件循环中（如脚本调用），下次启动时再渲染
+            self._fingerprint = None
+
+    def get_greeting(self, request, audio_format: str = "wav"):
+        """
+        从池中随机取一条问候语，返回 (文本, url)
+        未命中时后台补渲染该组合并返回 None，由调用方走实时 TTS
+        """
+        voice = request.state.reference_id or settings.reference_id
+        speed = normalize_speed(request.state.tts_speed or settings.local_tts_speed)
+        language = normalize_language(request.state.translate)
+        key = (voice, speed, language, audio_format)
+
+        entries = self._greetings.get(key)
+        if not entries:
+            if self._may_render(key):
+                asyncio.create_task(self.render_key(key))
+            return None
+
+        text, path = random.choice(entries)
+        if path.startswith(("http://", "https://")):
+            return text, path
+        return text, str(request.url_for("audio_files", path=path))
+
+
+audio_pool = AudioPool()
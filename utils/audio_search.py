@@ -0,0 +1,96 @@
+import html
+import re
+from tortoise import Tortoise
+
+# ngram 分词的最小词长（MySQL 默认 ngram_token_size=2），更短的关键词无法走全文索引
+NGRAM_TOKEN_SIZE = 2
+SNIPPET_WIDTH = 40
+
+MATCH_SQL = "MATCH(`user_question`, `ai_response_text`) AGAINST(%s IN BOOLEAN MODE)"
+# 布尔模式的运算符，用户输入中出现时去掉，按普通文本处理
+_OPERATOR_PATTERN = re.compile(r'[+\-<>()~*"@\\\']+')
+
+
+def search_terms(search: str) -> list:
+    return [t for t in _OPERATOR_PATTERN.sub(" ", search or "").split() if t]
+
+
+def fulltext_query(search: str):
+    """
+    关键词转为布尔模式查询：每个词作为短语且必须出现（+"词"）
+    有词短于 ngram 长度时返回 None，由调用方回退到 LIKE
+    """
+    terms = search_terms(search)
+    if not terms or any(len(t) < NGRAM_TOKEN_SIZE for t in terms):
+        return None
+    return " ".join(f'+"{t}"' for t in terms)
+
+
+def _exclude_sql(exclude_hashes: list):
+    if not exclude_hashes:
+        return "", []
+    return f" AND `question_hash` NOT IN ({', '.join(['%s'] * len(exclude_hashes))})", list(exclude_hashes)
+
+
+async def _query(sql: str, params: list) -> list:
+    return await Tortoise.get_connection("default").execute_query_dict(sql, params)
+
+
+async def grouped_page(query: str, exclude_hashes: list, offset: int, limit: int):
+    """全文检索命中的问题分组：返回 (分组总数, 当前页 question_hash 列表)，按组内最早创建时间排序"""
+    exclude, exclude_params = _exclude_sql(exclude_hashes)
+    where = f"WHERE {MATCH_SQL}{exclude}"
+    params = [query, *exclude_params]
+    total_rows = await _query(f"SELECT COUNT(DISTINCT `question_hash`) AS `total` FROM `audio_data` {where}", params)
+    rows = await _query(
+        f"SELECT `question_hash`, MIN(`created_at`) AS `first_created_at` FROM `audio_data` {where} "
+        "GROUP BY `question_hash` ORDER BY `first_created_at`, `question_hash` LIMIT %s OFFSET %s",
+        [*params, limit, offset]
+    )
+    return (int(total_rows[0]["total"]) if total_rows else 0), [row["question_hash"] for row in rows]
+
+
+async def group_row_ids(query: str, hashes: list) -> list:
+    """当前页分组内命中全文检索的记录 id"""
+    if not hashes:
+        return []
+    rows = await _query(
+        f"SELECT `id` FROM `audio_data` WHERE {MATCH_SQL} "
+        f"AND `question_hash` IN ({', '.join(['%s'] * len(hashes))})",
+        [query, *hashes]
+    )
+    return [row["id"] for row in rows]
+
+
+async def ranked_page(query: str, exclude_hashes: list, offset: int, limit: int):
+    """按相关度排序的记录：返回 (命中总数, [(id, score)])"""
+    exclude, exclude_params = _exclude_sql(exclude_hashes)
+    where = f"WHERE {MATCH_SQL}{exclude}"
+    params = [query, *exclude_params]
+    total_rows = await _query(f"SELECT COUNT(*) AS `total` FROM `audio_data` {where}", params)
+    rows = await _query(
+        f"SELECT `id`, {MATCH_SQL} AS `score` FROM `audio_data` {where} "
+        "ORDER BY `score` DESC, `id` DESC LIMIT %s OFFSET %s",
+        [query, *params, limit, offset]
+    )
+    return (int(total_rows[0]["total"]) if total_rows else 0), [(row["id"], float(row["score"])) for row in rows]
+
+
+def highlight(text: str, terms: list, width: int = SNIPPET_WIDTH) -> str:
+    """截取第一个命中词附近的片段，命中词用 <em> 包裹（其余内容已转义）"""
+    text = text or ""
+    if not terms:
+        return html.escape(text[:width * 2])
+    pattern = re.compile("|".join(re.escape(t) for t in sorted(terms, key=len, reverse=True)), re.IGNORECASE)
+    first = pattern.search(text)
+    start = max((first.start() if first else 0) - width, 0)
+    end = min(start + width * 2 + (len(first.group()) if first else 0), len(text))
+    snippet = text[start:end]
+
+    parts, last = [], 0
+    for m in pattern.finditer(snippet):
+        parts.append(html.escape(snippet[last:m.start()]))
+        parts.append(f"<em>{html.escape(m.group())}</em>")
+        last = m.end()
+    parts.append(html.escape(snippet[last:]))
+    return ("…" if start > 0 else "") + "".join(parts) + ("…" if end < len(text) else "")
@@ -34,6 +34,8 @@ async def clean_audio_data():
     """清理数据库中的音频数据记录"""
     try:
         await AudioData.all().delete()
+        from core.stats_rollup import reset_rollup
+        await reset_rollup()
         logger.debug("数据库音频记录已清理")
     except Exception as e:
         logger.error(f"清理数据库音频记录失败: {e}")
@@ -0,0 +1,184 @@
+"""
+图片派生文件：按宽度档位生成缩略图与 WebP / AVIF 版本，供列表接口返回 srcset
+- 在进程池中解码 / 缩放 / 编码，不占用事件循环与 GIL
+- 派生文件按源文件内容哈希命名（static/derived/ab/<sha256>-<宽度>.<格式>），内容相同的图片共用一份
+- 上传时生成，或在列表接口第一次遇到未生成 / 已变化的图片时在后台生成；生成完成前接口只返回原图
+- 依赖 Pillow（可选），未安装时不生成派生文件
+"""
+import asyncio
+import hashlib
+import importlib.util
+import os
+import orjson
+from concurrent.futures import ProcessPoolExecutor
+from settings.config import settings, AUDIO_DIR
+from core.logger import logger
+from core.redis_client import redis_client
+
+DERIVED_DIR = AUDIO_DIR / "derived"
+# 源图片索引：field 为相对 static 的路径，value 为 {"sha", "size", "mtime", "variants": [[宽度, 格式], ...]}
+INDEX_KEY = "image:variants"
+LOCK_KEY = "image:variants:lock:{path}"
+
+_STILL_EXTS = {".jpg", ".jpeg", ".png", ".webp"}
+_PIL_FORMATS = {"webp": "WEBP", "avif": "AVIF"}
+
+
+def _stat_sources(keys: list) -> list:
+    """批量 stat 源文件，文件不存在时为 None（在线程池中执行）"""
+    result = []
+    for key in keys:
+        try:
+            result.append(os.stat(AUDIO_DIR / key))
+        except FileNotFoundError:
+            result.append(None)
+    return result
+
+
+def derived_name(sha256: str, width: int, fmt: str) -> str:
+    return f"derived/{sha256[:2]}/{sha256}-{width}.{fmt}"
+
+
+def _render(source: str, derived_dir: str, widths: tuple, formats: tuple, quality: int) -> dict:
+    """（子进程中执行）读取源图片并生成各档位派生文件，已存在的跳过"""
+    import io
+    from PIL import Image, ImageOps, features
+
+    with open(source, "rb") as f:
+        data = f.read()
+    stat = os.stat(source)
+    sha256 = hashlib.sha256(data).hexdigest()
+
+    image = ImageOps.exif_transpose(Image.open(io.BytesIO(data)))
+    if image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGBA" if image.mode in ("LA", "PA") or "transparency" in image.info else "RGB")
+
+    # 不放大：大于原图宽度的档位省略，原图比最小档位还小时只按原宽度转码
+    targets = sorted({w for w in widths if w < image.width}) or [image.width]
+    formats = [fmt for fmt in formats if fmt != "avif" or features.check("avif")]
+
+    variants = []
+    for width in targets:
+        resized = image if width == image.width else image.resize(
+            (width, max(1, round(image.height * width / image.width))), Image.LANCZOS
+        )
+        for fmt in formats:
+            target = os.path.join(derived_dir, derived_name(sha256, width, fmt)[len("derived/"):])
+            if not os.path.exists(target):
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                temp = f"{target}.{os.getpid()}.tmp"
+                resized.save(temp, _PIL_FORMATS[fmt], quality=quality)
+                os.replace(temp, target)
+            variants.append([width, fmt])
+    return {"sha": sha256, "size": stat.st_size, "mtime": stat.st_mtime_ns, "variants": variants}
+
+
+class ImageVariants:
+    """
+    派生文件的生成与查询
+    - schedule(path): 后台生成（同一文件在各 worker 间用 Redis 锁去重）
+    - srcsets(request, paths): 一次 HMGET 取出一批图片的 srcset，{路径: {格式: "url 320w, url 640w"}}
+    """
+
+    def __init__(self):
+        self._pool = None
+        self._pending = set()
+        self._available = None
+
+    @property
+    def enabled(self) -> bool:
+        if self._available is None:
+            self._available = importlib.util.find_spec("PIL") is not None
+            if settings.image_variant_enable and not self._available:
+                logger.warning("未安装 Pillow，图片派生文件不会生成")
+        return settings.image_variant_enable and self._available
+
+    @staticmethod
+    def _normalize(path: str):
+        """去掉 static/ 前缀；非本地静态图片（外链、SVG、GIF 等）返回 None"""
+        if not path or path.startswith(("http://", "https://")):
+            return None
+        path = path.lstrip("/")
+        if path.startswith("static/"):
+            path = path[len("static/"):]
+        if path.startswith("derived/") or os.path.splitext(path)[1].lower() not in _STILL_EXTS:
+            return None
+        return path
+
+    def schedule(self, path: str):
+        path = self._normalize(path)
+        if not self.enabled or path is None or path in self._pending:
+            return
+        self._pending.add(path)
+        asyncio.create_task(self._generate(path))
+
+    async def _generate(self, path: str):
+        locked = False
+        try:
+            locked = await redis_client.set(LOCK_KEY.format(path=path), "1", nx=True, ex=300)
+            if not locked:
+                return
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=settings.image_variant_workers)
+            widths = tuple(int(w) for w in settings.image_variant_widths.split(",") if w.strip())
+            formats = tuple(f.strip() for f in settings.image_variant_formats.split(",") if f.strip() in _PIL_FORMATS)
+            entry = await asyncio.get_running_loop().run_in_executor(
+                self._pool, _render, str(AUDIO_DIR / path), str(DERIVED_DIR), widths, formats,
+                settings.image_variant_quality,
+            )
+            await redis_client.hset(INDEX_KEY, path, orjson.dumps(entry))
+        except FileNotFoundError:
+            await redis_client.hdel(INDEX_KEY, path)
+        except Exception as e:
+            logger.warning(f"生成图片派生文件失败 {path}: {e}")
+        finally:
+            self._pending.discard(path)
+            if locked:
+                await redis_client.delete(LOCK_KEY.format(path=path))
+
+    async def srcsets(self, request, paths) -> dict:
+        if not self.enabled:
+            return {}
+        normalized = {}
+        for path in paths:
+            key = self._normalize(path)
+            if key is not None:
+                normalized.setdefault(key, []).append(path)
+        if not normalized:
+            return {}
+
+        keys = list(normalized)
+        try:
+            entries = await redis_client.hmget(INDEX_KEY, keys)
+        except Exception as e:
+            logger.warning(f"读取图片派生索引失败: {e}")
+            return {}
+
+        stats = await asyncio.get_running_loop().run_in_executor(None, _stat_sources, keys)
+        result = {}
+        for key, raw, stat in zip(keys, entries, stats):
+            entry = orjson.loads(raw) if raw else None
+            # 源文件被替换（大小或修改时间变化）时重新生成
+            if stat is None:
+                continue
+            if not entry or entry["size"] != stat.st_size or entry["mtime"] != stat.st_mtime_ns:
+                self.schedule(key)
+                continue
+            srcset = {}
+            for width, fmt in entry["variants"]:
+                url = request.url_for("audio_files", path=derived_name(entry["sha"], width, fmt))
+                srcset.setdefault(fmt, []).append(f"{url} {width}w")
+            for path in normalized[key]:
+                result[path] = {fmt: ", ".join(items) for fmt, items in srcset.items()}
+        return result
+
+    async def srcset(self, request, path):
+        return (await self.srcsets(request, [path])).get(path)
+
+    def stop(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+image_variants = ImageVariants()
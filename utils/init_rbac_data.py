@@ -220,6 +220,11 @@ async def init_rbac_data():
         
         # 3. 升级现有管理员
         upgraded_count = await upgrade_existing_admin()
+
+        # 权限 / 角色可能有变化，已缓存的主体全部失效
+        if perm_count or role_count or upgraded_count:
+            from api_versions.auth.principal import principal_cache
+            await principal_cache.invalidate_all()
         
         logger.info(f"✅ RBAC数据初始化完成!")
         logger.info(f"   - 新建权限: {perm_count}")
@@ -158,6 +158,15 @@ async def is_real_image(url: str, timeout=3) -> bool:
 # ---- 文本时间规范化（用于TTS前处理）
 from core.logger import logger
 
+# 预编译，避免每次调用重复编译
+_TIME_RANGE_DASH = re.compile(r"(?<!\d)(\d{1,2})\s*[:：]\s*(\d{1,2})\s*[\-—–－~～〜﹘﹣]\s*(\d{1,2})\s*[:：]\s*(\d{1,2})(?!\d)")
+_TIME_RANGE_SPACE = re.compile(r"(?<!\d)(\d{1,2})\s*[:：]\s*(\d{1,2})\s+(?:到|至)?\s*(\d{1,2})\s*[:：]\s*(\d{1,2})(?!\d)")
+_AGE_DASH = re.compile(r"(?<!\d)(\d{1,3})\s*[\-—–－~～〜﹘﹣]\s*(\d{1,3})\s*岁")
+_AGE_SPACE = re.compile(r"(?<!\d)(\d{1,3})\s+(?:到|至)?\s*(\d{1,3})\s*岁")
+_YEAR_DASH = re.compile(r"(?<!\d)(\d{1,3})\s*[\-—–－~～〜﹘﹣]\s*(\d{1,3})\s*年")
+_YEAR_SPACE = re.compile(r"(?<!\d)(\d{1,3})\s+(?:到|至)?\s*(\d{1,3})\s*年")
+_SINGLE_TIME = re.compile(r"(?<!\d)(\d{1,2})\s*[:：]\s*(\d{1,2})(?!\d)")
+
 def normalize_time_range(text: str) -> str:
     """
     将类似 "21:30-21:45" / "21：30～21：45" 以及被上游清理为
@@ -175,13 +184,11 @@ def normalize_time_range(text: str) -> str:
             return match.group(0)
 
     # 1) 含连接符（-, —, –, －, ~, ～, 〜, ﹘, ﹣）与全角冒号
-    pattern_dash = re.compile(r"(?<!\d)(\d{1,2})\s*[:：]\s*(\d{1,2})\s*[\-—–－~～〜﹘﹣]\s*(\d{1,2})\s*[:：]\s*(\d{1,2})(?!\d)")
-    text = re.sub(pattern_dash, replacer, text)
+    text = _TIME_RANGE_DASH.sub(replacer, text)
 
     # 2) 连接符被上游替换为空格的情况：两个时间之间只有空白
     #    可兼容已有“到/至”残留，统一替换为“到”
-    pattern_space = re.compile(r"(?<!\d)(\d{1,2})\s*[:：]\s*(\d{1,2})\s+(?:到|至)?\s*(\d{1,2})\s*[:：]\s*(\d{1,2})(?!\d)")
-    text = re.sub(pattern_space, replacer, text)
+    text = _TIME_RANGE_SPACE.sub(replacer, text)
 
     return text
 
@@ -203,19 +210,15 @@ def normalize_age_range(text: str) -> str:
             return m.group(0)
 
     # 1) 带连接符的年龄范围
-    pattern_age_dash = re.compile(r"(?<!\d)(\d{1,3})\s*[\-—–－~～〜﹘﹣]\s*(\d{1,3})\s*岁")
-    text = re.sub(pattern_age_dash, replacer, text)
+    text = _AGE_DASH.sub(replacer, text)
 
     # 2) 连接符被替换为空格或已写成到/至：两个数字之间只有空白或‘到|至’，随后紧跟‘岁’
-    pattern_age_space = re.compile(r"(?<!\d)(\d{1,3})\s+(?:到|至)?\s*(\d{1,3})\s*岁")
-    text = re.sub(pattern_age_space, replacer, text)
+    text = _AGE_SPACE.sub(replacer, text)
 
     # 3) “年”也作为年龄单位的别名
-    pattern_year_dash = re.compile(r"(?<!\d)(\d{1,3})\s*[\-—–－~～〜﹘﹣]\s*(\d{1,3})\s*年")
-    text = re.sub(pattern_year_dash, lambda m: f"{int(m.group(1))}到{int(m.group(2))}年", text)
+    text = _YEAR_DASH.sub(lambda m: f"{int(m.group(1))}到{int(m.group(2))}年", text)
 
-    pattern_year_space = re.compile(r"(?<!\d)(\d{1,3})\s+(?:到|至)?\s*(\d{1,3})\s*年")
-    text = re.sub(pattern_year_space, lambda m: f"{int(m.group(1))}到{int(m.group(2))}年", text)
+    text = _YEAR_SPACE.sub(lambda m: f"{int(m.group(1))}到{int(m.group(2))}年", text)
 
     return text
 
@@ -248,8 +251,7 @@ def normalize_time_expressions(text: str) -> str:
         except Exception:
             return m.group(0)
 
-    single_pattern = re.compile(r"(?<!\d)(\d{1,2})\s*[:：]\s*(\d{1,2})(?!\d)")
-    text = re.sub(single_pattern, single_replacer, text)
+    text = _SINGLE_TIME.sub(single_replacer, text)
 
     if text != original:
         try:
@@ -1,9 +1,13 @@
+import asyncio
 import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Set
 import hashlib
 from tortoise import Tortoise
 from core.logger import logger
+from core.redis_client import redis_client
+from settings.config import settings
 from api_versions.v2.models import MediaFile
 
 # 定义静态目录和允许的扩展名
@@ -14,133 +18,240 @@ VIDEO_DIR = STATIC_DIR / "video"
 ALLOWED_IMAGE_EXTS: Set[str] = {".jpg", ".jpeg", ".png", ".webp", ".gif"}
 ALLOWED_VIDEO_EXTS: Set[str] = {".mp4", ".mov", ".webm", ".avi"}
 
+# 已同步文件清单：field 为相对路径，value 为 "大小:修改时间(ns):sha256"；大小与修改时间未变的文件不再计算哈希
+MANIFEST_KEY = "media:sync:manifest"
+SYNC_LOCK_KEY = "media:sync:lock"
+_HASH_BUFFER = 1024 * 1024
+_QUERY_CHUNK = 500
+
+
 async def sync_media_files() -> None:
-    """扫描 static/img 和 static/video，将文件信息同步到数据库 media_file 表。"""
+    """
+    增量扫描 static/img 和 static/video，将文件信息同步到数据库 media_file 表
+    - 只对清单中没有或大小 / 修改时间变化的文件计算哈希（线程池并行，分块读取）
+    - 数据库按哈希 / 路径批量查询，新文件批量插入
+    - 多个 worker 同时启动时只有持有锁的一个执行
+    """
     if not Tortoise._inited:  # 确保数据库已初始化
         logger.warning("数据库未初始化，跳过媒体同步")
         return
+    if not await redis_client.set(SYNC_LOCK_KEY, "1", nx=True, ex=3600):
+        logger.info("其他进程正在同步媒体文件，跳过")
+        return
+
+    try:
+        with ThreadPoolExecutor(max_workers=settings.media_sync_workers, thread_name_prefix="media-sync") as pool:
+            scanned = {}
+            for directory, media_type, allowed_exts in (
+                (IMG_DIR, "image", ALLOWED_IMAGE_EXTS),
+                (VIDEO_DIR, "video", ALLOWED_VIDEO_EXTS),
+            ):
+                scanned.update(await _scan_directory(pool, directory, media_type, allowed_exts))
+
+            # 先补全历史记录缺失的 file_hash，方便后续去重
+            await _backfill_missing_hashes(pool, scanned)
+            await _reconcile(scanned)
+    finally:
+        await redis_client.delete(SYNC_LOCK_KEY)
+
+
+def _list_files(directory: Path, allowed_exts: Set[str]) -> list:
+    """[(相对路径, 文件名, 大小, 修改时间 ns)]"""
+    files = []
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if not entry.is_file() or Path(entry.name).suffix.lower() not in allowed_exts:
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            files.append((f"{directory.name}/{entry.name}", entry.name, stat.st_size, stat.st_mtime_ns))
+    return files
+
+
+def _hash_file(path: Path):
+    hasher = hashlib.sha256()
+    try:
+        with open(path, "rb") as f:
+            while chunk := f.read(_HASH_BUFFER):
+                hasher.update(chunk)
+    except Exception as e:
+        logger.error(f"读取文件失败 {path}: {e}")
+        return None
+    return hasher.hexdigest()
+
 
-    # 先补全历史记录缺失的 file_hash，方便后续去重
-    await _backfill_missing_hashes()
+async def _hash_files(pool, paths: list) -> list:
+    loop = asyncio.get_running_loop()
+    return await asyncio.gather(*(loop.run_in_executor(pool, _hash_file, path) for path in paths))
 
-    await _sync_directory(IMG_DIR, "image", ALLOWED_IMAGE_EXTS)
-    await _sync_directory(VIDEO_DIR, "video", ALLOWED_VIDEO_EXTS)
 
-async def _sync_directory(directory: Path, media_type: str, allowed_exts: Set[str]):
+async def _scan_directory(pool, directory: Path, media_type: str, allowed_exts: Set[str]) -> dict:
+    """扫描目录并取得每个文件的哈希，返回 {相对路径: (文件名, 媒体类型, sha256)}，同时更新清单"""
     if not directory.exists():
         logger.info(f"目录不存在，跳过: {directory}")
-        return
+        return {}
+
+    loop = asyncio.get_running_loop()
+    files = await loop.run_in_executor(pool, _list_files, directory, allowed_exts)
+    prefix = f"{directory.name}/"
+    manifest = {
+        rel: value for rel, value in (await redis_client.hgetall(MANIFEST_KEY)).items() if rel.startswith(prefix)
+    }
+
+    result, changed = {}, []
+    for rel, name, size, mtime_ns in files:
+        cached = manifest.get(rel, "").split(":")
+        if len(cached) == 3 and cached[0] == str(size) and cached[1] == str(mtime_ns):
+            result[rel] = (name, media_type, cached[2])
+        else:
+            changed.append((rel, name, size, mtime_ns))
+
+    if changed:
+        logger.info(f"📁 {directory.name}: {len(files)} 个文件，{len(changed)} 个新增或变更，开始计算哈希…")
+        hashes = await _hash_files(pool, [directory / name for _, name, _, _ in changed])
+        updates = {}
+        for (rel, name, size, mtime_ns), file_hash in zip(changed, hashes):
+            if file_hash:
+                result[rel] = (name, media_type, file_hash)
+                updates[rel] = f"{size}:{mtime_ns}:{file_hash}"
+        if updates:
+            await redis_client.hset(MANIFEST_KEY, mapping=updates)
+
+    removed = [rel for rel in manifest if rel not in result]
+    if removed:
+        await redis_client.hdel(MANIFEST_KEY, *removed)
+    return result
 
-    files = list(directory.iterdir())
-    if not files:
-        logger.info(f"目录为空，跳过: {directory}")
+
+async def _rows_by(field: str, values: list) -> list:
+    rows = []
+    for start in range(0, len(values), _QUERY_CHUNK):
+        rows += await MediaFile.filter(**{f"{field}__in": values[start:start + _QUERY_CHUNK]}).values(
+            "id", "file_path", "file_hash", "is_delete"
+        )
+    return rows
+
+
+async def _reconcile(scanned: dict):
+    """按哈希 / 路径批量查出已有记录，再逐个文件决定跳过、更新路径、补写哈希或新建"""
+    if not scanned:
         return
+    by_hash = {row["file_hash"]: row for row in await _rows_by("file_hash", list({v[2] for v in scanned.values()}))}
+    by_path = {}
+    for row in await _rows_by("file_path", list(scanned)):
+        # 同一路径有多条记录时优先未删除的
+        if row["file_path"] not in by_path or by_path[row["file_path"]]["is_delete"]:
+            by_path[row["file_path"]] = row
 
-    for file in files:
-        if file.is_file() and file.suffix.lower() in allowed_exts:
-            rel_path = f"{directory.name}/{file.name}"
+    to_create, stale_ids, seen = [], [], set()
+    for rel, (name, media_type, file_hash) in scanned.items():
+        # 同一次扫描中内容相同的文件只保留第一个
+        if file_hash in seen:
+            logger.debug(f"跳过重复文件: {rel}")
+            continue
+        seen.add(file_hash)
+
+        existing = by_hash.get(file_hash)
+        if existing:
+            # 相同 hash 的记录已存在；路径不同且旧路径文件已不存在时视为文件移动
+            if (
+                existing["file_path"] != rel
+                and not existing["is_delete"]
+                and not (STATIC_DIR / existing["file_path"]).exists()
+            ):
+                try:
+                    await MediaFile.filter(id=existing["id"]).update(file_path=rel)
+                    logger.info(f"更新媒体路径（文件已移动）: {existing['file_path']} -> {rel}")
+                    await _cleanup_duplicates(rel, file_hash, existing["id"])
+                except Exception as e:
+                    logger.warning(f"更新媒体路径失败 {rel}: {e}")
+            continue
 
-            # 计算文件hash
+        # 若 hash 未找到，但根据 path 找到旧记录且缺少 hash，则更新
+        existing_by_path = by_path.get(rel)
+        if existing_by_path and not existing_by_path["file_hash"]:
             try:
-                with open(file, "rb") as f:
-                    file_bytes = f.read()
-                file_hash = hashlib.sha256(file_bytes).hexdigest()
+                await MediaFile.filter(id=existing_by_path["id"]).update(file_hash=file_hash)
+                logger.info(f"更新媒体hash: {rel}")
+                await _cleanup_duplicates(rel, file_hash, existing_by_path["id"])
             except Exception as e:
-                logger.error(f"读取文件失败 {file}: {e}")
-                continue
+                logger.warning(f"更新媒体hash失败 {rel}: {e}")
+            continue
 
-            # 查重：如果已存在相同 hash，跳过
-            # 先检查是否有完全匹配的记录（hash和路径都匹配）
-            exact_match = await MediaFile.filter(file_hash=file_hash, file_path=rel_path, is_delete=False).first()
-            if exact_match:
-                # 完全匹配，直接跳过
-                logger.debug(f"媒体文件完全匹配，跳过: {rel_path}")
-                continue
-            
-            # 查找相同hash但路径不同的记录
-            existing = await MediaFile.filter(file_hash=file_hash, is_delete=False).first()
-            if existing:
-                # 发现相同hash但路径不同的记录，这表示有重复数据
-                logger.debug(f"发现重复文件hash: 数据库路径='{existing.file_path}', 文件系统路径='{rel_path}'")
-                
-                # 检查文件系统中哪个路径的文件真实存在
-                existing_file_path = STATIC_DIR / existing.file_path
-                current_file_path = STATIC_DIR / rel_path
-                
-                if current_file_path.exists() and not existing_file_path.exists():
-                    # 当前文件存在，数据库中的旧路径文件不存在，更新为当前路径
-                    try:
-                        await existing.update_from_dict({"file_path": rel_path}).save()
-                        logger.info(f"更新媒体路径（文件已移动）: {existing.file_path} -> {rel_path}")
-                    except Exception as e:
-                        logger.warning(f"更新媒体路径失败 {rel_path}: {e}")
-                elif existing_file_path.exists() and current_file_path.exists():
-                    # 两个文件都存在，说明是重复文件，保留数据库中的记录，跳过当前文件
-                    logger.debug(f"跳过重复文件: {rel_path} (已存在: {existing.file_path})")
-                else:
-                    # 其他情况，保持原有逻辑
-                    logger.debug(f"保持原有记录: {existing.file_path}")
-
-                # 若之前被标记删除，恢复展示
-                if existing.is_delete:
-                    try:
-                        await existing.update_from_dict({"is_delete": False}).save()
-                        logger.info(f"恢复已删除的媒体文件: {existing.file_path}")
-                    except Exception:
-                        pass
-
-                # 清理可能的重复记录
-                await _cleanup_duplicates(existing.file_path, file_hash, existing.id)
-                
-                # 跳过创建新记录
-                continue
+        if existing_by_path and not existing_by_path["is_delete"]:
+            stale_ids.append(existing_by_path["id"])
+        to_create.append(MediaFile(
+            name=Path(name).stem,
+            file_path=rel,
+            file_hash=file_hash,
+            description=None,
+            media_type=media_type,
+            is_show=True,
+            is_delete=False,
+        ))
 
-            # 若 hash 未找到，但根据 path 找到旧记录且缺少 hash，则更新
-            existing_by_path = await MediaFile.get_or_none(file_path=rel_path)
-            if existing_by_path and not existing_by_path.file_hash:
-                try:
-                    await existing_by_path.update_from_dict({"file_hash": file_hash}).save()
-                    logger.info(f"更新媒体hash: {rel_path}")
-                    await _cleanup_duplicates(rel_path, file_hash, existing_by_path.id)
-                except Exception as e:
-                    logger.warning(f"更新媒体hash失败 {rel_path}: {e}")
-                continue
+    if to_create:
+        await _create_records(to_create, stale_ids)
 
-            # 不存在任何记录时创建
+
+async def _create_records(records: list, stale_ids: list):
+    """批量插入新记录，并将被替换的旧记录标记删除"""
+    try:
+        await MediaFile.bulk_create(records, batch_size=_QUERY_CHUNK)
+    except Exception as e:
+        # 与上传接口并发写入导致 hash 冲突时逐条插入，跳过冲突的记录
+        logger.warning(f"批量插入媒体记录失败，改为逐条插入: {e}")
+        for record in records:
             try:
-                # 再次检查是否存在相同hash的记录（防止并发创建）
-                existing_hash_check = await MediaFile.get_or_none(file_hash=file_hash)
-                if existing_hash_check:
-                    logger.debug(f"发现并发创建的重复hash记录，跳过: {rel_path}")
-                    await _cleanup_duplicates(rel_path, file_hash, existing_hash_check.id)
-                    continue
-
-                new_rec = await MediaFile.create(
-                    name=file.stem,
-                    file_path=rel_path,
-                    file_hash=file_hash,
-                    description=None,
-                    media_type=media_type,
-                    is_show=True,
-                    is_delete=False,
-                )
-                logger.info(f"已同步媒体文件: {rel_path}")
-                await _cleanup_duplicates(rel_path, file_hash, new_rec.id)
+                await record.save()
             except Exception as e:
-                # 如果是重复键错误，尝试查找现有记录并清理
                 if "Duplicate entry" in str(e) and "file_hash" in str(e):
-                    logger.warning(f"检测到file_hash重复，尝试清理: {rel_path}")
-                    try:
-                        existing_rec = await MediaFile.get_or_none(file_hash=file_hash)
-                        if existing_rec:
-                            await _cleanup_duplicates(rel_path, file_hash, existing_rec.id)
-                            logger.info(f"已清理重复记录: {rel_path}")
-                        else:
-                            logger.error(f"未找到重复的hash记录: {file_hash}")
-                    except Exception as cleanup_e:
-                        logger.error(f"清理重复记录失败 {rel_path}: {cleanup_e}")
+                    logger.debug(f"发现并发创建的重复hash记录，跳过: {record.file_path}")
                 else:
-                    logger.error(f"同步媒体文件失败 {rel_path}: {e}")
+                    logger.error(f"同步媒体文件失败 {record.file_path}: {e}")
+    logger.info(f"已同步 {len(records)} 个媒体文件")
+
+    # 内容已变化的文件：同一路径的旧记录标记删除
+    if stale_ids:
+        await MediaFile.filter(id__in=stale_ids, is_delete=False).update(is_delete=True)
+
+
+class MediaSyncer:
+    """
+    启动后在后台执行媒体同步（media_sync_mode=background），media_sync_interval > 0 时周期性重新扫描；
+    依赖清单，未变化的目录重新扫描只需 stat
+    """
+
+    def __init__(self):
+        self._task = None
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def _run(self):
+        while True:
+            try:
+                await sync_media_files()
+                await check_and_fix_duplicate_hashes()
+            except Exception as e:
+                logger.warning(f"媒体同步失败: {e}")
+            if settings.media_sync_interval <= 0:
+                return
+            await asyncio.sleep(settings.media_sync_interval)
+
+
+media_syncer = MediaSyncer()
 
 # --------------------------------- 工具函数 ---------------------------------
 
@@ -153,36 +264,37 @@ async def _cleanup_duplicates(rel_path: str, file_hash: str, keep_id: int):
     except Exception as e:
         logger.warning(f"清理重复媒体记录失败 {rel_path}: {e}")
 
-async def _backfill_missing_hashes():
-    """为旧记录补写 file_hash，并立即清理重复记录"""
+async def _backfill_missing_hashes(pool, scanned: dict):
+    """为旧记录补写 file_hash，并立即清理重复记录；扫描中已算出的哈希直接复用"""
     missing_hash_records = await MediaFile.filter(file_hash__isnull=True, is_delete=False).all()
     if not missing_hash_records:
         return
 
     logger.info(f"发现 {len(missing_hash_records)} 条缺失 hash 的媒体记录，开始补写…")
 
+    hashes = {rec.file_path: scanned[rec.file_path][2] for rec in missing_hash_records if rec.file_path in scanned}
+    pending = [
+        rec.file_path for rec in missing_hash_records
+        if rec.file_path not in hashes and (STATIC_DIR / rec.file_path).exists()
+    ]
+    hashes.update(zip(pending, await _hash_files(pool, [STATIC_DIR / path for path in pending])))
+    existing_ids = {
+        row["file_hash"]: row["id"] for row in await _rows_by("file_hash", list({h for h in hashes.values() if h}))
+    }
+
     for rec in missing_hash_records:
-        # 计算文件hash
-        file_path_full = STATIC_DIR / rec.file_path
-        if not file_path_full.exists():
-            logger.warning(f"文件不存在，跳过补写 hash: {rec.file_path}")
-            continue
-        try:
-            with open(file_path_full, "rb") as f:
-                file_bytes = f.read()
-            file_hash = hashlib.sha256(file_bytes).hexdigest()
-        except Exception as e:
-            logger.warning(f"读取文件失败，跳过 {rec.file_path}: {e}")
+        file_hash = hashes.get(rec.file_path)
+        if not file_hash:
+            logger.warning(f"文件不存在或读取失败，跳过补写 hash: {rec.file_path}")
             continue
 
-        # 如果已存在同 hash 的记录，保留较新的（created_at 较大）
-        existing_with_hash = await MediaFile.get_or_none(file_hash=file_hash)
-        if existing_with_hash:
-            # 保留较早创建的那条？按需求保留 existing_with_hash，删除当前
-            keep_id = existing_with_hash.id
+        # 如果已存在同 hash 的记录，保留已有记录，删除当前
+        keep_id = existing_ids.get(file_hash)
+        if keep_id:
             await rec.update_from_dict({"is_delete": True}).save()
             await _cleanup_duplicates(rec.file_path, file_hash, keep_id)
             continue
+        existing_ids[file_hash] = rec.id
 
         # 更新自身 hash
         try:
@@ -2,13 +2,13 @@ from core.logger import logger
 
 async def media_log_tools(*, request, m, operation_type, action, action_description, **kwargs):
     from api_versions.auth.routers import get_current_user
-    from api_versions.v2.models import OperationLog
+    from core.batch_writer import operation_log_writer
 
     # 获取当前用户（如果已登录）
     try:
         current_user = await get_current_user(request)
         username = current_user.username
-        is_admin = any(role.name in ["super_admin", "admin"] for role in await current_user.roles.all())
+        is_admin = current_user.principal.has_role("super_admin", "admin")
     except:
         username = "anonymous"
         is_admin = False
@@ -22,7 +22,7 @@ async def media_log_tools(*, request, m, operation_type, action, action_descript
 
     # 记录日志
     try:
-        await OperationLog.create(
+        operation_log_writer.submit(
             username=username,
             operation_type=operation_type,
             operation_content=f"{action_description}{media_type}: {file_name}",
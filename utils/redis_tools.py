@@ -1,12 +1,17 @@
 import hashlib
+import re
 import orjson
 from settings.config import settings
 from fastapi import Request
 from core.redis_client import redis_client
+from core.audio_store import audio_store
 from core.logger import logger
 from typing import Union, Any
 
 
+# SSE 缓存的结束标记：最后一项为该标记的缓存才是完整的
+END_OF_STREAM = "__END_OF_STREAM__"
+
 # 存储开场白建议问题的集合
 suggested_questions = set()
 
@@ -14,11 +19,20 @@ def update_suggested_questions(questions: list):
     """更新建议问题集合，存储时去除标点符号"""
     global suggested_questions
     # 存储时就去除标点符号，这样比较时就不用重复处理了
-    suggested_questions = {q.strip("？?。.>") for q in questions}
+    suggested_questions = {normalize_question(q) for q in questions}
+
+# 热门问题（由 core.hot_topics 定期刷新），与建议问题一样使用共享缓存
+hot_questions = set()
+
+def update_hot_questions(questions: list):
+    global hot_questions
+    hot_questions = set(questions)
+
+_SPACE_PATTERN = re.compile(r"\s+")
 
 def normalize_question(text: str) -> str:
-    """标准化问题文本，去除标点符号"""
-    return text.strip("？?。.>")
+    """标准化问题文本，去除首尾标点符号并合并多余空白（缓存 key 与热门问题统计共用）"""
+    return _SPACE_PATTERN.sub(" ", (text or "").strip("？?。.>")).strip()
 
 async def generate_cache_key(*, request:Request, text:str):
     """ 生成缓存key 
@@ -27,11 +41,16 @@ async def generate_cache_key(*, request:Request, text:str):
     """
     secret_key = request.state.api_key or settings.api_key
     reference_id = request.state.reference_id or settings.reference_id
+    # 缓存的事件里带有音频 URL，不同输出格式分开缓存（wav 保持原有 key）
+    from utils.audio_format import resolve_audio_format
+    audio_format = await resolve_audio_format(request)
+    if audio_format != "wav":
+        reference_id = f"{reference_id}.{audio_format}"
     
     # 标准化问题文本后再检查是否是建议问题之一
     normalized_text = normalize_question(text)
-    if normalized_text in suggested_questions:
-        # 建议问题：只用密钥和音色
+    if normalized_text in suggested_questions or normalized_text in hot_questions:
+        # 建议问题 / 热门问题：只用密钥和音色
         hashed_key = hashlib.sha256(f"{secret_key}_{reference_id}_{normalized_text}".encode("utf-8")).hexdigest()
         logger.debug(f"命中建议问题缓存 - 原文本: {text}, 标准化后: {normalized_text}")
         return f"sse_cache:suggested:{secret_key}:{reference_id}:{hashed_key}"
@@ -57,16 +76,15 @@ async def generate_cache_key(*, request:Request, text:str):
 #     return None
 
 async def get_cached_sse_data(*, request: Request, cache_key: str):
-    """优化后的缓存读取"""
-    if not await redis_client.exists(cache_key):
-        return None
-
+    """优化后的缓存读取：只返回以结束标记结尾的完整缓存，写到一半的缓存视为未命中"""
     try:
         # 单次获取全部数据
         raw_data = await redis_client.lrange(cache_key, 0, -1)
-        
+        if not raw_data or raw_data[-1] != END_OF_STREAM:
+            return None
+
         # 过滤结束标记
-        filtered_data = [item for item in raw_data if item != b"__END_OF_STREAM__"]
+        filtered_data = [item for item in raw_data if item != END_OF_STREAM]
         
         result = []
         for item in filtered_data:
@@ -109,19 +127,23 @@ async def store_see_data_to_cache(*, request:Request, cache_key:str, sse_data: U
         return None
 
 
-async def store_sse_bulk_data(cache_key: str, data_list: list, append: bool = False):
-    """批量存储SSE数据"""
+async def store_sse_bulk_data(cache_key: str, data_list: list, append: bool = False, replace: bool = False):
+    """批量存储SSE数据；replace=True 时先清除该 key 上已有的（可能不完整的）数据"""
     if not data_list:
         return
     
     try:
         async with redis_client.pipeline(transaction=True) as pipe:
+            if replace:
+                pipe.delete(cache_key)
             for data in data_list:
                 if isinstance(data, bytes):
                     pipe.rpush(cache_key, data)
                 else:
                     pipe.rpush(cache_key, orjson.dumps(data))
             pipe.expire(cache_key, settings.cache_expiry)
+            # 缓存中引用的音频在缓存过期前不被回收
+            audio_store.pin(pipe, data_list)
             await pipe.execute()
     except Exception as e:
         logger.error(f"批量存储失败: {e}")
\ No newline at end of file
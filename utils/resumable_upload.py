@@ -0,0 +1,213 @@
+"""
+可续传的分块上传：initiate → 任意顺序 / 并行 PUT 分块 → complete（校验 sha256 后合并）
+- 会话元数据与已收到的分块记录在 Redis（所有 worker 共享），分块暂存在本地磁盘
+- 合并时按顺序流式拷贝并增量计算哈希，不把分块读入内存
+- 后台任务清理过期会话留下的暂存目录
+"""
+import asyncio
+import hashlib
+import os
+import shutil
+import time
+import uuid
+from pathlib import Path
+from fastapi import HTTPException
+from core.logger import logger
+from core.redis_client import redis_client
+from settings.config import settings
+
+SESSION_KEY = "upload:session:{upload_id}"
+CHUNKS_KEY = "upload:session:{upload_id}:chunks"
+CLEANUP_LOCK_KEY = "upload:cleanup"
+
+_COPY_BUFFER = 1024 * 1024
+
+
+def _session_ttl() -> int:
+    return int(settings.model_upload_session_ttl)
+
+
+class ResumableUploads:
+    """
+    分块上传会话管理（staging_dir 下每个会话一个目录，分块文件名为序号）
+    """
+
+    def __init__(self, staging_dir: Path):
+        self.staging_dir = staging_dir
+        self._task = None
+
+    def _session_dir(self, upload_id: str) -> Path:
+        return self.staging_dir / upload_id
+
+    async def initiate(self, *, filename: str, size: int, owner: str, max_bytes: int = None) -> dict:
+        if size <= 0:
+            raise HTTPException(400, "文件大小无效")
+        if max_bytes and size > max_bytes:
+            raise HTTPException(413, f"文件超过大小上限 {max_bytes // 1024 // 1024}MB")
+        upload_id = uuid.uuid4().hex
+        chunk_size = settings.model_upload_chunk_mb * 1024 * 1024
+        total_chunks = (size + chunk_size - 1) // chunk_size
+        session = {
+            "filename": filename, "size": size, "chunk_size": chunk_size,
+            "total_chunks": total_chunks, "owner": owner, "created_at": int(time.time()),
+        }
+        self._session_dir(upload_id).mkdir(parents=True, exist_ok=True)
+        async with redis_client.pipeline(transaction=True) as pipe:
+            pipe.hset(SESSION_KEY.format(upload_id=upload_id), mapping=session)
+            pipe.expire(SESSION_KEY.format(upload_id=upload_id), _session_ttl())
+            await pipe.execute()
+        return {"upload_id": upload_id, **session}
+
+    async def session(self, upload_id: str) -> dict:
+        session = await redis_client.hgetall(SESSION_KEY.format(upload_id=upload_id))
+        if not session:
+            raise HTTPException(404, "上传会话不存在或已过期")
+        for field in ("size", "chunk_size", "total_chunks", "created_at"):
+            session[field] = int(session[field])
+        return session
+
+    async def status(self, upload_id: str) -> dict:
+        session = await self.session(upload_id)
+        received = sorted(int(i) for i in await redis_client.smembers(CHUNKS_KEY.format(upload_id=upload_id)))
+        return {"upload_id": upload_id, **session, "received": received}
+
+    async def put_chunk(self, upload_id: str, index: int, stream) -> dict:
+        """写入一个分块（先写临时文件再重命名，重复上传同一分块会覆盖）"""
+        session = await self.session(upload_id)
+        if not 0 <= index < session["total_chunks"]:
+            raise HTTPException(400, "分块序号超出范围")
+        last = session["total_chunks"] - 1
+        expected = session["chunk_size"] if index < last else session["size"] - session["chunk_size"] * last
+
+        loop = asyncio.get_running_loop()
+        session_dir = self._session_dir(upload_id)
+        session_dir.mkdir(parents=True, exist_ok=True)
+        temp_path = session_dir / f"{index}.{uuid.uuid4().hex[:8]}.tmp"
+        written = 0
+        f = await loop.run_in_executor(None, open, temp_path, "wb")
+        try:
+            async for data in stream:
+                written += len(data)
+                if written > expected:
+                    raise HTTPException(400, f"分块大小超出预期 {expected} 字节")
+                await loop.run_in_executor(None, f.write, data)
+        except BaseException:
+            await loop.run_in_executor(None, f.close)
+            temp_path.unlink(missing_ok=True)
+            raise
+        await loop.run_in_executor(None, f.close)
+        if written != expected:
+            temp_path.unlink(missing_ok=True)
+            raise HTTPException(400, f"分块大小不完整：收到 {written} 字节，应为 {expected} 字节")
+        await loop.run_in_executor(None, os.replace, temp_path, session_dir / str(index))
+
+        async with redis_client.pipeline(transaction=True) as pipe:
+            chunks_key = CHUNKS_KEY.format(upload_id=upload_id)
+            pipe.sadd(chunks_key, index)
+            pipe.expire(chunks_key, _session_ttl())
+            pipe.expire(SESSION_KEY.format(upload_id=upload_id), _session_ttl())
+            pipe.scard(chunks_key)
+            received = (await pipe.execute())[-1]
+        return {"upload_id": upload_id, "index": index, "received_chunks": received, "total_chunks": session["total_chunks"]}
+
+    def _assemble(self, upload_id: str, total_chunks: int, target_dir: Path, ext: str):
+        """按序拼接分块到目标目录的临时文件并计算 sha256（线程池中执行），返回 (临时路径, 大小, sha256)"""
+        session_dir = self._session_dir(upload_id)
+        target_dir.mkdir(parents=True, exist_ok=True)
+        temp_path = target_dir / f".upload-{upload_id}{ext}.part"
+        hasher = hashlib.sha256()
+        size = 0
+        try:
+            with open(temp_path, "wb") as out:
+                for index in range(total_chunks):
+                    with open(session_dir / str(index), "rb") as chunk:
+                        while data := chunk.read(_COPY_BUFFER):
+                            out.write(data)
+                            hasher.update(data)
+                            size += len(data)
+        except BaseException:
+            temp_path.unlink(missing_ok=True)
+            raise
+        return temp_path, size, hasher.hexdigest()
+
+    async def complete(self, upload_id: str, target_dir: Path, sha256: str = None):
+        """所有分块到齐后合并，按内容哈希命名后原子移动到 target_dir，返回 (最终路径, 大小, sha256)"""
+        session = await self.session(upload_id)
+        received = await redis_client.scard(CHUNKS_KEY.format(upload_id=upload_id))
+        if received != session["total_chunks"]:
+            raise HTTPException(409, f"分块未上传完整：{received}/{session['total_chunks']}")
+        # 同一会话只允许一个合并请求
+        if not await redis_client.set(f"{SESSION_KEY.format(upload_id=upload_id)}:complete", "1", nx=True, ex=600):
+            raise HTTPException(409, "上传会话正在合并")
+
+        loop = asyncio.get_running_loop()
+        ext = os.path.splitext(session["filename"])[1].lower()
+        try:
+            temp_path, size, digest = await loop.run_in_executor(
+                None, self._assemble, upload_id, session["total_chunks"], target_dir, ext
+            )
+            if size != session["size"] or (sha256 and sha256.lower() != digest):
+                temp_path.unlink(missing_ok=True)
+                raise HTTPException(422, "文件校验失败，请重新上传不一致的分块")
+            target_path = target_dir / f"{digest}{ext}"
+            await loop.run_in_executor(None, os.replace, temp_path, target_path)
+        finally:
+            await redis_client.delete(f"{SESSION_KEY.format(upload_id=upload_id)}:complete")
+
+        await self.abort(upload_id)
+        return target_path, size, digest
+
+    async def abort(self, upload_id: str):
+        await redis_client.delete(SESSION_KEY.format(upload_id=upload_id), CHUNKS_KEY.format(upload_id=upload_id))
+        await asyncio.get_running_loop().run_in_executor(
+            None, _rmtree, self._session_dir(upload_id)
+        )
+
+    # ------------------------------ 过期会话清理 ------------------------------
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def _run(self):
+        interval = settings.model_upload_cleanup_interval
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                if await redis_client.set(CLEANUP_LOCK_KEY, "1", nx=True, ex=int(interval)):
+                    await self.cleanup()
+            except Exception as e:
+                logger.warning(f"清理过期上传会话失败: {e}")
+
+    async def cleanup(self) -> int:
+        """会话已过期（Redis 中不存在）且目录超过有效期未修改的暂存目录"""
+        if not self.staging_dir.exists():
+            return 0
+        expire_before = time.time() - _session_ttl()
+        removed = 0
+        for session_dir in self.staging_dir.iterdir():
+            if not session_dir.is_dir() or session_dir.stat().st_mtime > expire_before:
+                continue
+            if await redis_client.exists(SESSION_KEY.format(upload_id=session_dir.name)):
+                continue
+            await asyncio.get_running_loop().run_in_executor(None, _rmtree, session_dir)
+            removed += 1
+        if removed:
+            logger.info(f"🧹 已清理 {removed} 个过期上传会话")
+        return removed
+
+
+def _rmtree(path: Path):
+    shutil.rmtree(path, ignore_errors=True)
+
+
+# 模型包的分块上传（暂存目录与模型文件在同一文件系统，合并后可原子重命名）
+model_uploads = ResumableUploads(Path("static/models/.uploads"))
@@ -2,7 +2,7 @@ import aiohttp
 import asyncio
 from settings.config import settings
 from core.dependencies import urls
-from utils.redis_tools import generate_cache_key, store_sse_bulk_data, update_suggested_questions, get_cached_sse_data
+from utils.redis_tools import generate_cache_key, store_sse_bulk_data, update_suggested_questions, get_cached_sse_data, normalize_question, END_OF_STREAM
 from core.services.v2 import llm_server
 from core.logger import logger
 
@@ -17,6 +17,8 @@ class MockRequest:
                 self.reference_id = reference_id
                 self.user_id = 'mock_user'  # 添加一个模拟的user_id，虽然缓存时不会用到它
                 self.tts_speed = tts_speed
+                self.audio_format = ""
+                self.device = ""
         
         self.state = State(api_key, reference_id)
         # 使用实际运行的URL
@@ -72,7 +74,6 @@ async def cache_suggested_question(api_key: str, reference_id: str, question: st
     cache_key = await generate_cache_key(request=mock_request, text=question)
     
     buffer = []
-    buffer_size = 10
     
     try:
         # 获取LLM回答
@@ -82,17 +83,9 @@ async def cache_suggested_question(api_key: str, reference_id: str, question: st
             else:
                 data_bytes = data
             buffer.append(data_bytes)
-            
-            if len(buffer) >= buffer_size:
-                await store_sse_bulk_data(cache_key, buffer.copy())
-                buffer.clear()
-        
-        if buffer:
-            await store_sse_bulk_data(cache_key, buffer)
-            buffer.clear()
-            
-        # 添加结束标记
-        await store_sse_bulk_data(cache_key, [b"__END_OF_STREAM__"])
+
+        # 连同结束标记一次写入，覆盖之前失败留下的不完整缓存
+        await store_sse_bulk_data(cache_key, buffer + [END_OF_STREAM], replace=True)
         logger.info(f"✅ 新建缓存成功 - 音色: {reference_id}, 问题: {question}")
     except Exception as e:
         logger.error(f"❌ 缓存问题失败 - 音色: {reference_id}, 问题: {question}, 错误: {e}")
@@ -121,7 +114,7 @@ async def get_opening_statement():
                 tasks = []
                 for question_ in suggested_questions:
 
-                    question = question_.strip("？?。.>")
+                    question = normalize_question(question_)
 
                     # 男声版本
                     tasks.append(cache_suggested_question(settings.api_key, "man", question))
@@ -6,6 +6,7 @@ import orjson
 import re
 import cn2an
 import random
+import functools
 import jwt
 import colorama
 from jwt import exceptions
@@ -45,16 +46,9 @@ def get_file_name() -> str:
 
 # 失败时候的音频
 def random_voice(*, voice_id):
-    import os
-    from settings.config import FAIL_DIR
+    from utils.audio_pool import audio_pool
 
-    audio_list = os.listdir(FAIL_DIR)
-    man_audio_list = [audio for audio in audio_list if audio.startswith("man")]
-    woman_audio_list = [audio for audio in audio_list if audio.startswith("woman")]
-    if voice_id == "man":
-        return f"fail/{random.choice(man_audio_list)}"
-    elif voice_id == "woman":
-        return f"fail/{random.choice(woman_audio_list)}"
+    return audio_pool.random_clip("fail", voice_id)
 
 
 
@@ -77,6 +71,7 @@ def get_user_id(access_token:str) -> str:
         }
 
 # 数字转中文读音（整数 + 小数）
+@functools.lru_cache(maxsize=4096)
 def number_to_chinese_readable(number_str: str) -> str:
 
     if '.' in number_str:
@@ -87,6 +82,8 @@ def number_to_chinese_readable(number_str: str) -> str:
     else:
         return cn2an.an2cn(int(number_str))
 
+_NUMBER_PATTERN = re.compile(r'\d+(\.\d+)?')
+
 def normalize_text_numbers(text: str) -> str:
     def replacer(match):
         num = match.group(0)
@@ -95,7 +92,7 @@ def normalize_text_numbers(text: str) -> str:
         except Exception:
             return num  # fallback
     # 匹配整数或小数（包括金额、序号等）
-    return re.sub(r'\d+(\.\d+)?', replacer, text)
+    return _NUMBER_PATTERN.sub(replacer, text)
 
 
 
@@ -107,6 +104,22 @@ async def greeting(request: Request):
     from utils.tts_tools import tts_servers
 
     if settings.greeting_enable:
+        from utils.audio_pool import audio_pool
+        from utils.audio_format import resolve_audio_format
+
+        # 优先使用预渲染的问候语音频，省去一次翻译 + TTS 往返
+        pooled = audio_pool.get_greeting(request, await resolve_audio_format(request))
+        if pooled:
+            translate_text, tts_url = pooled
+            greeting_event = {
+                "event": "message",
+                "answer": translate_text,
+                'greeting': True,
+                "status": "ok",
+                "url": tts_url
+            }
+            yield f"data: {orjson.dumps(greeting_event).decode()}\n\n".encode()
+            return
 
         # 先播一句问候语，立即响应
         greeting = random.choice(GREETING_LIST)
@@ -0,0 +1,127 @@
+import re
+import functools
+import emoji
+from core.logger import logger
+from settings.config import settings
+
+# 用于 TTS 的 markdown 清理：与 llm_server.CLEANUP_TABLE 一致，并额外去掉 -（避免序号被读出）
+TTS_CLEANUP_TABLE = str.maketrans('*#_[].!`/-', '          ')
+
+# emoji 首字符集合，先做一次廉价判断，绝大多数文本不需要进入 emoji 库
+# 键帽 emoji 以 0-9 / # / * 开头，ASCII 不放入集合（否则含数字的文本都会命中），改为按键帽组合字符 U+20E3 单独处理
+_KEYCAP = re.compile("[0-9#*]\ufe0f?\u20e3")
+_EMOJI_START = re.compile(
+    "[" + "".join(sorted({re.escape(k[0]) for k in emoji.EMOJI_DATA if not k[0].isascii()} | {"\u20e3"})) + "]"
+)
+
+_DASH = r"[\-—–－~～〜﹘﹣]"
+# 连接符，或被上游替换成空格（可残留 到/至）
+_JOIN = rf"(?:\s*{_DASH}\s*|\s+(?:到|至)?\s*)"
+
+# 规则按优先级排列，合并为一个正则一次扫描完成
+_TIME_RANGE = rf"(?P<time_range>(?<!\d)(?P<h1>\d{{1,2}})\s*[:：]\s*(?P<m1>\d{{1,2}}){_JOIN}(?P<h2>\d{{1,2}})\s*[:：]\s*(?P<m2>\d{{1,2}})(?!\d))"
+_AGE_RANGE = rf"(?P<age_range>(?<!\d)(?P<a1>\d{{1,3}}){_JOIN}(?P<a2>\d{{1,3}})\s*(?P<unit>岁|年))"
+_TIME = r"(?P<time>(?<!\d)(?P<th>\d{1,2})\s*[:：]\s*(?P<tm>\d{1,2})(?!\d))"
+_NUMBER = r"(?P<number>\d+(?:\.\d+)?)"
+
+
+def parse_pronunciations(value: str) -> dict:
+    """解析 "原词:替换词,原词:替换词" 形式的发音替换配置"""
+    pronunciations = {}
+    for item in (value or "").split(","):
+        source, sep, target = item.partition(":")
+        if sep and source.strip():
+            pronunciations[source.strip()] = target.strip()
+    return pronunciations
+
+
+class TTSNormalizer:
+    """
+    TTS 文本规范化（规则只编译一次，单次扫描）
+    - emoji 移除、markdown 符号清理
+    - 发音替换 > 时间范围 > 年龄范围 > 时间点 > 数字转中文
+    - 空白合并
+    结果按 (文本, 是否清理markdown) 做 LRU 缓存
+    """
+
+    def __init__(self, *, pronunciations: dict, numbers_to_chinese: bool, cache_size: int = 4096, number_reader=None):
+        self.pronunciations = pronunciations
+        self.numbers_to_chinese = numbers_to_chinese
+        if number_reader is None:
+            from utils.tools import number_to_chinese_readable
+            number_reader = number_to_chinese_readable
+        self._read_number = number_reader
+
+        rules = []
+        if pronunciations:
+            # 长词优先，避免被短词截断
+            words = sorted(pronunciations, key=len, reverse=True)
+            rules.append("(?P<word>" + "|".join(re.escape(w) for w in words) + ")")
+        rules += [_TIME_RANGE, _AGE_RANGE, _TIME]
+        if numbers_to_chinese:
+            rules.append(_NUMBER)
+        self.pattern = re.compile("|".join(rules))
+
+        self.normalize = functools.lru_cache(maxsize=cache_size)(self._normalize)
+
+    def _num(self, value: str) -> str:
+        if not self.numbers_to_chinese:
+            return str(int(value))
+        try:
+            return self._read_number(str(int(value)))
+        except Exception:
+            return value
+
+    def _replace(self, m: re.Match) -> str:
+        kind = m.lastgroup
+        if kind == "word":
+            return self.pronunciations[m.group(0)]
+        if kind == "time_range":
+            return f"{self._num(m['h1'])}点{self._num(m['m1'])}分到{self._num(m['h2'])}点{self._num(m['m2'])}分"
+        if kind == "age_range":
+            return f"{self._num(m['a1'])}到{self._num(m['a2'])}{m['unit']}"
+        if kind == "time":
+            return f"{self._num(m['th'])}点{self._num(m['tm'])}分"
+        if kind == "number":
+            try:
+                return self._read_number(m.group(0))
+            except Exception:
+                return m.group(0)
+        return m.group(0)
+
+    def _normalize(self, text: str, markdown: bool = False) -> str:
+        if not text:
+            return ""
+        if _EMOJI_START.search(text):
+            text = emoji.replace_emoji(_KEYCAP.sub("", text), replace="")
+        if markdown:
+            text = text.translate(TTS_CLEANUP_TABLE)
+        text = self.pattern.sub(self._replace, text)
+        return " ".join(text.split())
+
+
+_normalizer = None
+_normalizer_key = None
+
+
+def get_normalizer() -> TTSNormalizer:
+    """按当前配置返回规范化器，配置热加载后自动重建（同时清空缓存）"""
+    global _normalizer, _normalizer_key
+    key = (settings.tts_pronunciations, settings.numbers_to_chinese, settings.tts_normalize_cache_size)
+    if key != _normalizer_key:
+        _normalizer = TTSNormalizer(
+            pronunciations=parse_pronunciations(settings.tts_pronunciations),
+            numbers_to_chinese=settings.numbers_to_chinese,
+            cache_size=settings.tts_normalize_cache_size,
+        )
+        _normalizer_key = key
+        logger.debug(f"TTS 文本规范化器已重建: {key}")
+    return _normalizer
+
+
+def normalize_tts_text(text: str, *, markdown: bool = False) -> str:
+    """
+    合成前的文本规范化
+    markdown=True 时额外清理 LLM 输出中的 markdown 符号
+    """
+    return get_normalizer().normalize(text, markdown)
@@ -1,27 +1,23 @@
 from core.logger import logger
 from core.services.v2 import tts_server
 from settings.config import settings
-from utils.llm_tools import normalize_time_expressions
-
-async def _normalize_text_for_tts(text: str) -> str:
-    """TTS统一预处理：时间表达等中文规范化。"""
-    try:
-        return normalize_time_expressions(text)
-    except Exception as e:
-        logger.warning(f"_normalize_text_for_tts 失败: {e}")
-        return text
-
+from utils.tts_normalizer import normalize_tts_text
 
 async def tts_servers(*, func_name, request, text, **kwargs):
 
     logger.debug(f"Using TTS function: {func_name}")
 
-    # 统一规范化文本（如 21:30-21:45 -> 21点30分至21点45分）
+    # 统一规范化文本（如 21:30-21:45 -> 21点30分到21点45分），调用方已处理过的跳过
     original_text = text
-    text = await _normalize_text_for_tts(text)
+    if not kwargs.pop("normalized", False):
+        text = normalize_tts_text(text)
+
+    # 输出格式：请求头 > 设备配置 > 全局默认
+    from utils.audio_format import resolve_audio_format
+    audio_format = kwargs.pop("audio_format", None) or await resolve_audio_format(request)
 
     # 基础参数
-    base_params = {"request": request, "text": text}
+    base_params = {"request": request, "text": text, "audio_format": audio_format}
     # 添加额外参数（用于数据库保存/追踪规范化前后文本）
     base_params.update({
         "ai_response_text": text,
@@ -0,0 +1,101 @@
+"""
+上传文件的流式落盘：固定大小分块读取 → 线程池中写临时文件并增量计算 sha256 → 原子重命名
+- 边读边校验大小上限，超限立即中止，内存占用与文件大小无关
+- dedupe 回调按内容哈希查找已有文件，命中时丢弃临时文件直接复用
+"""
+import asyncio
+import hashlib
+import os
+import uuid
+from pathlib import Path
+from fastapi import HTTPException, UploadFile
+from core.logger import logger
+
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+class StoredUpload:
+    """落盘结果：path 为最终文件（去重命中时为已有文件的路径），duplicate 表示复用了已有文件"""
+
+    def __init__(self, path, size: int, sha256: str, duplicate: bool = False):
+        self.path = path
+        self.size = size
+        self.sha256 = sha256
+        self.duplicate = duplicate
+
+
+def check_extension(filename: str, allowed) -> str:
+    ext = os.path.splitext(filename or "")[1].lower()
+    if allowed is not None and ext not in allowed:
+        raise HTTPException(400, f"不支持的文件类型 {ext}")
+    return ext
+
+
+def _write_chunk(f, hasher, chunk: bytes):
+    f.write(chunk)
+    hasher.update(chunk)
+
+
+def _discard(path: Path):
+    try:
+        path.unlink(missing_ok=True)
+    except Exception as e:
+        logger.warning(f"删除临时上传文件失败: {path} {e}")
+
+
+async def stream_to_temp(upload: UploadFile, target_dir: Path, max_bytes: int = None):
+    """分块写入 target_dir 下的临时文件（与目标同一文件系统，便于原子重命名），返回 (临时路径, 大小, sha256)"""
+    loop = asyncio.get_running_loop()
+    target_dir.mkdir(parents=True, exist_ok=True)
+    temp_path = target_dir / f".upload-{uuid.uuid4().hex}.part"
+    hasher = hashlib.sha256()
+    size = 0
+    try:
+        f = await loop.run_in_executor(None, open, temp_path, "wb")
+        try:
+            while chunk := await upload.read(UPLOAD_CHUNK_SIZE):
+                size += len(chunk)
+                if max_bytes and size > max_bytes:
+                    raise HTTPException(413, f"文件超过大小上限 {max_bytes // 1024 // 1024}MB")
+                await loop.run_in_executor(None, _write_chunk, f, hasher, chunk)
+        finally:
+            await loop.run_in_executor(None, f.close)
+    except BaseException:
+        await loop.run_in_executor(None, _discard, temp_path)
+        raise
+    return temp_path, size, hasher.hexdigest()
+
+
+async def save_upload(
+    upload: UploadFile,
+    target_dir: Path,
+    filename=None,
+    *,
+    allowed_exts=None,
+    max_bytes: int = None,
+    dedupe=None,
+) -> StoredUpload:
+    """
+    流式保存上传文件
+    - filename: 目标文件名，可为 callable(ext, sha256)；为空时使用 sha256 + 扩展名（内容寻址）
+    - dedupe: async callable(sha256) -> 已有文件路径或 None
+    """
+    ext = check_extension(upload.filename, allowed_exts)
+    temp_path, size, sha256 = await stream_to_temp(upload, target_dir, max_bytes)
+    loop = asyncio.get_running_loop()
+
+    try:
+        if dedupe is not None:
+            existing = await dedupe(sha256)
+            if existing:
+                await loop.run_in_executor(None, _discard, temp_path)
+                return StoredUpload(existing, size, sha256, duplicate=True)
+
+        if callable(filename):
+            filename = filename(ext, sha256)
+        target_path = target_dir / (filename or f"{sha256}{ext}")
+        await loop.run_in_executor(None, os.replace, temp_path, target_path)
+    except BaseException:
+        await loop.run_in_executor(None, _discard, temp_path)
+        raise
+    return StoredUpload(target_path, size, sha256)
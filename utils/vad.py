@@ -0,0 +1,149 @@
+import io
+import subprocess
+import wave
+import numpy as np
+from core.logger import logger
+from settings.config import settings
+
+FRAME_MS = 20
+# 绝对静音下限（dBFS），低于该值的帧无论噪声底多低都视为静音
+ABS_FLOOR_DB = -50.0
+# 语音段之间小于该间隔的静音合并为同一段
+HANGOVER_MS = 300
+DECODE_SAMPLE_RATE = 16000
+
+
+class _BufferReader(io.RawIOBase):
+    """bytes / bytearray / memoryview 的只读文件对象，不像 BytesIO 那样复制整个缓冲区"""
+
+    def __init__(self, content):
+        self._view = memoryview(content).cast("B")
+        self._pos = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def readinto(self, b):
+        n = max(0, min(len(b), len(self._view) - self._pos))
+        b[:n] = self._view[self._pos:self._pos + n]
+        self._pos += n
+        return n
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self._pos, io.SEEK_END: len(self._view)}[whence]
+        self._pos = max(0, base + offset)
+        return self._pos
+
+    def tell(self):
+        return self._pos
+
+
+def _decode_wav(content):
+    """解析 PCM WAV，返回 (单声道 float32 [-1, 1], 采样率)；非 PCM 或解析失败返回 None"""
+    try:
+        with wave.open(_BufferReader(content)) as wav:
+            channels, width, rate = wav.getnchannels(), wav.getsampwidth(), wav.getframerate()
+            frames = wav.readframes(wav.getnframes())
+    except (wave.Error, EOFError):
+        return None
+    if width == 1:
+        samples = (np.frombuffer(frames, dtype=np.uint8).astype(np.float32) - 128) / 128
+    elif width == 2:
+        samples = np.frombuffer(frames, dtype="<i2").astype(np.float32) / 32768
+    elif width == 4:
+        samples = np.frombuffer(frames, dtype="<i4").astype(np.float32) / 2147483648
+    else:
+        return None
+    if channels > 1:
+        samples = samples[: len(samples) // channels * channels].reshape(-1, channels).mean(axis=1)
+    return samples, rate
+
+
+def _decode_ffmpeg(content):
+    """mp3 / webm / m4a 等压缩格式用 FFmpeg 解码成 16kHz 单声道 PCM"""
+    result = subprocess.run(
+        ["ffmpeg", "-loglevel", "quiet", "-i", "pipe:0", "-f", "s16le", "-ac", "1", "-ar", str(DECODE_SAMPLE_RATE), "pipe:1"],
+        input=content, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+    )
+    if result.returncode != 0 or not result.stdout:
+        return None
+    return np.frombuffer(result.stdout, dtype="<i2").astype(np.float32) / 32768, DECODE_SAMPLE_RATE
+
+
+def _encode_wav(samples: np.ndarray, rate: int) -> bytes:
+    pcm = (np.clip(samples, -1, 1) * 32767).astype("<i2")
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes(pcm.tobytes())
+    return buffer.getvalue()
+
+
+def detect_speech(samples: np.ndarray, rate: int):
+    """
+    基于能量的语音检测：按 20ms 分帧计算 dBFS，噪声底取 10% 分位，
+    高于 噪声底 + margin 的帧为语音。返回语音区间 (起始采样, 结束采样)，没有语音返回 None
+    """
+    frame_len = int(rate * FRAME_MS / 1000)
+    n_frames = len(samples) // frame_len
+    if n_frames == 0:
+        return None
+
+    frames = samples[: n_frames * frame_len].reshape(n_frames, frame_len)
+    energy_db = 10 * np.log10(np.mean(frames ** 2, axis=1) + 1e-10)
+    noise_floor = np.percentile(energy_db, 10)
+    threshold = max(noise_floor + settings.stt_vad_margin_db, ABS_FLOOR_DB)
+    voiced = energy_db > threshold
+
+    # 合并短间隔后，按最长的连续语音时长判断，避免零星的咔哒声被当成语音
+    hangover = HANGOVER_MS // FRAME_MS
+    voiced_idx = np.flatnonzero(voiced)
+    if voiced_idx.size == 0:
+        return None
+    breaks = np.flatnonzero(np.diff(voiced_idx) > hangover)
+    starts = np.concatenate(([voiced_idx[0]], voiced_idx[breaks + 1]))
+    ends = np.concatenate((voiced_idx[breaks], [voiced_idx[-1]])) + 1
+    min_frames = settings.stt_vad_min_speech_ms / FRAME_MS
+    keep = (ends - starts) >= min_frames
+    if not keep.any():
+        return None
+
+    pad = int(settings.stt_vad_padding_ms / FRAME_MS)
+    first = max(int(starts[keep][0]) - pad, 0)
+    last = min(int(ends[keep][-1]) + pad, n_frames)
+    return first * frame_len, min(last * frame_len, len(samples))
+
+
+def trim_silence(content, file_name: str):
+    """
+    STT 前的 VAD 与静音裁剪（同步，放在线程池中执行），content 为 bytes 或 memoryview，不复制
+    返回 (音频字节, 文件名)：
+      - 纯静音 / 噪声：(None, file_name)
+      - 检测到语音：裁剪后的 16bit 单声道 WAV
+      - 无法解码：原样返回，交给 STT 服务处理
+    """
+    decoded = _decode_wav(content) if file_name.lower().endswith(".wav") else None
+    if decoded is None:
+        decoded = _decode_ffmpeg(content)
+    if decoded is None:
+        return content, file_name
+
+    samples, rate = decoded
+    region = detect_speech(samples, rate)
+    duration = len(samples) / rate
+    if region is None:
+        logger.info(f"🔇 VAD 未检测到语音（{duration:.2f}s），跳过STT")
+        return None, file_name
+
+    start, end = region
+    if start == 0 and end == len(samples) and file_name.lower().endswith(".wav"):
+        return content, file_name
+    trimmed = _encode_wav(samples[start:end], rate)
+    logger.info(f"✂️ VAD 裁剪 {duration:.2f}s -> {(end - start) / rate:.2f}s，{len(content)} -> {len(trimmed)} 字节")
+    stem = file_name.rsplit(".", 1)[0] if "." in file_name else file_name
+    return trimmed, f"{stem}.wav"